@@ -5,6 +5,7 @@ import csv
 import json
 import logging
 import struct
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from pathlib import Path
@@ -26,13 +27,22 @@ try:
     from ..radio.pmr171_uart import (
         PMR171Radio, PMR171Error, list_serial_ports,
         ChannelData, codeplug_to_channels, channels_to_codeplug,
-        SERIAL_AVAILABLE
+        SERIAL_AVAILABLE, PIPELINED_READ_WINDOW
     )
+    from ..radio.image_cache import DEFAULT_VERIFY_SAMPLES
+    from ..radio.journal import SessionJournal, find_unfinished_journals
+    from ..radio.detect import PortDetector
+    from ..radio.retry import RetryPolicy
+    from ..radio.write_image import WriteImage
+    from ..radio.events import ProgressQueue, PROGRESS
 except ImportError:
     SERIAL_AVAILABLE = False
     PMR171Radio = None
 
 
+# Progress dialogs are redrawn from the radio's event queue at this interval (~30 fps)
+PROGRESS_FRAME_MS = 33
+
 # Cohesive blue color palette for the GUI (MOTOTRBO CPS style)
 BLUE_PALETTE = {
     'primary': '#0078D7',       # Primary blue - buttons, links (Windows blue)
@@ -192,6 +202,10 @@ class ChannelTableViewer:
         # Channel selection for read/write operations
         self.channel_checkboxes: Dict[str, tk.BooleanVar] = {}  # ch_id -> BooleanVar
         self.cancel_operation = False  # Flag for cancelling read/write
+        self._active_radio = None  # Radio running in _run_radio_task, for on_cancel
+        self._radio_identities = {}  # (port, hwid) -> PMR171Radio.identify() result
+        self.show_session_metrics = None  # Program > Show Session Metrics (BooleanVar)
+        self.retry_policy = None  # Program > Retry Settings (RetryPolicy, None = driver default)
         
         # Available columns for tree view (ordered as desired)
         # Note: Tree column (#0) is used for R/W checkbox, 'ch' column shows channel number
@@ -677,7 +691,8 @@ class ChannelTableViewer:
         read_mode = read_options['read_mode']
         to_new_file = read_options['to_new_file']
         new_filepath = read_options.get('filepath')
-        logger.info(f"User selected read mode: {read_mode}, to_new_file: {to_new_file}")
+        read_window = PIPELINED_READ_WINDOW if read_options.get('pipelined') else 1
+        logger.info(f"User selected read mode: {read_mode}, to_new_file: {to_new_file}, read_window: {read_window}")
         
         # Determine channels to read based on mode
         if read_mode == 'selected':
@@ -700,17 +715,16 @@ class ChannelTableViewer:
         
         try:
             logger.info(f"Connecting to radio on {port}...")
-            radio = PMR171Radio(port)
+            radio = PMR171Radio(port, read_window=read_window, retry_policy=self.retry_policy,
+                                events=ProgressQueue())
             radio.connect()
             logger.info("Connected to radio")
+            self._attach_radio_cache(radio)
+            journal = self._start_journal(SessionJournal.READ, port,
+                                          indices=channel_indices or list(range(1000)))
             
-            def progress_callback(current, total, message):
-                progress_dialog['var'].set(current)
-                progress_dialog['label'].config(text=message)
-                # Update progress info with x/y and percentage
-                percentage = int((current / total) * 100) if total > 0 else 0
-                progress_dialog['progress_info_var'].set(f"{current} of {total} channels ({percentage}%)")
-                progress_dialog['dialog'].update()
+            # Queued, not drawn: the dialog is redrawn on a timer (see _run_radio_task)
+            progress_callback = radio.events.callback
             
             def cancel_check():
                 return self.cancel_operation
@@ -719,10 +733,11 @@ class ChannelTableViewer:
             if read_mode in ('selected', 'first50'):
                 logger.info(f"Reading {len(channel_indices)} selected/first50 channels...")
                 # Selected or first 50 - use read_selected_channels with specific indices
-                channels_read = radio.read_selected_channels(
-                    channel_indices, progress_callback, cancel_check)
+                channels_read = self._run_radio_task(progress_dialog, radio, lambda: radio.read_selected_channels(
+                    channel_indices, progress_callback, cancel_check, journal=journal))
                 was_cancelled = self.cancel_operation
                 radio.disconnect()
+                self._finish_journal(journal, was_cancelled)
                 
                 logger.info(f"Read complete. Channels read: {len(channels_read)}, was_cancelled: {was_cancelled}")
                 
@@ -835,10 +850,11 @@ class ChannelTableViewer:
                 # Read all channels
                 logger.info("Reading ALL 1000 channels...")
                 from ..radio.pmr171_uart import channels_to_codeplug
-                channels_read = radio.read_all_channels(
-                    progress_callback, include_empty=True, cancel_check=cancel_check)
+                channels_read = self._run_radio_task(progress_dialog, radio, lambda: radio.read_all_channels(
+                    progress_callback, include_empty=True, cancel_check=cancel_check, journal=journal))
                 was_cancelled = self.cancel_operation
                 radio.disconnect()
+                self._finish_journal(journal, was_cancelled)
                 
                 logger.info(f"Read complete. Channels read: {len(channels_read)}, was_cancelled: {was_cancelled}")
                 
@@ -903,6 +919,7 @@ class ChannelTableViewer:
             
         except PMR171Error as e:
             logger.error(f"PMR171Error: {e}")
+            self._forget_detected_port(port)
             progress_dialog['dialog'].destroy()
             messagebox.showerror("Read Error", f"Failed to read from radio:\n\n{e}", parent=self.root)
         except Exception as e:
@@ -976,25 +993,45 @@ class ChannelTableViewer:
         progress_dialog = self._create_progress_dialog("Writing to Radio", total_channels)
         
         try:
-            radio = PMR171Radio(port)
+            radio = PMR171Radio(port, retry_policy=self.retry_policy,
+                                verify_echo=write_options.get('verify_echo', True),
+                                events=ProgressQueue())
             radio.connect()
+            use_cache = write_options.get('use_cache', False)
+            if not self._attach_radio_cache(radio):
+                use_cache = False
+            journal = None if use_cache else self._start_journal(
+                SessionJournal.WRITE, port, channels=channels_to_write)
             
-            def progress_callback(current, total, message):
-                progress_dialog['var'].set(current)
-                progress_dialog['label'].config(text=message)
-                # Update progress info with x/y and percentage
-                percentage = int((current / total) * 100) if total > 0 else 0
-                progress_dialog['progress_info_var'].set(f"{current} of {total} channels ({percentage}%)")
-                progress_dialog['dialog'].update()
+            # Queued, not drawn: the dialog is redrawn on a timer (see _run_radio_task)
+            progress_callback = radio.events.callback
             
             def cancel_check():
                 return self.cancel_operation
             
-            # Write channels
-            success_count = radio.write_all_channels(
-                channels_to_write, progress_callback, cancel_check)
+            # Write channels - every packet is encoded once, for the write and the verify pass
+            skip_unchanged = write_options.get('skip_unchanged', False)
+            image = WriteImage.compile(channels_to_write)
+            if use_cache:
+                success_count = self._run_radio_task(progress_dialog, radio, lambda: radio.write_changed_channels(
+                    channels_to_write, progress_callback, cancel_check,
+                    verify_samples=DEFAULT_VERIFY_SAMPLES))
+            else:
+                success_count = self._run_radio_task(progress_dialog, radio, lambda: radio.write_all_channels(
+                    channels_to_write, progress_callback, cancel_check,
+                    skip_unchanged=skip_unchanged, journal=journal, image=image))
+            summary = radio.last_write_summary
             was_cancelled = self.cancel_operation
+            
+            # Optional final pass: one pipelined read-back of everything written
+            verify_report = None
+            if write_options.get('verify') and not was_cancelled:
+                verify_report = self._run_radio_task(progress_dialog, radio, lambda: radio.verify_channels(
+                    image, progress_callback, cancel_check))
+                was_cancelled = self.cancel_operation
+            
             radio.disconnect()
+            self._finish_journal(journal, was_cancelled)
             
             # Close progress dialog
             progress_dialog['dialog'].destroy()
@@ -1007,20 +1044,245 @@ class ChannelTableViewer:
                     parent=self.root
                 )
             else:
-                messagebox.showinfo(
-                    "Write Complete",
-                    f"Successfully wrote {success_count} of {total_channels} channels to radio.",
-                    parent=self.root
-                )
+                message = f"Successfully wrote {success_count} of {total_channels} channels to radio."
+                if skip_unchanged or use_cache:
+                    message += (f"\n\n{summary['written']} written, "
+                                f"{summary['skipped']} already up to date.")
+                if verify_report is not None and not verify_report.ok:
+                    message += f"\n\nVerify found differences:\n{verify_report.summary(limit=8)}"
+                    messagebox.showwarning("Write Complete - Verify Failed", message, parent=self.root)
+                else:
+                    if verify_report is not None:
+                        message += f"\n\n{verify_report.summary()}."
+                    messagebox.showinfo("Write Complete", message, parent=self.root)
             self.status_label.config(text=f"Wrote {success_count} channels to radio")
             
         except PMR171Error as e:
+            self._forget_detected_port(port)
             progress_dialog['dialog'].destroy()
             messagebox.showerror("Write Error", f"Failed to write to radio:\n\n{e}", parent=self.root)
         except Exception as e:
             progress_dialog['dialog'].destroy()
             messagebox.showerror("Error", f"Unexpected error:\n\n{e}", parent=self.root)
     
+    def _show_retry_settings_dialog(self):
+        """Edit the retry policy used for radio reads and writes"""
+        if PMR171Radio is None:
+            messagebox.showerror("Not Available", "Radio support is not available.", parent=self.root)
+            return
+        policy = self.retry_policy or RetryPolicy()
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Retry Settings")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.resizable(False, False)
+        
+        header_frame = tk.Frame(dialog, bg=BLUE_PALETTE['header'], height=30)
+        header_frame.pack(fill=tk.X)
+        header_frame.pack_propagate(False)
+        tk.Label(header_frame, text="Retry Settings", font=('Arial', 10, 'bold'),
+                bg=BLUE_PALETTE['header'], fg='white').pack(side=tk.LEFT, padx=10, pady=5)
+        
+        content = ttk.Frame(dialog, padding=15)
+        content.pack(fill=tk.BOTH, expand=True)
+        
+        attempts_var = tk.IntVar(value=policy.max_attempts)
+        deadline_var = tk.DoubleVar(value=policy.deadline or 0.0)
+        breaker_var = tk.IntVar(value=policy.breaker_threshold or 0)
+        max_backoff_var = tk.DoubleVar(value=policy.max_backoff)
+        
+        fields = [
+            ("Attempts per channel:", attempts_var, 1, 20, 1),
+            ("Time limit per channel (s, 0 = none):", deadline_var, 0, 60, 0.5),
+            ("Abort after failed channels in a row (0 = never):", breaker_var, 0, 100, 1),
+            ("Longest wait between attempts (s):", max_backoff_var, 0, 10, 0.1),
+        ]
+        for row, (label, var, low, high, step) in enumerate(fields):
+            ttk.Label(content, text=label).grid(row=row, column=0, sticky='w', pady=3)
+            ttk.Spinbox(content, textvariable=var, from_=low, to=high, increment=step,
+                        width=8).grid(row=row, column=1, sticky='e', padx=(10, 0), pady=3)
+        ttk.Label(content,
+            text="CRC errors are retried at once; timeouts back off exponentially.",
+            font=('Arial', 9), foreground='#666666').grid(row=len(fields), column=0, columnspan=2,
+                                                          sticky='w', pady=(8, 0))
+        
+        button_frame = ttk.Frame(dialog, padding=10)
+        button_frame.pack(fill=tk.X)
+        
+        def on_ok():
+            try:
+                self.retry_policy = RetryPolicy(
+                    max_attempts=attempts_var.get(),
+                    base_backoff=policy.base_backoff,
+                    backoff_factor=policy.backoff_factor,
+                    max_backoff=max_backoff_var.get(),
+                    jitter=policy.jitter,
+                    crc_backoff=policy.crc_backoff,
+                    deadline=deadline_var.get() or None,
+                    breaker_threshold=breaker_var.get() or None,
+                )
+            except (tk.TclError, ValueError) as e:
+                messagebox.showerror("Invalid Setting", str(e), parent=dialog)
+                return
+            logger.info(f"Retry policy: {self.retry_policy}")
+            dialog.destroy()
+        
+        def on_defaults():
+            defaults = RetryPolicy()
+            attempts_var.set(defaults.max_attempts)
+            deadline_var.set(defaults.deadline or 0.0)
+            breaker_var.set(defaults.breaker_threshold or 0)
+            max_backoff_var.set(defaults.max_backoff)
+        
+        ttk.Button(button_frame, text="OK", command=on_ok, width=10).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=dialog.destroy, width=10).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Defaults", command=on_defaults, width=10).pack(side=tk.RIGHT, padx=5)
+        
+        dialog.update_idletasks()
+        x = self.root.winfo_x() + (self.root.winfo_width() - dialog.winfo_width()) // 2
+        y = self.root.winfo_y() + (self.root.winfo_height() - dialog.winfo_height()) // 2
+        dialog.geometry(f"+{x}+{y}")
+        self.root.wait_window(dialog)
+    
+    def _start_journal(self, operation: str, port: str, indices: List[int] = None,
+                       channels: List = None):
+        """Start a session journal so an interrupted read/write can be resumed
+        
+        Args:
+            operation: SessionJournal.READ or SessionJournal.WRITE
+            port: Serial port in use
+            indices: Channel indices (read sessions)
+            channels: Target ChannelData list (write sessions)
+            
+        Returns:
+            SessionJournal, or None if the journal could not be created
+        """
+        try:
+            return SessionJournal.create(operation, indices=indices, channels=channels, port=port)
+        except OSError as e:
+            logger.warning(f"Session journal unavailable: {e}")
+            return None
+    
+    def _finish_journal(self, journal, was_cancelled: bool) -> None:
+        """Delete a journal once every channel was confirmed
+        
+        Cancelled or partially failed sessions are left open for Program > Resume.
+        """
+        if journal is None:
+            return
+        try:
+            if not was_cancelled and not journal.pending() and not journal.integrity_check():
+                journal.finish()
+                journal.delete()
+            else:
+                logger.info(f"Session left resumable: {len(journal.pending())} channels unconfirmed "
+                            f"({journal.path})")
+        except OSError as e:
+            logger.warning(f"Could not update session journal: {e}")
+    
+    def _resume_session(self):
+        """Resume the most recent interrupted read/write session from its journal"""
+        if not SERIAL_AVAILABLE:
+            messagebox.showerror(
+                "pyserial Not Installed",
+                "The pyserial library is required for radio programming.\n\n"
+                "Install it with:\n"
+                "    pip install pyserial",
+                parent=self.root
+            )
+            return
+        
+        journals = find_unfinished_journals()
+        if not journals:
+            messagebox.showinfo("Resume Session", "There is no interrupted session to resume.",
+                                parent=self.root)
+            return
+        
+        journal = journals[0]
+        info = journal.summary()
+        started = datetime.fromtimestamp(info['started']).strftime('%Y-%m-%d %H:%M')
+        remaining = info['total'] - info['confirmed']
+        if not messagebox.askyesno(
+                "Resume Session",
+                f"Resume the {info['operation']} session started {started} on {info['port']}?\n\n"
+                f"{info['confirmed']} of {info['total']} channels done, {remaining} remaining.",
+                parent=self.root):
+            return
+        
+        port = self._select_serial_port(f"Resume {info['operation'].title()}")
+        if not port:
+            return
+        
+        progress_dialog = self._create_progress_dialog("Resuming Session", max(remaining, 1))
+        
+        try:
+            radio = PMR171Radio(port, retry_policy=self.retry_policy, events=ProgressQueue())
+            radio.connect()
+            self._attach_radio_cache(radio)
+            
+            # Queued, not drawn: the dialog is redrawn on a timer (see _run_radio_task)
+            progress_callback = radio.events.callback
+            
+            def cancel_check():
+                return self.cancel_operation
+            
+            result = self._run_radio_task(progress_dialog, radio, lambda: radio.resume(
+                journal.path, progress_callback, cancel_check))
+            radio.disconnect()
+            progress_dialog['dialog'].destroy()
+            
+            journal = SessionJournal.open(journal.path)
+            status = "complete" if journal.finished else f"{len(journal.pending())} channels still unconfirmed"
+            if journal.finished:
+                journal.delete()
+            
+            if info['operation'] == SessionJournal.READ:
+                # Merge everything the session has read into the current codeplug
+                self._save_state("Resume read from radio")
+                for ch in result:
+                    self.channels[str(ch.index)] = ch.to_dict()
+                self.current_channel = None
+                self._rebuild_channel_tree()
+                message = f"Read session {status}.\n{len(result)} channels loaded."
+            else:
+                message = f"Write session {status}.\n{result} of {info['total']} channels written."
+            
+            messagebox.showinfo("Resume Session", message, parent=self.root)
+            self.status_label.config(text=f"Resumed {info['operation']} session: {status}")
+            
+        except PMR171Error as e:
+            self._forget_detected_port(port)
+            progress_dialog['dialog'].destroy()
+            messagebox.showerror("Resume Error", f"Failed to resume session:\n\n{e}", parent=self.root)
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}", exc_info=True)
+            progress_dialog['dialog'].destroy()
+            messagebox.showerror("Error", f"Unexpected error:\n\n{e}", parent=self.root)
+    
+    def _attach_radio_cache(self, radio) -> bool:
+        """Attach the on-disk radio image cache, logging (not raising) on failure
+        
+        The radio is identified (0x27) the first time a port is used; later
+        operations on the same port and USB device reuse that answer. A
+        different radio swapped onto the same cable is caught by the sampled
+        readback before each delta write.
+        
+        Args:
+            radio: Connected PMR171Radio
+            
+        Returns:
+            True if the cache was attached
+        """
+        key = (radio.port, radio.port_hwid())
+        try:
+            radio.attach_image_cache(radio_info=self._radio_identities.get(key))
+            self._radio_identities[key] = radio.radio_info
+            return True
+        except Exception as e:
+            logger.warning(f"Radio image cache unavailable: {e}")
+            return False
+    
     def _select_serial_port(self, title: str) -> Optional[str]:
         """Show dialog to select a serial port
         
@@ -1106,6 +1368,8 @@ class ChannelTableViewer:
         ttk.Button(button_frame, text="Cancel", command=on_cancel, width=12).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Refresh", 
                   command=lambda: self._refresh_port_list(port_listbox, ports), width=12).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Auto-detect",
+                  command=lambda: self._detect_radio_ports(dialog, port_listbox, ports), width=12).pack(side=tk.RIGHT, padx=5)
         
         # Set initial focus to Connect button so Enter key works
         connect_btn.focus_set()
@@ -1135,6 +1399,52 @@ class ChannelTableViewer:
         if new_ports:
             listbox.selection_set(0)
     
+    def _detect_radio_ports(self, dialog: tk.Toplevel, listbox: tk.Listbox, ports: list):
+        """Probe all ports for a radio and list the ones that answer first, fastest on top
+        
+        Only known USB programming cables are probed unless the user agrees to
+        send the handshake to every other serial device as well.
+        """
+        detector = PortDetector()
+        dialog.config(cursor='watch')
+        try:
+            detected = self._run_radio_task(None, None, detector.detect)
+            if not detected and messagebox.askyesno(
+                    "Auto-detect",
+                    "No radio answered on a known USB programming cable.\n\n"
+                    "Also probe the other serial ports? This sends a channel read "
+                    "request to every serial device on this computer.",
+                    parent=dialog):
+                detected = self._run_radio_task(None, None, lambda: detector.detect(include_unknown=True))
+        finally:
+            dialog.config(cursor='')
+        
+        all_ports = list_serial_ports()
+        detected_names = [radio.port for radio in detected]
+        others = [p for p in all_ports if p['port'] not in detected_names]
+        ports.clear()
+        listbox.delete(0, tk.END)
+        for radio in detected:
+            ports.append({'port': radio.port, 'description': radio.description, 'hwid': radio.hwid})
+            listbox.insert(tk.END, f"{radio.port} - PMR-171 ({radio.response_time * 1000:.0f} ms)")
+            listbox.itemconfig(tk.END, fg=BLUE_PALETTE['primary'])
+        for port_info in others:
+            ports.append(port_info)
+            listbox.insert(tk.END, f"{port_info['port']} - {port_info['description']}")
+        
+        if ports:
+            listbox.selection_set(0)
+        if not detected:
+            messagebox.showinfo("Auto-detect", "No radio answered.\n\n"
+                                "Check that the radio is on and the cable is connected.", parent=dialog)
+    
+    def _forget_detected_port(self, port: str) -> None:
+        """Drop a port from the auto-detect cache after an operation on it failed"""
+        try:
+            PortDetector().forget(port)
+        except Exception as e:
+            logger.debug(f"Could not update detection cache: {e}")
+    
     def _show_read_destination_dialog(self, selected_count: int) -> Optional[dict]:
         """Show dialog to select which channels to read and where to put the data
         
@@ -1142,11 +1452,12 @@ class ChannelTableViewer:
             selected_count: Number of channels currently selected
             
         Returns:
-            Dictionary with 'read_mode' and 'to_new_file' keys, or None if cancelled
+            Dictionary with 'read_mode', 'to_new_file' and 'pipelined' keys,
+            or None if cancelled
         """
         dialog = tk.Toplevel(self.root)
         dialog.title("Read from Radio")
-        dialog.geometry("500x520")
+        dialog.geometry("500x610")
         dialog.transient(self.root)
         dialog.grab_set()
         dialog.resizable(False, False)
@@ -1241,6 +1552,17 @@ class ChannelTableViewer:
             font=('Arial', 9), foreground='#666666')
         update_desc.pack(anchor='w', padx=10)
         
+        # === Read Speed ===
+        ttk.Separator(content, orient='horizontal').pack(fill='x', pady=15)
+        
+        pipelined_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(content, text="Pipelined read (faster, experimental)",
+                        variable=pipelined_var).pack(anchor='w', padx=10)
+        ttk.Label(content,
+            text="    Keeps several channel requests in flight at once.\n"
+                 "    Falls back to one at a time if the radio cannot keep up.",
+            font=('Arial', 9), foreground='#666666').pack(anchor='w', padx=10)
+        
         # Button frame with LARGE prominent Start Read button
         button_frame = tk.Frame(dialog, bg='#E8E8E8', pady=15)
         button_frame.pack(fill=tk.X, side=tk.BOTTOM)
@@ -1251,6 +1573,7 @@ class ChannelTableViewer:
             result['value'] = {
                 'read_mode': read_mode,
                 'to_new_file': to_new_file,
+                'pipelined': pipelined_var.get(),
                 'filepath': None  # No file created yet - just in memory
             }
             dialog.destroy()
@@ -1411,12 +1734,13 @@ class ChannelTableViewer:
             selected_count: Number of channels currently selected in R/W Selection panel
             
         Returns:
-            Dictionary with 'write_mode' key ('selected', 'programmed', or 'all'), 
+            Dictionary with 'write_mode' key ('selected', 'programmed', or 'all')
+            and 'skip_unchanged' / 'use_cache' / 'verify_echo' / 'verify' flags,
             or None if cancelled
         """
         dialog = tk.Toplevel(self.root)
         dialog.title("Write to Radio")
-        dialog.geometry("450x420")
+        dialog.geometry("450x655")
         dialog.transient(self.root)
         dialog.grab_set()
         dialog.resizable(False, False)
@@ -1486,13 +1810,48 @@ class ChannelTableViewer:
             font=('Arial', 9), foreground='#666666')
         all_desc.pack(anchor='w', padx=10)
         
+        # === Write Speed ===
+        ttk.Separator(content, orient='horizontal').pack(fill='x', pady=15)
+        
+        skip_unchanged_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(content, text="Skip channels that are already on the radio",
+                        variable=skip_unchanged_var).pack(anchor='w', padx=10)
+        ttk.Label(content,
+            text="    Reads each slot back and only writes channels that differ.",
+            font=('Arial', 9), foreground='#666666').pack(anchor='w', padx=10)
+        
+        use_cache_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(content, text="Only write changes since the last read/write",
+                        variable=use_cache_var).pack(anchor='w', padx=10, pady=(8, 0))
+        ttk.Label(content,
+            text="    Uses the saved image of this radio; spot-checks a few slots first.",
+            font=('Arial', 9), foreground='#666666').pack(anchor='w', padx=10)
+        
+        verify_echo_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(content, text="Check each write's echo",
+                        variable=verify_echo_var).pack(anchor='w', padx=10, pady=(8, 0))
+        ttk.Label(content,
+            text="    Retries channels the radio echoes back differently (no extra time).",
+            font=('Arial', 9), foreground='#666666').pack(anchor='w', padx=10)
+        
+        verify_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(content, text="Verify after writing",
+                        variable=verify_var).pack(anchor='w', padx=10, pady=(8, 0))
+        ttk.Label(content,
+            text="    Reads every written channel back (pipelined) and compares it.",
+            font=('Arial', 9), foreground='#666666').pack(anchor='w', padx=10)
+        
         # Button frame (shorter height)
         button_frame = tk.Frame(dialog, bg='#E8E8E8', pady=10)
         button_frame.pack(fill=tk.X, side=tk.BOTTOM)
         
         def on_start_write():
             write_mode = range_var.get()
-            result['value'] = {'write_mode': write_mode}
+            result['value'] = {'write_mode': write_mode,
+                               'skip_unchanged': skip_unchanged_var.get(),
+                               'use_cache': use_cache_var.get(),
+                               'verify_echo': verify_echo_var.get(),
+                               'verify': verify_var.get()}
             dialog.destroy()
         
         def on_cancel():
@@ -1526,19 +1885,24 @@ class ChannelTableViewer:
     def _create_progress_dialog(self, title: str, total: int) -> dict:
         """Create a progress dialog for long operations with Cancel button
         
+        When Program > Show Session Metrics is checked, the dialog also shows
+        a live line of radio session metrics (see _update_progress_metrics).
+        
         Args:
             title: Dialog title
             total: Total number of steps
             
         Returns:
-            Dictionary with 'dialog', 'var', 'bar', 'label', 'progress_info', 'cancelled' keys
+            Dictionary with 'dialog', 'var', 'bar', 'label', 'progress_info',
+            'metrics_var' (None unless metrics are shown), 'cancelled' keys
         """
         # Reset cancel flag
         self.cancel_operation = False
+        show_metrics = bool(self.show_session_metrics is not None and self.show_session_metrics.get())
         
         dialog = tk.Toplevel(self.root)
         dialog.title(title)
-        dialog.geometry("400x180")
+        dialog.geometry("400x205" if show_metrics else "400x180")
         dialog.transient(self.root)
         dialog.grab_set()
         dialog.resizable(False, False)
@@ -1572,6 +1936,13 @@ class ChannelTableViewer:
         status_label = ttk.Label(content, text="Starting...", font=('Arial', 9))
         status_label.pack(anchor='w')
         
+        # Session metrics (RTT, retries, throughput) - optional
+        metrics_var = None
+        if show_metrics:
+            metrics_var = tk.StringVar(value="")
+            ttk.Label(content, textvariable=metrics_var, font=('Arial', 8),
+                      foreground='#666666').pack(anchor='w')
+        
         # Store total for percentage calculation
         dialog.total = total
         dialog.progress_info_var = progress_info_var
@@ -1582,13 +1953,15 @@ class ChannelTableViewer:
         
         def on_cancel():
             self.cancel_operation = True
-            status_label.config(text="Cancelling after current channel...")
+            if self._active_radio is not None:
+                self._active_radio.cancel()  # Interrupts waits and retries at once
+            status_label.config(text="Cancelling...")
             cancel_btn.config(state='disabled')
         
         cancel_btn = ttk.Button(button_frame, text="Cancel", command=on_cancel, width=10)
         cancel_btn.pack(side=tk.RIGHT)
         
-        # Bind ESC, Space, and Enter keys to cancel (elegant cancellation after current channel)
+        # Bind ESC, Space, and Enter keys to cancel
         dialog.bind('<Escape>', lambda e: on_cancel())
         dialog.bind('<space>', lambda e: on_cancel())
         dialog.bind('<Return>', lambda e: on_cancel())
@@ -1608,9 +1981,79 @@ class ChannelTableViewer:
             'bar': progress_bar,
             'label': status_label,
             'progress_info_var': progress_info_var,
+            'metrics_var': metrics_var,
             'total': total,
             'cancel_btn': cancel_btn
         }
+    
+    def _update_progress_metrics(self, progress_dialog: dict, radio) -> None:
+        """Show the radio's session metrics in a progress dialog, if enabled"""
+        if progress_dialog.get('metrics_var') is not None:
+            progress_dialog['metrics_var'].set(radio.metrics.status_line())
+    
+    def _drain_progress_events(self, progress_dialog: dict, radio) -> None:
+        """Redraw a progress dialog from the latest queued progress event"""
+        latest = None
+        for event in radio.events.drain():
+            if event.kind == PROGRESS:
+                latest = event
+        if latest is not None:
+            current, total = latest.current, latest.total
+            progress_dialog['bar'].config(maximum=max(total, 1))
+            progress_dialog['var'].set(current)
+            progress_dialog['label'].config(text=latest.message)
+            # Update progress info with x/y and percentage
+            percentage = int((current / total) * 100) if total > 0 else 0
+            progress_dialog['progress_info_var'].set(f"{current} of {total} channels ({percentage}%)")
+        self._update_progress_metrics(progress_dialog, radio)
+    
+    def _run_radio_task(self, progress_dialog: dict, radio, task):
+        """Run a radio operation on a worker thread while the dialog stays live
+        
+        The radio only queues its progress (radio.events); the Tk event loop
+        keeps running here and redraws the dialog every PROGRESS_FRAME_MS, so
+        the I/O loop never waits for the GUI. While it runs, the dialog's
+        Cancel button calls radio.cancel().
+        
+        Args:
+            progress_dialog: Dialog from _create_progress_dialog, or None
+            radio: PMR171Radio created with events=ProgressQueue(), or None
+                for serial I/O without a radio (e.g. port detection)
+            task: Callable doing the radio I/O
+            
+        Returns:
+            Whatever task returned (its exception is re-raised here)
+        """
+        outcome = {}
+        finished = tk.BooleanVar(value=False)
+        
+        def worker():
+            try:
+                outcome['result'] = task()
+            except BaseException as e:
+                outcome['error'] = e
+        
+        thread = threading.Thread(target=worker, name='pmr171-io', daemon=True)
+        
+        def refresh():
+            if radio is not None:
+                self._drain_progress_events(progress_dialog, radio)
+            if thread.is_alive():
+                self.root.after(PROGRESS_FRAME_MS, refresh)
+            else:
+                finished.set(True)
+        
+        self._active_radio = radio
+        try:
+            thread.start()
+            self.root.after(PROGRESS_FRAME_MS, refresh)
+            self.root.wait_variable(finished)
+        finally:
+            self._active_radio = None
+        
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['result']
 
     def _create_tree_navigation(self, parent):
         """Create tree navigation panel (left side)"""
@@ -1899,6 +2342,12 @@ class ChannelTableViewer:
         menubar.add_cascade(label="Program", menu=program_menu)
         program_menu.add_command(label="Read from Radio...", command=self._read_from_radio, accelerator="Ctrl+R")
         program_menu.add_command(label="Write to Radio...", command=self._write_to_radio, accelerator="Ctrl+W")
+        program_menu.add_separator()
+        program_menu.add_command(label="Resume Interrupted Session...", command=self._resume_session)
+        program_menu.add_separator()
+        program_menu.add_command(label="Retry Settings...", command=self._show_retry_settings_dialog)
+        self.show_session_metrics = tk.BooleanVar(value=False)
+        program_menu.add_checkbutton(label="Show Session Metrics", variable=self.show_session_metrics)
         
         # View menu (rightmost position)
         view_menu = tk.Menu(menubar, tearoff=0)
@@ -0,0 +1,659 @@
+"""
+asyncio client for the PMR-171 UART protocol.
+
+PMR171Radio blocks on every serial read, so the GUI, scripts and tests have
+to block or wrap it in threads. AsyncPMR171Radio speaks the same protocol
+with coroutines, sharing the packet codec (build_packet, parse_packet,
+parse_channel_packet, build_channel_packet, build_dmr_data_packet), the
+PacketFramer and the adaptive TimingController with the blocking driver.
+
+All I/O goes through an AsyncTransport, so a pty, socket or in-memory
+stand-in can replace the serial port:
+
+    AsyncSerialTransport   pyserial port, blocking reads run in an executor
+    StreamTransport        any asyncio StreamReader/StreamWriter pair
+                           (e.g. from asyncio.open_connection to a TCP bridge)
+
+Cancellation uses asyncio tasks: cancelling the task running
+read_all_channels() stops it at the next await, and the receive buffer is
+cleared before the next command. There is no cancel_check polling.
+
+Example:
+    >>> async def main():
+    ...     async with AsyncPMR171Radio('COM6') as radio:
+    ...         channels = await radio.read_all_channels()
+    >>> asyncio.run(main())
+"""
+
+import asyncio
+import logging
+import struct
+import time
+from typing import List, Optional, Callable, Tuple
+
+from .pmr171_uart import (
+    ChannelData,
+    Command,
+    Mode,
+    PacketFramer,
+    CommunicationError,
+    TimeoutError,
+    CRCError,
+    ConnectionError,
+    DMRReadError,
+    SessionAbortedError,
+    DEFAULT_BAUDRATE,
+    DEFAULT_TIMEOUT,
+    CHANNEL_COUNT,
+    MAX_SCAN_BYTES,
+    WAKE_RESPONSE_TIMEOUT,
+    PRE_WRITE_WAKE_TIMEOUT,
+    DMR_COMMIT_DELAY,
+    DMR_COMMIT_STEP,
+    build_packet,
+    parse_packet,
+    build_channel_packet,
+    parse_channel_packet,
+    build_dmr_data_packet,
+    parse_dmr_data_packet,
+)
+from .retry import RetryPolicy, CircuitBreaker, ERROR_CRC, ERROR_TIMEOUT, ERROR_OTHER
+from .session import ProgrammingSession, DEFAULT_IDLE_THRESHOLD
+from .timing import TimingController
+from .transport import SerialTransport
+
+logger = logging.getLogger(__name__)
+
+# Largest chunk requested from the transport in one read
+READ_CHUNK_SIZE = 4096
+
+
+class AsyncTransport:
+    """
+    Byte pipe to the radio used by AsyncPMR171Radio.
+
+    Subclasses implement open/close/read/write; read returns at least one
+    byte (waiting as long as necessary) and may return more.
+    """
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def read(self) -> bytes:
+        raise NotImplementedError
+
+    async def write(self, data: bytes) -> None:
+        raise NotImplementedError
+
+    async def discard_input(self) -> int:
+        """Drop bytes already buffered by the transport; returns count dropped"""
+        return 0
+
+
+class StreamTransport(AsyncTransport):
+    """
+    Transport over an asyncio StreamReader/StreamWriter pair.
+
+    Args:
+        reader: Stream to read radio bytes from
+        writer: Stream to write requests to
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> 'StreamTransport':
+        """Open a TCP connection (e.g. to a serial-over-network bridge)"""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass
+
+    async def read(self) -> bytes:
+        data = await self.reader.read(READ_CHUNK_SIZE)
+        if not data:
+            raise CommunicationError("Connection closed by peer")
+        return data
+
+    async def write(self, data: bytes) -> None:
+        self.writer.write(data)
+        await self.writer.drain()
+
+
+class AsyncSerialTransport(AsyncTransport):
+    """
+    Transport over a pyserial port (wrapping the blocking SerialTransport).
+
+    pyserial has no native asyncio support, so blocking reads run in the
+    default executor with a short port timeout, keeping the event loop free.
+
+    Args:
+        port: Serial port name (e.g., 'COM6', '/dev/ttyUSB0')
+        baudrate: Serial baud rate (default 115200)
+        poll_interval: Port read timeout in seconds
+    """
+
+    def __init__(self, port: str, baudrate: int = DEFAULT_BAUDRATE, poll_interval: float = 0.05):
+        self.port = port
+        self._serial = SerialTransport(port, baudrate, timeout=poll_interval)
+        self._pending_read = None
+
+    async def open(self) -> None:
+        try:
+            self._serial.open()
+        except OSError as e:
+            raise ConnectionError(f"Failed to connect to {self.port}: {e}")
+
+        # CRITICAL: Set DTR and RTS high to enable radio programming mode
+        self._serial.set_control_lines(dtr=True, rts=True)
+        self._serial.reset_input_buffer()
+        self._serial.reset_output_buffer()
+        await asyncio.sleep(0.5)  # Allow radio to stabilize and enter programming mode
+
+    async def close(self) -> None:
+        self._serial.close()
+
+    def _read_blocking(self) -> bytes:
+        return self._serial.read(self._serial.in_waiting or 1)
+
+    async def read(self) -> bytes:
+        loop = asyncio.get_running_loop()
+        while True:
+            # A read abandoned by a timeout or cancel is still running in the
+            # executor; pick up its result rather than losing those bytes
+            if self._pending_read is None:
+                self._pending_read = loop.run_in_executor(None, self._read_blocking)
+            try:
+                data = await asyncio.shield(self._pending_read)
+            except OSError as e:
+                raise CommunicationError(f"Serial error: {e}")
+            finally:
+                if self._pending_read.done():
+                    self._pending_read = None
+            if data:
+                return data
+
+    async def write(self, data: bytes) -> None:
+        try:
+            self._serial.write(data)
+            self._serial.flush()
+        except OSError as e:
+            raise CommunicationError(f"Failed to send packet: {e}")
+
+    def _discard_blocking(self) -> int:
+        waiting = self._serial.in_waiting if self._serial.is_open else 0
+        if waiting:
+            return len(self._serial.read(waiting))
+        return 0
+
+    async def discard_input(self) -> int:
+        # pyserial is not safe to read from two threads: let a read still
+        # running in the executor finish (its bytes are stale too), then
+        # drain in the executor as well
+        dropped = 0
+        if self._pending_read is not None:
+            try:
+                dropped += len(await asyncio.shield(self._pending_read))
+            except OSError:
+                pass
+            finally:
+                self._pending_read = None
+        loop = asyncio.get_running_loop()
+        try:
+            dropped += await loop.run_in_executor(None, self._discard_blocking)
+        except OSError:
+            pass
+        return dropped
+
+
+class AsyncPMR171Radio:
+    """
+    asyncio PMR-171 radio interface.
+
+    Args:
+        port: Serial port name, or an AsyncTransport instance
+        baudrate: Serial baud rate (ignored for transport instances)
+        timeout: Base response timeout in seconds (as PMR171Radio)
+        adaptive_timing: Derive timeouts and delays from measured round trips
+        retry_policy: Attempts, backoff, per-channel deadline and circuit
+            breaker (see retry.py)
+        keepalive_idle: Seconds without an acknowledged command before
+            write_channel sends a pre-write wake (see session.py)
+    """
+
+    def __init__(self, port, baudrate: int = DEFAULT_BAUDRATE,
+                 timeout: float = DEFAULT_TIMEOUT, adaptive_timing: bool = True,
+                 retry_policy: RetryPolicy = None,
+                 keepalive_idle: float = DEFAULT_IDLE_THRESHOLD):
+        if isinstance(port, AsyncTransport):
+            self.transport = port
+        else:
+            self.transport = AsyncSerialTransport(port, baudrate)
+        self.timeout = timeout
+        self.timing = TimingController(max_timeout=timeout * 2, adaptive=adaptive_timing)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.session = ProgrammingSession(idle_threshold=keepalive_idle)
+        self._framer = PacketFramer()
+        # Created in connect(): before Python 3.10 a Lock binds to the loop
+        # current at construction, which need not be the one running later
+        self._lock: Optional[asyncio.Lock] = None
+        self._connected = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    async def connect(self) -> None:
+        """
+        Open the transport and wake the radio into programming mode.
+
+        Raises:
+            ConnectionError: If the transport cannot be opened
+        """
+        if self._connected:
+            return
+        await self.transport.open()
+        self._lock = asyncio.Lock()
+        self._connected = True
+        await self._clear_input()
+        try:
+            await self._wake_radio()
+        except (CommunicationError, TimeoutError, CRCError) as e:
+            logger.warning(f"Wake command failed (may be normal): {e}")
+
+    async def disconnect(self) -> None:
+        """Close the transport"""
+        self.session.expire()
+        if self._connected:
+            self._connected = False
+            await self.transport.close()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
+        return False
+
+    async def _clear_input(self) -> int:
+        return self._framer.reset() + await self.transport.discard_input()
+
+    async def _wake_radio(self) -> bool:
+        """Send a channel 0 read so the radio stops streaming status data"""
+        async with self._lock:
+            await self.transport.write(build_packet(Command.CHANNEL_READ, struct.pack('>H', 0)))
+            try:
+                await self._receive_packet(WAKE_RESPONSE_TIMEOUT)
+            except TimeoutError:
+                logger.warning("Radio did not respond to wake command")
+                return False
+            finally:
+                await self._clear_input()
+        self.session.touch()
+        logger.debug("Radio woke up - received valid packet")
+        return True
+
+    async def _pre_write_wake(self, channel_index: int) -> bool:
+        """
+        Read the slot about to be written so the radio is (back) in
+        programming mode, as PMR171Radio._pre_write_wake.
+
+        Returns:
+            True if the radio answered
+        """
+        if not self._connected:
+            raise CommunicationError("Not connected to radio")
+        logger.debug(f"Pre-write wake: reading channel {channel_index} first...")
+        wake_timeout = min(PRE_WRITE_WAKE_TIMEOUT,
+                           self.timing.response_timeout(Command.CHANNEL_READ))
+        async with self._lock:
+            await self.transport.write(
+                build_packet(Command.CHANNEL_READ, struct.pack('>H', channel_index)))
+            sent_at = time.monotonic()
+            try:
+                await self._receive_packet(wake_timeout)
+            except (TimeoutError, CRCError) as e:
+                logger.debug(f"Pre-write wake failed (continuing anyway): {e}")
+                return False
+            finally:
+                # Anything after the wake response is stale
+                await self._clear_input()
+        self.timing.record(Command.CHANNEL_READ, time.monotonic() - sent_at)
+        self.session.touch()
+        return True
+
+    async def _receive_packet(self, timeout: float) -> bytes:
+        """
+        Receive the next packet, skipping status noise.
+
+        Raises:
+            TimeoutError: If no packet arrives within timeout
+            CRCError: If the packet fails CRC verification
+        """
+        scanned = 0
+        deadline = time.monotonic() + timeout
+        while True:
+            for kind, frame in self._framer.frames():
+                if kind == PacketFramer.PACKET:
+                    return frame
+                if kind == PacketFramer.CRC_ERROR:
+                    raise CRCError("Packet CRC verification failed")
+                scanned += len(frame)
+
+            if scanned >= MAX_SCAN_BYTES:
+                raise TimeoutError(f"Valid header not found after scanning {scanned} bytes")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Timeout waiting for packet header")
+            try:
+                chunk = await asyncio.wait_for(self.transport.read(), remaining)
+            except asyncio.TimeoutError:
+                continue  # Deadline check above raises
+            self._framer.feed(chunk)
+
+    async def _exchange(self, packet: bytes, command: int, settle: float = 0.0) -> Tuple[int, bytes]:
+        """
+        Send a request and return the response, recording the RTT.
+
+        Args:
+            packet: Complete request packet
+            command: Command code the round trip is recorded under
+            settle: Fixed time to leave the radio after sending, before
+                reading the response (e.g. a flash commit)
+
+        Returns:
+            (command, payload) of the response; callers check the command
+        """
+        if not self._connected:
+            raise CommunicationError("Not connected to radio")
+        async with self._lock:
+            await self._clear_input()
+            await self.transport.write(packet)
+            sent_at = time.monotonic()
+            try:
+                if settle > 0:
+                    await asyncio.sleep(settle)
+                response = await self._receive_packet(self.timing.response_timeout(command))
+            except TimeoutError:
+                self.timing.on_timeout(command)
+                raise
+            except asyncio.CancelledError:
+                # Whatever arrives for the abandoned request is stale
+                await self._clear_input()
+                raise
+            self.timing.record(command, time.monotonic() - sent_at)
+            self.session.touch()
+        cmd, payload, _ = parse_packet(response)
+        return cmd, payload
+
+    @staticmethod
+    def _check_response(cmd: int, payload: bytes, command: int, channel_index: int = None) -> None:
+        """
+        Reject a response to some other request.
+
+        Raises:
+            CommunicationError: If cmd is not command, or the payload is for
+                a different slot than channel_index
+        """
+        if cmd != command:
+            raise CommunicationError(f"Expected response 0x{command:02X}, got 0x{cmd:02X}")
+        if channel_index is not None and payload[:2] != struct.pack('>H', channel_index):
+            raise CommunicationError(f"Response 0x{command:02X} for slot {payload[:2].hex()}, "
+                                     f"expected channel {channel_index}")
+
+    async def _retry_wait(self, command: int, attempt: int, max_retries: int,
+                          error: Exception, started: float) -> bool:
+        """Drain and back off as retry_policy says; False if the caller should give up"""
+        if isinstance(error, CRCError):
+            kind = ERROR_CRC
+        else:
+            kind = ERROR_TIMEOUT if isinstance(error, TimeoutError) else ERROR_OTHER
+        if kind != ERROR_CRC:
+            await asyncio.sleep(self.timing.drain_delay(command))
+        await self._clear_input()
+        if attempt >= max_retries - 1:
+            return False
+        delay = self.timing.backoff_delay(command, attempt, self.retry_policy.backoff(attempt, kind))
+        if self.retry_policy.out_of_time(time.monotonic() - started, delay):
+            return False
+        await asyncio.sleep(delay)
+        return True
+
+    async def _retry(self, command: int, description: str, operation, max_retries: Optional[int]):
+        """Run operation() until it succeeds or the retry policy gives up"""
+        if max_retries is None:
+            max_retries = self.retry_policy.max_attempts
+        last_error = None
+        started = time.monotonic()
+        for attempt in range(max_retries):
+            try:
+                result = await operation(attempt)
+                if attempt > 0:
+                    logger.info(f"{description} succeeded on retry {attempt + 1}")
+                return result
+            except (CommunicationError, TimeoutError, CRCError) as e:
+                last_error = e
+                logger.warning(f"{description} attempt {attempt + 1}/{max_retries} failed: {e}")
+                if not await self._retry_wait(command, attempt, max_retries, e, started):
+                    break
+        logger.error(f"{description} failed after {attempt + 1} attempts: {last_error}")
+        raise last_error
+
+    async def send_command(self, command: int, data: bytes = b'') -> bytes:
+        """
+        Send a command and return the response payload.
+
+        Raises:
+            CommunicationError: If the radio answered with another command
+        """
+        cmd, payload = await self._exchange(build_packet(command, data), command)
+        self._check_response(cmd, payload, command)
+        return payload
+
+    async def read_dmr_data(self, channel_index: int, max_retries: int = None) -> dict:
+        """Read DMR-specific data (0x44) for a channel"""
+        async def attempt(_):
+            cmd, payload = await self._exchange(
+                build_packet(Command.DMR_DATA_READ, struct.pack('>H', channel_index)),
+                Command.DMR_DATA_READ)
+            self._check_response(cmd, payload, Command.DMR_DATA_READ, channel_index)
+            return parse_dmr_data_packet(payload)
+        return await self._retry(Command.DMR_DATA_READ, f"Channel {channel_index} DMR read",
+                                 attempt, max_retries)
+
+    async def read_channel(self, channel_index: int, max_retries: int = None) -> ChannelData:
+        """
+        Read a single channel (0x41), plus its DMR data (0x44) for DMR channels.
+
+        Args:
+            channel_index: Channel number (0-999)
+            max_retries: Maximum number of attempts (default: retry_policy.max_attempts)
+
+        Returns:
+            ChannelData object
+
+        Raises:
+            DMRReadError: If the channel is DMR and its DMR data could not be
+                read; the channel, with default DMR settings, is in e.channel
+        """
+        async def attempt(_):
+            cmd, payload = await self._exchange(
+                build_packet(Command.CHANNEL_READ, struct.pack('>H', channel_index)),
+                Command.CHANNEL_READ)
+            self._check_response(cmd, payload, Command.CHANNEL_READ, channel_index)
+            return parse_channel_packet(payload)
+
+        channel = await self._retry(Command.CHANNEL_READ, f"Channel {channel_index} read",
+                                    attempt, max_retries)
+        if channel.rx_mode == Mode.DMR:
+            try:
+                dmr_data = await self.read_dmr_data(channel_index)
+                channel.rx_cc = dmr_data['rx_cc']
+                channel.tx_cc = dmr_data['tx_cc']
+                channel.slot = dmr_data['slot']
+                channel.call_id = dmr_data['call_id']
+                channel.own_id = dmr_data['own_id']
+                channel.call_format = dmr_data['call_type']
+            except (CommunicationError, TimeoutError, CRCError) as e:
+                raise DMRReadError(f"Channel {channel_index} DMR data read failed", channel) from e
+        return channel
+
+    async def write_dmr_data(self, channel: ChannelData, max_retries: int = None) -> bool:
+        """Write DMR-specific data (0x43) for a channel"""
+        packet = build_dmr_data_packet(channel, Command.DMR_DATA_WRITE)
+
+        async def attempt(attempt_number):
+            try:
+                # Wait for radio to commit, then for acknowledgment
+                cmd, payload = await self._exchange(
+                    packet, Command.DMR_DATA_WRITE,
+                    settle=DMR_COMMIT_DELAY + attempt_number * DMR_COMMIT_STEP)
+                self._check_response(cmd, payload, Command.DMR_DATA_WRITE, channel.index)
+            except (CommunicationError, TimeoutError, CRCError):
+                self.session.expire()
+                raise
+            return payload
+
+        try:
+            await self._retry(Command.DMR_DATA_WRITE, f"Channel {channel.index} DMR write",
+                              attempt, max_retries)
+            return True
+        except (CommunicationError, TimeoutError, CRCError):
+            return False
+
+    async def write_channel(self, channel: ChannelData, max_retries: int = None) -> bool:
+        """
+        Write a single channel (0x40), plus its DMR data (0x43) for DMR channels.
+
+        Args:
+            channel: ChannelData to write
+            max_retries: Maximum number of attempts (default: retry_policy.max_attempts)
+
+        Returns:
+            True if successful; False if either block failed, including a
+            DMR channel whose 0x40 block was written but whose 0x43 was not
+        """
+        packet = build_channel_packet(channel, Command.CHANNEL_WRITE)
+
+        async def attempt(_):
+            stale = await self._clear_input()
+            if stale:
+                logger.debug(f"Cleared {stale} stale bytes before write")
+            # Wake the radio with a read first unless the programming session
+            # is still active (see session.py)
+            if self.session.needs_wake():
+                await self._pre_write_wake(channel.index)
+            try:
+                cmd, payload = await self._exchange(packet, Command.CHANNEL_WRITE)
+                self._check_response(cmd, payload, Command.CHANNEL_WRITE, channel.index)
+            except (CommunicationError, TimeoutError, CRCError):
+                self.session.expire()  # Wake before the next attempt
+                raise
+            return payload
+
+        try:
+            await self._retry(Command.CHANNEL_WRITE, f"Channel {channel.index} write",
+                              attempt, max_retries)
+        except (CommunicationError, TimeoutError, CRCError):
+            return False
+
+        if channel.rx_mode == Mode.DMR and not await self.write_dmr_data(channel):
+            logger.warning(f"Channel {channel.index} DMR data write failed")
+            return False
+        return True
+
+    async def read_all_channels(self,
+                                progress_callback: Callable[[int, int, str], None] = None,
+                                include_empty: bool = True,
+                                channel_indices: Optional[List[int]] = None) -> List[ChannelData]:
+        """
+        Read channels from the radio.
+
+        Cancel the task running this coroutine to stop early.
+
+        Args:
+            progress_callback: Optional callback(current, total, message)
+            include_empty: If True, include empty channels in result
+            channel_indices: Channels to read (default: all 1000)
+
+        Returns:
+            List of ChannelData objects; a DMR channel whose DMR data could
+            not be read is kept with default DMR settings but reported failed
+
+        Raises:
+            SessionAbortedError: If retry_policy.breaker_threshold channels in a row failed
+        """
+        indices = list(range(CHANNEL_COUNT)) if channel_indices is None else list(channel_indices)
+        total = len(indices)
+        channels = []
+        breaker = self.retry_policy.breaker()
+        for i, channel_index in enumerate(indices):
+            if progress_callback:
+                progress_callback(i + 1, total, f"Reading channel {channel_index}")
+            try:
+                channel = await self.read_channel(channel_index)
+            except DMRReadError as e:
+                channels.append(e.channel)
+                if progress_callback:
+                    progress_callback(i + 1, total,
+                                      f"Error reading DMR data for channel {channel_index}")
+                self._channel_failed(breaker, channel_index)
+                continue
+            except (CommunicationError, TimeoutError, CRCError) as e:
+                if progress_callback:
+                    progress_callback(i + 1, total, f"Error reading channel {channel_index}: {e}")
+                self._channel_failed(breaker, channel_index)
+                continue
+            breaker.success()
+            if include_empty or not channel.is_empty:
+                channels.append(channel)
+        return channels
+
+    async def write_all_channels(self,
+                                 channels: List[ChannelData],
+                                 progress_callback: Callable[[int, int, str], None] = None) -> int:
+        """
+        Write channels to the radio.
+
+        Returns:
+            Number of channels successfully written
+
+        Raises:
+            SessionAbortedError: If retry_policy.breaker_threshold channels in a row failed
+        """
+        success_count = 0
+        total = len(channels)
+        breaker = self.retry_policy.breaker()
+        for i, channel in enumerate(channels):
+            if progress_callback:
+                progress_callback(i + 1, total, f"Writing channel {channel.index}")
+            if await self.write_channel(channel):
+                success_count += 1
+                breaker.success()
+            else:
+                self._channel_failed(breaker, channel.index)
+        return success_count
+
+    @staticmethod
+    def _channel_failed(breaker: CircuitBreaker, channel_index: int) -> None:
+        """
+        Count a failed channel of a bulk operation.
+
+        Raises:
+            SessionAbortedError: If the retry policy's circuit breaker opened
+        """
+        if breaker.failure():
+            raise SessionAbortedError(
+                f"Aborted at channel {channel_index} after {breaker.consecutive} consecutive "
+                f"failed channels - is the radio still connected and in programming mode?")
@@ -0,0 +1,63 @@
+"""
+Cancellation token for PMR171Radio operations.
+
+cancel_check callbacks are only polled between channels, so a cancel
+during a retry backoff, a commit delay or a read that is waiting out its
+timeout only took effect once the channel gave up - seconds later on a
+dead link. A CancelToken is a threading.Event that every wait of the
+driver observes instead: sleeps become Event.wait() and blocking reads
+poll it every READ_POLL_INTERVAL, so cancel() from any thread returns
+control within one poll interval.
+
+PMR171Radio consumes the token when it acts on it (the input buffer is
+drained, the programming session expired and the token cleared), so the
+same radio and token can be used for the next operation.
+
+Example:
+    >>> token = CancelToken()
+    >>> radio = PMR171Radio('COM6', cancel_token=token)
+    >>> worker = threading.Thread(target=radio.read_all_channels)
+    >>> worker.start()
+    >>> token.cancel()            # From the GUI thread
+    >>> worker.join()             # Returns within ~50 ms
+"""
+
+import threading
+
+
+class CancelToken:
+    """
+    Thread-safe, resettable cancel request.
+
+    Calling the token returns whether cancellation was requested, so it
+    can also be passed wherever a cancel_check callback is expected.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def __call__(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Request cancellation (safe from any thread)"""
+        self._event.set()
+
+    def clear(self) -> None:
+        """Withdraw the request so the token can be reused"""
+        self._event.clear()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Sleep for up to timeout seconds, waking early on cancel().
+
+        Returns:
+            True if cancellation was requested
+        """
+        if timeout <= 0:
+            return self._event.is_set()
+        return self._event.wait(timeout)
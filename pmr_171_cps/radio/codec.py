@@ -0,0 +1,178 @@
+"""
+Precompiled struct layouts for PMR-171 packets.
+
+The packet helpers in pmr171_uart used to encode a channel by concatenating
+a dozen small bytes objects (after packing the same fields once more into a
+struct that was thrown away), and decoded it with one struct.unpack per
+field on slices of slices. The codec compiles every layout once as a
+module-level struct.Struct:
+
+    CHANNEL_LAYOUT  26-byte channel block (0x40/0x41)
+    DMR_LAYOUT      26-byte DMR block (0x43/0x44)
+
+Packets are encoded with pack_into straight into a preallocated buffer,
+with the CRC computed over a memoryview of that buffer, and blocks are
+decoded with a single unpack_from. decode_packet() can hand out the payload
+as a memoryview into the received buffer instead of a copy.
+encode_packets() writes many packets into one contiguous bytearray and
+decode_payloads() unpacks many blocks in one call (scripts/benchmark_codec.py
+compares the per-packet cost with the original code).
+
+The codec works on plain field tuples; ChannelData conversion lives next
+to the packet helpers in pmr171_uart (build_channel_packets,
+parse_channel_payloads).
+
+Example:
+    >>> buffer = encode_packets(Command.CHANNEL_WRITE, CHANNEL_LAYOUT, rows)
+    >>> command, payload, crc_ok = decode_packet(buffer[:packet_size(BLOCK_SIZE)])
+    >>> CHANNEL_LAYOUT.unpack_from(payload)
+"""
+
+import struct
+from typing import Iterable, List, Sequence, Tuple, Union
+
+from .crc import crc16_ccitt
+
+PACKET_HEADER = bytes([0xA5, 0xA5, 0xA5, 0xA5])
+
+# Channel and DMR data blocks are both 26 bytes
+BLOCK_SIZE = 26
+
+# index, rx_mode, tx_mode, rx_freq_hz, tx_freq_hz, rx_ctcss, tx_ctcss, name
+CHANNEL_LAYOUT = struct.Struct('>HBBIIBB12s')
+
+# index, (pad), rx_cc, tx_cc, slot, call_id, own_id, (5 reserved), call_type, settings
+DMR_LAYOUT = struct.Struct('>HxBBBII5xB6s')
+
+# Bytes 20-25 of every DMR block the CPS writes
+DMR_SETTINGS = bytes([0x00, 0x00, 0x00, 0x00, 0x00, 0x01])
+
+_PREFIX = struct.Struct('>4sBB')  # Header, length, command
+_CRC = struct.Struct('>H')
+
+# Header + length + command + CRC
+PACKET_OVERHEAD = _PREFIX.size + _CRC.size
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def packet_size(payload_size: int) -> int:
+    """Size on the wire of a packet with payload_size data bytes"""
+    return payload_size + PACKET_OVERHEAD
+
+
+def pack_packet_into(buffer: bytearray, offset: int, command: int,
+                     layout: struct.Struct, values: Sequence) -> int:
+    """
+    Encode one packet into buffer at offset.
+
+    Args:
+        buffer: Writable buffer with room for packet_size(layout.size) bytes
+        offset: Position of the packet header in buffer
+        command: Command byte
+        layout: Payload layout (e.g. CHANNEL_LAYOUT)
+        values: Payload fields in layout order
+
+    Returns:
+        Number of bytes written
+    """
+    end = offset + _PREFIX.size + layout.size
+    _PREFIX.pack_into(buffer, offset, PACKET_HEADER, layout.size + 3, command)
+    layout.pack_into(buffer, offset + _PREFIX.size, *values)
+    # CRC covers Length + Command + Data
+    with memoryview(buffer) as view:
+        crc = crc16_ccitt(view[offset + 4:end])
+    _CRC.pack_into(buffer, end, crc)
+    return end + _CRC.size - offset
+
+
+def encode_packet(command: int, layout: struct.Struct, values: Sequence) -> bytes:
+    """
+    Encode a single packet.
+
+    Args:
+        command: Command byte
+        layout: Payload layout
+        values: Payload fields in layout order
+
+    Returns:
+        Complete packet bytes
+    """
+    buffer = bytearray(packet_size(layout.size))
+    pack_packet_into(buffer, 0, command, layout, values)
+    return bytes(buffer)
+
+
+def encode_packets(command: int, layout: struct.Struct, rows: Iterable[Sequence]) -> bytearray:
+    """
+    Encode many packets back to back into one buffer.
+
+    Args:
+        command: Command byte of every packet
+        layout: Payload layout
+        rows: Payload fields of each packet, in layout order
+
+    Returns:
+        Contiguous buffer; packet i starts at i * packet_size(layout.size)
+    """
+    rows = rows if isinstance(rows, Sequence) else list(rows)
+    step = packet_size(layout.size)
+    buffer = bytearray(step * len(rows))
+    for position, values in enumerate(rows):
+        pack_packet_into(buffer, position * step, command, layout, values)
+    return buffer
+
+
+def decode_packet(data: BytesLike, copy: bool = False) -> Tuple[int, BytesLike, bool]:
+    """
+    Parse a packet, by default without copying its payload.
+
+    Args:
+        data: Raw packet bytes (must start with header)
+        copy: Return the payload as bytes instead of a memoryview into data.
+            For a single short packet slicing bytes is cheaper than setting
+            up a view, and parse_packet callers keep the payload anyway.
+
+    Returns:
+        Tuple of (command, payload, crc_valid)
+
+    Raises:
+        ValueError: If packet is malformed
+    """
+    if len(data) < 8:
+        raise ValueError(f"Packet too short: {len(data)} bytes")
+
+    if data[:4] != PACKET_HEADER:
+        raise ValueError(f"Invalid header: {data[:4].hex()}")
+
+    length = data[4]
+    if length < 3:
+        raise ValueError(f"Invalid length: {length}")
+
+    crc_end = 5 + length - 2  # End of Length + Command + Data
+    if len(data) < crc_end + 2:
+        raise ValueError(f"Packet incomplete: expected {crc_end + 2}, got {len(data)}")
+
+    if not copy:
+        data = memoryview(data)
+    crc_valid = crc16_ccitt(data[4:crc_end]) == _CRC.unpack_from(data, crc_end)[0]
+    payload = data[6:crc_end]
+    return data[5], bytes(payload) if copy else payload, crc_valid
+
+
+def decode_payloads(layout: struct.Struct, payloads: Iterable[BytesLike]) -> List[tuple]:
+    """
+    Unpack many payloads in one call.
+
+    Args:
+        layout: Payload layout
+        payloads: Blocks of at least layout.size bytes each, or one
+            contiguous buffer of back-to-back blocks
+
+    Returns:
+        Field tuples in input order
+    """
+    if isinstance(payloads, (bytes, bytearray, memoryview)):
+        return list(layout.iter_unpack(payloads))
+    unpack_from = layout.unpack_from
+    return [unpack_from(payload) for payload in payloads]
@@ -0,0 +1,120 @@
+"""
+CRC-16-CCITT for the PMR-171 UART protocol.
+
+Algorithm from PMR-171 manual (Sheet 39):
+  - Polynomial: 0x1021 (MSB first, no reflection)
+  - Initial value: 0xFFFF
+  - No final XOR
+  - Input: bytes from Length field through last DATA byte (before CRC)
+
+This is the CRC-16/CCITT-FALSE variant, which is what the standard library's
+binascii.crc_hqx computes when seeded with 0xFFFF. crc_hqx runs in C, so it is
+used as the fast path; a 256-entry table implementation is kept as a pure
+Python fallback and as the reference the fast path is checked against at
+import time.
+
+Incremental use (e.g. while a packet is still arriving):
+    >>> crc = CRC_INIT
+    >>> crc = crc16_update(crc, b'\\x1d\\x41')
+    >>> crc = crc16_update(crc, payload)
+"""
+
+import binascii
+
+POLYNOMIAL = 0x1021
+CRC_INIT = 0xFFFF
+
+
+def _build_table() -> tuple:
+    """Build the 256-entry lookup table for polynomial 0x1021"""
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ POLYNOMIAL) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+        table.append(crc)
+    return tuple(table)
+
+
+CRC16_TABLE = _build_table()
+
+
+def crc16_ccitt_bitwise(data: bytes, crc: int = CRC_INIT) -> int:
+    """
+    Bit-by-bit reference implementation (the original protocol code).
+
+    Kept for verification and benchmarking only - it is roughly two orders
+    of magnitude slower than crc16_update().
+    """
+    for byte in data:
+        cur = byte << 8
+        for _ in range(8):
+            if (crc ^ cur) & 0x8000:
+                crc = ((crc << 1) ^ POLYNOMIAL) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+            cur = (cur << 1) & 0xFFFF
+    return crc
+
+
+def crc16_update_table(crc: int, data: bytes) -> int:
+    """
+    Table-driven CRC update in pure Python.
+
+    Args:
+        crc: Running CRC value (start with CRC_INIT)
+        data: Next chunk of bytes
+
+    Returns:
+        Updated CRC value
+    """
+    table = CRC16_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+def _hqx_matches_table() -> bool:
+    """Check binascii.crc_hqx is bit-exact with the table implementation"""
+    vectors = (b'', b'123456789', bytes(range(256)), b'\xa5' * 33)
+    for vector in vectors:
+        for seed in (CRC_INIT, 0x0000, 0x1D41):
+            if binascii.crc_hqx(vector, seed) != crc16_update_table(seed, vector):
+                return False
+    return True
+
+
+# Use the C implementation unless it disagrees with the reference table
+HQX_AVAILABLE = _hqx_matches_table()
+
+if HQX_AVAILABLE:
+    def crc16_update(crc: int, data: bytes) -> int:
+        """
+        Feed a chunk of bytes into a running CRC-16-CCITT.
+
+        Args:
+            crc: Running CRC value (start with CRC_INIT)
+            data: Next chunk of bytes
+
+        Returns:
+            Updated CRC value
+        """
+        return binascii.crc_hqx(data, crc)
+else:  # pragma: no cover - CPython's crc_hqx always matches
+    crc16_update = crc16_update_table
+
+
+def crc16_ccitt(data: bytes) -> int:
+    """
+    Calculate CRC-16-CCITT for PMR-171 protocol.
+
+    Args:
+        data: Bytes to calculate CRC for (Length + Command + Data)
+
+    Returns:
+        16-bit CRC value
+    """
+    return crc16_update(CRC_INIT, data)
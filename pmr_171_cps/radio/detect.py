@@ -0,0 +1,293 @@
+"""
+Parallel auto-detection of attached PMR-171 radios.
+
+Picking the wrong entry from list_serial_ports() only fails after connect()
+and the wake timeouts. PortDetector instead probes every candidate port at
+once with a single CHANNEL_READ handshake (the same request _wake_radio
+uses) and returns the ports that answer with a channel 0 block in a valid
+A5A5A5A5 frame, fastest first. A port that merely echoes the request (a
+loopback adapter or modem) is not a radio.
+
+Ports whose USB VID:PID is not a known USB-UART bridge are skipped unless
+include_unknown is set. Results are cached per hwid in
+~/.pmr171/detected_ports.json, so a second detection returns immediately;
+ports that did not answer are re-probed after a few minutes. A port that
+answered stays cached for a day, so call forget(port) once connecting to
+it or an operation on it fails (the GUI does).
+
+Example:
+    >>> detector = PortDetector()
+    >>> for radio in detector.detect():
+    ...     print(radio.port, f"{radio.response_time * 1000:.0f} ms")
+"""
+
+import json
+import logging
+import re
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Callable, Any
+
+from .pmr171_uart import (
+    DEFAULT_BAUDRATE,
+    READ_POLL_INTERVAL,
+    Command,
+    PacketFramer,
+    build_packet,
+    parse_packet,
+    list_serial_ports,
+)
+from .transport import SerialTransport
+
+logger = logging.getLogger(__name__)
+
+# USB-UART bridges used in PMR-171 programming cables: (VID, PID) -> chip
+KNOWN_USB_IDS: Dict[Tuple[int, int], str] = {
+    (0x1A86, 0x7523): 'CH340',
+    (0x1A86, 0x55D4): 'CH9102',
+    (0x10C4, 0xEA60): 'CP210x',
+    (0x0403, 0x6001): 'FT232R',
+    (0x0403, 0x6015): 'FT231X',
+    (0x067B, 0x2303): 'PL2303',
+}
+
+PROBE_TIMEOUT = 0.5              # Seconds to wait for the handshake response
+PROBE_SETTLE_DELAY = 0.5         # Radio enters programming mode after DTR/RTS (as connect)
+CHANNEL_BLOCK_SIZE = 26          # Slot index + channel data of a CHANNEL_READ response
+DEFAULT_DETECT_CACHE = Path.home() / '.pmr171' / 'detected_ports.json'
+FOUND_CACHE_TTL = 24 * 3600      # Trust a port that answered for a day
+NOT_FOUND_CACHE_TTL = 300        # Re-probe silent ports after five minutes
+
+_USB_ID_RE = re.compile(r'VID:PID=([0-9A-Fa-f]{4}):([0-9A-Fa-f]{4})')
+
+
+def parse_usb_id(hwid: str) -> Optional[Tuple[int, int]]:
+    """
+    Extract the USB (VID, PID) from a pyserial hwid string.
+
+    Args:
+        hwid: e.g. 'USB VID:PID=1A86:7523 SER=5 LOCATION=1-1.2'
+
+    Returns:
+        (vid, pid) or None for non-USB ports
+    """
+    match = _USB_ID_RE.search(hwid or '')
+    if not match:
+        return None
+    return int(match.group(1), 16), int(match.group(2), 16)
+
+
+@dataclass
+class DetectedRadio:
+    """A port that answered the handshake"""
+    port: str
+    hwid: str = ''
+    description: str = ''
+    response_time: float = 0.0   # Handshake round trip (s)
+    cached: bool = False         # Taken from the detection cache, not probed
+
+
+def _open_port(port: str) -> SerialTransport:
+    transport = SerialTransport(port, DEFAULT_BAUDRATE, timeout=READ_POLL_INTERVAL)
+    transport.open()
+    return transport
+
+
+def _is_handshake_response(frame: bytes) -> bool:
+    """True if frame is a radio's answer to the channel 0 read, not an echo of it"""
+    cmd, payload, _ = parse_packet(frame)
+    return (cmd == Command.CHANNEL_READ and len(payload) >= CHANNEL_BLOCK_SIZE
+            and payload[:2] == struct.pack('>H', 0))
+
+
+def probe_port(port: str, timeout: float = PROBE_TIMEOUT,
+               serial_factory: Callable[[str], Any] = None,
+               settle_delay: float = PROBE_SETTLE_DELAY) -> Optional[float]:
+    """
+    Send the CHANNEL_READ handshake to one port.
+
+    Args:
+        port: Serial port name
+        timeout: Seconds to wait for a response
+        serial_factory: Callable(port) -> open Transport (default SerialTransport)
+        settle_delay: Seconds between raising DTR/RTS and sending the request,
+            for the radio to enter programming mode
+
+    Returns:
+        Round-trip time in seconds, or None if no valid response arrived
+    """
+    try:
+        ser = (serial_factory or _open_port)(port)
+    except Exception as e:
+        logger.debug(f"Probe {port}: cannot open: {e}")
+        return None
+
+    try:
+        ser.set_control_lines(dtr=True, rts=True)
+        if settle_delay > 0:
+            time.sleep(settle_delay)
+        if ser.in_waiting:
+            ser.read(ser.in_waiting)  # Status stream noise
+
+        framer = PacketFramer()
+        sent_at = time.time()
+        ser.write(build_packet(Command.CHANNEL_READ, struct.pack('>H', 0)))
+        ser.flush()
+
+        deadline = sent_at + timeout
+        while time.time() < deadline:
+            chunk = ser.read(ser.in_waiting or 1)
+            if not chunk:
+                continue
+            framer.feed(chunk)
+            for kind, frame in framer.frames():
+                if kind == PacketFramer.PACKET and _is_handshake_response(frame):
+                    return time.time() - sent_at
+        return None
+    except Exception as e:
+        logger.debug(f"Probe {port}: {e}")
+        return None
+    finally:
+        try:
+            ser.close()
+        except Exception:
+            pass
+
+
+class PortDetector:
+    """
+    Find serial ports with a PMR-171 attached.
+
+    Args:
+        known_ids: USB (VID, PID) pairs considered candidates
+        probe_timeout: Seconds each probe waits for the handshake
+        settle_delay: Seconds each probe waits after raising DTR/RTS before
+            sending the handshake
+        cache_path: Detection cache file (default ~/.pmr171/detected_ports.json,
+            None to disable caching)
+        serial_factory: Callable(port) -> open Transport, for probing
+        list_ports: Callable returning list_serial_ports()-style dicts
+    """
+
+    def __init__(self, known_ids: Dict[Tuple[int, int], str] = None,
+                 probe_timeout: float = PROBE_TIMEOUT,
+                 settle_delay: float = PROBE_SETTLE_DELAY,
+                 cache_path: Optional[Path] = DEFAULT_DETECT_CACHE,
+                 serial_factory: Callable[[str], Any] = None,
+                 list_ports: Callable[[], List[Dict[str, str]]] = list_serial_ports):
+        self.known_ids = KNOWN_USB_IDS if known_ids is None else known_ids
+        self.probe_timeout = probe_timeout
+        self.settle_delay = settle_delay
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.serial_factory = serial_factory
+        self.list_ports = list_ports
+
+    def candidates(self, include_unknown: bool = False) -> List[Dict[str, str]]:
+        """
+        Ports worth probing.
+
+        Args:
+            include_unknown: Also return ports whose VID:PID is unknown or
+                that are not USB at all
+
+        Returns:
+            list_serial_ports() entries
+        """
+        ports = []
+        for info in self.list_ports():
+            usb_id = parse_usb_id(info.get('hwid', ''))
+            if include_unknown or usb_id in self.known_ids:
+                ports.append(info)
+        return ports
+
+    def detect(self, include_unknown: bool = False, refresh: bool = False) -> List[DetectedRadio]:
+        """
+        Probe all candidate ports concurrently.
+
+        Args:
+            include_unknown: Probe ports with unknown VID:PID as well
+            refresh: Ignore the cache and probe every candidate
+
+        Returns:
+            Ports with a radio attached, fastest response first
+        """
+        cache = {} if refresh else self._load_cache()
+        now = time.time()
+        found: List[DetectedRadio] = []
+        to_probe: List[Dict[str, str]] = []
+
+        for info in self.candidates(include_unknown):
+            key = info.get('hwid') or info['port']
+            entry = cache.get(key)
+            if entry and entry.get('port') == info['port']:
+                ttl = FOUND_CACHE_TTL if entry.get('found') else NOT_FOUND_CACHE_TTL
+                if now - entry.get('t', 0) < ttl:
+                    if entry.get('found'):
+                        found.append(DetectedRadio(info['port'], info.get('hwid', ''),
+                                                   info.get('description', ''),
+                                                   entry.get('response_time', 0.0), cached=True))
+                    continue
+            to_probe.append(info)
+
+        if to_probe:
+            logger.info(f"Probing {len(to_probe)} port(s): {', '.join(p['port'] for p in to_probe)}")
+            with ThreadPoolExecutor(max_workers=len(to_probe), thread_name_prefix='pmr171-detect') as pool:
+                rtts = list(pool.map(
+                    lambda info: probe_port(info['port'], self.probe_timeout, self.serial_factory,
+                                            self.settle_delay),
+                    to_probe))
+
+            for info, rtt in zip(to_probe, rtts):
+                key = info.get('hwid') or info['port']
+                cache[key] = {'port': info['port'], 'found': rtt is not None,
+                              'response_time': rtt, 't': now}
+                if rtt is not None:
+                    found.append(DetectedRadio(info['port'], info.get('hwid', ''),
+                                               info.get('description', ''), rtt))
+            self._save_cache(cache)
+
+        found.sort(key=lambda radio: radio.response_time)
+        logger.info(f"Detected radios: {[radio.port for radio in found]}")
+        return found
+
+    def forget(self, port: str = None) -> None:
+        """Drop cached results for one port (or all ports), e.g. after a failed connect"""
+        if port is None:
+            self._save_cache({})
+            return
+        cache = self._load_cache()
+        self._save_cache({key: entry for key, entry in cache.items() if entry.get('port') != port})
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable detection cache {self.cache_path}: {e}")
+            return {}
+
+    def _save_cache(self, cache: Dict[str, Dict[str, Any]]) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not save detection cache: {e}")
+
+
+def detect_radios(include_unknown: bool = False, refresh: bool = False) -> List[str]:
+    """
+    Convenience wrapper for scripts: ports with a radio, fastest first.
+
+    Args:
+        include_unknown: Probe ports with unknown VID:PID as well
+        refresh: Ignore the detection cache
+    """
+    return [radio.port for radio in PortDetector().detect(include_unknown, refresh)]
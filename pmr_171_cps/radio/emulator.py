@@ -0,0 +1,316 @@
+"""
+Software PMR-171 emulator on a pseudo-terminal.
+
+Most of the hardware tests need a radio on COM6, so read/write throughput
+could not be measured or regression-tested without one. RadioEmulator opens
+a pty and answers the programming protocol from a 1000-slot memory image,
+so PMR171Radio runs unmodified against the slave device path:
+
+    0x40 CHANNEL_WRITE   stores the 26-byte block, echoes the packet
+    0x41 CHANNEL_READ    returns the 26-byte block
+    0x43 DMR_DATA_WRITE  stores the 26-byte DMR block, echoes the packet
+    0x44 DMR_DATA_READ   returns the 26-byte DMR block
+    0x27 EQUIPMENT_TYPE  returns equipment_type
+    0x0B STATUS_SYNC     returns an 80-byte status block
+
+Like the radio, it streams 84 a9 61 00 status frames while idle and stops
+once it sees a valid programming command. Responses are paced at the line
+rate of the configured baud rate (10 bits per byte), and writes can be
+given a per-command flash-commit latency.
+
+The pty needs os.openpty (Linux/macOS). Without a pty the emulator can
+still serve as an in-memory device through transport.LoopbackTransport.
+
+Example:
+    >>> with RadioEmulator(commit_latency={Command.CHANNEL_WRITE: 0.01}) as emulator:
+    ...     radio = PMR171Radio(emulator.port)
+    ...     radio.connect()
+    ...     radio.read_all_channels()
+
+Or from a shell, to point other tools at it:
+    python -m pmr_171_cps.radio.emulator
+"""
+
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from typing import List, Dict, Optional
+
+from .pmr171_uart import (
+    ChannelData,
+    Command,
+    Mode,
+    PacketFramer,
+    DEFAULT_BAUDRATE,
+    CHANNEL_COUNT,
+    build_packet,
+    build_channel_packet,
+    build_dmr_data_packet,
+    parse_packet,
+)
+from .status import STATUS_HEADER, STATUS_BODY_SIZE
+
+try:
+    import tty
+    EMULATOR_AVAILABLE = hasattr(os, 'openpty')
+except ImportError:
+    EMULATOR_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Status frame streamed while idle: header plus the first 20 bytes of the
+# STATUS_SYNC block (see status.py); this is the frame of a zeroed block
+STATUS_FRAME = STATUS_HEADER + bytes(STATUS_BODY_SIZE)
+STATUS_INTERVAL = 0.1           # Seconds between idle status frames
+PROGRAMMING_IDLE_TIMEOUT = 3.0  # Seconds without a command before status resumes
+STATUS_SYNC_LENGTH = 80
+DEFAULT_EQUIPMENT_TYPE = b'\x01\x71'  # Placeholder; real firmware responses vary
+
+
+def empty_channel_block(index: int) -> bytes:
+    """26-byte block of an unused slot"""
+    return struct.pack('>H', index) + bytes([Mode.UNUSED, Mode.UNUSED]) + bytes(22)
+
+
+def empty_dmr_block(index: int) -> bytes:
+    """26-byte DMR block of a slot that was never given DMR settings"""
+    return struct.pack('>H', index) + bytes(24)
+
+
+class RadioEmulator:
+    """
+    PMR-171 programming-protocol emulator on a pseudo-terminal.
+
+    Args:
+        channels: Optional channels to preload into the memory image
+        baudrate: Line rate used to pace responses (0 to disable pacing)
+        commit_latency: Command -> seconds to hold the response, modelling
+            the flash commit of writes (e.g. {Command.CHANNEL_WRITE: 0.02})
+        status_interval: Seconds between idle status frames (0 to disable)
+        idle_timeout: Seconds without a command before status frames resume
+        equipment_type: Payload returned for EQUIPMENT_TYPE
+    """
+
+    def __init__(self, channels: List[ChannelData] = None,
+                 baudrate: int = DEFAULT_BAUDRATE,
+                 commit_latency: Dict[int, float] = None,
+                 status_interval: float = STATUS_INTERVAL,
+                 idle_timeout: float = PROGRAMMING_IDLE_TIMEOUT,
+                 equipment_type: bytes = DEFAULT_EQUIPMENT_TYPE):
+        self.baudrate = baudrate
+        self.commit_latency = dict(commit_latency or {})
+        self.status_interval = status_interval
+        self.idle_timeout = idle_timeout
+        self.equipment_type = equipment_type
+        self.channels: List[bytes] = [empty_channel_block(i) for i in range(CHANNEL_COUNT)]
+        self.dmr: List[bytes] = [empty_dmr_block(i) for i in range(CHANNEL_COUNT)]
+        self.status = bytearray(STATUS_SYNC_LENGTH)
+        self.requests: Dict[int, int] = {}  # command -> count
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.port: Optional[str] = None
+
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._framer = PacketFramer()
+        self._last_command = 0.0
+
+        for channel in channels or []:
+            self.load_channel(channel)
+
+    def load_channel(self, channel: ChannelData) -> None:
+        """Store a channel (and its DMR block) in the memory image"""
+        self.channels[channel.index] = parse_packet(build_channel_packet(channel, Command.CHANNEL_WRITE))[1]
+        if channel.rx_mode == Mode.DMR:
+            self.dmr[channel.index] = parse_packet(build_dmr_data_packet(channel, Command.DMR_DATA_WRITE))[1]
+
+    def start(self) -> str:
+        """
+        Open the pty and start answering requests.
+
+        Returns:
+            Slave device path to pass to PMR171Radio
+        """
+        if not EMULATOR_AVAILABLE:
+            raise OSError("The radio emulator needs pseudo-terminal support (os.openpty)")
+        if self._thread is not None:
+            return self.port
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        tty.setraw(self._master)
+        self.port = os.ttyname(self._slave)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='pmr171-emulator', daemon=True)
+        self._thread.start()
+        logger.info(f"PMR-171 emulator listening on {self.port}")
+        return self.port
+
+    def stop(self) -> None:
+        """Stop the emulator and close the pty"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._master = self._slave = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+    @property
+    def programming(self) -> bool:
+        """True while the emulated radio is in programming mode (no status stream)"""
+        return time.time() - self._last_command < self.idle_timeout
+
+    def _line_time(self, size: int) -> float:
+        return size * 10 / self.baudrate if self.baudrate else 0.0
+
+    def _send(self, data: bytes) -> None:
+        time.sleep(self._line_time(len(data)))
+        view = memoryview(data)
+        while view:
+            written = os.write(self._master, view)
+            view = view[written:]
+        self.bytes_out += len(data)
+
+    def _run(self) -> None:
+        next_status = time.time()
+        while not self._stop.is_set():
+            wait = self.status_interval if self.status_interval else 0.1
+            readable, _, _ = select.select([self._master], [], [], wait)
+            if readable:
+                try:
+                    data = os.read(self._master, 4096)
+                except OSError:
+                    data = b''
+                if data:
+                    self.bytes_in += len(data)
+                    self._framer.feed(data)
+                    for kind, frame in self._framer.frames():
+                        if kind == PacketFramer.PACKET:
+                            self._handle(frame)
+
+            if self.status_interval and not self.programming and time.time() >= next_status:
+                self._send(STATUS_HEADER + bytes(self.status[:STATUS_BODY_SIZE]))
+                next_status = time.time() + self.status_interval
+
+    def _handle(self, frame: bytes) -> None:
+        cmd, payload, _ = parse_packet(frame)
+        time.sleep(self._line_time(len(frame)))  # The request took this long to arrive
+        self._count(cmd)
+
+        response = self.respond(cmd, payload)
+        if response is None:
+            return
+        latency = self.commit_latency.get(cmd, 0.0)
+        if latency:
+            time.sleep(latency)
+        self._send(response)
+
+    def _count(self, cmd: int) -> None:
+        self.requests[cmd] = self.requests.get(cmd, 0) + 1
+        self._last_command = time.time()
+
+    def feed(self, data: bytes) -> bytes:
+        """
+        Answer request bytes at once, without line time or commit latency.
+
+        This is the device side of LoopbackTransport; the pty is not used.
+
+        Args:
+            data: Bytes written by the driver
+
+        Returns:
+            Response bytes for every complete request
+        """
+        self.bytes_in += len(data)
+        self._framer.feed(data)
+        responses = bytearray()
+        for kind, frame in self._framer.frames():
+            if kind != PacketFramer.PACKET:
+                continue
+            cmd, payload, _ = parse_packet(frame)
+            self._count(cmd)
+            response = self.respond(cmd, payload)
+            if response is not None:
+                responses += response
+        self.bytes_out += len(responses)
+        return bytes(responses)
+
+    def respond(self, cmd: int, payload: bytes) -> Optional[bytes]:
+        """
+        Build the response packet for one request.
+
+        Args:
+            cmd: Request command code
+            payload: Request data
+
+        Returns:
+            Response packet, or None for commands the emulator ignores
+        """
+        index = struct.unpack_from('>H', payload)[0] if len(payload) >= 2 else 0
+        if cmd in (Command.CHANNEL_READ, Command.DMR_DATA_READ,
+                   Command.CHANNEL_WRITE, Command.DMR_DATA_WRITE) and index >= CHANNEL_COUNT:
+            return None
+
+        if cmd == Command.CHANNEL_READ:
+            return build_packet(cmd, self.channels[index])
+        if cmd == Command.DMR_DATA_READ:
+            return build_packet(cmd, self.dmr[index])
+        if cmd == Command.CHANNEL_WRITE and len(payload) >= 26:
+            self.channels[index] = bytes(payload[:26])
+            return build_packet(cmd, payload)
+        if cmd == Command.DMR_DATA_WRITE and len(payload) >= 26:
+            self.dmr[index] = bytes(payload[:26])
+            return build_packet(cmd, payload)
+        if cmd == Command.EQUIPMENT_TYPE:
+            return build_packet(cmd, self.equipment_type)
+        if cmd == Command.STATUS_SYNC:
+            return build_packet(cmd, bytes(self.status))
+        return None
+
+
+def main():
+    """Run an emulator until interrupted and print its device path"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PMR-171 emulator on a pseudo-terminal")
+    parser.add_argument('--baudrate', type=int, default=DEFAULT_BAUDRATE,
+                        help="Line rate used to pace responses (0 = unpaced)")
+    parser.add_argument('--write-latency', type=float, default=0.0,
+                        help="Flash-commit latency for channel and DMR writes (seconds)")
+    parser.add_argument('--no-status', action='store_true', help="Do not stream idle status frames")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    latency = {Command.CHANNEL_WRITE: args.write_latency, Command.DMR_DATA_WRITE: args.write_latency}
+    emulator = RadioEmulator(baudrate=args.baudrate, commit_latency=latency,
+                             status_interval=0 if args.no_status else STATUS_INTERVAL)
+    with emulator:
+        print(f"PMR-171 emulator on {emulator.port} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    for command, count in sorted(emulator.requests.items()):
+        print(f"  0x{command:02X}: {count} requests")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Progress event stream for PMR171Radio operations.
+
+Bulk reads and writes report progress through progress_callback, which
+runs synchronously inside the I/O loop: a consumer that redraws a window
+(or worse, runs the Tk event loop) on every call slows down every round
+trip. A ProgressQueue decouples the two. The radio only appends events to
+an unbounded thread-safe queue, which never blocks, and the consumer
+drains it whenever it likes - the GUI does so on a timer at a fixed frame
+rate while the operation runs on a worker thread.
+
+Event kinds:
+
+    PHASE_CHANGED    a new phase started ('read', 'channel_blocks',
+                     'dmr_blocks', 'write', 'verify'); total = its slots
+    CHANNEL_STARTED  a channel's first request is about to be sent
+    CHANNEL_DONE     a channel completed; current/total = phase progress
+    CHANNEL_RETRIED  a failed attempt will be retried (attempt = number
+                     of the attempt that failed, 1-based)
+    CHANNEL_FAILED   a channel of a bulk operation ran out of attempts
+    PROGRESS         the operation's progress_callback(current, total,
+                     message), when ProgressQueue.callback is passed as
+                     the callback
+
+Example:
+    >>> events = ProgressQueue()
+    >>> radio = PMR171Radio('COM6', events=events)
+    >>> worker = threading.Thread(target=radio.read_all_channels,
+    ...                           kwargs={'progress_callback': events.callback})
+    >>> worker.start()
+    >>> while worker.is_alive():
+    ...     for event in events.drain():
+    ...         print(event.kind, event.channel, event.current, event.total)
+    ...     time.sleep(0.05)
+"""
+
+import queue
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+PHASE_CHANGED = 'phase_changed'
+CHANNEL_STARTED = 'channel_started'
+CHANNEL_DONE = 'channel_done'
+CHANNEL_RETRIED = 'channel_retried'
+CHANNEL_FAILED = 'channel_failed'
+PROGRESS = 'progress'
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """One event of a radio operation"""
+    kind: str
+    channel: Optional[int] = None   # Channel index (None for phase/progress events)
+    current: int = 0                # Slots completed in the phase (PROGRESS: as reported)
+    total: int = 0                  # Slots in the phase (PROGRESS: as reported)
+    phase: str = ''
+    message: str = ''
+    attempt: int = 0
+    time: float = field(default_factory=time.monotonic)
+
+
+class ProgressQueue:
+    """
+    Unbounded, thread-safe event queue; producers never block.
+
+    Any number of threads may emit; normally one consumer drains.
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, event: ProgressEvent) -> None:
+        self._queue.put(event)
+
+    def emit(self, kind: str, **fields) -> None:
+        """Queue a new ProgressEvent (fields as in ProgressEvent)"""
+        self._queue.put(ProgressEvent(kind, **fields))
+
+    def callback(self, current: int, total: int, message: str) -> None:
+        """progress_callback that queues a PROGRESS event instead of doing work"""
+        self._queue.put(ProgressEvent(PROGRESS, current=current, total=total, message=message))
+
+    def drain(self, limit: int = None) -> List[ProgressEvent]:
+        """
+        Take the queued events without waiting.
+
+        Args:
+            limit: Maximum number of events to take (None for all)
+
+        Returns:
+            Events in the order they were emitted (possibly empty)
+        """
+        events = []
+        while limit is None or len(events) < limit:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
@@ -0,0 +1,268 @@
+"""
+Parallel programming of several PMR-171 radios with the same codeplug.
+
+FleetProgrammer takes a codeplug and a list of serial ports, encodes every
+channel (0x40) and DMR (0x43) packet once into a WriteImage (or takes a
+compiled one, e.g. loaded from disk), and programs or verifies all
+radios concurrently with one worker thread per port. Each worker owns its
+own PMR171Radio, so a slow or failing radio only delays itself.
+
+Progress from all workers is aggregated into a single
+callback(current, total, message); the result holds per-radio throughput
+and a failure summary. Each worker has a circuit breaker from its radio's
+retry_policy, so a radio that stops answering is abandoned after
+breaker_threshold failed channels in a row instead of timing out on
+every remaining channel.
+
+Example:
+    >>> fleet = FleetProgrammer(channels, ['COM6', 'COM7', 'COM8'])
+    >>> result = fleet.program(progress_callback=print)
+    >>> print(result.summary())
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Callable, Union
+
+from .pmr171_uart import (
+    PMR171Radio,
+    ChannelData,
+    Command,
+    SessionAbortedError,
+    WRITE_FAILED,
+    WRITE_WRITTEN,
+    build_channel_packet,
+    build_dmr_data_packet,
+    parse_packet,
+)
+from .write_image import WriteImage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EncodedChannel:
+    """A channel with its packets encoded once for the whole fleet"""
+    channel: ChannelData
+    packet: bytes                       # 0x40 CHANNEL_WRITE packet (view into the image)
+    payload: bytes                      # 26-byte channel block
+    dmr_packet: Optional[bytes] = None  # 0x43 DMR_DATA_WRITE packet (DMR channels)
+    dmr_payload: Optional[bytes] = None
+
+
+def encode_channels(channels: Union[List[ChannelData], WriteImage]) -> List[EncodedChannel]:
+    """
+    Encode channel and DMR packets once, in channel order.
+
+    Args:
+        channels: Channels to encode, or an already compiled WriteImage
+
+    Returns:
+        List of EncodedChannel sorted by channel index
+    """
+    image = channels if isinstance(channels, WriteImage) else WriteImage.compile(channels)
+    return [EncodedChannel(channel, image.packet(channel.index), image.payload(channel.index),
+                           image.dmr_packet(channel.index), image.dmr_payload(channel.index))
+            for channel in image]
+
+
+@dataclass
+class RadioReport:
+    """Outcome of one radio's share of a fleet operation"""
+    port: str
+    operation: str
+    total: int
+    completed: int = 0            # Channels that succeeded (including skipped ones)
+    skipped: int = 0
+    failed_channels: List[int] = field(default_factory=list)
+    error: Optional[str] = None   # Fatal error (e.g. could not connect)
+    started: float = 0.0
+    finished: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.failed_channels and self.completed == self.total
+
+    @property
+    def attempted(self) -> int:
+        """Channels processed, successfully or not"""
+        return self.completed + len(self.failed_channels)
+
+    @property
+    def elapsed(self) -> float:
+        return max(0.0, self.finished - self.started)
+
+    @property
+    def throughput(self) -> float:
+        """Channels successfully processed per second"""
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class FleetResult:
+    """Per-radio reports of a fleet operation"""
+    operation: str
+    reports: Dict[str, RadioReport] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return all(report.ok for report in self.reports.values())
+
+    def failures(self) -> Dict[str, str]:
+        """Port -> reason for every radio that did not finish cleanly"""
+        failures = {}
+        for port, report in self.reports.items():
+            if report.error:
+                failures[port] = report.error
+            elif report.failed_channels:
+                failures[port] = f"{len(report.failed_channels)} channel(s) failed: {report.failed_channels}"
+            elif report.attempted < report.total:
+                failures[port] = f"stopped after {report.attempted} of {report.total} channels"
+        return failures
+
+    def summary(self) -> str:
+        """Human-readable table of results"""
+        lines = [f"Fleet {self.operation}: {len(self.reports) - len(self.failures())}/{len(self.reports)} radios OK"]
+        for port, report in self.reports.items():
+            status = "OK" if report.ok else "FAILED"
+            lines.append(f"  {port:12s} {status:6s} {report.completed}/{report.total} channels "
+                         f"in {report.elapsed:.1f}s ({report.throughput:.1f} ch/s)")
+        for port, reason in self.failures().items():
+            lines.append(f"  {port}: {reason}")
+        return "\n".join(lines)
+
+
+class FleetProgrammer:
+    """
+    Program or verify several radios concurrently.
+
+    Args:
+        channels: Codeplug channels to program/verify on every radio, or a
+            WriteImage of them
+        ports: Serial ports, one radio each
+        radio_factory: Callable(port) -> unconnected PMR171Radio-compatible
+            object (default PMR171Radio)
+        skip_unchanged: Read each slot back first and skip identical channels
+    """
+
+    def __init__(self, channels: Union[List[ChannelData], WriteImage], ports: List[str],
+                 radio_factory: Callable[[str], PMR171Radio] = PMR171Radio,
+                 skip_unchanged: bool = False):
+        if len(set(ports)) != len(ports):
+            raise ValueError("Each port may appear only once in a fleet")
+        self.encoded = encode_channels(channels)
+        self.ports = list(ports)
+        self.radio_factory = radio_factory
+        self.skip_unchanged = skip_unchanged
+        self._progress_lock = threading.Lock()
+
+    def program(self, progress_callback: Callable[[int, int, str], None] = None,
+                cancel_check: Callable[[], bool] = None) -> FleetResult:
+        """
+        Write the codeplug to every radio.
+
+        Args:
+            progress_callback: Optional callback(current, total, message),
+                aggregated over all radios (called from worker threads)
+            cancel_check: Optional callback that returns True if all workers should stop
+
+        Returns:
+            FleetResult with one RadioReport per port
+        """
+        return self._run('program', self._program_channel, progress_callback, cancel_check)
+
+    def verify(self, progress_callback: Callable[[int, int, str], None] = None,
+               cancel_check: Callable[[], bool] = None) -> FleetResult:
+        """
+        Read every radio back and compare it with the codeplug byte-for-byte.
+
+        Channels that differ (or cannot be read) are listed in each
+        report's failed_channels.
+        """
+        return self._run('verify', self._verify_channel, progress_callback, cancel_check)
+
+    def _program_channel(self, radio, item: EncodedChannel, report: RadioReport) -> bool:
+        if self.skip_unchanged:
+            result = radio.write_channel_if_changed(item.channel, packet=item.packet,
+                                                    dmr_packet=item.dmr_packet)
+            if result == WRITE_FAILED:
+                return False
+            if result != WRITE_WRITTEN:
+                report.skipped += 1
+            return True
+        return radio.write_channel(item.channel, packet=item.packet, dmr_packet=item.dmr_packet)
+
+    def _verify_channel(self, radio, item: EncodedChannel, report: RadioReport) -> bool:
+        channel = radio.read_channel(item.channel.index)
+        if parse_packet(build_channel_packet(channel, Command.CHANNEL_WRITE))[1] != item.payload:
+            return False
+        if item.dmr_payload is not None:
+            dmr = parse_packet(build_dmr_data_packet(channel, Command.DMR_DATA_WRITE))[1]
+            return dmr == item.dmr_payload
+        return True
+
+    def _run(self, operation: str, handle_channel, progress_callback, cancel_check) -> FleetResult:
+        result = FleetResult(operation)
+        per_radio = len(self.encoded)
+        grand_total = per_radio * len(self.ports)
+        done = [0]
+
+        def report_progress(port: str, message: str) -> None:
+            if not progress_callback:
+                return
+            with self._progress_lock:
+                done[0] += 1
+                progress_callback(done[0], grand_total, f"{port}: {message}")
+
+        def worker(port: str) -> None:
+            report = result.reports[port]
+            report.started = time.time()
+            radio = None
+            try:
+                radio = self.radio_factory(port)
+                radio.connect()
+                breaker = radio.retry_policy.breaker()
+                for item in self.encoded:
+                    if cancel_check and cancel_check():
+                        break
+                    index = item.channel.index
+                    try:
+                        success = handle_channel(radio, item, report)
+                    except Exception as e:
+                        logger.warning(f"{port}: channel {index} {operation} failed: {e}")
+                        success = False
+                    if success:
+                        breaker.success()
+                        report.completed += 1
+                    else:
+                        report.failed_channels.append(index)
+                    report_progress(port, f"{operation} channel {index}"
+                                          f"{'' if success else ' FAILED'}")
+                    if not success and breaker.failure():
+                        raise SessionAbortedError(
+                            f"Aborted at channel {index} after {breaker.consecutive} "
+                            f"consecutive failed channels")
+            except Exception as e:
+                logger.error(f"{port}: {operation} aborted: {e}")
+                report.error = str(e)
+            finally:
+                if radio is not None:
+                    try:
+                        radio.disconnect()
+                    except Exception:
+                        pass
+                report.finished = time.time()
+
+        for port in self.ports:
+            result.reports[port] = RadioReport(port, operation, per_radio)
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.ports)),
+                                thread_name_prefix='pmr171-fleet') as pool:
+            for future in [pool.submit(worker, port) for port in self.ports]:
+                future.result()
+
+        logger.info(result.summary())
+        return result
@@ -0,0 +1,297 @@
+"""
+Persistent radio image cache and delta-write planner.
+
+Re-programming the same radio after a few edits used to push every
+channel again. RadioImageCache keeps the last known raw 26-byte channel
+(0x41/0x40) and DMR (0x44/0x43) payload for every slot of one physical
+radio on disk. PMR171Radio updates it after every successful read or
+write once a cache is attached (see PMR171Radio.attach_image_cache).
+
+plan_writes() diffs a target codeplug against the cache and returns the
+minimal set of writes. The cache can drift if the radio is programmed by
+other software, so verify_image_cache() reads back a random sample of
+cached slots and corrects any that no longer match.
+
+Cache files live in ~/.pmr171/radio_cache/<key>.json, where the key is
+derived from the USB port hwid and the radio's equipment-type response.
+
+Example:
+    >>> radio = PMR171Radio('COM6')
+    >>> radio.connect()
+    >>> radio.attach_image_cache()
+    >>> radio.write_changed_channels(channels, verify_samples=10)
+"""
+
+import hashlib
+import json
+import logging
+import random
+import struct
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Optional, Any
+
+from .pmr171_uart import (
+    ChannelData,
+    Command,
+    Mode,
+    OperationCancelledError,
+    build_channel_packet,
+    build_dmr_data_packet,
+    parse_packet,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / '.pmr171' / 'radio_cache'
+CACHE_VERSION = 1
+
+# Cached slots read back before a delta write from the GUI
+DEFAULT_VERIFY_SAMPLES = 10
+
+
+def radio_cache_key(hwid: str, radio_info: Dict[str, Any]) -> str:
+    """
+    Build the cache key identifying one physical radio.
+
+    Args:
+        hwid: Serial port hardware ID (USB VID:PID and serial number)
+        radio_info: Result of PMR171Radio.get_radio_info()
+
+    Returns:
+        Short hex digest usable as a file name
+    """
+    identity = f"{hwid}|{radio_info.get('model', '')}|{radio_info.get('raw_response', '')}"
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+
+
+def channel_payload(channel: ChannelData) -> bytes:
+    """26-byte payload write_channel would send for a channel"""
+    return parse_packet(build_channel_packet(channel, Command.CHANNEL_WRITE))[1]
+
+
+def dmr_payload(channel: ChannelData) -> bytes:
+    """26-byte payload write_dmr_data would send for a channel"""
+    return parse_packet(build_dmr_data_packet(channel, Command.DMR_DATA_WRITE))[1]
+
+
+class RadioImageCache:
+    """
+    Last known channel and DMR payloads for every slot of one radio.
+
+    Args:
+        key: Cache key (see radio_cache_key)
+        cache_dir: Directory holding cache files (default ~/.pmr171/radio_cache)
+        identity: Optional description stored alongside the payloads
+    """
+
+    def __init__(self, key: str, cache_dir: Optional[Path] = None,
+                 identity: Optional[Dict[str, Any]] = None):
+        self.key = key
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.identity = identity or {}
+        self.channels: Dict[int, bytes] = {}
+        self.dmr: Dict[int, bytes] = {}
+        self.dirty = False
+
+    @property
+    def path(self) -> Path:
+        """Location of the cache file"""
+        return self.cache_dir / f"{self.key}.json"
+
+    @classmethod
+    def load(cls, key: str, cache_dir: Optional[Path] = None,
+             identity: Optional[Dict[str, Any]] = None) -> 'RadioImageCache':
+        """
+        Load the cache for a radio, or start an empty one.
+
+        A missing, unreadable or incompatible file gives an empty cache.
+        """
+        cache = cls(key, cache_dir, identity)
+        try:
+            with open(cache.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cache
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable radio image cache {cache.path}: {e}")
+            return cache
+
+        if data.get('version') != CACHE_VERSION or data.get('key') != key:
+            logger.warning(f"Ignoring incompatible radio image cache {cache.path}")
+            return cache
+
+        cache.identity = identity or data.get('identity', {})
+        for index, slot in data.get('slots', {}).items():
+            if 'channel' in slot:
+                cache.channels[int(index)] = bytes.fromhex(slot['channel'])
+            if 'dmr' in slot:
+                cache.dmr[int(index)] = bytes.fromhex(slot['dmr'])
+        logger.debug(f"Loaded radio image cache {cache.path}: {len(cache.channels)} slots")
+        return cache
+
+    def save(self) -> None:
+        """Write the cache to disk if anything changed"""
+        if not self.dirty:
+            return
+
+        slots: Dict[str, Dict[str, str]] = {}
+        for index, payload in self.channels.items():
+            slots.setdefault(str(index), {})['channel'] = payload.hex()
+        for index, payload in self.dmr.items():
+            slots.setdefault(str(index), {})['dmr'] = payload.hex()
+
+        data = {
+            'version': CACHE_VERSION,
+            'key': self.key,
+            'identity': self.identity,
+            'updated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'slots': dict(sorted(slots.items(), key=lambda item: int(item[0]))),
+        }
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so an interrupted save keeps the old cache
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+        tmp_path.replace(self.path)
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self.channels
+
+    def update_channel(self, payload: bytes) -> None:
+        """Record a channel payload read from or written to the radio"""
+        index = struct.unpack_from('>H', payload)[0]
+        payload = bytes(payload[:26])
+        if self.channels.get(index) != payload:
+            self.channels[index] = payload
+            self.dirty = True
+
+    def update_dmr(self, payload: bytes) -> None:
+        """Record a DMR payload read from or written to the radio"""
+        index = struct.unpack_from('>H', payload)[0]
+        payload = bytes(payload[:26])
+        if self.dmr.get(index) != payload:
+            self.dmr[index] = payload
+            self.dirty = True
+
+    def invalidate(self, index: int) -> None:
+        """Forget a slot so the next plan writes it"""
+        had_channel = self.channels.pop(index, None) is not None
+        had_dmr = self.dmr.pop(index, None) is not None
+        if had_channel or had_dmr:
+            self.dirty = True
+
+    def clear(self) -> None:
+        """Forget every slot"""
+        if self.channels or self.dmr:
+            self.channels.clear()
+            self.dmr.clear()
+            self.dirty = True
+
+
+@dataclass
+class WritePlan:
+    """Minimal set of writes that brings the radio to a target codeplug"""
+    full: List[ChannelData] = field(default_factory=list)       # Channel block (+ DMR) writes
+    dmr_only: List[ChannelData] = field(default_factory=list)   # Only the 0x43 block differs
+    unchanged: List[int] = field(default_factory=list)          # Already on the radio
+
+    def __len__(self) -> int:
+        return len(self.full) + len(self.dmr_only)
+
+    def summary(self) -> Dict[str, int]:
+        """Counts of each kind of write"""
+        return {
+            'full': len(self.full),
+            'dmr_only': len(self.dmr_only),
+            'unchanged': len(self.unchanged),
+        }
+
+
+def plan_writes(channels: List[ChannelData], cache: RadioImageCache) -> WritePlan:
+    """
+    Diff target channels against the cached radio image.
+
+    Slots the cache does not know are always written.
+
+    Args:
+        channels: Target channels
+        cache: Radio image cache
+
+    Returns:
+        WritePlan listing the writes needed, in channel order
+    """
+    plan = WritePlan()
+    for channel in sorted(channels, key=lambda c: c.index):
+        channel_same = cache.channels.get(channel.index) == channel_payload(channel)
+        dmr_same = (channel.rx_mode != Mode.DMR or
+                    cache.dmr.get(channel.index) == dmr_payload(channel))
+
+        if channel_same and dmr_same:
+            plan.unchanged.append(channel.index)
+        elif channel_same:
+            plan.dmr_only.append(channel)
+        else:
+            plan.full.append(channel)
+    return plan
+
+
+def verify_image_cache(radio, cache: RadioImageCache, samples: int,
+                       rng: Optional[random.Random] = None) -> List[int]:
+    """
+    Check the cache against readbacks of a random sample of cached slots.
+
+    Each slot is read with radio.read_channel (retries, response checks
+    and the DMR block for DMR channels). Slots that no longer match are
+    updated with what the radio actually holds; slots that cannot be read
+    are invalidated so the next plan writes them.
+
+    Args:
+        radio: Connected PMR171Radio
+        cache: Radio image cache to check
+        samples: Number of slots to read back
+        rng: Random source (for reproducible sampling)
+
+    Returns:
+        Indices of slots that did not match
+    """
+    rng = rng or random.Random()
+    indices = sorted(cache.channels)
+    sample = sorted(rng.sample(indices, min(samples, len(indices))))
+
+    # Read through the driver's retrying path; its reads update the
+    # attached cache, so point that at the cache being checked
+    attached = radio.image_cache
+    radio.image_cache = cache
+    mismatched = []
+    try:
+        for index in sample:
+            expected = cache.channels[index]
+            expected_dmr = cache.dmr.get(index)
+            try:
+                channel = radio.read_channel(index)
+            except OperationCancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Cache verification read of channel {index} failed: {e}")
+                cache.invalidate(index)
+                mismatched.append(index)
+                continue
+
+            matches = cache.channels.get(index) == expected
+            if channel.rx_mode == Mode.DMR and cache.dmr.get(index) != expected_dmr:
+                matches = False
+            if not matches:
+                mismatched.append(index)
+    finally:
+        radio.image_cache = attached
+
+    if mismatched:
+        logger.warning(f"Radio image cache out of date for channels {mismatched}")
+    return mismatched
@@ -0,0 +1,306 @@
+"""
+Append-only session journal for resumable codeplug reads and writes.
+
+A 1000-channel read or write takes minutes. Without a record of progress a
+USB drop, crash or cancel at channel 870 meant starting again from 0.
+
+SessionJournal writes one JSON line per event to
+~/.pmr171/journals/<session>.jsonl:
+
+    {"type": "session", "operation": "write", "indices": [...], "targets": {...}}
+    {"type": "confirm", "index": 0, "sha1": "...", "t": 1700000000.0}
+    {"type": "discard", "index": 5}
+    {"type": "finish", "status": "complete"}
+
+Each line is flushed and fsync'd as soon as the channel is confirmed by the
+radio, so the journal survives a crash. A torn last line is ignored on
+replay. The payload hash is the SHA-1 of the raw 26-byte channel block plus
+the 26-byte DMR block for DMR channels.
+
+Write sessions store the target payloads in the header, and read sessions
+store each channel's payloads in its confirm record, so a session can be
+resumed from the journal alone (see PMR171Radio.resume).
+
+Example:
+    >>> journal = SessionJournal.create(SessionJournal.WRITE, channels=channels, port='COM6')
+    >>> radio.write_all_channels(channels, journal=journal)
+    >>> # ... interrupted ...
+    >>> radio.resume(journal.path)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import List, Dict, Optional, Any
+
+from .pmr171_uart import (
+    ChannelData,
+    Command,
+    Mode,
+    build_channel_packet,
+    build_dmr_data_packet,
+    parse_packet,
+    parse_channel_packet,
+    parse_dmr_data_packet,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_DIR = Path.home() / '.pmr171' / 'journals'
+JOURNAL_VERSION = 1
+
+
+def encode_channel(channel: ChannelData) -> Dict[str, str]:
+    """Raw payloads of a channel as hex strings ('dmr' only for DMR channels)"""
+    record = {'payload': parse_packet(build_channel_packet(channel, Command.CHANNEL_WRITE))[1].hex()}
+    if channel.rx_mode == Mode.DMR:
+        record['dmr'] = parse_packet(build_dmr_data_packet(channel, Command.DMR_DATA_WRITE))[1].hex()
+    return record
+
+
+def decode_channel(record: Dict[str, str]) -> ChannelData:
+    """Rebuild a ChannelData from encode_channel() output"""
+    channel = parse_channel_packet(bytes.fromhex(record['payload']))
+    if 'dmr' in record:
+        dmr_data = parse_dmr_data_packet(bytes.fromhex(record['dmr']), channel)
+        channel.call_format = dmr_data['call_type']
+    return channel
+
+
+def record_digest(record: Dict[str, str]) -> str:
+    """SHA-1 of the channel block plus the DMR block, if any"""
+    data = bytes.fromhex(record['payload']) + bytes.fromhex(record.get('dmr', ''))
+    return hashlib.sha1(data).hexdigest()
+
+
+class SessionJournal:
+    """
+    Append-only journal of one read or write session.
+
+    Use create() to start a session and open() to replay one from disk.
+    """
+
+    READ = 'read'
+    WRITE = 'write'
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.operation = ''
+        self.port = ''
+        self.indices: List[int] = []
+        self.targets: Dict[int, Dict[str, str]] = {}
+        self.confirmed: Dict[int, Dict[str, Any]] = {}
+        self.status: Optional[str] = None
+        self.started = 0.0
+
+    @classmethod
+    def create(cls, operation: str, indices: List[int] = None,
+               channels: List[ChannelData] = None, port: str = '',
+               journal_dir: Optional[Path] = None) -> 'SessionJournal':
+        """
+        Start a new journal file.
+
+        Args:
+            operation: SessionJournal.READ or SessionJournal.WRITE
+            indices: Channel indices to read (READ sessions)
+            channels: Target channels (WRITE sessions)
+            port: Serial port, recorded for the resume prompt
+            journal_dir: Directory for journal files (default ~/.pmr171/journals)
+
+        Returns:
+            New SessionJournal with its header written
+        """
+        if operation == cls.WRITE:
+            if channels is None:
+                raise ValueError("Write journals need the target channels")
+            indices = [channel.index for channel in channels]
+        elif operation != cls.READ:
+            raise ValueError(f"Unknown journal operation: {operation}")
+
+        journal_dir = Path(journal_dir) if journal_dir else DEFAULT_JOURNAL_DIR
+        journal_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime('%Y%m%d_%H%M%S')
+        path = journal_dir / f"{operation}_{stamp}_{os.getpid()}.jsonl"
+
+        journal = cls(path)
+        journal.operation = operation
+        journal.port = port
+        journal.indices = list(indices or [])
+        journal.started = time.time()
+        if channels is not None:
+            journal.targets = {channel.index: encode_channel(channel) for channel in channels}
+
+        journal._append({
+            'type': 'session',
+            'version': JOURNAL_VERSION,
+            'operation': operation,
+            'port': port,
+            'started': journal.started,
+            'indices': journal.indices,
+            'targets': {str(index): target for index, target in journal.targets.items()},
+        })
+        return journal
+
+    @classmethod
+    def open(cls, path) -> 'SessionJournal':
+        """
+        Replay a journal file.
+
+        Raises:
+            ValueError: If the file has no valid session header
+        """
+        journal = cls(path)
+        with open(journal.path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+
+        for line_number, line in enumerate(lines, 1):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A crash can leave the last line half-written
+                logger.warning(f"{journal.path}:{line_number}: ignoring torn journal entry")
+                continue
+
+            kind = entry.get('type')
+            if kind == 'session':
+                if entry.get('version') != JOURNAL_VERSION:
+                    raise ValueError(f"Unsupported journal version in {journal.path}")
+                journal.operation = entry['operation']
+                journal.port = entry.get('port', '')
+                journal.started = entry.get('started', 0.0)
+                journal.indices = entry['indices']
+                journal.targets = {int(index): target for index, target in entry.get('targets', {}).items()}
+            elif kind == 'confirm':
+                journal.confirmed[entry['index']] = entry
+            elif kind == 'discard':
+                journal.confirmed.pop(entry['index'], None)
+            elif kind == 'finish':
+                journal.status = entry.get('status')
+
+        if not journal.operation:
+            raise ValueError(f"No session header in {journal.path}")
+        if lines and not lines[-1].endswith('\n'):
+            # Terminate the torn line so new entries start on a line of their own
+            with open(journal.path, 'a', encoding='utf-8') as f:
+                f.write('\n')
+        return journal
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    @property
+    def finished(self) -> bool:
+        """True once the session completed and passed its integrity check"""
+        return self.status == 'complete'
+
+    def confirm(self, channel: ChannelData) -> None:
+        """
+        Record that the radio confirmed a channel (read back or write acknowledged).
+
+        Read sessions keep the payloads so the channel can be rebuilt on resume.
+        """
+        record = encode_channel(channel)
+        entry = {'type': 'confirm', 'index': channel.index,
+                 'sha1': record_digest(record), 't': time.time()}
+        if self.operation == self.READ:
+            entry.update(record)
+        self._append(entry)
+        self.confirmed[channel.index] = entry
+
+    def discard(self, index: int) -> None:
+        """Withdraw a confirmation so the slot is processed again"""
+        self._append({'type': 'discard', 'index': index})
+        self.confirmed.pop(index, None)
+
+    def finish(self, status: str = 'complete') -> None:
+        """Mark the session complete (or e.g. 'cancelled', which stays resumable)"""
+        self._append({'type': 'finish', 'status': status, 't': time.time()})
+        self.status = status
+
+    def delete(self) -> None:
+        """Remove the journal file, e.g. once the session is complete"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def pending(self) -> List[int]:
+        """Indices not yet confirmed, in session order"""
+        return [index for index in self.indices if index not in self.confirmed]
+
+    def pending_targets(self) -> List[ChannelData]:
+        """Channels still to write (WRITE sessions)"""
+        return [decode_channel(self.targets[index]) for index in self.pending()]
+
+    def channels(self) -> List[ChannelData]:
+        """Channels confirmed so far, in session order (READ sessions)"""
+        return [decode_channel(self.confirmed[index]) for index in self.indices
+                if index in self.confirmed]
+
+    def integrity_check(self) -> List[int]:
+        """
+        Find confirm records damaged or altered in the journal file.
+
+        This checks the file, not the radio: confirm() hashes the channel it
+        is given, so for a WRITE session a record only fails if it was
+        corrupted or edited after being written. A record fails if its slot
+        is not part of the session or its hash does not match the target
+        payload (WRITE) or the payload stored with it (READ). Use
+        PMR171Radio.verify_channels to check written slots on the radio.
+
+        Returns:
+            Indices with damaged confirmations
+        """
+        session_indices = set(self.indices)
+        bad = []
+        for index, entry in self.confirmed.items():
+            if index not in session_indices:
+                bad.append(index)
+            elif self.operation == self.WRITE:
+                if entry.get('sha1') != record_digest(self.targets[index]):
+                    bad.append(index)
+            elif 'payload' not in entry or entry.get('sha1') != record_digest(entry):
+                bad.append(index)
+        return sorted(bad)
+
+    def summary(self) -> Dict[str, Any]:
+        """Progress overview for prompts and logs"""
+        return {
+            'path': str(self.path),
+            'operation': self.operation,
+            'port': self.port,
+            'started': self.started,
+            'total': len(self.indices),
+            'confirmed': len(self.confirmed),
+            'status': self.status,
+        }
+
+
+def find_unfinished_journals(journal_dir: Optional[Path] = None) -> List[SessionJournal]:
+    """
+    Journals of sessions that did not complete, newest first.
+
+    Args:
+        journal_dir: Directory to search (default ~/.pmr171/journals)
+    """
+    journal_dir = Path(journal_dir) if journal_dir else DEFAULT_JOURNAL_DIR
+    if not journal_dir.is_dir():
+        return []
+
+    journals = []
+    for path in journal_dir.glob('*.jsonl'):
+        try:
+            journal = SessionJournal.open(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Skipping unreadable journal {path}: {e}")
+            continue
+        if not journal.finished:
+            journals.append(journal)
+    journals.sort(key=lambda journal: journal.started, reverse=True)
+    return journals
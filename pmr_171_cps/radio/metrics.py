@@ -0,0 +1,185 @@
+"""
+Session metrics for the PMR-171 UART driver.
+
+Retries used to be visible only as logger.warning lines. SessionMetrics
+counts what a programming session actually spent its time on, so slow slots
+and phases of a 1000-channel read or write can be found and compared
+between versions:
+
+    rtt          per-command round-trip histogram (fixed millisecond buckets)
+    noise_bytes  bytes discarded while searching for an A5A5A5A5 header
+    crc_errors   complete packets whose CRC did not match
+    echo_mismatches  write echoes that differed from the data sent
+                 (only checked with PMR171Radio(verify_echo=True))
+    retries      failed attempts per command and per channel
+    wakes        wake exchanges sent (connect and pre-write wakes)
+    cancellations  operations stopped by PMR171Radio.cancel()
+    channels     channels completed, and channels/sec between the first
+                 and last completion
+
+Recording is a few integer updates, so the metrics are always on
+(PMR171Radio.metrics). snapshot() returns a plain dict suitable for JSON.
+
+Example:
+    >>> radio.read_all_channels()
+    >>> radio.metrics.snapshot()['channels_per_sec']
+    >>> print(radio.metrics.summary())
+"""
+
+import bisect
+import time
+from typing import Dict, List, Any
+
+# Upper bucket edges of the RTT histograms (seconds); the last bucket is open
+RTT_BUCKETS = (0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0)
+
+
+def _command_name(command: int) -> str:
+    return getattr(command, 'name', f"0x{command:02X}")
+
+
+def bucket_labels(edges=RTT_BUCKETS) -> List[str]:
+    """Histogram bucket names, e.g. '<=5ms', ..., '>2000ms'"""
+    labels = [f"<={edge * 1000:g}ms" for edge in edges]
+    labels.append(f">{edges[-1] * 1000:g}ms")
+    return labels
+
+
+class SessionMetrics:
+    """
+    Counters and RTT histograms for one radio connection.
+
+    Not locked: update it from the thread that drives the radio.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every counter (e.g. before a run that should be measured alone)"""
+        self._rtt: Dict[int, List[int]] = {}
+        self._rtt_total: Dict[int, float] = {}
+        self.noise_bytes = 0
+        self.crc_errors = 0
+        self.echo_mismatches = 0
+        self.timeouts = 0
+        self.wakes = 0
+        self.cancellations = 0
+        self.retries: Dict[int, int] = {}              # command -> failed attempts
+        self.channel_retries: Dict[int, int] = {}      # channel index -> failed attempts
+        self.channels = 0
+        self._first_channel = 0.0
+        self._last_channel = 0.0
+
+    def record_rtt(self, command: int, rtt: float) -> None:
+        """Add one round-trip time to the command's histogram"""
+        counts = self._rtt.get(command)
+        if counts is None:
+            counts = self._rtt[command] = [0] * (len(RTT_BUCKETS) + 1)
+            self._rtt_total[command] = 0.0
+        counts[bisect.bisect_left(RTT_BUCKETS, rtt)] += 1
+        self._rtt_total[command] += rtt
+
+    def record_noise(self, size: int) -> None:
+        """Count bytes skipped before a valid header"""
+        self.noise_bytes += size
+
+    def record_crc_error(self) -> None:
+        self.crc_errors += 1
+
+    def record_echo_mismatch(self) -> None:
+        self.echo_mismatches += 1
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+
+    def record_wake(self) -> None:
+        self.wakes += 1
+
+    def record_cancel(self) -> None:
+        self.cancellations += 1
+
+    def record_retry(self, command: int, channel_index: int = None) -> None:
+        """
+        Count a failed attempt that will be (or was) retried.
+
+        Args:
+            command: Command that failed
+            channel_index: Channel the attempt was for, if any
+        """
+        self.retries[command] = self.retries.get(command, 0) + 1
+        if channel_index is not None:
+            self.channel_retries[channel_index] = self.channel_retries.get(channel_index, 0) + 1
+
+    def record_channel(self, count: int = 1) -> None:
+        """Count channels completed (read or written)"""
+        now = time.time()
+        if not self.channels:
+            self._first_channel = now
+        self._last_channel = now
+        self.channels += count
+
+    @property
+    def channels_per_sec(self) -> float:
+        """Channels completed per second between the first and last completion"""
+        elapsed = self._last_channel - self._first_channel
+        return (self.channels - 1) / elapsed if self.channels > 1 and elapsed > 0 else 0.0
+
+    def slowest_channels(self, count: int = 10) -> List[int]:
+        """Channels that needed the most retries, worst first"""
+        ranked = sorted(self.channel_retries.items(), key=lambda item: (-item[1], item[0]))
+        return [index for index, _ in ranked[:count]]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Copy of all metrics as plain data.
+
+        Returns:
+            Dict with rtt (command name -> count, mean and bucket counts),
+            noise_bytes, crc_errors, echo_mismatches, timeouts, wakes,
+            cancellations, retries (command name
+            -> count), channel_retries (index -> count), channels and
+            channels_per_sec
+        """
+        labels = bucket_labels()
+        rtt = {}
+        for command, counts in sorted(self._rtt.items()):
+            samples = sum(counts)
+            rtt[_command_name(command)] = {
+                'samples': samples,
+                'mean': self._rtt_total[command] / samples if samples else 0.0,
+                'histogram': dict(zip(labels, counts)),
+            }
+        return {
+            'rtt': rtt,
+            'noise_bytes': self.noise_bytes,
+            'crc_errors': self.crc_errors,
+            'echo_mismatches': self.echo_mismatches,
+            'timeouts': self.timeouts,
+            'wakes': self.wakes,
+            'cancellations': self.cancellations,
+            'retries': {_command_name(command): count for command, count in sorted(self.retries.items())},
+            'channel_retries': dict(sorted(self.channel_retries.items())),
+            'channels': self.channels,
+            'channels_per_sec': self.channels_per_sec,
+        }
+
+    def status_line(self) -> str:
+        """One-line summary for progress displays"""
+        retries = sum(self.retries.values())
+        return (f"{self.channels_per_sec:.1f} ch/s | {retries} retries | "
+                f"{self.crc_errors} CRC errors | {self.noise_bytes} noise bytes")
+
+    def summary(self) -> str:
+        """Human-readable report"""
+        lines = [self.status_line(), f"Wakes: {self.wakes}, timeouts: {self.timeouts}"]
+        if self.echo_mismatches:
+            lines.append(f"Write echo mismatches: {self.echo_mismatches}")
+        for name, stats in self.snapshot()['rtt'].items():
+            buckets = ', '.join(f"{label}: {n}" for label, n in stats['histogram'].items() if n)
+            lines.append(f"  {name}: {stats['samples']} samples, mean {stats['mean'] * 1000:.1f} ms ({buckets})")
+        slow = self.slowest_channels()
+        if slow:
+            lines.append("Most retried channels: " +
+                         ', '.join(f"{index} ({self.channel_retries[index]})" for index in slow))
+        return "\n".join(lines)
@@ -36,16 +36,43 @@ DMR Data Packet Structure (0x43/0x44, 26 bytes):
   - Byte 19:     Call Type (0x01 = Group, 0x00 = Private)
   - Bytes 20-25: Other settings
 
-CRC: CRC-16-CCITT (polynomial 0x1021, initial value 0xFFFF)
+CRC: CRC-16-CCITT (polynomial 0x1021, initial value 0xFFFF) - see crc.py
 """
 
 import logging
 import struct
 import time
-from typing import List, Dict, Optional, Callable, Tuple, Any
+from collections import deque
+from typing import List, Dict, Optional, Callable, Tuple, Any, Iterator
 from dataclasses import dataclass
 from enum import IntEnum
 
+from .crc import crc16_ccitt, crc16_update, CRC_INIT
+from .codec import (
+    PACKET_HEADER,
+    CHANNEL_LAYOUT,
+    DMR_LAYOUT,
+    DMR_SETTINGS,
+    decode_packet,
+    decode_payloads,
+    encode_packet,
+    encode_packets,
+)
+from .timing import TimingController
+from .metrics import SessionMetrics
+from .retry import RetryPolicy, CircuitBreaker, ERROR_CRC, ERROR_TIMEOUT, ERROR_OTHER
+from .session import ProgrammingSession, DEFAULT_IDLE_THRESHOLD
+from .events import (
+    ProgressQueue,
+    PHASE_CHANGED,
+    CHANNEL_STARTED,
+    CHANNEL_DONE,
+    CHANNEL_RETRIED,
+    CHANNEL_FAILED,
+)
+from .cancel import CancelToken
+from .transport import Transport, open_transport
+
 # Set up debug logging
 logger = logging.getLogger(__name__)
 
@@ -82,6 +109,35 @@ class TimeoutError(PMR171Error):
     pass
 
 
+class SessionAbortedError(CommunicationError):
+    """Bulk operation aborted after too many consecutive failed channels"""
+    pass
+
+
+class EchoMismatchError(CommunicationError):
+    """Radio echoed a write with different data than was sent"""
+    pass
+
+
+class OperationCancelledError(PMR171Error):
+    """Operation stopped by PMR171Radio.cancel() (or its cancel_token)"""
+    pass
+
+
+class DMRReadError(PMR171Error):
+    """
+    A DMR channel's 0x41 block was read but its 0x44 DMR block was not.
+    
+    Not a CommunicationError, so read_channel's retry loop does not re-read
+    the channel block. The channel, with default DMR settings, is kept in
+    the channel attribute.
+    """
+    
+    def __init__(self, message: str, channel: 'ChannelData' = None):
+        super().__init__(message)
+        self.channel = channel
+
+
 class Command(IntEnum):
     """PMR-171 command codes"""
     PTT_CONTROL = 0x07
@@ -129,14 +185,34 @@ CTCSS_TONES = {
 # Reverse mapping: frequency to index
 CTCSS_FREQ_TO_INDEX = {v: k for k, v in CTCSS_TONES.items() if v is not None}
 
-# Packet header
-PACKET_HEADER = bytes([0xA5, 0xA5, 0xA5, 0xA5])
-
 # Default serial settings
 DEFAULT_BAUDRATE = 115200
 DEFAULT_TIMEOUT = 1.0
 CHANNEL_COUNT = 1000
 
+# In-flight CHANNEL_READ requests used when pipelined reads are enabled
+PIPELINED_READ_WINDOW = 8
+
+# Maximum noise bytes to skip while waiting for a response header
+MAX_SCAN_BYTES = 500
+
+# Serial read timeout; short so response deadlines are honoured precisely
+READ_POLL_INTERVAL = 0.05
+
+# Longest wait for the wake response (connect / before each write)
+WAKE_RESPONSE_TIMEOUT = 0.7
+PRE_WRITE_WAKE_TIMEOUT = 0.35
+
+# Time the radio needs to commit a DMR write (0x43) to flash, plus the
+# extra allowed per retry; adaptive timing shortens this once measured
+DMR_COMMIT_DELAY = 0.15
+DMR_COMMIT_STEP = 0.1
+
+# write_channel_if_changed() results
+WRITE_SKIPPED = 'skipped'
+WRITE_WRITTEN = 'written'
+WRITE_FAILED = 'failed'
+
 
 @dataclass
 class ChannelData:
@@ -305,33 +381,6 @@ class ChannelData:
                 f"RX={rx_tone}, TX={tx_tone}, Name='{self.name}'")
 
 
-def crc16_ccitt(data: bytes) -> int:
-    """
-    Calculate CRC-16-CCITT for PMR-171 protocol.
-    
-    Algorithm from PMR-171 manual (Sheet 39):
-    - Polynomial: 0x1021
-    - Initial value: 0xFFFF
-    - Input: bytes from Length field through last DATA byte (before CRC)
-    
-    Args:
-        data: Bytes to calculate CRC for
-        
-    Returns:
-        16-bit CRC value
-    """
-    crc = 0xFFFF
-    for byte in data:
-        cur = byte << 8
-        for _ in range(8):
-            if (crc ^ cur) & 0x8000:
-                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
-            else:
-                crc = (crc << 1) & 0xFFFF
-            cur = (cur << 1) & 0xFFFF
-    return crc
-
-
 def build_packet(command: int, data: bytes = b'') -> bytes:
     """
     Build a complete PMR-171 packet.
@@ -353,13 +402,10 @@ def build_packet(command: int, data: bytes = b'') -> bytes:
     packet = PACKET_HEADER + bytes([length, command]) + data
     
     # Calculate CRC over Length + Command + Data
-    crc_data = bytes([length, command]) + data
-    crc = crc16_ccitt(crc_data)
+    crc = crc16_ccitt(memoryview(packet)[4:])
     
     # Append CRC (big-endian)
-    packet += struct.pack('>H', crc)
-    
-    return packet
+    return packet + struct.pack('>H', crc)
 
 
 def parse_packet(data: bytes) -> Tuple[int, bytes, bool]:
@@ -375,36 +421,45 @@ def parse_packet(data: bytes) -> Tuple[int, bytes, bool]:
     Raises:
         ValueError: If packet is malformed
     """
-    if len(data) < 8:
-        raise ValueError(f"Packet too short: {len(data)} bytes")
-    
-    if data[:4] != PACKET_HEADER:
-        raise ValueError(f"Invalid header: {data[:4].hex()}")
-    
-    length = data[4]
-    if length < 3:
-        raise ValueError(f"Invalid length: {length}")
-    
-    expected_size = 4 + 1 + length  # header + length byte + (cmd + data + crc)
-    if len(data) < expected_size:
-        raise ValueError(f"Packet incomplete: expected {expected_size}, got {len(data)}")
-    
-    command = data[5]
-    payload = data[6:5 + length - 2]  # Exclude CRC bytes
+    return decode_packet(data, copy=True)
+
+
+def _channel_fields(channel: ChannelData) -> tuple:
+    """Fields of channel in CHANNEL_LAYOUT order"""
+    # Channel name: 11 characters, null-terminated in the 12-byte field
+    name_bytes = channel.name.encode('ascii', errors='replace')[:11]
+    return (channel.index, channel.rx_mode, channel.tx_mode, channel.rx_freq_hz,
+            channel.tx_freq_hz, channel.rx_ctcss_index, channel.tx_ctcss_index, name_bytes)
+
+
+def _channel_from_fields(fields: tuple) -> ChannelData:
+    """ChannelData from a CHANNEL_LAYOUT tuple"""
+    index, rx_mode, tx_mode, rx_freq, tx_freq, rx_ctcss, tx_ctcss, name_bytes = fields
     
-    # Verify CRC
-    crc_data = data[4:5 + length - 2]  # Length + Command + Data
-    calculated_crc = crc16_ccitt(crc_data)
-    packet_crc = (data[5 + length - 2] << 8) | data[5 + length - 1]
+    # Decode name (null-terminated ASCII)
+    try:
+        name = name_bytes.split(b'\x00')[0].decode('ascii', errors='replace')
+    except:
+        name = ""
     
-    return command, payload, calculated_crc == packet_crc
+    # Positional: keyword construction of the dataclass costs twice as much
+    return ChannelData(index, rx_mode, tx_mode, rx_freq, tx_freq, rx_ctcss, tx_ctcss, name)
+
+
+def _dmr_fields(channel: ChannelData) -> tuple:
+    """DMR fields of channel in DMR_LAYOUT order"""
+    # Get call type from channel's call_format field
+    # 0 = Private call, 1 = Group call, 2 = All call
+    call_type = getattr(channel, 'call_format', 1)  # Default to group call
+    return (channel.index, channel.rx_cc & 0x0F, channel.tx_cc & 0x0F, channel.slot,
+            channel.call_id, channel.own_id, call_type, DMR_SETTINGS)
 
 
 def build_channel_packet(channel: ChannelData, command: int = Command.CHANNEL_WRITE) -> bytes:
     """
     Build a channel write/read packet.
     
-    Channel data structure (26 bytes):
+    Channel data structure (26 bytes, see codec.CHANNEL_LAYOUT):
     - 0-1:   Channel index (big-endian)
     - 2:     RX Mode
     - 3:     TX Mode
@@ -421,37 +476,23 @@ def build_channel_packet(channel: ChannelData, command: int = Command.CHANNEL_WR
     Returns:
         Complete packet bytes
     """
-    # Encode channel name (12 bytes, null-terminated)
-    name_bytes = channel.name.encode('ascii', errors='replace')[:11]
-    name_bytes = name_bytes + b'\x00' * (12 - len(name_bytes))
-    
-    # Build data payload
-    data = struct.pack(
-        '>HBBIIBBc11s',  # Note: 12 byte name field
-        channel.index,
-        channel.rx_mode,
-        channel.tx_mode,
-        channel.rx_freq_hz,
-        channel.tx_freq_hz,
-        channel.rx_ctcss_index,
-        channel.tx_ctcss_index,
-        name_bytes[:1],  # First byte of name
-        name_bytes[1:12]  # Rest of name
-    )
-    
-    # Alternative packing without struct issues
-    data = (
-        struct.pack('>H', channel.index) +  # Channel index (2 bytes)
-        bytes([channel.rx_mode]) +           # RX mode (1 byte)
-        bytes([channel.tx_mode]) +           # TX mode (1 byte)
-        struct.pack('>I', channel.rx_freq_hz) +  # RX freq (4 bytes)
-        struct.pack('>I', channel.tx_freq_hz) +  # TX freq (4 bytes)
-        bytes([channel.rx_ctcss_index]) +    # RX CTCSS (1 byte)
-        bytes([channel.tx_ctcss_index]) +    # TX CTCSS (1 byte)
-        name_bytes                           # Name (12 bytes)
-    )
-    
-    return build_packet(command, data)
+    return encode_packet(command, CHANNEL_LAYOUT, _channel_fields(channel))
+
+
+def build_channel_packets(channels: List[ChannelData],
+                          command: int = Command.CHANNEL_WRITE) -> bytearray:
+    """
+    Build the channel packets for many channels in one buffer.
+    
+    Args:
+        channels: Channels to encode
+        command: Command code (CHANNEL_WRITE or CHANNEL_READ)
+        
+    Returns:
+        Contiguous buffer of packets, one per channel in order, each
+        codec.packet_size(26) bytes long
+    """
+    return encode_packets(command, CHANNEL_LAYOUT, [_channel_fields(channel) for channel in channels])
 
 
 def parse_channel_packet(data: bytes) -> ChannelData:
@@ -466,39 +507,28 @@ def parse_channel_packet(data: bytes) -> ChannelData:
     """
     if len(data) < 26:
         raise ValueError(f"Channel data too short: {len(data)} bytes")
+    return _channel_from_fields(CHANNEL_LAYOUT.unpack_from(data))
+
+
+def parse_channel_payloads(payloads) -> List[ChannelData]:
+    """
+    Parse many channel payloads in one call.
     
-    index = struct.unpack('>H', data[0:2])[0]
-    rx_mode = data[2]
-    tx_mode = data[3]
-    rx_freq = struct.unpack('>I', data[4:8])[0]
-    tx_freq = struct.unpack('>I', data[8:12])[0]
-    rx_ctcss = data[12]
-    tx_ctcss = data[13]
-    
-    # Decode name (null-terminated ASCII)
-    name_bytes = data[14:26]
-    try:
-        name = name_bytes.split(b'\x00')[0].decode('ascii', errors='replace')
-    except:
-        name = ""
-    
-    return ChannelData(
-        index=index,
-        rx_mode=rx_mode,
-        tx_mode=tx_mode,
-        rx_freq_hz=rx_freq,
-        tx_freq_hz=tx_freq,
-        rx_ctcss_index=rx_ctcss,
-        tx_ctcss_index=tx_ctcss,
-        name=name
-    )
+    Args:
+        payloads: Iterable of 26-byte payloads, or one buffer of
+            back-to-back payloads
+        
+    Returns:
+        ChannelData objects in input order
+    """
+    return [_channel_from_fields(fields) for fields in decode_payloads(CHANNEL_LAYOUT, payloads)]
 
 
 def build_dmr_data_packet(channel: ChannelData, command: int = Command.DMR_DATA_WRITE) -> bytes:
     """
     Build a DMR data write packet (command 0x43).
     
-    DMR data structure (26 bytes):
+    DMR data structure (26 bytes, see codec.DMR_LAYOUT):
     - 0-1:   Channel index (big-endian)
     - 2:     Padding (0x00)
     - 3:     RX Color Code (0-15)
@@ -518,26 +548,22 @@ def build_dmr_data_packet(channel: ChannelData, command: int = Command.DMR_DATA_
     Returns:
         Complete packet bytes
     """
-    # Get call type from channel's call_format field
-    # 0 = Private call, 1 = Group call, 2 = All call
-    call_type = getattr(channel, 'call_format', 1)  # Default to group call
-    
-    # Build DMR data payload (26 bytes)
-    data = (
-        struct.pack('>H', channel.index) +      # Channel index (2 bytes)
-        bytes([0x00]) +                          # Padding (1 byte)
-        bytes([channel.rx_cc & 0x0F]) +          # RX Color Code (1 byte, 0-15)
-        bytes([channel.tx_cc & 0x0F]) +          # TX Color Code (1 byte, 0-15)
-        bytes([channel.slot]) +                  # Timeslot (1 byte, 1 or 2)
-        struct.pack('>I', channel.call_id) +    # Talk Group ID (4 bytes)
-        struct.pack('>I', channel.own_id) +     # Own DMR ID (4 bytes)
-        bytes([0x00, 0x00, 0x00, 0x00]) +        # Unknown (4 bytes)
-        bytes([0x00]) +                          # Unknown (1 byte)
-        bytes([call_type]) +                     # Call Type (1 byte)
-        bytes([0x00, 0x00, 0x00, 0x00, 0x00, 0x01])  # Other settings (6 bytes)
-    )
+    return encode_packet(command, DMR_LAYOUT, _dmr_fields(channel))
+
+
+def build_dmr_data_packets(channels: List[ChannelData],
+                           command: int = Command.DMR_DATA_WRITE) -> bytearray:
+    """
+    Build the DMR data packets for many channels in one buffer.
     
-    return build_packet(command, data)
+    Args:
+        channels: Channels to encode (normally the DMR ones only)
+        command: Command code (DMR_DATA_WRITE)
+        
+    Returns:
+        Contiguous buffer of packets, one per channel in order
+    """
+    return encode_packets(command, DMR_LAYOUT, [_dmr_fields(channel) for channel in channels])
 
 
 def parse_dmr_data_packet(data: bytes, channel: ChannelData = None) -> dict:
@@ -554,13 +580,8 @@ def parse_dmr_data_packet(data: bytes, channel: ChannelData = None) -> dict:
     if len(data) < 26:
         raise ValueError(f"DMR data too short: {len(data)} bytes")
     
-    index = struct.unpack('>H', data[0:2])[0]
-    rx_cc = data[3]
-    tx_cc = data[4]
-    slot = data[5]
-    call_id = struct.unpack('>I', data[6:10])[0]
-    own_id = struct.unpack('>I', data[10:14])[0]
-    call_type = data[19]  # 1 = Group, 0 = Private
+    # call_type: 1 = Group, 0 = Private
+    index, rx_cc, tx_cc, slot, call_id, own_id, call_type, _ = DMR_LAYOUT.unpack_from(data)
     
     result = {
         'index': index,
@@ -583,6 +604,129 @@ def parse_dmr_data_packet(data: bytes, channel: ChannelData = None) -> dict:
     return result
 
 
+class PacketFramer:
+    """
+    Incremental packet framer for the radio's UART byte stream.
+
+    Outside of programming responses the radio streams status frames
+    (84 a9 61 00 header), so valid A5 A5 A5 A5 packets arrive mixed in with
+    noise. Instead of scanning one byte per serial read, callers feed
+    whatever the port has buffered and the framer locates headers with
+    bytes.find, checks the length and CRC, and hands back complete packets.
+
+    Every byte fed ends up in exactly one frame, so callers can account for
+    the discarded noise as well as the packets.
+
+    Example:
+        >>> framer = PacketFramer()
+        >>> framer.feed(serial_port.read(serial_port.in_waiting))
+        >>> for kind, data in framer.frames():
+        ...     if kind == PacketFramer.PACKET:
+        ...         command, payload, _ = parse_packet(data)
+    """
+
+    PACKET = 'packet'        # Complete packet with valid CRC
+    NOISE = 'noise'          # Bytes discarded while searching for a header
+    CRC_ERROR = 'crc_error'  # Complete packet whose CRC did not match
+
+    def __init__(self):
+        # Reused for the lifetime of the framer; deleting consumed bytes from
+        # the front of a bytearray does not copy the remainder.
+        self._buffer = bytearray()
+        # Running CRC over buffer[4:_crc_end] for the packet at the front of
+        # the buffer, so a packet arriving in pieces is checksummed as it
+        # arrives rather than all at once at the end.
+        self._crc = CRC_INIT
+        self._crc_end = 4
+
+    def __len__(self) -> int:
+        """Number of buffered bytes not yet returned in a frame"""
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> None:
+        """
+        Append received bytes to the framer.
+
+        Args:
+            data: Raw bytes read from the serial port (any size)
+        """
+        self._buffer += data
+
+    def reset(self) -> int:
+        """
+        Drop all buffered bytes.
+
+        Returns:
+            Number of bytes discarded
+        """
+        discarded = len(self._buffer)
+        self._take(discarded)
+        return discarded
+
+    def _take(self, size: int) -> bytes:
+        """Remove and return bytes from the front of the buffer"""
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self._crc = CRC_INIT
+        self._crc_end = 4
+        return data
+
+    def frames(self) -> Iterator[Tuple[str, bytes]]:
+        """
+        Yield complete frames from the buffered bytes.
+
+        Yields (kind, data) tuples where kind is PACKET, NOISE or CRC_ERROR.
+        A packet that is still incomplete stays buffered until more bytes
+        are fed.
+        """
+        buffer = self._buffer
+        while buffer:
+            header_pos = buffer.find(PACKET_HEADER)
+
+            if header_pos == -1:
+                # Keep a possible partial header at the end of the buffer
+                keep = 0
+                for size in (3, 2, 1):
+                    if buffer.endswith(PACKET_HEADER[:size]):
+                        keep = size
+                        break
+                if len(buffer) > keep:
+                    yield self.NOISE, self._take(len(buffer) - keep)
+                return
+
+            if header_pos > 0:
+                yield self.NOISE, self._take(header_pos)
+                continue
+
+            if len(buffer) < 5:
+                return
+
+            length = buffer[4]
+            if length < 3:
+                # Not a real header (e.g. A5 bytes inside status data)
+                yield self.NOISE, self._take(1)
+                continue
+
+            # CRC covers Length + Command + Data, i.e. everything up to the
+            # two CRC bytes
+            packet_size = 5 + length
+            crc_stop = min(len(buffer), packet_size - 2)
+            if crc_stop > self._crc_end:
+                self._crc = crc16_update(self._crc, buffer[self._crc_end:crc_stop])
+                self._crc_end = crc_stop
+
+            if len(buffer) < packet_size:
+                return
+
+            calculated_crc = self._crc
+            packet = self._take(packet_size)
+            packet_crc = (packet[-2] << 8) | packet[-1]
+            if calculated_crc == packet_crc:
+                yield self.PACKET, packet
+            else:
+                yield self.CRC_ERROR, packet
+
+
 def list_serial_ports() -> List[Dict[str, str]]:
     """
     List available serial ports.
@@ -608,7 +752,9 @@ class PMR171Radio:
     PMR-171 Radio UART Interface
     
     Provides methods for reading and writing channel configurations
-    directly to the radio via serial connection.
+    directly to the radio. All I/O goes through a Transport (see
+    transport.py), so the radio can be on a serial port, behind a TCP
+    serial bridge or emulated in memory.
     
     Example:
         >>> radio = PMR171Radio('COM6')
@@ -617,35 +763,83 @@ class PMR171Radio:
         >>> radio.disconnect()
     """
     
-    def __init__(self, port: str, baudrate: int = DEFAULT_BAUDRATE, 
-                 timeout: float = DEFAULT_TIMEOUT):
+    def __init__(self, port, baudrate: int = DEFAULT_BAUDRATE, 
+                 timeout: float = DEFAULT_TIMEOUT, read_window: int = 1,
+                 adaptive_timing: bool = True,
+                 keepalive_idle: float = DEFAULT_IDLE_THRESHOLD,
+                 retry_policy: RetryPolicy = None,
+                 verify_echo: bool = False,
+                 events: ProgressQueue = None,
+                 cancel_token: CancelToken = None):
         """
         Initialize PMR-171 radio interface.
         
         Args:
-            port: Serial port name (e.g., 'COM6', '/dev/ttyUSB0')
+            port: Serial port name (e.g., 'COM6', '/dev/ttyUSB0'), a
+                'socket://host:port' bridge URL, or a Transport instance
             baudrate: Serial baud rate (default 115200)
             timeout: Read timeout in seconds
+            read_window: Maximum CHANNEL_READ requests kept in flight by
+                read_all_channels/read_selected_channels. 1 (default) reads
+                one channel per round trip; larger values enable pipelined reads.
+            adaptive_timing: Derive response timeouts and retry delays
+                from measured round-trip times (see timing.py). If False the
+                fixed legacy delays are always used.
+            keepalive_idle: Seconds without an acknowledged command before
+                write_channel sends a pre-write wake (see session.py).
+                0 wakes before every write.
+            retry_policy: Attempts, backoff, per-channel deadline and circuit
+                breaker for every channel operation (see retry.py)
+            verify_echo: Compare the radio's echo of every 0x40/0x43 write
+                byte-for-byte with the data sent and retry on a mismatch.
+                Verifies writes without any extra round trips.
+            events: Optional ProgressQueue that receives typed progress
+                events (phase changes, channel started/done/retried/failed)
+                without ever blocking the I/O loop (see events.py)
+            cancel_token: CancelToken observed by every sleep, read and
+                retry wait (see cancel.py); a new one is created if omitted
         """
-        if not SERIAL_AVAILABLE:
-            raise ImportError(
-                "pyserial is required for UART communication. "
-                "Install it with: pip install pyserial"
-            )
+        if isinstance(port, Transport):
+            self.transport: Optional[Transport] = port
+            port = port.name
+        else:
+            if not SERIAL_AVAILABLE and '://' not in port:
+                raise ImportError(
+                    "pyserial is required for UART communication. "
+                    "Install it with: pip install pyserial"
+                )
+            self.transport = None  # Created by connect()
         
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
-        self._serial: Optional[serial.Serial] = None
+        self.read_window = max(1, read_window)
+        self._framer = PacketFramer()
+        self.timing = TimingController(max_timeout=timeout * 2, adaptive=adaptive_timing)
+        self.session = ProgrammingSession(idle_threshold=keepalive_idle)
+        self.metrics = SessionMetrics()  # Latency/retry counters, see metrics.py
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.verify_echo = verify_echo
+        self.events = events
+        self.cancel_token = cancel_token or CancelToken()
+        self._phase_name = ''
+        self._phase_done = 0
+        self._phase_total = 0
+        self.last_write_summary: Dict[str, int] = {}
+        self.image_cache = None  # RadioImageCache, see attach_image_cache()
+        self.radio_info: Optional[Dict[str, Any]] = None  # Set by identify(), cleared on disconnect
+        # Receives the non-packet bytes the driver discards, i.e. the idle
+        # status stream (e.g. StatusMonitor.feed, see status.py)
+        self.status_feed: Optional[Callable[[bytes], Any]] = None
     
     @property
     def is_connected(self) -> bool:
-        """Check if serial port is open"""
-        return self._serial is not None and self._serial.is_open
+        """Check if the transport is open"""
+        return self.transport is not None and self.transport.is_open
     
     def connect(self) -> None:
         """
-        Open serial connection to radio.
+        Open the connection to the radio.
         
         The PMR-171 requires DTR and RTS to be set high to enter programming mode.
         After connection, we send a test read command to ensure the radio is ready.
@@ -657,37 +851,26 @@ class PMR171Radio:
             return
         
         try:
-            self._serial = serial.Serial(
-                port=self.port,
-                baudrate=self.baudrate,
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                timeout=self.timeout,
-                write_timeout=None,  # No write timeout - writes should be instant
-                rtscts=False,  # Disable hardware flow control
-                dsrdtr=False   # Disable DSR/DTR flow control
-            )
+            self._ensure_transport()
+            self.transport.open()
             
             # CRITICAL: Set DTR and RTS high to enable radio programming mode
-            self._serial.dtr = True
-            self._serial.rts = True
+            self.transport.set_control_lines(dtr=True, rts=True)
             
             # Clear any pending data
-            self._serial.reset_input_buffer()
-            self._serial.reset_output_buffer()
-            time.sleep(0.5)  # Allow radio to stabilize and enter programming mode
+            self.transport.reset_input_buffer()
+            self.transport.reset_output_buffer()
+            self._sleep(0.5)  # Allow radio to stabilize and enter programming mode
             
             # Clear any streaming status data from the radio
             # The radio may be sending status updates (84 a9 61 00 header)
             # We need to flush these before programming commands will work
             for _ in range(5):
-                if self._serial.in_waiting > 0:
-                    stale = self._serial.read(self._serial.in_waiting)
-                    logger.debug(f"Cleared {len(stale)} bytes of status data during connect")
-                    time.sleep(0.1)
-                else:
+                stale = self._clear_input()
+                if not stale:
                     break
+                logger.debug(f"Cleared {stale} bytes of status data during connect")
+                self._sleep(0.1)
             
             logger.debug(f"Connected to {self.port} with DTR=True, RTS=True")
             
@@ -695,12 +878,21 @@ class PMR171Radio:
             # The radio streams status data (84 a9 61 00) until it receives a valid command
             try:
                 self._wake_radio()
+            except OperationCancelledError:
+                raise
             except Exception as e:
                 logger.warning(f"Wake command failed (may be normal): {e}")
                 
-        except serial.SerialException as e:
+        except (OSError, ValueError) as e:
             raise ConnectionError(f"Failed to connect to {self.port}: {e}")
     
+    def _ensure_transport(self) -> Transport:
+        """Create the transport for self.port unless one is already set"""
+        if self.transport is None:
+            self.transport = open_transport(self.port, self.baudrate,
+                                            timeout=min(self.timeout, READ_POLL_INTERVAL))
+        return self.transport
+    
     def _wake_radio(self) -> bool:
         """
         Wake the radio into programming mode by sending a read command.
@@ -716,53 +908,51 @@ class PMR171Radio:
         
         # Clear any streaming status data
         for _ in range(10):
-            if self._serial.in_waiting > 0:
-                stale = self._serial.read(self._serial.in_waiting)
-                logger.debug(f"Cleared {len(stale)} bytes during wake")
-                time.sleep(0.05)
-            else:
+            cleared = self._clear_input()
+            if not cleared:
                 break
+            logger.debug(f"Cleared {cleared} bytes during wake")
+            self._sleep(0.05)
         
         # Send a simple channel 0 read command to trigger programming mode
         data = struct.pack('>H', 0)  # Channel 0
         packet = build_packet(Command.CHANNEL_READ, data)
         
         try:
-            self._serial.write(packet)
-            self._serial.flush()
-            time.sleep(0.2)
+            sent_at = time.time()
+            self.transport.write(packet)
+            self.transport.flush()
+            self.metrics.record_wake()
             
-            # Try to read response - may take a few attempts
-            for attempt in range(5):
-                # Clear any garbage
-                if self._serial.in_waiting > 0:
-                    response_data = self._serial.read(self._serial.in_waiting)
-                    
-                    # Look for A5 A5 A5 A5 header in response
-                    header_pos = response_data.find(PACKET_HEADER)
-                    if header_pos != -1:
-                        logger.debug(f"Radio woke up - found valid header at byte {header_pos}")
-                        return True
-                    else:
-                        logger.debug(f"Wake attempt {attempt+1}: got {len(response_data)} bytes, no valid header yet")
-                
-                time.sleep(0.1)
+            # Returns as soon as the response is in rather than after a fixed delay
+            response = self._wait_packet(WAKE_RESPONSE_TIMEOUT)
+            if response is not None:
+                self._record_rtt(Command.CHANNEL_READ, time.time() - sent_at)
+                self.session.touch()
+                logger.debug("Radio woke up - received valid packet")
+                return True
             
             logger.warning("Radio did not respond to wake command")
             return False
             
+        except OperationCancelledError:
+            raise
         except Exception as e:
             logger.warning(f"Wake command error: {e}")
             return False
     
     def disconnect(self) -> None:
-        """Close serial connection"""
-        if self._serial:
+        """Close serial connection (and save the radio image cache, if attached)"""
+        self.session.expire()
+        self._save_image_cache()
+        self.radio_info = None
+        if self.metrics.channels:
+            logger.info(f"Session metrics: {self.metrics.status_line()}")
+        if self.transport is not None:
             try:
-                self._serial.close()
+                self.transport.close()
             except:
                 pass
-            self._serial = None
     
     def __enter__(self):
         self.connect()
@@ -786,18 +976,20 @@ class PMR171Radio:
             raise CommunicationError("Not connected to radio")
         
         try:
-            self._serial.write(packet)
-            self._serial.flush()
-        except serial.SerialException as e:
+            self.transport.write(packet)
+            self.transport.flush()
+        except OSError as e:
             raise CommunicationError(f"Failed to send packet: {e}")
     
-    def _receive_packet(self, expected_length: int = None, retry_on_bad_header: bool = True) -> bytes:
+    def _receive_packet(self, expected_length: int = None, retry_on_bad_header: bool = True,
+                        timeout: float = None) -> bytes:
         """
         Receive a packet from the radio.
         
         Args:
             expected_length: Expected packet length (optional)
             retry_on_bad_header: If True, keep looking for valid header in stream
+            timeout: Seconds to wait for the packet (default: twice the port timeout)
             
         Returns:
             Complete packet bytes
@@ -811,64 +1003,263 @@ class PMR171Radio:
         
         try:
             # The radio may be streaming status data (84 a9 61 00 header)
-            # We need to scan through the stream looking for the valid A5 A5 A5 A5 header
-            max_scan_bytes = 500  # Maximum bytes to scan through
+            # The framer discards it while searching for the A5 A5 A5 A5 header
             scanned = 0
-            buffer = bytearray()
-            
             start_time = time.time()
-            timeout = self.timeout * 2  # Allow extra time for scanning
+            if timeout is None:
+                timeout = self.timeout * 2  # Allow extra time for scanning
             
-            while scanned < max_scan_bytes:
+            while True:
+                for kind, frame in self._framer.frames():
+                    if kind == PacketFramer.PACKET:
+                        if scanned > 0:
+                            logger.debug(f"Found valid header after scanning {scanned} bytes")
+                        return frame
+                    if kind == PacketFramer.CRC_ERROR:
+                        self.metrics.record_crc_error()
+                        raise CRCError("Packet CRC verification failed")
+                    scanned += len(frame)
+                    self.metrics.record_noise(len(frame))
+                    if self.status_feed is not None and kind == PacketFramer.NOISE:
+                        self.status_feed(frame)
+                
+                if scanned >= MAX_SCAN_BYTES:
+                    raise TimeoutError(f"Valid header not found after scanning {scanned} bytes")
                 if time.time() - start_time > timeout:
+                    if len(self._framer) > 0:
+                        raise TimeoutError(f"Timeout reading packet data: {len(self._framer)} bytes buffered")
                     raise TimeoutError("Timeout waiting for packet header")
                 
-                # Read one byte at a time until we find header
-                byte = self._serial.read(1)
-                if not byte:
-                    continue  # Timeout on single byte read, keep trying
-                
-                buffer.append(byte[0])
-                scanned += 1
-                
-                # Check if we have 4 bytes and if they match the header
-                if len(buffer) >= 4:
-                    if buffer[-4:] == bytearray(PACKET_HEADER):
-                        # Found valid header!
-                        if scanned > 4:
-                            logger.debug(f"Found valid header after scanning {scanned} bytes")
-                        break
-                    # Keep only last 3 bytes for overlap check
-                    if len(buffer) > 100:
-                        buffer = buffer[-3:]
-            else:
-                raise TimeoutError(f"Valid header not found after scanning {scanned} bytes")
-            
-            header = bytes(PACKET_HEADER)
+                # Blocks for up to the port read timeout when nothing is buffered yet
+                self._read_into_framer(block=True)
             
-            # Read length byte
-            length_byte = self._serial.read(1)
-            if not length_byte:
-                raise TimeoutError("Timeout waiting for length byte")
-            
-            length = length_byte[0]
+        except OSError as e:
+            raise CommunicationError(f"Serial error: {e}")
+    
+    def _read_into_framer(self, block: bool = False) -> int:
+        """
+        Move bytes from the serial port into the packet framer.
+        
+        Reads everything the port has buffered in a single call. When nothing
+        is waiting and block is True, waits (up to the port timeout, at most
+        READ_POLL_INTERVAL for ports opened by connect) for at least one byte.
+        
+        Args:
+            block: Wait for data if none is buffered
             
-            # Read rest of packet (command + data + CRC)
-            remaining = self._serial.read(length)
-            if len(remaining) < length:
-                raise TimeoutError(f"Timeout reading packet data: got {len(remaining)}/{length}")
+        Returns:
+            Number of bytes read
             
-            packet = header + length_byte + remaining
+        Raises:
+            OperationCancelledError: If block is True and cancel() was called
+        """
+        if block and self.cancel_token.cancelled:
+            raise self._cancelled()
+        waiting = self.transport.in_waiting
+        if waiting == 0 and not block:
+            return 0
+        chunk = self.transport.read(waiting or 1)
+        if chunk:
+            self._framer.feed(chunk)
+        return len(chunk)
+    
+    def _wait_packet(self, timeout: float) -> Optional[bytes]:
+        """
+        Wait for a complete packet, returning as soon as one arrives.
+        
+        Unlike _receive_packet this never raises on noise, CRC errors or
+        timeout; it is used for best-effort wake exchanges.
+        
+        Args:
+            timeout: Maximum seconds to wait
             
-            # Verify CRC
-            command, payload, crc_valid = parse_packet(packet)
-            if not crc_valid:
-                raise CRCError("Packet CRC verification failed")
+        Returns:
+            First valid packet received, or None if none arrived
+        """
+        deadline = time.time() + timeout
+        while True:
+            for kind, frame in self._framer.frames():
+                if kind == PacketFramer.PACKET:
+                    return frame
+                if kind == PacketFramer.NOISE:
+                    self.metrics.record_noise(len(frame))
+                    if self.status_feed is not None:
+                        self.status_feed(frame)
+            if time.time() >= deadline:
+                return None
+            self._read_into_framer(block=True)
+    
+    def _exchange(self, packet: bytes, command: int, settle: float = 0.0) -> bytes:
+        """
+        Send a request and receive its response, feeding the round-trip
+        time to the timing controller.
+        
+        Args:
+            packet: Complete request packet
+            command: Command code the round trip is recorded under
+            settle: Fixed time to leave the radio after sending, before
+                reading the response (e.g. a flash commit)
             
-            return packet
+        Returns:
+            Complete response packet bytes
+        """
+        self._send_packet(packet)
+        sent_at = time.time()
+        if settle > 0:
+            self._sleep(settle)
+        try:
+            response = self._receive_packet(timeout=self.timing.response_timeout(command))
+        except TimeoutError:
+            self.timing.on_timeout(command)
+            self.metrics.record_timeout()
+            raise
+        self._record_rtt(command, time.time() - sent_at)
+        self.session.touch()
+        return response
+    
+    def _record_rtt(self, command: int, rtt: float) -> None:
+        """Feed a round-trip time to the timing controller and the metrics"""
+        self.timing.record(command, rtt)
+        self.metrics.record_rtt(command, rtt)
+    
+    def _retry_wait(self, command: int, attempt: int, max_retries: int,
+                    channel_index: int = None, error: Exception = None,
+                    started: float = None) -> bool:
+        """
+        Drain late bytes and back off after a failed attempt.
+        
+        The backoff comes from retry_policy: short after a CRC error, growing
+        after timeouts, capped by the measured RTT once timing is warm.
+        
+        Args:
+            command: Command that failed
+            attempt: Zero-based attempt number that failed
+            max_retries: Attempt limit (no backoff after the last attempt)
+            channel_index: Channel the attempt was for (counted in metrics)
+            error: Exception the attempt failed with
+            started: When the operation started, for the policy deadline
             
-        except serial.SerialException as e:
-            raise CommunicationError(f"Serial error: {e}")
+        Returns:
+            True if the caller should try again
+        """
+        self.metrics.record_retry(command, channel_index)
+        kind = self._error_kind(error)
+        if self.transport is not None and kind != ERROR_CRC:
+            self._sleep(self.timing.drain_delay(command))  # Extra settling time
+        stale = self._clear_input()
+        if stale:
+            logger.debug(f"Cleared {stale} bytes before retry")
+        
+        if attempt >= max_retries - 1:
+            return False
+        delay = self.timing.backoff_delay(command, attempt, self.retry_policy.backoff(attempt, kind))
+        if started is not None and self.retry_policy.out_of_time(time.time() - started, delay):
+            logger.warning(f"Giving up on command 0x{command:02X} after {attempt + 1} attempts: "
+                           f"{self.retry_policy.deadline}s deadline reached")
+            return False
+        self._emit(CHANNEL_RETRIED, channel=channel_index, attempt=attempt + 1, message=str(error or ''))
+        self._sleep(delay)
+        return True
+    
+    @staticmethod
+    def _error_kind(error: Exception) -> str:
+        """Classify a failed attempt for the retry policy"""
+        if isinstance(error, CRCError):
+            return ERROR_CRC
+        if isinstance(error, TimeoutError):
+            return ERROR_TIMEOUT
+        return ERROR_OTHER
+    
+    def _attempts(self, max_retries: Optional[int]) -> int:
+        """Attempt limit: an explicit max_retries, else the retry policy's"""
+        return max_retries if max_retries is not None else self.retry_policy.max_attempts
+    
+    def _channel_failed(self, breaker: CircuitBreaker, channel_index: int) -> None:
+        """
+        Count a failed channel of a bulk operation.
+        
+        Raises:
+            SessionAbortedError: If the retry policy's circuit breaker opened
+        """
+        self._emit(CHANNEL_FAILED, channel=channel_index, current=self._phase_done,
+                   total=self._phase_total)
+        if breaker.failure():
+            raise SessionAbortedError(
+                f"Aborted at channel {channel_index} after {breaker.consecutive} consecutive "
+                f"failed channels - is the radio still connected and in programming mode?")
+    
+    def _emit(self, kind: str, **fields) -> None:
+        """Queue a progress event if an events queue is attached"""
+        if self.events is not None:
+            self.events.emit(kind, phase=self._phase_name, **fields)
+    
+    def _start_phase(self, name: str, total: int) -> None:
+        """Start counting channels of a new operation phase"""
+        self._phase_name = name
+        self._phase_done = 0
+        self._phase_total = total
+        self._emit(PHASE_CHANGED, total=total)
+    
+    def _channel_done(self, channel_index: int) -> None:
+        """Count a channel completed in the current phase"""
+        self._phase_done += 1
+        self._emit(CHANNEL_DONE, channel=channel_index, current=self._phase_done,
+                   total=self._phase_total)
+    
+    def cancel(self) -> None:
+        """
+        Stop the running operation as soon as possible (safe from any thread).
+        
+        The operation returns what it completed so far, as with cancel_check;
+        single-channel calls raise OperationCancelledError.
+        """
+        self.cancel_token.cancel()
+    
+    def _sleep(self, seconds: float) -> None:
+        """
+        time.sleep() that wakes up on cancel().
+        
+        Raises:
+            OperationCancelledError: If cancel() was called
+        """
+        if self.cancel_token.wait(seconds):
+            raise self._cancelled()
+    
+    def _cancel_requested(self, cancel_check: Callable[[], bool] = None) -> bool:
+        """True if cancel() was called (the request is consumed) or cancel_check says so"""
+        if self.cancel_token.cancelled:
+            self._cancelled()
+            return True
+        return bool(cancel_check and cancel_check())
+    
+    def _cancelled(self) -> OperationCancelledError:
+        """
+        Consume a cancel request, leaving the radio ready for the next operation.
+        
+        Returns:
+            The exception to raise
+        """
+        self.cancel_token.clear()
+        self.metrics.record_cancel()
+        self.session.expire()  # Wake before the next write; a request may have been cut short
+        stale = self._clear_input()
+        logger.info(f"Operation cancelled ({stale} bytes discarded)")
+        return OperationCancelledError("Operation cancelled")
+    
+    def _clear_input(self) -> int:
+        """
+        Discard stale bytes from the serial input buffer and the framer.
+        
+        Returns:
+            Number of bytes discarded
+        """
+        cleared = self._framer.reset()
+        if self.transport is not None and self.transport.in_waiting > 0:
+            stale = self.transport.read(self.transport.in_waiting)
+            if self.status_feed is not None:
+                self.status_feed(stale)
+            cleared += len(stale)
+        return cleared
     
     def send_command(self, command: int, data: bytes = b'') -> bytes:
         """
@@ -882,12 +1273,11 @@ class PMR171Radio:
             Response payload bytes
         """
         packet = build_packet(command, data)
-        self._send_packet(packet)
-        response = self._receive_packet()
+        response = self._exchange(packet, command)
         cmd, payload, _ = parse_packet(response)
         return payload
     
-    def read_channel(self, channel_index: int, max_retries: int = 10) -> ChannelData:
+    def read_channel(self, channel_index: int, max_retries: int = None) -> ChannelData:
         """
         Read a single channel from the radio with automatic retry on failure.
         
@@ -896,47 +1286,47 @@ class PMR171Radio:
         
         Args:
             channel_index: Channel number (0-999)
-            max_retries: Maximum number of retry attempts (default 10)
+            max_retries: Maximum number of attempts (default: retry_policy.max_attempts)
             
         Returns:
             ChannelData object
+            
+        Raises:
+            DMRReadError: If the channel is DMR and its DMR data could not be
+                read (the partially read channel is in its channel attribute)
         """
         last_error = None
         
+        max_retries = self._attempts(max_retries)
+        started = time.time()
         for attempt in range(max_retries):
             try:
                 # Clear any stale data from input buffer before sending request
-                if self._serial and self._serial.in_waiting > 0:
-                    stale = self._serial.read(self._serial.in_waiting)
-                    logger.debug(f"Cleared {len(stale)} stale bytes before read")
+                stale = self._clear_input()
+                if stale:
+                    logger.debug(f"Cleared {stale} stale bytes before read")
                 
                 # Build channel read request - just the 2-byte channel index
                 data = struct.pack('>H', channel_index)
                 packet = build_packet(Command.CHANNEL_READ, data)
                 
-                self._send_packet(packet)
-                response = self._receive_packet()
+                response = self._exchange(packet, Command.CHANNEL_READ)
                 cmd, payload, _ = parse_packet(response)
+                if cmd != Command.CHANNEL_READ or payload[:2] != data:
+                    raise CommunicationError(f"Channel {channel_index} read got cmd=0x{cmd:02X} "
+                                             f"for slot {payload[:2].hex()}")
                 
                 if attempt > 0:
                     logger.info(f"Channel {channel_index} read succeeded on retry {attempt + 1}")
                 
                 channel = parse_channel_packet(payload)
+                self._cache_channel(payload)
                 
                 # For DMR channels, also read DMR-specific data
-                if channel.rx_mode == Mode.DMR:
-                    try:
-                        dmr_data = self.read_dmr_data(channel_index)
-                        channel.rx_cc = dmr_data.get('rx_cc', 1)
-                        channel.tx_cc = dmr_data.get('tx_cc', 1)
-                        channel.slot = dmr_data.get('slot', 1)
-                        channel.call_id = dmr_data.get('call_id', 0)
-                        channel.own_id = dmr_data.get('own_id', 0)
-                        channel.call_format = dmr_data.get('call_type', 1)  # 0=Private, 1=Group, 2=All
-                        logger.debug(f"Channel {channel_index} DMR data: CC={channel.rx_cc}, Slot={channel.slot}, callType={channel.call_format}")
-                    except Exception as e:
-                        logger.warning(f"Channel {channel_index} DMR read failed: {e}")
+                if channel.rx_mode == Mode.DMR and not self._read_dmr_into(channel):
+                    raise DMRReadError(f"Channel {channel_index} DMR data read failed", channel)
                 
+                self.metrics.record_channel()
                 return channel
                 
             except (CommunicationError, TimeoutError, CRCError) as e:
@@ -944,21 +1334,46 @@ class PMR171Radio:
                 logger.warning(f"Channel {channel_index} read attempt {attempt + 1}/{max_retries} failed: {e}")
                 
                 # Clear buffer and wait before retry
-                if self._serial:
-                    time.sleep(0.2)  # Extra settling time
-                    if self._serial.in_waiting > 0:
-                        stale = self._serial.read(self._serial.in_waiting)
-                        logger.debug(f"Cleared {len(stale)} bytes before retry")
-                
-                if attempt < max_retries - 1:
-                    # Wait longer before each subsequent retry
-                    time.sleep(0.3 * (attempt + 1))
+                if not self._retry_wait(Command.CHANNEL_READ, attempt, max_retries, channel_index, e, started):
+                    break
         
         # All retries exhausted
-        logger.error(f"Channel {channel_index} read failed after {max_retries} attempts: {last_error}")
+        logger.error(f"Channel {channel_index} read failed after {attempt + 1} attempts: {last_error}")
         raise last_error
     
-    def write_channel(self, channel: ChannelData, max_retries: int = 10) -> bool:
+    def _read_dmr_into(self, channel: ChannelData) -> bool:
+        """
+        Read DMR-specific data (0x44) for a channel and merge it in place.
+        
+        Args:
+            channel: DMR channel to update
+            
+        Returns:
+            True if the DMR data was read, False if the read failed
+        """
+        try:
+            dmr_data = self.read_dmr_data(channel.index)
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Channel {channel.index} DMR read failed: {e}")
+            return False
+        
+        self._apply_dmr_data(channel, dmr_data)
+        return True
+    
+    def _apply_dmr_data(self, channel: ChannelData, dmr_data: dict) -> None:
+        """Merge fields parsed by parse_dmr_data_packet into a channel"""
+        channel.rx_cc = dmr_data.get('rx_cc', 1)
+        channel.tx_cc = dmr_data.get('tx_cc', 1)
+        channel.slot = dmr_data.get('slot', 1)
+        channel.call_id = dmr_data.get('call_id', 0)
+        channel.own_id = dmr_data.get('own_id', 0)
+        channel.call_format = dmr_data.get('call_type', 1)  # 0=Private, 1=Group, 2=All
+        logger.debug(f"Channel {channel.index} DMR data: CC={channel.rx_cc}, Slot={channel.slot}, callType={channel.call_format}")
+    
+    def write_channel(self, channel: ChannelData, max_retries: int = None,
+                      packet: bytes = None, dmr_packet: bytes = None) -> bool:
         """
         Write a single channel to the radio with automatic retry on failure.
         
@@ -967,10 +1382,13 @@ class PMR171Radio:
         
         Args:
             channel: ChannelData to write
-            max_retries: Maximum number of retry attempts (default 10)
+            max_retries: Maximum number of attempts (default: retry_policy.max_attempts)
+            packet: Pre-encoded 0x40 packet for channel (built if omitted)
+            dmr_packet: Pre-encoded 0x43 packet for channel (built if omitted)
             
         Returns:
-            True if successful
+            True if successful; False if either block failed, including a
+            DMR channel whose 0x40 block was written but whose 0x43 was not
             
         Note:
             The radio requires time to commit data to flash memory after receiving
@@ -983,109 +1401,226 @@ class PMR171Radio:
             automatic retry with increasing delays to handle such cases gracefully.
         """
         last_error = None
+        if packet is None:
+            packet = build_channel_packet(channel, Command.CHANNEL_WRITE)
+        sent = parse_packet(packet)[1]
         
+        max_retries = self._attempts(max_retries)
+        started = time.time()
         for attempt in range(max_retries):
             try:
                 # Clear any stale data from input buffer before sending write
-                if self._serial and self._serial.in_waiting > 0:
-                    stale = self._serial.read(self._serial.in_waiting)
-                    logger.debug(f"Cleared {len(stale)} stale bytes before write")
-                
-                # Wake the radio by sending a read command first
-                # This ensures the radio is in programming mode right before the write
-                logger.debug(f"Pre-write wake: reading channel {channel.index} first...")
-                try:
-                    # Send read command to wake/keep radio in programming mode
-                    read_data = struct.pack('>H', channel.index)
-                    read_packet = build_packet(Command.CHANNEL_READ, read_data)
-                    self._serial.write(read_packet)
-                    self._serial.flush()
-                    time.sleep(0.15)
-                    # Wait for and consume the read response properly
-                    for _ in range(10):
-                        if self._serial.in_waiting > 0:
-                            response_data = self._serial.read(self._serial.in_waiting)
-                            if PACKET_HEADER in response_data:
-                                logger.debug(f"Pre-write wake: got valid response ({len(response_data)} bytes)")
-                                break
-                        time.sleep(0.02)
-                except Exception as e:
-                    logger.debug(f"Pre-write wake failed (continuing anyway): {e}")
+                stale = self._clear_input()
+                if stale:
+                    logger.debug(f"Cleared {stale} stale bytes before write")
                 
-                packet = build_channel_packet(channel, Command.CHANNEL_WRITE)
-                self._send_packet(packet)
+                # Wake the radio with a read first unless the programming session
+                # is still active (see session.py)
+                if self.session.needs_wake():
+                    self._pre_write_wake(channel.index)
                 
                 # Read response immediately - no delay needed
                 # The radio echoes back the write packet
-                response = self._receive_packet()
+                response = self._exchange(packet, Command.CHANNEL_WRITE)
                 cmd, payload, _ = parse_packet(response)
                 
                 # Verify the write by checking response
                 if cmd == Command.CHANNEL_WRITE:
+                    self._check_echo(sent, payload, channel.index, "write")
                     if attempt > 0:
                         logger.info(f"Channel {channel.index} write succeeded on retry {attempt + 1}")
+                    self._cache_channel(sent)
                     
                     # For DMR channels, also write DMR-specific data
                     if channel.rx_mode == Mode.DMR:
-                        dmr_success = self.write_dmr_data(channel)
+                        dmr_success = self.write_dmr_data(channel, packet=dmr_packet)
                         if not dmr_success:
+                            # The channel block is written but the slot is not
+                            # complete, so the write as a whole failed
                             logger.warning(f"Channel {channel.index} DMR data write failed")
-                            # Continue anyway - basic channel is written
+                            return False
                     
+                    self.metrics.record_channel()
                     return True
                 else:
                     logger.warning(f"Channel {channel.index} write got unexpected response: cmd=0x{cmd:02X}")
+                    self.session.expire()
                     
             except (CommunicationError, TimeoutError, CRCError) as e:
                 last_error = e
                 logger.warning(f"Channel {channel.index} write attempt {attempt + 1}/{max_retries} failed: {e}")
+                self.session.expire()  # Wake before the next attempt
                 
                 # Clear buffer and wait before retry
-                if self._serial:
-                    time.sleep(0.2)  # Extra settling time
-                    if self._serial.in_waiting > 0:
-                        stale = self._serial.read(self._serial.in_waiting)
-                        logger.debug(f"Cleared {len(stale)} bytes before retry")
-                
-                if attempt < max_retries - 1:
-                    # Wait longer before each subsequent retry
-                    time.sleep(0.3 * (attempt + 1))
+                if not self._retry_wait(Command.CHANNEL_WRITE, attempt, max_retries, channel.index, e, started):
+                    break
         
         # All retries exhausted
-        logger.error(f"Channel {channel.index} write failed after {max_retries} attempts: {last_error}")
+        logger.error(f"Channel {channel.index} write failed after {attempt + 1} attempts: {last_error}")
         return False
     
-    def read_dmr_data(self, channel_index: int, max_retries: int = 10) -> dict:
+    def _pre_write_wake(self, channel_index: int) -> Optional[bytes]:
+        """
+        Send a CHANNEL_READ for the slot about to be written and consume the
+        response, putting the radio (back) into programming mode.
+        
+        Args:
+            channel_index: Channel about to be written
+            
+        Returns:
+            The read response packet, or None if the radio did not answer
+        """
+        logger.debug(f"Pre-write wake: reading channel {channel_index} first...")
+        try:
+            # Send read command to wake/keep radio in programming mode
+            read_data = struct.pack('>H', channel_index)
+            read_packet = build_packet(Command.CHANNEL_READ, read_data)
+            sent_at = time.time()
+            self.transport.write(read_packet)
+            self.transport.flush()
+            self.metrics.record_wake()
+            # Wait for and consume the read response properly
+            wake_timeout = min(PRE_WRITE_WAKE_TIMEOUT,
+                               self.timing.response_timeout(Command.CHANNEL_READ))
+            wake_response = self._wait_packet(wake_timeout)
+            if wake_response is not None:
+                self._record_rtt(Command.CHANNEL_READ, time.time() - sent_at)
+                self.session.touch()
+                logger.debug(f"Pre-write wake: got valid response ({len(wake_response)} bytes)")
+            # Anything after the wake response is stale
+            self._clear_input()
+            return wake_response
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Pre-write wake failed (continuing anyway): {e}")
+            return None
+    
+    def _readback_matches(self, channel: ChannelData, packet: bytes = None,
+                          dmr_packet: bytes = None) -> Tuple[bool, bool]:
+        """
+        Read back the slot about to be written and compare it byte-for-byte
+        with the payloads that would be sent.
+        
+        The readback also serves as the pre-write wake, so the write that
+        may follow goes straight to CHANNEL_WRITE.
+        
+        Args:
+            channel: ChannelData about to be written
+            packet: Pre-encoded 0x40 packet for channel (built if omitted)
+            dmr_packet: Pre-encoded 0x43 packet for channel (built if omitted)
+            
+        Returns:
+            Tuple of (channel block matches, DMR block matches). The DMR
+            block always matches for non-DMR channels. A failed readback
+            counts as a mismatch.
+        """
+        if packet is None:
+            packet = build_channel_packet(channel, Command.CHANNEL_WRITE)
+        _, channel_payload, _ = parse_packet(packet)
+        index_data = struct.pack('>H', channel.index)
+        
+        try:
+            self._clear_input()
+            response = self._exchange(build_packet(Command.CHANNEL_READ, index_data), Command.CHANNEL_READ)
+            cmd, payload, _ = parse_packet(response)
+        except (CommunicationError, TimeoutError, CRCError) as e:
+            logger.debug(f"Channel {channel.index} readback failed, writing anyway: {e}")
+            self._clear_input()
+            return False, False
+        
+        channel_matches = cmd == Command.CHANNEL_READ and payload == channel_payload
+        if cmd == Command.CHANNEL_READ:
+            self._cache_channel(payload)
+        if not channel_matches and len(payload) >= 26:
+            current = parse_channel_packet(payload)
+            logger.debug(f"Channel {channel.index} differs on radio: {current!r}")
+        
+        if channel.rx_mode != Mode.DMR:
+            return channel_matches, True
+        
+        if dmr_packet is None:
+            dmr_packet = build_dmr_data_packet(channel, Command.DMR_DATA_WRITE)
+        _, dmr_payload, _ = parse_packet(dmr_packet)
+        try:
+            response = self._exchange(build_packet(Command.DMR_DATA_READ, index_data), Command.DMR_DATA_READ)
+            cmd, payload, _ = parse_packet(response)
+        except (CommunicationError, TimeoutError, CRCError) as e:
+            logger.debug(f"Channel {channel.index} DMR readback failed, writing anyway: {e}")
+            self._clear_input()
+            return channel_matches, False
+        
+        if cmd == Command.DMR_DATA_READ:
+            self._cache_dmr(payload)
+        return channel_matches, cmd == Command.DMR_DATA_READ and payload == dmr_payload
+    
+    def write_channel_if_changed(self, channel: ChannelData, max_retries: int = None,
+                                 packet: bytes = None, dmr_packet: bytes = None) -> str:
+        """
+        Write a channel only if the radio does not already hold it.
+        
+        The slot is read back first (0x41, plus 0x44 for DMR channels) and
+        compared byte-for-byte with the packets write_channel would send.
+        Matching blocks are not written, which also skips their flash
+        commit delay.
+        
+        Args:
+            channel: ChannelData to write
+            max_retries: Maximum number of attempts per write (default: retry_policy)
+            packet: Pre-encoded 0x40 packet for channel (built if omitted)
+            dmr_packet: Pre-encoded 0x43 packet for channel (built if omitted)
+            
+        Returns:
+            WRITE_SKIPPED if nothing needed writing, WRITE_WRITTEN if the
+            channel and/or DMR block was written, WRITE_FAILED otherwise
+        """
+        channel_matches, dmr_matches = self._readback_matches(channel, packet, dmr_packet)
+        
+        if channel_matches and dmr_matches:
+            logger.debug(f"Channel {channel.index} unchanged on radio, skipping write")
+            self.metrics.record_channel()
+            return WRITE_SKIPPED
+        
+        if channel_matches:
+            # Only the 0x43 block differs
+            success = self.write_dmr_data(channel, max_retries, packet=dmr_packet)
+        else:
+            success = self.write_channel(channel, max_retries, packet=packet, dmr_packet=dmr_packet)
+        return WRITE_WRITTEN if success else WRITE_FAILED
+    
+    def read_dmr_data(self, channel_index: int, max_retries: int = None) -> dict:
         """
         Read DMR-specific data for a channel using command 0x44.
         
         Args:
             channel_index: Channel number (0-999)
-            max_retries: Maximum number of retry attempts
+            max_retries: Maximum number of attempts (default: retry_policy.max_attempts)
             
         Returns:
             Dictionary with DMR fields (rx_cc, tx_cc, slot, call_id, own_id)
         """
         last_error = None
         
+        max_retries = self._attempts(max_retries)
+        started = time.time()
         for attempt in range(max_retries):
             try:
                 # Clear any stale data
-                if self._serial and self._serial.in_waiting > 0:
-                    stale = self._serial.read(self._serial.in_waiting)
-                    logger.debug(f"Cleared {len(stale)} stale bytes before DMR read")
+                stale = self._clear_input()
+                if stale:
+                    logger.debug(f"Cleared {stale} stale bytes before DMR read")
                 
                 # Build DMR data read request - just the 2-byte channel index
                 data = struct.pack('>H', channel_index)
                 packet = build_packet(Command.DMR_DATA_READ, data)
                 
-                self._send_packet(packet)
-                response = self._receive_packet()
+                response = self._exchange(packet, Command.DMR_DATA_READ)
                 cmd, payload, _ = parse_packet(response)
                 
                 if cmd == Command.DMR_DATA_READ:
                     if attempt > 0:
                         logger.info(f"Channel {channel_index} DMR read succeeded on retry {attempt + 1}")
+                    self._cache_dmr(payload)
                     return parse_dmr_data_packet(payload)
                 else:
                     logger.warning(f"DMR read got unexpected response: cmd=0x{cmd:02X}")
@@ -1094,25 +1629,44 @@ class PMR171Radio:
                 last_error = e
                 logger.warning(f"Channel {channel_index} DMR read attempt {attempt + 1}/{max_retries} failed: {e}")
                 
-                if self._serial:
-                    time.sleep(0.2)
-                    if self._serial.in_waiting > 0:
-                        stale = self._serial.read(self._serial.in_waiting)
-                        logger.debug(f"Cleared {len(stale)} bytes before retry")
-                
-                if attempt < max_retries - 1:
-                    time.sleep(0.3 * (attempt + 1))
+                # Clear buffer and wait before retry
+                if not self._retry_wait(Command.DMR_DATA_READ, attempt, max_retries, channel_index, e, started):
+                    break
         
-        logger.error(f"Channel {channel_index} DMR read failed after {max_retries} attempts: {last_error}")
+        logger.error(f"Channel {channel_index} DMR read failed after {attempt + 1} attempts: {last_error}")
         raise last_error
     
-    def write_dmr_data(self, channel: ChannelData, max_retries: int = 10) -> bool:
+    def _check_echo(self, sent: bytes, echoed: bytes, channel_index: int, what: str) -> None:
+        """
+        Compare the radio's echo of a write with the payload sent.
+        
+        Only active with verify_echo; the radio echoes 0x40 and 0x43 writes
+        unchanged, so any difference means the write was garbled on the way.
+        
+        Raises:
+            EchoMismatchError: If the echoed payload differs from sent
+        """
+        if not self.verify_echo or echoed == sent:
+            return
+        self.metrics.record_echo_mismatch()
+        diff = next((i for i, (a, b) in enumerate(zip(sent, echoed)) if a != b),
+                    min(len(sent), len(echoed)))
+        raise EchoMismatchError(
+            f"Channel {channel_index} {what} echo differs at byte {diff} "
+            f"(sent {sent.hex()}, echoed {echoed.hex()})")
+    
+    def write_dmr_data(self, channel: ChannelData, max_retries: int = None,
+                       packet: bytes = None, wake: bool = False) -> bool:
         """
         Write DMR-specific data for a channel using command 0x43.
         
         Args:
             channel: ChannelData containing DMR settings
-            max_retries: Maximum number of retry attempts
+            max_retries: Maximum number of attempts (default: retry_policy.max_attempts)
+            packet: Pre-encoded 0x43 packet for channel (built if omitted)
+            wake: Send a pre-write wake first if the programming session is
+                idle, as write_channel does. Only needed when the DMR block
+                is written without its channel block.
             
         Returns:
             True if successful
@@ -1120,91 +1674,446 @@ class PMR171Radio:
         last_error = None
         
         logger.info(f"write_dmr_data ch{channel.index}: CC={channel.rx_cc}/{channel.tx_cc}, slot={channel.slot}, TG={channel.call_id}, ownID={channel.own_id}")
+        if packet is None:
+            packet = build_dmr_data_packet(channel, Command.DMR_DATA_WRITE)
+        sent = parse_packet(packet)[1]
         
+        max_retries = self._attempts(max_retries)
+        started = time.time()
         for attempt in range(max_retries):
             try:
                 # Clear any stale data
-                if self._serial and self._serial.in_waiting > 0:
-                    stale = self._serial.read(self._serial.in_waiting)
-                    logger.debug(f"Cleared {len(stale)} stale bytes before DMR write")
+                stale = self._clear_input()
+                if stale:
+                    logger.debug(f"Cleared {stale} stale bytes before DMR write")
                 
-                packet = build_dmr_data_packet(channel, Command.DMR_DATA_WRITE)
-                logger.debug(f"DMR packet (hex): {packet.hex()}")
-                self._send_packet(packet)
+                if wake and self.session.needs_wake():
+                    self._pre_write_wake(channel.index)
                 
-                # Wait for radio to commit
-                base_delay = 0.15
-                retry_delay = base_delay + (attempt * 0.1)
-                time.sleep(retry_delay)
+                logger.debug(f"DMR packet (hex): {packet.hex()}")
                 
-                # Wait for acknowledgment
-                response = self._receive_packet()
+                # Wait for radio to commit, then for acknowledgment. The
+                # commit delay is a fixed flash-write time, not a round trip,
+                # so it is neither learned nor overlapped with the ack.
+                response = self._exchange(packet, Command.DMR_DATA_WRITE,
+                                          settle=DMR_COMMIT_DELAY + attempt * DMR_COMMIT_STEP)
                 cmd, payload, _ = parse_packet(response)
                 
                 if cmd == Command.DMR_DATA_WRITE:
+                    self._check_echo(sent, payload, channel.index, "DMR write")
                     if attempt > 0:
                         logger.info(f"Channel {channel.index} DMR write succeeded on retry {attempt + 1}")
+                    self._cache_dmr(sent)
                     return True
                 else:
                     logger.warning(f"DMR write got unexpected response: cmd=0x{cmd:02X}")
+                    self.session.expire()
                     
             except (CommunicationError, TimeoutError, CRCError) as e:
                 last_error = e
                 logger.warning(f"Channel {channel.index} DMR write attempt {attempt + 1}/{max_retries} failed: {e}")
+                self.session.expire()  # Wake before the next write
                 
-                if self._serial:
-                    time.sleep(0.2)
-                    if self._serial.in_waiting > 0:
-                        stale = self._serial.read(self._serial.in_waiting)
-                        logger.debug(f"Cleared {len(stale)} bytes before retry")
-                
-                if attempt < max_retries - 1:
-                    time.sleep(0.3 * (attempt + 1))
+                # Clear buffer and wait before retry
+                if not self._retry_wait(Command.DMR_DATA_WRITE, attempt, max_retries, channel.index, e, started):
+                    break
         
-        logger.error(f"Channel {channel.index} DMR write failed after {max_retries} attempts: {last_error}")
+        logger.error(f"Channel {channel.index} DMR write failed after {attempt + 1} attempts: {last_error}")
         return False
     
+    def _pipeline_requests(self,
+                           command: int,
+                           indices: List[int],
+                           on_response: Callable[[int, bytes], None],
+                           on_failure: Callable[[int], None] = None,
+                           cancel_check: Callable[[], bool] = None,
+                           max_retries: int = None,
+                           window: int = None) -> bool:
+        """
+        Send indexed read requests with up to read_window in flight.
+        
+        Responses are matched back to their request by the big-endian channel
+        index at the start of the 26-byte payload, so they may arrive in any
+        order. A slot whose response does not arrive within the timeout is
+        re-requested on its own; the other slots in flight are unaffected.
+        A CRC error re-requests the oldest slot in flight at once if it has
+        been waiting longer than the smoothed RTT of this read, since the
+        corrupted frame was most likely its response.
+        
+        The window starts at read_window, halves on every CRC error or
+        timeout, and grows back by one after a full window of clean
+        responses, so a radio that cannot keep up degrades to one request
+        per round trip instead of failing.
+        
+        Args:
+            command: Read command (CHANNEL_READ or DMR_DATA_READ)
+            indices: Channel numbers to request
+            on_response: Called with (index, payload) for every response
+            on_failure: Optional, called with the index of a slot that ran out of retries
+            cancel_check: Optional callback that returns True if operation should be cancelled
+            max_retries: Maximum requests sent per channel (default: retry_policy.max_attempts)
+            window: Requests kept in flight (default read_window)
+            
+        Returns:
+            True if every slot was answered or gave up, False if cancelled
+        """
+        max_retries = self._attempts(max_retries)
+        pending = deque(indices)
+        in_flight: Dict[int, float] = {}  # channel index -> time request sent
+        attempts: Dict[int, int] = {}
+        slot_timeout = self.timeout * 2
+        srtt: Optional[float] = None  # Smoothed RTT of the responses so far
+        
+        max_window = window or self.read_window
+        window = max_window
+        clean_streak = 0
+        
+        def shrink(reason: str) -> None:
+            nonlocal window, clean_streak
+            clean_streak = 0
+            if window > 1:
+                window = max(1, window // 2)
+                logger.debug(f"Pipelined read: {reason}, window reduced to {window}")
+        
+        def requeue(channel_index: int, reason: str) -> None:
+            # Re-request a slot that was taken out of in_flight, or give up on it
+            if attempts[channel_index] < max_retries:
+                self.metrics.record_retry(command, channel_index)
+                self._emit(CHANNEL_RETRIED, channel=channel_index,
+                           attempt=attempts[channel_index], message=reason)
+                logger.warning(f"Channel {channel_index} read attempt {attempts[channel_index]}/{max_retries}: {reason}")
+                pending.appendleft(channel_index)
+            else:
+                logger.error(f"Channel {channel_index} read failed after {max_retries} attempts")
+                if on_failure:
+                    on_failure(channel_index)
+        
+        stale = self._clear_input()
+        if stale:
+            logger.debug(f"Cleared {stale} stale bytes before pipelined read")
+        
+        try:
+            while pending or in_flight:
+                if self._cancel_requested(cancel_check):
+                    return False
+        
+                # Keep the window full
+                while pending and len(in_flight) < window:
+                    channel_index = pending.popleft()
+                    attempts[channel_index] = attempts.get(channel_index, 0) + 1
+                    if attempts[channel_index] == 1:
+                        self._emit(CHANNEL_STARTED, channel=channel_index)
+                    packet = build_packet(command, struct.pack('>H', channel_index))
+                    self._send_packet(packet)
+                    in_flight[channel_index] = time.time()
+        
+                self._read_into_framer(block=True)
+        
+                for kind, frame in self._framer.frames():
+                    if kind == PacketFramer.CRC_ERROR:
+                        self.metrics.record_crc_error()
+                        shrink("CRC error")
+                        # Don't leave the slot the garbled frame was meant for
+                        # waiting out slot_timeout
+                        if in_flight and srtt is not None:
+                            oldest = min(in_flight, key=in_flight.get)
+                            if time.time() - in_flight[oldest] > srtt:
+                                del in_flight[oldest]
+                                requeue(oldest, "CRC error")
+                        continue
+                    if kind != PacketFramer.PACKET:
+                        self.metrics.record_noise(len(frame))
+                        continue
+        
+                    cmd, payload, _ = parse_packet(frame)
+                    if cmd != command or len(payload) < 26:
+                        continue  # Request echo or unrelated packet
+        
+                    channel_index = struct.unpack_from('>H', payload)[0]
+                    if channel_index not in in_flight:
+                        continue  # Late duplicate of a retransmitted slot
+        
+                    rtt = time.time() - in_flight.pop(channel_index)
+                    self.metrics.record_rtt(command, rtt)
+                    srtt = rtt if srtt is None else srtt + TimingController.ALPHA * (rtt - srtt)
+                    self.session.touch()
+                    if attempts[channel_index] > 1:
+                        logger.info(f"Channel {channel_index} read succeeded on retry {attempts[channel_index]}")
+                    on_response(channel_index, payload)
+        
+                    clean_streak += 1
+                    if clean_streak >= window and window < max_window:
+                        window += 1
+                        clean_streak = 0
+        
+                # Selectively re-request slots whose response is overdue
+                now = time.time()
+                for channel_index, sent_at in list(in_flight.items()):
+                    if now - sent_at < slot_timeout:
+                        continue
+                    del in_flight[channel_index]
+                    shrink(f"channel {channel_index} timed out")
+                    self.metrics.record_timeout()
+                    requeue(channel_index, "timeout")
+        except OperationCancelledError:
+            return False
+        finally:
+            # Responses for abandoned requests must not leak into the next command
+            self._clear_input()
+        
+        return True
+    
+    def _read_channels_pipelined(self,
+                                 channel_indices: List[int],
+                                 progress_callback: Callable[[int, int, str], None] = None,
+                                 cancel_check: Callable[[], bool] = None,
+                                 max_retries: int = None,
+                                 journal=None) -> Dict[int, ChannelData]:
+        """
+        Read channels in two pipelined phases (see _pipeline_requests).
+        
+        Phase 1 reads the 0x41 channel block of every slot. Phase 2 then
+        reads the 0x44 DMR block of the slots that turned out to be DMR
+        channels, again pipelined, and merges it into their ChannelData.
+        DMR-heavy codeplugs no longer pay a second serialized round trip
+        per slot.
+        
+        Progress covers both phases: the total grows by the number of DMR
+        channels once phase 1 is done. The duration of each phase is
+        recorded in timing.phases().
+        
+        Args:
+            channel_indices: Channel numbers to read
+            progress_callback: Optional callback(current, total, message)
+            cancel_check: Optional callback that returns True if operation should be cancelled
+            max_retries: Maximum requests sent per channel (default: retry_policy.max_attempts)
+            journal: Optional SessionJournal; each channel is confirmed once
+                complete (after its DMR block, for DMR channels)
+            
+        Returns:
+            Dictionary mapping channel index to ChannelData for every
+            channel that was read
+        """
+        if not self.is_connected:
+            raise CommunicationError("Not connected to radio")
+        
+        total = len(channel_indices)
+        results: Dict[int, ChannelData] = {}
+        breaker = self.retry_policy.breaker()
+        
+        def channel_block(channel_index: int, payload: bytes) -> None:
+            channel = results[channel_index] = parse_channel_packet(payload)
+            self._cache_channel(payload)
+            self.metrics.record_channel()
+            self._channel_done(channel_index)
+            breaker.success()
+            if journal is not None and channel.rx_mode != Mode.DMR:
+                journal.confirm(channel)
+            if progress_callback:
+                progress_callback(len(results), total, f"Read channel {channel_index}")
+        
+        def channel_failed(channel_index: int) -> None:
+            if progress_callback:
+                progress_callback(len(results), total, f"Error reading channel {channel_index}: timeout")
+            self._channel_failed(breaker, channel_index)
+        
+        self._start_phase('channel_blocks', total)
+        started = time.time()
+        completed = self._pipeline_requests(Command.CHANNEL_READ, channel_indices, channel_block,
+                                            channel_failed, cancel_check, max_retries)
+        self.timing.record_phase('channel_blocks', time.time() - started, len(results))
+        if not completed:
+            logger.info(f"Pipelined read cancelled with {len(results)}/{total} channels read")
+            if progress_callback:
+                progress_callback(len(results), total, "Cancelled")
+            return results
+        
+        # Phase 2: DMR channels need their 0x44 block as well
+        dmr_indices = [i for i in channel_indices if i in results and results[i].rx_mode == Mode.DMR]
+        if not dmr_indices:
+            return results
+        
+        total += len(dmr_indices)
+        dmr_done = 0
+        
+        def dmr_block(channel_index: int, payload: bytes) -> None:
+            nonlocal dmr_done
+            channel = results[channel_index]
+            self._cache_dmr(payload)
+            self._apply_dmr_data(channel, parse_dmr_data_packet(payload))
+            if journal is not None:
+                journal.confirm(channel)
+            breaker.success()
+            dmr_done += 1
+            self._channel_done(channel_index)
+            if progress_callback:
+                progress_callback(len(results) + dmr_done, total, f"Read DMR data for channel {channel_index}")
+        
+        def dmr_failed(channel_index: int) -> None:
+            logger.warning(f"Channel {channel_index} DMR read failed, keeping default DMR settings")
+            if progress_callback:
+                progress_callback(len(results) + dmr_done, total,
+                                  f"Error reading DMR data for channel {channel_index}: timeout")
+            self._channel_failed(breaker, channel_index)
+        
+        self._start_phase('dmr_blocks', len(dmr_indices))
+        started = time.time()
+        completed = self._pipeline_requests(Command.DMR_DATA_READ, dmr_indices, dmr_block,
+                                            dmr_failed, cancel_check, max_retries)
+        self.timing.record_phase('dmr_blocks', time.time() - started, dmr_done)
+        if not completed:
+            logger.info(f"Pipelined read cancelled with {dmr_done}/{len(dmr_indices)} DMR blocks read")
+            if progress_callback:
+                progress_callback(len(results) + dmr_done, total, "Cancelled")
+        
+        return results
+        
+    def verify_channels(self,
+                        expected,
+                        progress_callback: Callable[[int, int, str], None] = None,
+                        cancel_check: Callable[[], bool] = None,
+                        window: int = None):
+        """
+        Read channels back and compare them byte-for-byte with what was written.
+        
+        All slots are read with the pipelined reader (0x41 first, then 0x44
+        for DMR channels), whatever read_window is, so verifying costs about
+        one extra pipelined read rather than a round trip per channel.
+        
+        Args:
+            expected: Channels as written, or the WriteImage they were written from
+            progress_callback: Optional callback(current, total, message)
+            cancel_check: Optional callback that returns True if operation should be cancelled
+            window: Requests kept in flight (default: read_window, at least
+                PIPELINED_READ_WINDOW)
+            
+        Returns:
+            VerifyReport listing every (slot, field, expected, actual)
+            mismatch; slots that did not answer get field 'missing'
+        """
+        from .verify import (VerifyReport, CHANNEL_FIELDS, DMR_FIELDS,
+                             compare_block, expected_payloads)
+        
+        if not self.is_connected:
+            raise CommunicationError("Not connected to radio")
+        
+        blocks, dmr_blocks = expected_payloads(expected)
+        indices = sorted(blocks)
+        window = window or max(self.read_window, PIPELINED_READ_WINDOW)
+        total = len(indices) + len(dmr_blocks)
+        actual: Dict[int, bytes] = {}
+        actual_dmr: Dict[int, bytes] = {}
+        report = VerifyReport()
+        
+        def received(store: Dict[int, bytes], label: str):
+            def on_response(channel_index: int, payload: bytes) -> None:
+                store[channel_index] = bytes(payload[:26])
+                self._channel_done(channel_index)
+                if progress_callback:
+                    progress_callback(len(actual) + len(actual_dmr), total,
+                                      f"Verifying {label}channel {channel_index}")
+            return on_response
+        
+        self._start_phase('verify', total)
+        started = time.time()
+        completed = self._pipeline_requests(Command.CHANNEL_READ, indices, received(actual, ''),
+                                            cancel_check=cancel_check, window=window)
+        if completed and dmr_blocks:
+            completed = self._pipeline_requests(Command.DMR_DATA_READ, sorted(dmr_blocks),
+                                                received(actual_dmr, 'DMR data for '),
+                                                cancel_check=cancel_check, window=window)
+        self.timing.record_phase('verify', time.time() - started, len(actual) + len(actual_dmr))
+        
+        report.cancelled = not completed
+        for index in indices:
+            if report.cancelled and index not in actual:
+                continue
+            report.checked += 1
+            report.mismatches += compare_block(index, blocks[index], actual.get(index), CHANNEL_FIELDS)
+            if index in dmr_blocks and not (report.cancelled and index not in actual_dmr):
+                report.mismatches += compare_block(index, dmr_blocks[index], actual_dmr.get(index),
+                                                   DMR_FIELDS, prefix='dmr.')
+        
+        logger.info(report.summary(limit=10))
+        if progress_callback:
+            progress_callback(total, total, "Verify cancelled" if report.cancelled else
+                              f"Verify complete: {len(report.mismatched_slots())} channel(s) differ")
+        return report
+    
     def read_all_channels(self, 
                           progress_callback: Callable[[int, int, str], None] = None,
                           include_empty: bool = True,
-                          cancel_check: Callable[[], bool] = None) -> List[ChannelData]:
+                          cancel_check: Callable[[], bool] = None,
+                          journal=None) -> List[ChannelData]:
         """
         Read all channels from the radio.
         
+        When read_window is greater than 1, requests are pipelined
+        (see _read_channels_pipelined).
+        
         Args:
             progress_callback: Optional callback(current, total, message)
             include_empty: If True, include empty channels in result
             cancel_check: Optional callback that returns True if operation should be cancelled
+            journal: Optional SessionJournal recording each channel read (see resume)
             
         Returns:
             List of ChannelData objects
+            
+        Raises:
+            SessionAbortedError: If retry_policy.breaker_threshold channels in a row failed
         """
+        if self.read_window > 1:
+            results = self._read_channels_pipelined(
+                list(range(CHANNEL_COUNT)), progress_callback, cancel_check, journal=journal)
+            return [results[i] for i in range(CHANNEL_COUNT)
+                    if i in results and (include_empty or not results[i].is_empty)]
+        
         channels = []
+        breaker = self.retry_policy.breaker()
+        self._start_phase('read', CHANNEL_COUNT)
         
         for i in range(CHANNEL_COUNT):
             # Check for cancellation before starting each channel
-            if cancel_check and cancel_check():
+            if self._cancel_requested(cancel_check):
                 if progress_callback:
                     progress_callback(i, CHANNEL_COUNT, f"Cancelled at channel {i}")
                 break
             
             if progress_callback:
                 progress_callback(i + 1, CHANNEL_COUNT, f"Reading channel {i}")
+            self._emit(CHANNEL_STARTED, channel=i)
             
             try:
                 channel = self.read_channel(i)
+                breaker.success()
+                self._channel_done(i)
+                if journal is not None:
+                    journal.confirm(channel)
                 if include_empty or not channel.is_empty:
                     channels.append(channel)
+            except DMRReadError as e:
+                # Keep the channel like the pipelined reader, but not as confirmed
+                channels.append(e.channel)
+                if progress_callback:
+                    progress_callback(i + 1, CHANNEL_COUNT, f"Error reading DMR data for channel {i}")
+                self._channel_failed(breaker, i)
+            except OperationCancelledError:
+                if progress_callback:
+                    progress_callback(i, CHANNEL_COUNT, f"Cancelled at channel {i}")
+                break
             except Exception as e:
                 if progress_callback:
                     progress_callback(i + 1, CHANNEL_COUNT, f"Error reading channel {i}: {e}")
+                self._channel_failed(breaker, i)
         
         return channels
     
     def read_selected_channels(self,
                                channel_indices: List[int],
                                progress_callback: Callable[[int, int, str], None] = None,
-                               cancel_check: Callable[[], bool] = None) -> List[ChannelData]:
+                               cancel_check: Callable[[], bool] = None,
+                               journal=None) -> List[ChannelData]:
         """
         Read specific channels from the radio.
         
@@ -1212,18 +2121,31 @@ class PMR171Radio:
             channel_indices: List of channel indices to read
             progress_callback: Optional callback(current, total, message)
             cancel_check: Optional callback that returns True if operation should be cancelled
+            journal: Optional SessionJournal recording each channel read (see resume)
             
         Returns:
             List of ChannelData objects
+            
+        Raises:
+            SessionAbortedError: If retry_policy.breaker_threshold channels in a row failed
         """
         channels = []
         total = len(channel_indices)
         
         logger.info(f"read_selected_channels: {total} channels to read")
         
+        if self.read_window > 1:
+            results = self._read_channels_pipelined(channel_indices, progress_callback, cancel_check,
+                                                    journal=journal)
+            channels = [results[i] for i in channel_indices if i in results]
+            logger.info(f"read_selected_channels: returning {len(channels)} channels")
+            return channels
+        
+        breaker = self.retry_policy.breaker()
+        self._start_phase('read', total)
         for idx, ch_num in enumerate(channel_indices):
             # Check for cancellation before starting each channel
-            if cancel_check and cancel_check():
+            if self._cancel_requested(cancel_check):
                 logger.info(f"Cancelled at channel {ch_num}")
                 if progress_callback:
                     progress_callback(idx, total, f"Cancelled at channel {ch_num}")
@@ -1231,16 +2153,34 @@ class PMR171Radio:
             
             if progress_callback:
                 progress_callback(idx + 1, total, f"Reading channel {ch_num}")
+            self._emit(CHANNEL_STARTED, channel=ch_num)
             
             try:
                 logger.debug(f"Reading channel {ch_num}...")
                 channel = self.read_channel(ch_num)
+                breaker.success()
+                self._channel_done(ch_num)
                 logger.info(f"Channel {ch_num}: {channel.rx_freq_mhz:.6f} MHz, name='{channel.name}'")
                 channels.append(channel)
+                if journal is not None:
+                    journal.confirm(channel)
+            except DMRReadError as e:
+                # Keep the channel like the pipelined reader, but not as confirmed
+                logger.warning(f"{e}, keeping default DMR settings")
+                channels.append(e.channel)
+                if progress_callback:
+                    progress_callback(idx + 1, total, f"Error reading DMR data for channel {ch_num}")
+                self._channel_failed(breaker, ch_num)
+            except OperationCancelledError:
+                logger.info(f"Cancelled at channel {ch_num}")
+                if progress_callback:
+                    progress_callback(idx, total, f"Cancelled at channel {ch_num}")
+                break
             except Exception as e:
                 logger.error(f"Error reading channel {ch_num}: {e}")
                 if progress_callback:
                     progress_callback(idx + 1, total, f"Error reading channel {ch_num}: {e}")
+                self._channel_failed(breaker, ch_num)
         
         logger.info(f"read_selected_channels: returning {len(channels)} channels")
         return channels
@@ -1248,57 +2188,181 @@ class PMR171Radio:
     def write_all_channels(self,
                            channels: List[ChannelData],
                            progress_callback: Callable[[int, int, str], None] = None,
-                           cancel_check: Callable[[], bool] = None) -> int:
+                           cancel_check: Callable[[], bool] = None,
+                           skip_unchanged: bool = False,
+                           journal=None,
+                           image=None) -> int:
         """
         Write all channels to the radio.
         
         Args:
-            channels: List of ChannelData objects to write
+            channels: List of ChannelData objects to write, or a WriteImage
             progress_callback: Optional callback(current, total, message)
             cancel_check: Optional callback that returns True if operation should be cancelled
+            skip_unchanged: Read each slot back first and skip channels the
+                radio already holds (see write_channel_if_changed)
+            journal: Optional SessionJournal recording each channel the
+                radio acknowledged (see resume)
+            image: WriteImage to send the packets of channels from instead
+                of encoding them (see write_image.py); channels it does not
+                hold are encoded as usual
             
         Returns:
-            Number of channels successfully written
+            Number of channels successfully written (including skipped
+            channels when skip_unchanged is set). Written/skipped/failed
+            counts are left in last_write_summary.
+            
+        Raises:
+            SessionAbortedError: If retry_policy.breaker_threshold channels in a row failed
         """
+        from .write_image import WriteImage
+        
         success_count = 0
         total = len(channels)
+        summary = {WRITE_WRITTEN: 0, WRITE_SKIPPED: 0, WRITE_FAILED: 0}
+        self.last_write_summary = summary
+        self.session.reset_counters()
+        breaker = self.retry_policy.breaker()
+        if image is None and isinstance(channels, WriteImage):
+            image = channels
+        self._start_phase('write', total)
         
         for i, channel in enumerate(channels):
             # Check for cancellation before starting each channel
-            if cancel_check and cancel_check():
+            if self._cancel_requested(cancel_check):
                 if progress_callback:
                     progress_callback(i, total, f"Cancelled at channel {channel.index}")
                 break
             
             if progress_callback:
                 progress_callback(i + 1, total, f"Writing channel {channel.index}")
+            self._emit(CHANNEL_STARTED, channel=channel.index)
+            
+            packet = dmr_packet = None
+            if image is not None and channel.index in image:
+                packet, dmr_packet = image.packet(channel.index), image.dmr_packet(channel.index)
             
             try:
-                if self.write_channel(channel):
-                    success_count += 1
+                if skip_unchanged:
+                    result = self.write_channel_if_changed(channel, packet=packet, dmr_packet=dmr_packet)
+                else:
+                    success = self.write_channel(channel, packet=packet, dmr_packet=dmr_packet)
+                    result = WRITE_WRITTEN if success else WRITE_FAILED
+            except OperationCancelledError:
+                # The slot may be half-written; it is left unconfirmed in the journal
+                if progress_callback:
+                    progress_callback(i, total, f"Cancelled at channel {channel.index}")
+                break
             except Exception as e:
+                result = WRITE_FAILED
                 if progress_callback:
                     progress_callback(i + 1, total, f"Error writing channel {channel.index}: {e}")
+            
+            summary[result] += 1
+            if result == WRITE_FAILED:
+                self._channel_failed(breaker, channel.index)
+            else:
+                breaker.success()
+                self._channel_done(channel.index)
+                success_count += 1
+                if journal is not None:
+                    journal.confirm(channel)
+            if skip_unchanged and progress_callback:
+                progress_callback(i + 1, total,
+                                  f"Channel {channel.index} {result} "
+                                  f"({summary[WRITE_WRITTEN]} written, {summary[WRITE_SKIPPED]} unchanged)")
         
+        if skip_unchanged:
+            logger.info(f"Skip-unchanged write: {summary[WRITE_WRITTEN]} written, "
+                        f"{summary[WRITE_SKIPPED]} unchanged, {summary[WRITE_FAILED]} failed")
+        logger.info(f"Keepalive: {self.session.wakes_sent} pre-write wakes sent, "
+                    f"{self.session.wakes_avoided} avoided")
         return success_count
     
     def write_selected_channels(self,
                                 channels: List[ChannelData],
                                 progress_callback: Callable[[int, int, str], None] = None,
-                                cancel_check: Callable[[], bool] = None) -> int:
+                                cancel_check: Callable[[], bool] = None,
+                                skip_unchanged: bool = False,
+                                journal=None,
+                                image=None) -> int:
         """
         Write specific channels to the radio.
         
         Args:
-            channels: List of ChannelData objects to write
+            channels: List of ChannelData objects to write, or a WriteImage
             progress_callback: Optional callback(current, total, message)
             cancel_check: Optional callback that returns True if operation should be cancelled
+            skip_unchanged: Skip channels the radio already holds
+            journal: Optional SessionJournal recording each channel the
+                radio acknowledged (see resume)
+            image: WriteImage to send the packets of channels from instead
+                of encoding them (see write_image.py)
             
         Returns:
             Number of channels successfully written
         """
         # Same implementation as write_all_channels but with explicit naming for clarity
-        return self.write_all_channels(channels, progress_callback, cancel_check)
+        return self.write_all_channels(channels, progress_callback, cancel_check, skip_unchanged,
+                                       journal=journal, image=image)
+    
+    def resume(self,
+               journal_path: str,
+               progress_callback: Callable[[int, int, str], None] = None,
+               cancel_check: Callable[[], bool] = None):
+        """
+        Continue an interrupted read or write session from its journal.
+        
+        Only slots without a confirmation are processed. Before and after
+        that, an integrity pass over the journal file withdraws confirm
+        records that were damaged or altered (and processes those slots
+        again). The journal is marked complete once every slot is confirmed
+        and intact.
+        
+        Args:
+            journal_path: Path of the session journal (.jsonl)
+            progress_callback: Optional callback(current, total, message)
+            cancel_check: Optional callback that returns True if operation should be cancelled
+            
+        Returns:
+            READ sessions: list of every channel read so far, in session order.
+            WRITE sessions: number of channels confirmed written.
+        """
+        from .journal import SessionJournal
+        
+        journal = SessionJournal.open(journal_path)
+        logger.info(f"Resuming {journal.operation} session {journal.path}: "
+                    f"{len(journal.confirmed)}/{len(journal.indices)} confirmed")
+        
+        # Second pass is the final integrity check (and one more try at
+        # anything that failed in the first)
+        for _ in range(2):
+            for index in journal.integrity_check():
+                logger.warning(f"Journal entry for channel {index} is damaged, redoing it")
+                journal.discard(index)
+            
+            pending = journal.pending()
+            if not pending or self._cancel_requested(cancel_check):
+                break
+            
+            cancels = self.metrics.cancellations
+            if journal.operation == SessionJournal.READ:
+                self.read_selected_channels(pending, progress_callback, cancel_check, journal=journal)
+            else:
+                self.write_all_channels(journal.pending_targets(), progress_callback, cancel_check,
+                                        journal=journal)
+            if self.metrics.cancellations != cancels:
+                break
+        
+        if not journal.pending() and not journal.integrity_check():
+            journal.finish()
+            logger.info(f"Session {journal.path} complete")
+        else:
+            logger.warning(f"Session {journal.path} still has {len(journal.pending())} unconfirmed channels")
+        
+        if journal.operation == SessionJournal.READ:
+            return journal.channels()
+        return len(journal.confirmed)
     
     def read_codeplug(self, 
                       progress_callback: Callable[[int, int, str], None] = None) -> Dict[str, Dict]:
@@ -1321,25 +2385,229 @@ class PMR171Radio:
     
     def write_codeplug(self,
                        codeplug: Dict[str, Dict],
-                       progress_callback: Callable[[int, int, str], None] = None) -> int:
+                       progress_callback: Callable[[int, int, str], None] = None,
+                       skip_unchanged: bool = False) -> int:
         """
         Write a codeplug dictionary to the radio.
         
+        The codeplug is compiled into a WriteImage first, so every packet is
+        encoded once however often it is retried.
+        
         Args:
-            codeplug: Dictionary with channel IDs as keys, channel data dicts as values
+            codeplug: Dictionary with channel IDs as keys, channel data dicts
+                as values, or an already compiled WriteImage
             progress_callback: Optional callback(current, total, message)
+            skip_unchanged: Skip channels the radio already holds
             
         Returns:
             Number of channels successfully written
         """
-        channels = []
-        for ch_id, ch_data in codeplug.items():
-            channels.append(ChannelData.from_dict(ch_data))
+        from .write_image import WriteImage
+        
+        # Sorted by channel index
+        image = codeplug if isinstance(codeplug, WriteImage) else WriteImage.from_codeplug(codeplug)
+        return self.write_all_channels(image.channels, progress_callback,
+                                       skip_unchanged=skip_unchanged, image=image)
+    
+    def port_hwid(self) -> str:
+        """USB hardware ID of the port (the port name if it has none)"""
+        return next((p['hwid'] for p in list_serial_ports() if p['port'] == self.port), '') or self.port
+    
+    def identify(self) -> Dict[str, Any]:
+        """
+        Identify the connected radio, once per connection.
+        
+        Sends 0x27 EQUIPMENT_TYPE, the protocol's identification query. It is
+        not one of the commands that crashed the radio under rapid polling
+        (0x2D/0x2E, see docs/CRITICAL_Command_Crash_Analysis.md), and it is
+        sent at most once between connect() and disconnect(); later calls
+        return the stored answer.
         
-        # Sort by channel index
-        channels.sort(key=lambda c: c.index)
+        Returns:
+            get_radio_info() result
+            
+        Raises:
+            CommunicationError: If the radio did not answer
+        """
+        if self.radio_info is None:
+            info = self.get_radio_info()
+            if not info.get('connected'):
+                raise CommunicationError(f"Radio did not identify itself: {info.get('error')}")
+            self.radio_info = info
+        return self.radio_info
+    
+    def attach_image_cache(self, cache_dir: str = None, radio_info: Dict[str, Any] = None):
+        """
+        Load (or start) the on-disk image cache for the connected radio.
         
-        return self.write_all_channels(channels, progress_callback)
+        The cache is keyed by the port's USB hwid and the radio's
+        equipment-type response, and is updated by every successful read
+        and write from then on. It is saved on disconnect.
+        
+        Args:
+            cache_dir: Directory for cache files (default ~/.pmr171/radio_cache)
+            radio_info: identify() result from an earlier connection to the
+                same radio; the radio is identified if omitted
+            
+        Returns:
+            The attached RadioImageCache
+            
+        Raises:
+            CommunicationError: If the radio cannot be identified. The hwid
+                alone would let every radio on the same cable share a cache.
+        """
+        from .image_cache import RadioImageCache, radio_cache_key
+        
+        hwid = self.port_hwid()
+        if radio_info is not None:
+            if not radio_info.get('connected'):
+                raise CommunicationError("Radio identification failed, not attaching image cache")
+            self.radio_info = radio_info
+        info = self.identify()
+        identity = {'port': self.port, 'hwid': hwid, 'equipment_type': info.get('raw_response', '')}
+        self.image_cache = RadioImageCache.load(radio_cache_key(hwid, info), cache_dir, identity)
+        logger.info(f"Radio image cache {self.image_cache.path}: {len(self.image_cache)} known slots")
+        return self.image_cache
+    
+    def _cache_channel(self, payload: bytes) -> None:
+        if self.image_cache is not None and len(payload) >= 26:
+            self.image_cache.update_channel(payload)
+    
+    def _cache_dmr(self, payload: bytes) -> None:
+        if self.image_cache is not None and len(payload) >= 26:
+            self.image_cache.update_dmr(payload)
+    
+    def _save_image_cache(self) -> None:
+        if self.image_cache is None:
+            return
+        try:
+            self.image_cache.save()
+        except OSError as e:
+            logger.warning(f"Could not save radio image cache: {e}")
+    
+    def start_trace(self, recorder=None):
+        """
+        Record all bytes sent to and received from the radio (see trace.py).
+        
+        Can be called before or after connect(). Tracing costs a slice copy
+        per read/write, so it can stay on for whole programming sessions.
+        
+        Args:
+            recorder: TraceRecorder to append to (default: a new 4 MiB one)
+            
+        Returns:
+            The TraceRecorder; call its dump(path) to save a .pmrtrace file
+        """
+        from .trace import TraceRecorder, TracingTransport
+        
+        transport = self._ensure_transport()
+        if isinstance(transport, TracingTransport):
+            if recorder is not None:
+                transport.recorder = recorder
+            return transport.recorder
+        self.transport = TracingTransport(transport, recorder or TraceRecorder())
+        return self.transport.recorder
+    
+    def stop_trace(self):
+        """
+        Stop recording and remove the trace wrapper from the transport.
+        
+        Returns:
+            The TraceRecorder that was in use, or None if not tracing
+        """
+        from .trace import TracingTransport
+        
+        if not isinstance(self.transport, TracingTransport):
+            return None
+        recorder = self.transport.recorder
+        self.transport = self.transport.inner
+        return recorder
+    
+    def write_changed_channels(self,
+                               channels: List[ChannelData],
+                               progress_callback: Callable[[int, int, str], None] = None,
+                               cancel_check: Callable[[], bool] = None,
+                               verify_samples: int = 0) -> int:
+        """
+        Write only the channels that differ from the cached radio image.
+        
+        Requires attach_image_cache(). Slots the cache does not know are
+        written in full; channels whose DMR settings alone changed only get
+        the 0x43 block.
+        
+        Args:
+            channels: Target channels
+            progress_callback: Optional callback(current, total, message)
+            cancel_check: Optional callback that returns True if operation should be cancelled
+            verify_samples: Number of cached slots to read back first, to
+                catch a radio that was programmed elsewhere (0 to skip)
+            
+        Returns:
+            Number of channels now matching the target (written plus
+            unchanged). Counts are left in last_write_summary.
+        """
+        from .image_cache import plan_writes, verify_image_cache
+        
+        if self.image_cache is None:
+            raise PMR171Error("No radio image cache attached - call attach_image_cache() first")
+        
+        if verify_samples > 0 and len(self.image_cache) > 0:
+            if progress_callback:
+                progress_callback(0, len(channels), f"Verifying {verify_samples} cached channels...")
+            verify_image_cache(self, self.image_cache, verify_samples)
+        
+        plan = plan_writes(channels, self.image_cache)
+        logger.info(f"Delta write plan: {plan.summary()}")
+        
+        summary = {WRITE_WRITTEN: 0, WRITE_SKIPPED: len(plan.unchanged), WRITE_FAILED: 0}
+        self.last_write_summary = summary
+        total = len(plan)
+        
+        writes = [(channel, False) for channel in plan.full] + [(channel, True) for channel in plan.dmr_only]
+        writes.sort(key=lambda item: item[0].index)
+        breaker = self.retry_policy.breaker()
+        self._start_phase('write', len(writes))
+        
+        try:
+            for i, (channel, dmr_only) in enumerate(writes):
+                if self._cancel_requested(cancel_check):
+                    if progress_callback:
+                        progress_callback(i, total, f"Cancelled at channel {channel.index}")
+                    break
+                
+                if progress_callback:
+                    progress_callback(i + 1, total,
+                                      f"Writing channel {channel.index} "
+                                      f"({summary[WRITE_SKIPPED]} unchanged)")
+                self._emit(CHANNEL_STARTED, channel=channel.index)
+                
+                try:
+                    if dmr_only:
+                        success = self.write_dmr_data(channel, wake=True)
+                    else:
+                        success = self.write_channel(channel)
+                except OperationCancelledError:
+                    self.image_cache.invalidate(channel.index)
+                    if progress_callback:
+                        progress_callback(i, total, f"Cancelled at channel {channel.index}")
+                    break
+                except Exception as e:
+                    success = False
+                    if progress_callback:
+                        progress_callback(i + 1, total, f"Error writing channel {channel.index}: {e}")
+                
+                summary[WRITE_WRITTEN if success else WRITE_FAILED] += 1
+                if not success:
+                    # The slot is in an unknown state now
+                    self.image_cache.invalidate(channel.index)
+                    self._channel_failed(breaker, channel.index)
+                else:
+                    breaker.success()
+                    self._channel_done(channel.index)
+        finally:
+            self._save_image_cache()
+        
+        return summary[WRITE_WRITTEN] + summary[WRITE_SKIPPED]
     
     def get_radio_info(self) -> Dict[str, Any]:
         """
@@ -1367,16 +2635,24 @@ class PMR171Radio:
         """
         Get current radio status.
         
+        To follow the status continuously, use a StatusMonitor (status.py)
+        rather than calling this in a loop.
+        
         Returns:
-            Dictionary with status information
+            Dictionary with status information; the fields the reply shares
+            with the idle status stream are decoded (see status.py)
         """
+        from .status import STATUS_BODY_SIZE, decode_status_sync
+        
         try:
             payload = self.send_command(Command.STATUS_SYNC)
-            # Parse status response - contains frequencies, modes, etc.
-            return {
+            status = {
                 'raw_response': payload.hex(),
                 'status': 'connected'
             }
+            if len(payload) >= STATUS_BODY_SIZE:
+                status.update(decode_status_sync(payload).to_dict())
+            return status
         except Exception as e:
             return {
                 'error': str(e),
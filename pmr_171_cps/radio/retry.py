@@ -0,0 +1,143 @@
+"""
+Retry policy for the PMR-171 UART drivers.
+
+Every per-channel operation used to retry max_retries=10 times with a
+linear 0.3 s * (attempt + 1) backoff, so a radio that had stopped
+answering cost over 16 s per slot and a full read ground through all 1000
+slots before giving up.
+
+RetryPolicy gathers those decisions in one object shared by all operations:
+
+    max_attempts       attempts per channel operation
+    backoff            exponential (base * factor ** attempt, capped at
+                       max_backoff) with +/- jitter, so retries of several
+                       radios do not fall into lock step
+    crc_backoff        a CRC error means the radio answered, only garbled:
+                       retry almost at once instead of backing off
+    deadline           seconds one channel operation may spend in total
+    breaker_threshold  consecutive failed channels after which a bulk
+                       read/write is aborted (CircuitBreaker)
+
+With adaptive timing the backoff is additionally capped by the measured
+round-trip time (see TimingController.backoff_delay).
+
+Example:
+    >>> policy = RetryPolicy(max_attempts=5, deadline=3.0, breaker_threshold=3)
+    >>> radio = PMR171Radio('COM6', retry_policy=policy)
+"""
+
+import random
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+
+# Error classes a retry decision depends on
+ERROR_CRC = 'crc'          # Complete packet with a bad CRC
+ERROR_TIMEOUT = 'timeout'  # No (complete) response in time
+ERROR_OTHER = 'other'      # Unexpected response, I/O error
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How failed channel operations are retried.
+
+    Args:
+        max_attempts: Attempts per channel operation (first try included)
+        base_backoff: Backoff after the first failed attempt (seconds)
+        backoff_factor: Growth of the backoff per further attempt
+        max_backoff: Upper bound for a single backoff (seconds)
+        jitter: Random spread applied to every backoff, as a fraction
+            (0.2 = +/- 20 %)
+        crc_backoff: Backoff after a CRC error (seconds)
+        deadline: Seconds one channel operation may take including all
+            retries (None for no limit)
+        breaker_threshold: Consecutive failed channels that abort a bulk
+            operation (None or 0 to never abort)
+    """
+    max_attempts: int = 10
+    base_backoff: float = 0.1
+    backoff_factor: float = 2.0
+    max_backoff: float = 2.0
+    jitter: float = 0.2
+    crc_backoff: float = 0.02
+    deadline: Optional[float] = None
+    breaker_threshold: Optional[int] = 10
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if self.deadline is not None and self.deadline <= 0:
+            raise ValueError("deadline must be positive (or None)")
+
+    def backoff(self, attempt: int, error: str = ERROR_TIMEOUT) -> float:
+        """
+        Delay before retrying after a failed attempt.
+
+        Args:
+            attempt: Zero-based number of the attempt that failed
+            error: ERROR_CRC, ERROR_TIMEOUT or ERROR_OTHER
+
+        Returns:
+            Seconds to wait (jitter included)
+        """
+        if error == ERROR_CRC:
+            delay = self.crc_backoff
+        else:
+            delay = min(self.max_backoff, self.base_backoff * self.backoff_factor ** attempt)
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+    def out_of_time(self, elapsed: float, next_delay: float = 0.0) -> bool:
+        """
+        True if an operation that has run for elapsed seconds may not retry.
+
+        Args:
+            elapsed: Seconds spent on the operation so far
+            next_delay: Backoff that would precede the next attempt
+        """
+        return self.deadline is not None and elapsed + next_delay >= self.deadline
+
+    def breaker(self) -> 'CircuitBreaker':
+        """New circuit breaker for one bulk operation"""
+        return CircuitBreaker(self.breaker_threshold)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RetryPolicy':
+        """Build from to_dict() output; unknown keys are ignored"""
+        fields = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in data.items() if key in fields})
+
+
+class CircuitBreaker:
+    """
+    Counts consecutive failed channels of a bulk operation.
+
+    Args:
+        threshold: Consecutive failures that open the breaker (None or 0
+            to never open)
+    """
+
+    def __init__(self, threshold: Optional[int]):
+        self.threshold = threshold
+        self.consecutive = 0
+
+    def success(self) -> None:
+        self.consecutive = 0
+
+    def failure(self) -> bool:
+        """
+        Count a failed channel.
+
+        Returns:
+            True if the operation should be aborted
+        """
+        self.consecutive += 1
+        return self.is_open
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self.threshold) and self.consecutive >= self.threshold
@@ -0,0 +1,90 @@
+"""
+Programming-session keepalive for the PMR-171 UART driver.
+
+The radio streams status frames (84 a9 61 00) until it receives a valid
+programming command, and drops back to streaming after a period without
+one. The driver used to send a CHANNEL_READ "wake" before every write
+attempt to be safe, doubling the packets on the wire for a full codeplug
+write.
+
+ProgrammingSession remembers when the radio last acknowledged a programming
+command. A wake is only needed once the link has been idle for longer than
+idle_threshold, or after a failure has put the session in doubt.
+
+Example:
+    >>> session = ProgrammingSession(idle_threshold=2.0)
+    >>> session.needs_wake()      # True - nothing acknowledged yet
+    >>> session.touch()           # Radio answered a command
+    >>> session.needs_wake()      # False - skip the wake
+    >>> session.stats()
+"""
+
+import time
+from typing import Dict, Any, Optional
+
+# Seconds without an acknowledged command before the radio is woken again
+DEFAULT_IDLE_THRESHOLD = 2.0
+
+
+class ProgrammingSession:
+    """
+    Tracks whether the radio is still in programming mode.
+
+    Args:
+        idle_threshold: Seconds since the last acknowledged command after
+            which a wake is sent. 0 wakes before every write (legacy behavior).
+    """
+
+    def __init__(self, idle_threshold: float = DEFAULT_IDLE_THRESHOLD):
+        self.idle_threshold = idle_threshold
+        self.last_ack: Optional[float] = None
+        self.wakes_sent = 0
+        self.wakes_avoided = 0
+
+    @property
+    def active(self) -> bool:
+        """True if the radio acknowledged a command within idle_threshold"""
+        if self.last_ack is None:
+            return False
+        return time.time() - self.last_ack < self.idle_threshold
+
+    def touch(self) -> None:
+        """Record that the radio just acknowledged a programming command"""
+        self.last_ack = time.time()
+
+    def expire(self) -> None:
+        """Forget the session (after a failure or disconnect) so the next write wakes"""
+        self.last_ack = None
+
+    def needs_wake(self) -> bool:
+        """
+        Decide whether a wake is needed before the next command and count it.
+
+        Returns:
+            True if the caller should send a wake, False if the session is active
+        """
+        if self.active:
+            self.wakes_avoided += 1
+            return False
+        self.wakes_sent += 1
+        return True
+
+    def reset_counters(self) -> None:
+        """Zero the wake counters (e.g. at the start of a bulk write)"""
+        self.wakes_sent = 0
+        self.wakes_avoided = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the session state.
+
+        Returns:
+            Dict with active, idle seconds, idle_threshold, wakes_sent and wakes_avoided
+        """
+        return {
+            'active': self.active,
+            'idle': None if self.last_ack is None else time.time() - self.last_ack,
+            'idle_threshold': self.idle_threshold,
+            'wakes_sent': self.wakes_sent,
+            'wakes_avoided': self.wakes_avoided,
+        }
@@ -0,0 +1,456 @@
+"""
+Spectrum data (0x39) ingest for the PMR-171.
+
+Spectrum frames arrive in the radio's byte stream with their own header:
+
+    7E 7E 7E 7E | 0x39 | Bins (u16, big-endian) | Bins x u8 level | CRC16
+
+The CRC is the protocol's CRC-16-CCITT (crc.py) over the command byte, the
+bin count and the levels. The reply carries 80 or 256 bins
+(SPECTRUM_BIN_COUNTS); a header with any other count is treated as noise.
+analyze_uart_capture.py only counted 7E 7E 7E 7E headers and the archived
+captures contain no spectrum traffic, so the layout after the header is
+provisional until it can be checked against a capture.
+
+SpectrumFramer separates frames from the byte stream (pure Python).
+SpectrumPipeline decodes them into a preallocated NumPy waterfall ring
+buffer and publishes each frame to subscribers. Its reader thread only
+moves bytes from the port into a queue, and a second thread decodes, so
+a slow subscriber delays decoding but never reading: at 115200 baud the
+radio delivers at most ~43 full 256-bin frames per second and none are
+lost. extract_spectrum_frames() pulls every frame out of a whole capture
+(e.g. an Eltima .spm file) in one vectorized pass.
+
+NumPy is optional; SpectrumFramer works without it.
+
+Example:
+    >>> pipeline = SpectrumPipeline('COM6', rows=200)
+    >>> pipeline.subscribe(lambda frame: plot(frame.bins))
+    >>> pipeline.start()
+    ...
+    >>> pipeline.waterfall.rows()        # (frames, 256) uint8, oldest first
+    >>> pipeline.stop()
+
+    >>> offsets, frames = load_spm_spectrum('capture.spm')
+"""
+
+import logging
+import queue
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .crc import crc16_ccitt
+from .pmr171_uart import DEFAULT_BAUDRATE, READ_POLL_INTERVAL, Command
+from .transport import Transport, open_transport
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SPECTRUM_HEADER = bytes([0x7E, 0x7E, 0x7E, 0x7E])
+SPECTRUM_BIN_COUNTS = (80, 256)
+MAX_BINS = max(SPECTRUM_BIN_COUNTS)
+_PREFIX = struct.Struct('>BH')       # Command, bin count
+_BINS_OFFSET = len(SPECTRUM_HEADER) + _PREFIX.size
+SPECTRUM_OVERHEAD = _BINS_OFFSET + 2  # Header, command, bin count and CRC
+
+DEFAULT_WATERFALL_ROWS = 256
+RATE_WINDOW = 64  # Frames the rate estimates span
+
+
+def _require_numpy() -> None:
+    if not NUMPY_AVAILABLE:
+        raise ImportError(
+            "numpy is required for spectrum decoding. "
+            "Install it with: pip install numpy"
+        )
+
+
+def spectrum_frame_size(bin_count: int) -> int:
+    """Bytes on the wire of a frame with bin_count bins"""
+    return SPECTRUM_OVERHEAD + bin_count
+
+
+def build_spectrum_frame(bins: bytes) -> bytes:
+    """
+    Build a spectrum frame (as the radio sends it) from 8-bit bin levels.
+
+    Raises:
+        ValueError: If the bin count is not one of SPECTRUM_BIN_COUNTS
+    """
+    if len(bins) not in SPECTRUM_BIN_COUNTS:
+        raise ValueError(f"Spectrum frames carry {SPECTRUM_BIN_COUNTS} bins, not {len(bins)}")
+    body = _PREFIX.pack(Command.SPECTRUM_DATA, len(bins)) + bytes(bins)
+    return SPECTRUM_HEADER + body + struct.pack('>H', crc16_ccitt(body))
+
+
+class SpectrumFramer:
+    """
+    Incremental spectrum-frame framer.
+
+    Bytes that are not part of a valid frame (programming packets, status
+    frames, corrupted frames) are skipped and counted.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.frames_found = 0
+        self.crc_errors = 0
+        self.noise_bytes = 0
+
+    def __len__(self) -> int:
+        """Number of buffered bytes not yet framed"""
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> None:
+        self._buffer += data
+
+    def reset(self) -> int:
+        discarded = len(self._buffer)
+        self._buffer.clear()
+        return discarded
+
+    def frames(self) -> Iterator[bytes]:
+        """
+        Yield the bin levels of every complete frame buffered.
+
+        A frame that is still incomplete stays buffered until more bytes
+        are fed.
+        """
+        buffer = self._buffer
+        pos = 0
+        try:
+            while True:
+                start = buffer.find(SPECTRUM_HEADER, pos)
+                if start == -1:
+                    # Keep a possible partial header at the end of the buffer
+                    end = len(buffer)
+                    for size in (3, 2, 1):
+                        if buffer.endswith(SPECTRUM_HEADER[:size]):
+                            end -= size
+                            break
+                    self.noise_bytes += max(0, end - pos)
+                    pos = max(pos, end)
+                    return
+                self.noise_bytes += start - pos
+                pos = start
+                if len(buffer) - start < _BINS_OFFSET:
+                    return
+                command, bin_count = _PREFIX.unpack_from(buffer, start + len(SPECTRUM_HEADER))
+                if command != Command.SPECTRUM_DATA or bin_count not in SPECTRUM_BIN_COUNTS:
+                    self.noise_bytes += 1  # Not a frame header (e.g. a run of 7E bytes)
+                    pos = start + 1
+                    continue
+                end = start + spectrum_frame_size(bin_count)
+                if len(buffer) < end:
+                    return
+                with memoryview(buffer) as view:
+                    crc_valid = crc16_ccitt(view[start + len(SPECTRUM_HEADER):end - 2]) == \
+                        (buffer[end - 2] << 8 | buffer[end - 1])
+                if not crc_valid:
+                    self.crc_errors += 1
+                    self.noise_bytes += 1
+                    pos = start + 1  # A real frame may start inside the corrupted one
+                    continue
+                self.frames_found += 1
+                pos = end
+                yield bytes(buffer[start + _BINS_OFFSET:end - 2])
+        finally:
+            del buffer[:pos]
+
+
+@dataclass
+class SpectrumFrame:
+    """One decoded frame as published to subscribers"""
+    sequence: int    # Frames decoded before this one
+    time: float      # time.monotonic() when decoded
+    bins: Any        # numpy uint8 array; a view of the waterfall row,
+                     # overwritten once the ring wraps around
+
+
+class SpectrumWaterfall:
+    """
+    Fixed-size ring buffer of spectrum rows, allocated once.
+
+    Args:
+        rows: Number of frames kept (the oldest is overwritten)
+        bins: Row width (frames with fewer bins fill the start of a row)
+    """
+
+    def __init__(self, rows: int = DEFAULT_WATERFALL_ROWS, bins: int = MAX_BINS):
+        _require_numpy()
+        self.data = np.zeros((rows, bins), dtype=np.uint8)
+        self.times = np.zeros(rows, dtype=np.float64)
+        self.bin_counts = np.zeros(rows, dtype=np.uint16)
+        self._next = 0
+        self.total = 0  # Rows ever pushed
+
+    def __len__(self) -> int:
+        return min(self.total, len(self.data))
+
+    def push(self, bins: bytes, received: float) -> 'np.ndarray':
+        """
+        Store one frame's levels in the next row.
+
+        Returns:
+            View of the stored row, trimmed to the frame's bin count
+        """
+        row = self._next
+        count = min(len(bins), self.data.shape[1])
+        target = self.data[row]
+        target[:count] = np.frombuffer(bins, dtype=np.uint8, count=count)
+        target[count:] = 0
+        self.times[row] = received
+        self.bin_counts[row] = count
+        self._next = (row + 1) % len(self.data)
+        self.total += 1
+        return target[:count]
+
+    def latest(self) -> Optional['np.ndarray']:
+        """Most recent row (view), or None if nothing was pushed"""
+        if not self.total:
+            return None
+        row = (self._next - 1) % len(self.data)
+        return self.data[row, :self.bin_counts[row]]
+
+    def rows(self) -> 'np.ndarray':
+        """Copy of the stored rows, oldest first"""
+        if self.total < len(self.data):
+            return self.data[:self.total].copy()
+        return np.concatenate((self.data[self._next:], self.data[:self._next]))
+
+    def clear(self) -> None:
+        self.data.fill(0)
+        self.times.fill(0)
+        self.bin_counts.fill(0)
+        self._next = 0
+        self.total = 0
+
+
+class SpectrumPipeline:
+    """
+    Streaming spectrum ingest: framer -> waterfall -> subscribers.
+
+    Feed it bytes with ingest(), or let start() read a port. Subscribers
+    run on the decoding thread (or the caller of ingest()).
+
+    Args:
+        port: Serial port name, bridge URL or Transport read by start();
+            None if bytes are only passed to ingest()
+        rows: Waterfall rows kept
+        baudrate: Serial baud rate for a port name (also the line rate
+            stats() reports utilization against)
+
+    Raises:
+        ImportError: If numpy is not installed
+    """
+
+    def __init__(self, port=None, rows: int = DEFAULT_WATERFALL_ROWS,
+                 baudrate: int = DEFAULT_BAUDRATE):
+        _require_numpy()
+        self.port = port
+        self.baudrate = baudrate
+        self.transport: Optional[Transport] = port if isinstance(port, Transport) else None
+        self.framer = SpectrumFramer()
+        self.waterfall = SpectrumWaterfall(rows)
+        self.frames = 0
+        self.bytes = 0
+        self._times = deque(maxlen=RATE_WINDOW)
+        self._subscribers: List[Callable[[SpectrumFrame], None]] = []
+        self._lock = threading.Lock()
+        self._chunks: 'queue.SimpleQueue' = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def subscribe(self, callback: Callable[[SpectrumFrame], None]) -> Callable[[], None]:
+        """
+        Call callback with every decoded SpectrumFrame.
+
+        Returns:
+            Function that removes the subscription
+        """
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._subscribers = [s for s in self._subscribers if s is not callback]
+        return unsubscribe
+
+    def ingest(self, data: bytes) -> int:
+        """
+        Decode bytes from the radio into the waterfall and publish frames.
+
+        Returns:
+            Number of frames decoded from data
+        """
+        self.bytes += len(data)
+        self.framer.feed(data)
+        decoded = 0
+        subscribers = self._subscribers
+        for bins in self.framer.frames():
+            received = time.monotonic()
+            frame = SpectrumFrame(self.frames, received, self.waterfall.push(bins, received))
+            self.frames += 1
+            decoded += 1
+            self._times.append(received)
+            for callback in subscribers:
+                try:
+                    callback(frame)
+                except Exception as e:
+                    logger.warning(f"Spectrum subscriber {callback!r} failed: {e}")
+        return decoded
+
+    @property
+    def frames_per_sec(self) -> float:
+        """Frame rate over the last RATE_WINDOW frames"""
+        if len(self._times) < 2:
+            return 0.0
+        elapsed = self._times[-1] - self._times[0]
+        return (len(self._times) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of the ingest so far"""
+        return {
+            'frames': self.frames,
+            'bytes': self.bytes,
+            'crc_errors': self.framer.crc_errors,
+            'noise_bytes': self.framer.noise_bytes,
+            'frames_per_sec': self.frames_per_sec,
+            'backlog_chunks': self._chunks.qsize(),
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        """
+        Read the port on one background thread and decode on another.
+
+        Raises:
+            ValueError: If the pipeline was created without a port
+        """
+        if self.is_running:
+            return
+        if self.transport is None:
+            if self.port is None:
+                raise ValueError("SpectrumPipeline has no port to read")
+            self.transport = open_transport(self.port, self.baudrate, timeout=READ_POLL_INTERVAL)
+        if not self.transport.is_open:
+            self.transport.open()
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._read, name='pmr171-spectrum-read', daemon=True),
+            threading.Thread(target=self._decode, name='pmr171-spectrum-decode', daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Stop both threads once the bytes already read are decoded"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _read(self) -> None:
+        transport = self.transport
+        try:
+            while not self._stop.is_set():
+                data = transport.read(transport.in_waiting or 1)
+                if data:
+                    self._chunks.put(data)
+        except OSError as e:
+            logger.error(f"Spectrum read failed: {e}")
+        finally:
+            self._chunks.put(None)
+
+    def _decode(self) -> None:
+        while True:
+            data = self._chunks.get()
+            if data is None:
+                return
+            self.ingest(data)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+
+def extract_spectrum_frames(data: bytes, bin_count: int = None) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Extract every spectrum frame from a complete capture.
+
+    Headers are located and the frame bins gathered with array operations
+    over the whole capture; only the CRC check runs per frame.
+
+    Args:
+        data: Raw capture bytes
+        bin_count: Frame size to extract (default: the most common one)
+
+    Returns:
+        (offsets, frames): offset of each frame in data, and a
+        (frames, bin_count) uint8 array of their levels
+
+    Raises:
+        ImportError: If numpy is not installed
+    """
+    _require_numpy()
+    raw = np.frombuffer(data, dtype=np.uint8)
+    empty = (np.zeros(0, dtype=np.int64), np.zeros((0, bin_count or MAX_BINS), dtype=np.uint8))
+    if len(raw) < spectrum_frame_size(min(SPECTRUM_BIN_COUNTS)):
+        return empty
+
+    marker = SPECTRUM_HEADER[0]
+    is_marker = raw == marker
+    run = is_marker[:-3] & is_marker[1:-2] & is_marker[2:-1] & is_marker[3:]
+    starts = np.flatnonzero(run[:len(raw) - _BINS_OFFSET + 1])
+    starts = starts[raw[starts + 4] == Command.SPECTRUM_DATA]
+    counts = raw[starts + 5].astype(np.int64) << 8 | raw[starts + 6]
+
+    if bin_count is None:
+        sizes = [(int(np.count_nonzero(counts == size)), size) for size in SPECTRUM_BIN_COUNTS]
+        found, bin_count = max(sizes)
+        if not found:
+            return empty
+    starts = starts[(counts == bin_count) & (starts + spectrum_frame_size(bin_count) <= len(raw))]
+
+    view = memoryview(data)
+    crc_at = _BINS_OFFSET + bin_count
+    valid = []
+    end = -1
+    for start in starts.tolist():
+        if start < end:
+            continue  # Inside the previous frame
+        stored = view[start + crc_at] << 8 | view[start + crc_at + 1]
+        if crc16_ccitt(view[start + len(SPECTRUM_HEADER):start + crc_at]) == stored:
+            valid.append(start)
+            end = start + crc_at + 2
+
+    offsets = np.array(valid, dtype=np.int64)
+    frames = raw[offsets[:, None] + _BINS_OFFSET + np.arange(bin_count)]
+    return offsets, frames
+
+
+def load_spm_spectrum(path: str, bin_count: int = None) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    extract_spectrum_frames() over a capture file (.spm, .pmrtrace or raw).
+
+    The capture formats keep the serial bytes in order, so the file is
+    scanned as it is, as analyze_uart_capture.py does.
+    """
+    with open(path, 'rb') as f:
+        return extract_spectrum_frames(f.read(), bin_count)
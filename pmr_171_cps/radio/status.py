@@ -0,0 +1,388 @@
+"""
+Decoder and live monitor for the radio's idle status stream.
+
+Outside of programming mode the radio streams fixed-size status frames:
+
+    84 a9 61 00 | 20-byte body
+
+_receive_packet and _wake_radio used to discard them as noise, so the only
+way to follow the radio's state was to poll get_status() (a 0x0B
+STATUS_SYNC round trip) in a loop. StatusDecoder frames the stream in
+bulk - one bytes.find per frame over whatever was read, no per-byte work -
+and decodes each body with a precompiled struct into a RadioStatus.
+
+The body carries the leading fields of the 0x0B reply, in the order
+docs/Pmr171_Protocol.md lists them (VFO A/B mode, VFO A/B frequency, A/B
+selection, NR/NB, RIT, XIT, filter bandwidth, spectrum bandwidth,
+voltage, UTC time, ...), so decode_status_sync() decodes the first 20
+bytes of a STATUS_SYNC payload with the same layout:
+
+    Offset  Field         Size
+    0       VFO A mode    1     Mode value
+    1       VFO B mode    1
+    2       VFO A freq    4     Hz, big-endian
+    6       VFO B freq    4     Hz, big-endian
+    10      A/B select    1     0 = VFO A, 1 = VFO B
+    11      NR/NB         1     bit 0 = NR, bit 1 = NB
+    12      RIT           1     signed offset step
+    13      XIT           1     signed offset step
+    14      Filter BW     1     filter index
+    15      Spectrum BW   1     span index
+    16      Voltage       2     0.1 V, big-endian
+    18      (UTC time)    2     start of the time field, not decoded
+
+The document gives the order but not the field sizes. Only the modes and
+frequencies have been checked against the radio; the sizes of the other
+fields are assumptions. The status bar, S/PO table and SWR/AUD/ALC fields
+come after the UTC time, beyond the 20 bytes, and are not decoded.
+
+StatusMonitor publishes decoded frames as a live feed. It either reads a
+transport on its own thread (radio idle, port not used for programming)
+or is fed the bytes PMR171Radio discards (radio.status_feed), and offers
+callbacks, an async iterator and rate statistics.
+
+Example:
+    >>> monitor = StatusMonitor('COM6')
+    >>> monitor.subscribe(lambda status: print(status.active_freq_hz), changes_only=True)
+    >>> monitor.start()
+    ...
+    >>> monitor.stats.snapshot()['frames_per_sec']
+    >>> monitor.stop()
+
+    >>> async for status in monitor.stream(changes_only=True):
+    ...     dashboard.update(status)
+"""
+
+import asyncio
+import logging
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+from .pmr171_uart import DEFAULT_BAUDRATE, READ_POLL_INTERVAL, Mode
+from .transport import Transport, open_transport
+
+logger = logging.getLogger(__name__)
+
+STATUS_HEADER = bytes.fromhex('84a96100')
+STATUS_BODY_SIZE = 20
+STATUS_FRAME_SIZE = len(STATUS_HEADER) + STATUS_BODY_SIZE
+
+STATUS_LAYOUT = struct.Struct('>BBIIBBbbBBH2x')
+
+RATE_WINDOW = 64             # Frames the frames_per_sec estimate spans
+DEFAULT_STREAM_QUEUE = 256   # Frames an async consumer may fall behind by
+
+
+@dataclass(frozen=True)
+class RadioStatus:
+    """One decoded status frame (fields as in the module docstring)"""
+    vfo_a_mode: int
+    vfo_b_mode: int
+    vfo_a_freq_hz: int
+    vfo_b_freq_hz: int
+    vfo: int
+    nr_nb: int
+    rit: int
+    xit: int
+    filter_bw: int
+    spectrum_bw: int
+    supply_dv: int
+    time: float = field(default=0.0, compare=False)  # time.monotonic() when received
+
+    @property
+    def active_mode(self) -> int:
+        return self.vfo_b_mode if self.vfo else self.vfo_a_mode
+
+    @property
+    def active_freq_hz(self) -> int:
+        return self.vfo_b_freq_hz if self.vfo else self.vfo_a_freq_hz
+
+    @property
+    def active_mode_name(self) -> str:
+        try:
+            return Mode(self.active_mode).name
+        except ValueError:
+            return f"Unknown({self.active_mode})"
+
+    @property
+    def supply_voltage(self) -> float:
+        return self.supply_dv / 10
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        del data['time']
+        data['active_freq_hz'] = self.active_freq_hz
+        data['active_mode'] = self.active_mode_name
+        data['supply_voltage'] = self.supply_voltage
+        return data
+
+
+def decode_status(body: bytes, received: float = 0.0) -> RadioStatus:
+    """
+    Decode the 20-byte body of a status frame.
+
+    Raises:
+        ValueError: If body is shorter than STATUS_BODY_SIZE
+    """
+    if len(body) < STATUS_BODY_SIZE:
+        raise ValueError(f"Status body too short: {len(body)} bytes")
+    return RadioStatus(*STATUS_LAYOUT.unpack_from(body), received)
+
+
+def decode_status_sync(payload: bytes) -> RadioStatus:
+    """
+    Decode the fields a STATUS_SYNC (0x0B) reply shares with the status stream.
+
+    Raises:
+        ValueError: If payload is shorter than STATUS_BODY_SIZE
+    """
+    return decode_status(payload, time.monotonic())
+
+
+class StatusDecoder:
+    """
+    Incremental status-frame decoder.
+
+    Feed any chunks of the byte stream; bytes that are not part of a status
+    frame (programming packets, line noise) are skipped and counted.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.frames = 0
+        self.noise_bytes = 0
+
+    def __len__(self) -> int:
+        """Number of buffered bytes not yet decoded"""
+        return len(self._buffer)
+
+    def reset(self) -> None:
+        self._buffer.clear()
+
+    def feed(self, data: bytes) -> List[RadioStatus]:
+        """
+        Add received bytes and decode every complete frame.
+
+        Args:
+            data: Raw bytes from the radio (any size)
+
+        Returns:
+            Decoded frames, oldest first (possibly empty)
+        """
+        buffer = self._buffer
+        buffer += data
+        received = time.monotonic()
+        unpack_from = STATUS_LAYOUT.unpack_from
+        header_size = len(STATUS_HEADER)
+        decoded = []
+        pos = 0
+        while True:
+            start = buffer.find(STATUS_HEADER, pos)
+            if start == -1:
+                # Keep a possible partial header at the end of the buffer
+                end = len(buffer)
+                for size in (3, 2, 1):
+                    if buffer.endswith(STATUS_HEADER[:size]):
+                        end -= size
+                        break
+                self.noise_bytes += max(0, end - pos)
+                pos = max(pos, end)
+                break
+            self.noise_bytes += start - pos
+            if len(buffer) - start < STATUS_FRAME_SIZE:
+                pos = start
+                break
+            decoded.append(RadioStatus(*unpack_from(buffer, start + header_size), received))
+            pos = start + STATUS_FRAME_SIZE
+        del buffer[:pos]
+        self.frames += len(decoded)
+        return decoded
+
+
+class StatusStats:
+    """Rate statistics of a status feed"""
+
+    def __init__(self):
+        self.frames = 0
+        self.changes = 0
+        self.bytes = 0
+        self.dropped = 0  # Frames an async consumer fell too far behind to see
+        self._times = deque(maxlen=RATE_WINDOW)
+
+    def record(self, statuses: List[RadioStatus], size: int, changes: int) -> None:
+        self.bytes += size
+        self.frames += len(statuses)
+        self.changes += changes
+        self._times.extend(status.time for status in statuses)
+
+    @property
+    def frames_per_sec(self) -> float:
+        """Frame rate over the last RATE_WINDOW frames"""
+        if len(self._times) < 2:
+            return 0.0
+        elapsed = self._times[-1] - self._times[0]
+        return (len(self._times) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'frames': self.frames,
+            'changes': self.changes,
+            'bytes': self.bytes,
+            'dropped': self.dropped,
+            'frames_per_sec': self.frames_per_sec,
+        }
+
+
+class StatusMonitor:
+    """
+    Live feed of the radio's status frames.
+
+    Callbacks run on the thread that delivers the bytes (the monitor's
+    reader thread, or the thread driving PMR171Radio); keep them short or
+    use stream().
+
+    Args:
+        port: Serial port name, bridge URL or Transport to read with
+            start(); None if the monitor is only fed (see feed)
+        baudrate: Serial baud rate for a port name
+    """
+
+    def __init__(self, port=None, baudrate: int = DEFAULT_BAUDRATE):
+        self.port = port
+        self.baudrate = baudrate
+        self.transport: Optional[Transport] = port if isinstance(port, Transport) else None
+        self.decoder = StatusDecoder()
+        self.stats = StatusStats()
+        self.latest: Optional[RadioStatus] = None
+        self._subscribers: List[tuple] = []  # (callback, changes_only)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[RadioStatus], None],
+                  changes_only: bool = False) -> Callable[[], None]:
+        """
+        Call callback with every decoded frame.
+
+        Args:
+            callback: Called with each RadioStatus
+            changes_only: Only call it when a field differs from the
+                previous frame
+
+        Returns:
+            Function that removes the subscription
+        """
+        entry = (callback, changes_only)
+        with self._lock:
+            self._subscribers = self._subscribers + [entry]
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._subscribers = [s for s in self._subscribers if s is not entry]
+        return unsubscribe
+
+    def feed(self, data: bytes) -> List[RadioStatus]:
+        """
+        Decode bytes from the radio and publish the frames.
+
+        Can be set as PMR171Radio.status_feed to follow the status frames a
+        programming session discards.
+
+        Returns:
+            The frames decoded from data
+        """
+        statuses = self.decoder.feed(data)
+        changes = 0
+        subscribers = self._subscribers
+        for status in statuses:
+            changed = status != self.latest
+            changes += changed
+            self.latest = status
+            for callback, changes_only in subscribers:
+                if changed or not changes_only:
+                    try:
+                        callback(status)
+                    except Exception as e:
+                        logger.warning(f"Status subscriber {callback!r} failed: {e}")
+        self.stats.record(statuses, len(data), changes)
+        return statuses
+
+    async def stream(self, changes_only: bool = False, maxsize: int = DEFAULT_STREAM_QUEUE):
+        """
+        Async iterator over decoded frames.
+
+        If the consumer falls more than maxsize frames behind, the oldest
+        are dropped (counted in stats.dropped) so the feed never blocks.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+        def push(status: RadioStatus) -> None:
+            if queue.full():
+                queue.get_nowait()
+                self.stats.dropped += 1
+            queue.put_nowait(status)
+
+        def deliver(status: RadioStatus) -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(push, status)
+
+        unsubscribe = self.subscribe(deliver, changes_only)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            unsubscribe()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Read and publish frames on a background thread.
+
+        Raises:
+            ValueError: If the monitor was created without a port
+        """
+        if self.is_running:
+            return
+        if self.transport is None:
+            if self.port is None:
+                raise ValueError("StatusMonitor has no port to read")
+            self.transport = open_transport(self.port, self.baudrate, timeout=READ_POLL_INTERVAL)
+        if not self.transport.is_open:
+            self.transport.open()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='pmr171-status', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the reader thread (the transport is left open)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        transport = self.transport
+        while not self._stop.is_set():
+            try:
+                data = transport.read(transport.in_waiting or 1)
+            except OSError as e:
+                logger.error(f"Status monitor read failed: {e}")
+                break
+            if data:
+                self.feed(data)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
@@ -0,0 +1,223 @@
+"""
+Adaptive timing for the PMR-171 UART driver.
+
+The driver used to sleep fixed amounts around every command (0.2 s settle
+after a failure, 0.3 s * attempt backoff, 0.15 s before reading a DMR write
+acknowledgment, 0.15 s + polling for the pre-write wake). Those values were
+chosen for the worst case and dominate a full codeplug write even when the
+radio answers in a few milliseconds.
+
+TimingController measures the round-trip time of each command and keeps a
+smoothed estimate per command, using the same estimator TCP uses for its
+retransmission timer (RFC 6298):
+
+    RTTVAR = (1 - beta) * RTTVAR + beta * |SRTT - R|
+    SRTT   = (1 - alpha) * SRTT + alpha * R
+    RTO    = SRTT + K * RTTVAR
+
+Until a command has warmup_samples measurements the legacy fixed delays are
+used unchanged. After that every delay is derived from the estimate and
+capped at its legacy value, so adaptive timing can only ever make a session
+faster than before - never wait longer than the old code did.
+
+The 0.15 s DMR commit delay is not adapted: it is the time the radio needs
+to write the block to flash, not a round trip, so write_dmr_data always
+sleeps it out before reading the acknowledgment.
+
+Example:
+    >>> timing = TimingController()
+    >>> timing.record(0x41, 0.012)
+    >>> timing.response_timeout(0x41)
+    >>> timing.profile()
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Any
+
+# Legacy fixed delays (seconds) used until the estimate is warm
+RETRY_DRAIN_DELAY = 0.2    # Let a late response land before clearing input
+RETRY_BACKOFF_STEP = 0.3   # Backoff grows by this much per attempt
+
+
+@dataclass
+class RttEstimate:
+    """Smoothed round-trip estimate for one command"""
+    samples: int = 0
+    srtt: float = 0.0
+    rttvar: float = 0.0
+    min_rtt: float = 0.0
+    max_rtt: float = 0.0
+    timeouts: int = 0        # Total timeouts seen
+    backoff: int = 0         # Consecutive timeouts since the last sample
+
+
+class TimingController:
+    """
+    Per-command round-trip estimator that derives the driver's delays.
+
+    Args:
+        max_timeout: Response timeout used before the estimate is warm, and
+            the upper bound afterwards
+        min_timeout: Lower bound for the adaptive response timeout
+        warmup_samples: Samples needed before a command's delays adapt
+        adaptive: If False, always return the legacy fixed delays
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    def __init__(self, max_timeout: float = 2.0, min_timeout: float = 0.1,
+                 warmup_samples: int = 3, adaptive: bool = True):
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.warmup_samples = warmup_samples
+        self.adaptive = adaptive
+        self._estimates: Dict[int, RttEstimate] = {}
+        self._phases: Dict[str, Dict[str, float]] = {}
+
+    def _estimate(self, command: int) -> RttEstimate:
+        estimate = self._estimates.get(command)
+        if estimate is None:
+            estimate = self._estimates[command] = RttEstimate()
+        return estimate
+
+    def _warm(self, command: int) -> bool:
+        estimate = self._estimates.get(command)
+        return (self.adaptive and estimate is not None and
+                estimate.samples >= self.warmup_samples)
+
+    def record(self, command: int, rtt: float) -> None:
+        """
+        Add a round-trip measurement for a command.
+
+        Args:
+            command: Command code the sample belongs to
+            rtt: Seconds from sending the request to receiving the full response
+        """
+        estimate = self._estimate(command)
+        if estimate.samples == 0:
+            estimate.srtt = rtt
+            estimate.rttvar = rtt / 2
+            estimate.min_rtt = estimate.max_rtt = rtt
+        else:
+            estimate.rttvar = ((1 - self.BETA) * estimate.rttvar +
+                               self.BETA * abs(estimate.srtt - rtt))
+            estimate.srtt = (1 - self.ALPHA) * estimate.srtt + self.ALPHA * rtt
+            estimate.min_rtt = min(estimate.min_rtt, rtt)
+            estimate.max_rtt = max(estimate.max_rtt, rtt)
+        estimate.samples += 1
+        estimate.backoff = 0
+
+    def on_timeout(self, command: int) -> None:
+        """Note that a command timed out; the next timeout is doubled"""
+        estimate = self._estimate(command)
+        estimate.timeouts += 1
+        estimate.backoff += 1
+
+    def rto(self, command: int) -> float:
+        """Retransmission timeout (SRTT + K * RTTVAR) without clamping"""
+        estimate = self._estimate(command)
+        return estimate.srtt + self.K * estimate.rttvar
+
+    def response_timeout(self, command: int) -> float:
+        """
+        How long to wait for a response before treating it as lost.
+
+        Doubles for every consecutive timeout (as TCP does) so a radio that
+        has slowed down is not retried into the ground.
+        """
+        if not self._warm(command):
+            return self.max_timeout
+        backoff = 2 ** self._estimates[command].backoff
+        timeout = max(self.min_timeout, self.rto(command)) * backoff
+        return min(self.max_timeout, timeout)
+
+    def settle_delay(self, command: int, legacy: float) -> float:
+        """
+        Minimum time between sending a command and the next action.
+
+        Once warm this is the observed response time plus margin, capped at
+        the legacy delay. Not for fixed processing times such as the DMR
+        flash commit, which do not shrink with the round trip.
+
+        Args:
+            command: Command being settled
+            legacy: Fixed delay used before adaptive timing
+        """
+        if not self._warm(command):
+            return legacy
+        return min(legacy, self.rto(command))
+
+    def drain_delay(self, command: int) -> float:
+        """Wait after a failed attempt so late bytes arrive before clearing"""
+        if not self._warm(command):
+            return RETRY_DRAIN_DELAY
+        return min(RETRY_DRAIN_DELAY, self.rto(command))
+
+    def backoff_delay(self, command: int, attempt: int, legacy: float = None) -> float:
+        """
+        Backoff before retry number attempt + 1.
+
+        Legacy: 0.3 s * (attempt + 1), or the given delay (e.g. from a
+        RetryPolicy). Once warm: RTO * 2^attempt, capped at the legacy value.
+        """
+        if legacy is None:
+            legacy = RETRY_BACKOFF_STEP * (attempt + 1)
+        if not self._warm(command):
+            return legacy
+        return min(legacy, self.rto(command) * (2 ** attempt))
+
+    def record_phase(self, name: str, elapsed: float, items: int) -> None:
+        """
+        Record how long one phase of a bulk operation took.
+
+        Args:
+            name: Phase name (e.g. 'channel_blocks', 'dmr_blocks')
+            elapsed: Seconds the phase took
+            items: Number of items completed in the phase
+        """
+        self._phases[name] = {
+            'elapsed': elapsed,
+            'items': items,
+            'per_item': elapsed / items if items else 0.0,
+        }
+
+    def phases(self) -> Dict[str, Dict[str, float]]:
+        """
+        Durations of the most recent run of each phase.
+
+        Returns:
+            Dict of phase name -> elapsed (s), items and per_item (s)
+        """
+        return {name: dict(phase) for name, phase in self._phases.items()}
+
+    def reset(self) -> None:
+        """Forget all measurements (e.g. after reconnecting)"""
+        self._estimates.clear()
+        self._phases.clear()
+
+    def profile(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Snapshot of the learned timing, keyed by command name.
+
+        Returns:
+            Dict of command name -> samples, srtt, rttvar, min/max RTT,
+            timeouts and the delays currently derived from them (seconds)
+        """
+        result = {}
+        for command, estimate in sorted(self._estimates.items()):
+            name = getattr(command, 'name', f"0x{command:02X}")
+            result[name] = {
+                'samples': estimate.samples,
+                'srtt': estimate.srtt,
+                'rttvar': estimate.rttvar,
+                'min_rtt': estimate.min_rtt,
+                'max_rtt': estimate.max_rtt,
+                'timeouts': estimate.timeouts,
+                'adaptive': self._warm(command),
+                'response_timeout': self.response_timeout(command),
+                'drain_delay': self.drain_delay(command),
+                'backoff_delay': self.backoff_delay(command, 0),
+            }
+        return result
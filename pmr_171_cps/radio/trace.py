@@ -0,0 +1,255 @@
+"""
+Low-overhead wire trace recorder for the PMR-171 driver.
+
+The protocol analysis tools work on Eltima .spm captures made on Windows,
+and PMR171Radio had no capture of its own. TraceRecorder keeps timestamped
+TX/RX chunks in a preallocated ring buffer: recording a chunk is a slice
+copy plus four array stores, with no allocation, so tracing can stay on
+during production sessions. When the ring is full the oldest chunks are
+overwritten.
+
+TracingTransport wraps any Transport and records everything written to and
+read from it (see PMR171Radio.start_trace).
+
+dump() writes a compact binary file (.pmrtrace):
+
+    header   '<8sHHdII'  magic 'PMR171TR', version, flags,
+                         wall-clock start time, data length, record count
+    data     every chunk's bytes, concatenated in time order
+    records  '<dIIB' per chunk: seconds since start, offset into data,
+             length, direction (0 = TX to radio, 1 = RX from radio)
+
+Because the data section is the raw byte stream in order, tools that scan
+for A5A5A5A5 packets (analyze_uart_capture.py) parse the file as they
+parse a .spm capture; read_trace() restores the per-chunk timing.
+
+Example:
+    >>> recorder = radio.start_trace()
+    >>> radio.read_all_channels()
+    >>> recorder.dump('session.pmrtrace')
+"""
+
+import struct
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Tuple
+
+from .transport import Transport
+
+TRACE_MAGIC = b'PMR171TR'
+TRACE_VERSION = 1
+TRACE_HEADER = struct.Struct('<8sHHdII')
+TRACE_RECORD = struct.Struct('<dIIB')
+
+TX = 0  # Host -> radio
+RX = 1  # Radio -> host
+
+DEFAULT_TRACE_BYTES = 4 * 1024 * 1024   # Ring capacity for chunk data
+DEFAULT_TRACE_RECORDS = 256 * 1024      # Ring capacity for chunk records
+
+
+@dataclass
+class TraceRecord:
+    """One chunk read from or written to the transport"""
+    time: float      # Seconds since the trace started
+    direction: int   # TX or RX
+    data: bytes
+
+
+class TraceRecorder:
+    """
+    Ring buffer of timestamped TX/RX chunks.
+
+    Not thread-safe: record from the thread that drives the transport.
+
+    Args:
+        capacity: Bytes of chunk data kept
+        max_records: Chunks kept
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TRACE_BYTES, max_records: int = DEFAULT_TRACE_RECORDS):
+        self.capacity = capacity
+        self.max_records = max_records
+        self._data = bytearray(capacity)
+        self._times = array('d', bytes(8 * max_records))
+        self._positions = array('Q', bytes(8 * max_records))
+        self._lengths = array('I', bytes(4 * max_records))
+        self._directions = bytearray(max_records)
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget all recorded chunks and restart the clock"""
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self._written = 0   # Total bytes ever recorded
+        self._count = 0     # Total chunks ever recorded
+
+    def record(self, direction: int, data: bytes) -> None:
+        """
+        Append a chunk.
+
+        Args:
+            direction: TX or RX
+            data: Bytes sent or received
+        """
+        size = len(data)
+        if not size:
+            return
+        if size > self.capacity:
+            data = data[-self.capacity:]
+            self._written += size - self.capacity
+            size = self.capacity
+
+        start = self._written % self.capacity
+        end = start + size
+        if end <= self.capacity:
+            self._data[start:end] = data
+        else:
+            split = self.capacity - start
+            self._data[start:] = data[:split]
+            self._data[:size - split] = data[split:]
+
+        slot = self._count % self.max_records
+        self._times[slot] = time.perf_counter() - self._t0
+        self._positions[slot] = self._written
+        self._lengths[slot] = size
+        self._directions[slot] = direction
+        self._written += size
+        self._count += 1
+
+    def __len__(self) -> int:
+        """Chunks currently held"""
+        return len(self._live_slots())
+
+    def _live_slots(self) -> List[int]:
+        """Ring slots of the chunks still fully held, oldest first"""
+        first = max(0, self._count - self.max_records)
+        oldest_byte = self._written - self.capacity
+        slots = []
+        for index in range(first, self._count):
+            slot = index % self.max_records
+            if self._positions[slot] >= oldest_byte:
+                slots.append(slot)
+        return slots
+
+    def _chunk(self, slot: int) -> bytes:
+        start = self._positions[slot] % self.capacity
+        end = start + self._lengths[slot]
+        if end <= self.capacity:
+            return bytes(self._data[start:end])
+        return bytes(self._data[start:]) + bytes(self._data[:end - self.capacity])
+
+    def records(self) -> List[TraceRecord]:
+        """Chunks currently held, oldest first"""
+        return [TraceRecord(self._times[slot], self._directions[slot], self._chunk(slot))
+                for slot in self._live_slots()]
+
+    def dump(self, path) -> int:
+        """
+        Write the held chunks to a .pmrtrace file.
+
+        Args:
+            path: Output file
+
+        Returns:
+            Number of chunks written
+        """
+        records = self.records()
+        data = bytearray()
+        table = bytearray()
+        for record in records:
+            table += TRACE_RECORD.pack(record.time, len(data), len(record.data), record.direction)
+            data += record.data
+
+        with open(path, 'wb') as f:
+            f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, 0, self.started, len(data), len(records)))
+            f.write(data)
+            f.write(table)
+        return len(records)
+
+
+def read_trace(path) -> Tuple[float, List[TraceRecord]]:
+    """
+    Load a .pmrtrace file.
+
+    Args:
+        path: File written by TraceRecorder.dump
+
+    Returns:
+        (wall-clock start time, records oldest first)
+
+    Raises:
+        ValueError: If the file is not a trace or is truncated
+    """
+    content = Path(path).read_bytes()
+    if len(content) < TRACE_HEADER.size or not content.startswith(TRACE_MAGIC):
+        raise ValueError(f"{path} is not a PMR-171 trace")
+    _, version, _, started, data_length, count = TRACE_HEADER.unpack_from(content)
+    if version != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version {version} in {path}")
+
+    data_start = TRACE_HEADER.size
+    table_start = data_start + data_length
+    if len(content) < table_start + count * TRACE_RECORD.size:
+        raise ValueError(f"{path} is truncated")
+
+    records = []
+    for index in range(count):
+        t, offset, length, direction = TRACE_RECORD.unpack_from(
+            content, table_start + index * TRACE_RECORD.size)
+        chunk = content[data_start + offset:data_start + offset + length]
+        records.append(TraceRecord(t, direction, chunk))
+    return started, records
+
+
+class TracingTransport(Transport):
+    """
+    Transport wrapper that records all traffic into a TraceRecorder.
+
+    Args:
+        inner: Transport doing the actual I/O
+        recorder: Recorder to append to
+    """
+
+    def __init__(self, inner: Transport, recorder: TraceRecorder):
+        self.inner = inner
+        self.recorder = recorder
+        self.name = inner.name
+
+    def open(self) -> None:
+        self.inner.open()
+
+    def close(self) -> None:
+        self.inner.close()
+
+    @property
+    def is_open(self) -> bool:
+        return self.inner.is_open
+
+    @property
+    def in_waiting(self) -> int:
+        return self.inner.in_waiting
+
+    def read(self, size: int = 1) -> bytes:
+        data = self.inner.read(size)
+        if data:
+            self.recorder.record(RX, data)
+        return data
+
+    def write(self, data: bytes) -> int:
+        self.recorder.record(TX, data)
+        return self.inner.write(data)
+
+    def flush(self) -> None:
+        self.inner.flush()
+
+    def reset_input_buffer(self) -> None:
+        self.inner.reset_input_buffer()
+
+    def reset_output_buffer(self) -> None:
+        self.inner.reset_output_buffer()
+
+    def set_control_lines(self, dtr: bool = True, rts: bool = True) -> None:
+        self.inner.set_control_lines(dtr, rts)
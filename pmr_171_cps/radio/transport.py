@@ -0,0 +1,325 @@
+"""
+Byte transports for the PMR-171 driver.
+
+PMR171Radio only talks to a Transport, never to pyserial directly, so the
+same driver can program a radio on a local serial port, a radio behind a
+network serial bridge, or an in-memory device:
+
+    SerialTransport    pyserial port ('COM6', '/dev/ttyUSB0', a pty)
+    TcpTransport       raw TCP socket to a ser2net-style bridge
+                       ('socket://host:port')
+    LoopbackTransport  zero-latency in-memory device (e.g. RadioEmulator),
+                       for profiling the protocol layer in isolation
+
+The interface is the subset of pyserial's Serial API the driver uses
+(in_waiting, read, write, flush, reset_input_buffer), plus
+set_control_lines for the DTR/RTS programming-mode lines.
+
+Example:
+    >>> radio = PMR171Radio('socket://192.168.1.50:4001')
+    >>> radio = PMR171Radio(LoopbackTransport(RadioEmulator()))
+"""
+
+import errno
+import logging
+import select
+import socket
+import time
+from typing import Optional
+
+try:
+    import serial
+    SERIAL_AVAILABLE = True
+except ImportError:
+    SERIAL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READ_TIMEOUT = 0.05   # Seconds read() waits for the first byte
+TCP_URL_PREFIX = 'socket://'
+LOOPBACK_URL = 'loop://'
+
+
+class Transport:
+    """
+    Byte pipe to the radio used by PMR171Radio.
+
+    Subclasses implement open/close/read/write/in_waiting and set is_open.
+    read(size) waits up to the read timeout for the first byte and returns
+    up to size bytes (b'' on timeout).
+    """
+
+    name = ''
+    is_open = False
+
+    def open(self) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+    @property
+    def in_waiting(self) -> int:
+        """Bytes that can be read without waiting"""
+        raise NotImplementedError
+
+    def read(self, size: int = 1) -> bytes:
+        raise NotImplementedError
+
+    def write(self, data: bytes) -> int:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Wait until written data has been sent"""
+
+    def reset_input_buffer(self) -> None:
+        """Discard received bytes"""
+        while self.in_waiting:
+            self.read(self.in_waiting)
+
+    def reset_output_buffer(self) -> None:
+        """Discard bytes not yet sent"""
+
+    def set_control_lines(self, dtr: bool = True, rts: bool = True) -> None:
+        """Set the modem control lines (no-op where there are none)"""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class SerialTransport(Transport):
+    """
+    Transport over a pyserial port.
+
+    Args:
+        port: Serial port name (e.g., 'COM6', '/dev/ttyUSB0')
+        baudrate: Serial baud rate
+        timeout: Seconds read() waits for the first byte
+    """
+
+    def __init__(self, port: str, baudrate: int = 115200, timeout: float = DEFAULT_READ_TIMEOUT):
+        if not SERIAL_AVAILABLE:
+            raise ImportError(
+                "pyserial is required for UART communication. "
+                "Install it with: pip install pyserial"
+            )
+        self.name = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self._serial = None
+
+    def open(self) -> None:
+        self._serial = serial.Serial(
+            port=self.name,
+            baudrate=self.baudrate,
+            bytesize=serial.EIGHTBITS,
+            parity=serial.PARITY_NONE,
+            stopbits=serial.STOPBITS_ONE,
+            timeout=self.timeout,
+            write_timeout=None,  # No write timeout - writes should be instant
+            rtscts=False,  # Disable hardware flow control
+            dsrdtr=False   # Disable DSR/DTR flow control
+        )
+
+    def close(self) -> None:
+        if self._serial is not None:
+            try:
+                self._serial.close()
+            except serial.SerialException:
+                pass
+            self._serial = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._serial is not None and self._serial.is_open
+
+    @property
+    def in_waiting(self) -> int:
+        return self._serial.in_waiting
+
+    def read(self, size: int = 1) -> bytes:
+        return self._serial.read(size)
+
+    def write(self, data: bytes) -> int:
+        return self._serial.write(data)
+
+    def flush(self) -> None:
+        self._serial.flush()
+
+    def reset_input_buffer(self) -> None:
+        self._serial.reset_input_buffer()
+
+    def reset_output_buffer(self) -> None:
+        self._serial.reset_output_buffer()
+
+    def set_control_lines(self, dtr: bool = True, rts: bool = True) -> None:
+        """
+        Set DTR and RTS; the PMR-171 needs both high for programming mode.
+
+        Pseudo-terminals (e.g. the emulator in emulator.py) have no modem
+        control lines; the ioctl error they raise is ignored.
+        """
+        try:
+            self._serial.dtr = dtr
+            self._serial.rts = rts
+        except OSError as e:
+            if e.errno not in (errno.ENOTTY, errno.EINVAL):
+                raise
+            logger.debug(f"{self.name} has no modem control lines ({e}), DTR/RTS not set")
+
+
+class TcpTransport(Transport):
+    """
+    Transport over a raw TCP connection to a network serial bridge.
+
+    The bridge (ser2net, a terminal server, ...) must pass bytes through
+    unmodified and handle baud rate and DTR/RTS on its side.
+
+    Args:
+        host: Bridge host name or address
+        port: Bridge TCP port
+        timeout: Seconds read() waits for the first byte
+        connect_timeout: Seconds to wait for the TCP connection
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = DEFAULT_READ_TIMEOUT,
+                 connect_timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.name = f"{TCP_URL_PREFIX}{host}:{port}"
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._socket: Optional[socket.socket] = None
+        self._buffer = bytearray()
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = DEFAULT_READ_TIMEOUT) -> 'TcpTransport':
+        """
+        Create from a 'socket://host:port' URL (pyserial's notation).
+
+        Raises:
+            ValueError: If the URL has no port
+        """
+        address = url[len(TCP_URL_PREFIX):] if url.startswith(TCP_URL_PREFIX) else url
+        host, _, port = address.rpartition(':')
+        if not host or not port.isdigit():
+            raise ValueError(f"Expected socket://host:port, got {url!r}")
+        return cls(host.strip('[]'), int(port), timeout)
+
+    def open(self) -> None:
+        self._socket = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.setblocking(False)
+        self._buffer.clear()
+
+    def close(self) -> None:
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._socket is not None
+
+    def _receive(self, wait: float) -> None:
+        readable, _, _ = select.select([self._socket], [], [], wait)
+        if not readable:
+            return
+        try:
+            data = self._socket.recv(65536)
+        except BlockingIOError:
+            return
+        if not data:
+            self.close()
+            raise OSError(errno.ECONNRESET, f"Connection to {self.name} closed by peer")
+        self._buffer += data
+
+    @property
+    def in_waiting(self) -> int:
+        self._receive(0)
+        return len(self._buffer)
+
+    def read(self, size: int = 1) -> bytes:
+        if not self._buffer:
+            self._receive(self.timeout)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def write(self, data: bytes) -> int:
+        self._socket.setblocking(True)
+        try:
+            self._socket.sendall(data)
+        finally:
+            self._socket.setblocking(False)
+        return len(data)
+
+    def reset_input_buffer(self) -> None:
+        self._buffer.clear()
+        while self.in_waiting:
+            self._buffer.clear()
+
+
+class LoopbackTransport(Transport):
+    """
+    Zero-latency in-memory transport.
+
+    Every write is handed to device.feed(data), and whatever it returns is
+    readable at once. Pair it with RadioEmulator to profile the driver's
+    protocol overhead without any I/O.
+
+    Args:
+        device: Object with feed(data: bytes) -> bytes (e.g. RadioEmulator)
+        name: Name reported as the port
+    """
+
+    def __init__(self, device, name: str = LOOPBACK_URL):
+        self.device = device
+        self.name = name
+        self.is_open = False
+        self._buffer = bytearray()
+
+    def open(self) -> None:
+        self.is_open = True
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self.is_open = False
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self._buffer)
+
+    def read(self, size: int = 1) -> bytes:
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def write(self, data: bytes) -> int:
+        self._buffer += self.device.feed(bytes(data))
+        return len(data)
+
+
+def open_transport(port: str, baudrate: int = 115200,
+                   timeout: float = DEFAULT_READ_TIMEOUT) -> Transport:
+    """
+    Create (but do not open) the transport for a port name or URL.
+
+    Args:
+        port: 'socket://host:port' for a TCP bridge, 'loop://' for an
+            in-memory RadioEmulator, anything else is a serial port name
+        baudrate: Serial baud rate (serial ports only)
+        timeout: Seconds read() waits for the first byte
+
+    Returns:
+        Unopened Transport
+    """
+    if port.startswith(TCP_URL_PREFIX):
+        return TcpTransport.from_url(port, timeout)
+    if port == LOOPBACK_URL:
+        from .emulator import RadioEmulator
+        return LoopbackTransport(RadioEmulator(status_interval=0))
+    return SerialTransport(port, baudrate, timeout)
@@ -0,0 +1,158 @@
+"""
+Read-back verification of channels written to a PMR-171.
+
+Checking a write used to mean reading every channel back one round trip at
+a time and comparing ChannelData field by field. PMR171Radio.verify_channels
+reads the whole set back with the pipelined reader (0x41 for every slot,
+then 0x44 for the DMR slots) and compares the raw 26-byte payloads with the
+ones a write would send. Only slots whose bytes differ are decoded, field by
+field, into the report.
+
+Example:
+    >>> radio.write_all_channels(channels)
+    >>> report = radio.verify_channels(channels)
+    >>> if not report.ok:
+    ...     print(report.summary())
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple, Any, Optional, Union
+
+from .pmr171_uart import (
+    ChannelData,
+    Command,
+    Mode,
+    build_channel_packet,
+    build_dmr_data_packet,
+    parse_packet,
+)
+from .write_image import WriteImage
+
+# (field, start, end) of the 26-byte channel block (0x40/0x41)
+CHANNEL_FIELDS: List[Tuple[str, int, int]] = [
+    ('index', 0, 2),
+    ('rx_mode', 2, 3),
+    ('tx_mode', 3, 4),
+    ('rx_freq_hz', 4, 8),
+    ('tx_freq_hz', 8, 12),
+    ('rx_ctcss_index', 12, 13),
+    ('tx_ctcss_index', 13, 14),
+    ('name', 14, 26),
+]
+
+# (field, start, end) of the 26-byte DMR block (0x43/0x44)
+DMR_FIELDS: List[Tuple[str, int, int]] = [
+    ('index', 0, 2),
+    ('reserved', 2, 3),
+    ('rx_cc', 3, 4),
+    ('tx_cc', 4, 5),
+    ('slot', 5, 6),
+    ('call_id', 6, 10),
+    ('own_id', 10, 14),
+    ('reserved', 14, 19),
+    ('call_format', 19, 20),
+    ('settings', 20, 26),
+]
+
+MISSING = 'missing'  # Field name used for a block the radio never returned
+
+
+@dataclass
+class Mismatch:
+    """One field that reads back differently from what was written"""
+    slot: int
+    field: str       # Field name; DMR block fields are prefixed 'dmr.'
+    expected: Any
+    actual: Any
+
+
+@dataclass
+class VerifyReport:
+    """Outcome of PMR171Radio.verify_channels"""
+    checked: int = 0                       # Slots compared
+    mismatches: List[Mismatch] = field(default_factory=list)
+    cancelled: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.cancelled and not self.mismatches
+
+    def mismatched_slots(self) -> List[int]:
+        """Slots with at least one mismatch, in order"""
+        return sorted({mismatch.slot for mismatch in self.mismatches})
+
+    def by_slot(self) -> Dict[int, List[Mismatch]]:
+        slots: Dict[int, List[Mismatch]] = {}
+        for mismatch in self.mismatches:
+            slots.setdefault(mismatch.slot, []).append(mismatch)
+        return slots
+
+    def summary(self, limit: int = 20) -> str:
+        """Human-readable report (at most limit mismatch lines)"""
+        slots = self.mismatched_slots()
+        if self.ok:
+            return f"Verified {self.checked} channels: all match"
+        lines = [f"Verified {self.checked} channels: {len(slots)} differ"
+                 f"{' (cancelled)' if self.cancelled else ''}"]
+        for mismatch in self.mismatches[:limit]:
+            lines.append(f"  Channel {mismatch.slot} {mismatch.field}: "
+                         f"expected {mismatch.expected!r}, read {mismatch.actual!r}")
+        if len(self.mismatches) > limit:
+            lines.append(f"  ... and {len(self.mismatches) - limit} more")
+        return "\n".join(lines)
+
+
+def _decode(name: str, raw: bytes) -> Any:
+    if name == 'name':
+        return raw.split(b'\x00')[0].decode('ascii', errors='replace')
+    if len(raw) <= 4:
+        return int.from_bytes(raw, 'big')
+    return raw.hex()
+
+
+def compare_block(slot: int, expected: bytes, actual: Optional[bytes],
+                  fields: List[Tuple[str, int, int]], prefix: str = '') -> List[Mismatch]:
+    """
+    Compare a block read back with the one written.
+
+    Args:
+        slot: Channel number
+        expected: 26-byte payload that was written
+        actual: 26-byte payload read back (None if none arrived)
+        fields: CHANNEL_FIELDS or DMR_FIELDS
+        prefix: Prefix for field names (e.g. 'dmr.')
+
+    Returns:
+        One Mismatch per differing field (empty if the bytes are identical)
+    """
+    if actual is None:
+        return [Mismatch(slot, prefix + MISSING, 'response', None)]
+    if actual[:26] == expected[:26]:
+        return []
+    mismatches = []
+    for name, start, end in fields:
+        if expected[start:end] != actual[start:end]:
+            mismatches.append(Mismatch(slot, prefix + name, _decode(name, expected[start:end]),
+                                       _decode(name, actual[start:end])))
+    return mismatches
+
+
+def expected_payloads(channels: Union[List[ChannelData], WriteImage]) -> Tuple[Dict[int, bytes], Dict[int, bytes]]:
+    """
+    Encode what a write of channels puts into each slot.
+
+    Args:
+        channels: List of ChannelData, or a WriteImage (nothing is encoded)
+
+    Returns:
+        (slot -> channel payload, slot -> DMR payload for DMR channels)
+    """
+    if isinstance(channels, WriteImage):
+        return channels.expected_payloads()
+    blocks: Dict[int, bytes] = {}
+    dmr_blocks: Dict[int, bytes] = {}
+    for channel in channels:
+        blocks[channel.index] = parse_packet(build_channel_packet(channel, Command.CHANNEL_WRITE))[1]
+        if channel.rx_mode == Mode.DMR:
+            dmr_blocks[channel.index] = parse_packet(build_dmr_data_packet(channel, Command.DMR_DATA_WRITE))[1]
+    return blocks, dmr_blocks
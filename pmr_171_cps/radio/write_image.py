@@ -0,0 +1,195 @@
+"""
+Pre-encoded write image of a codeplug.
+
+write_codeplug converted every channel dict with ChannelData.from_dict and
+write_channel then built the 0x40 and 0x43 packets (CRC included) again on
+every attempt. A WriteImage encodes a whole codeplug once into a single
+contiguous buffer of ready-to-send packets:
+
+    | 0x40 packet, channel 0 | 0x40 packet, channel 1 | ... | 0x43 packet, first DMR channel | ...
+
+Every packet is codec.packet_size(26) = 34 bytes, and the image keeps the
+offset of each slot's packets. The write engine sends memoryview slices of
+the buffer, so the same image can be reused across retries, a read-back
+verification (verify_channels accepts an image), several radios
+(FleetProgrammer accepts an image) and, via save()/load(), later jobs.
+
+File format (little-endian header, then the buffer as sent on the wire):
+
+    magic 'PMR171WI' | version u16 | channel packets u32 | DMR packets u32
+
+Example:
+    >>> image = WriteImage.from_codeplug(codeplug)
+    >>> image.save('club_repeaters.pmrimg')
+    >>> radio.write_codeplug(WriteImage.load('club_repeaters.pmrimg'))
+"""
+
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .codec import BLOCK_SIZE, decode_packet, packet_size
+from .pmr171_uart import (
+    ChannelData,
+    Command,
+    Mode,
+    build_channel_packets,
+    build_dmr_data_packets,
+    parse_channel_packet,
+    parse_dmr_data_packet,
+)
+
+IMAGE_MAGIC = b'PMR171WI'
+IMAGE_VERSION = 1
+_FILE_HEADER = struct.Struct('<8sHII')
+
+PACKET_SIZE = packet_size(BLOCK_SIZE)
+_PAYLOAD = slice(6, 6 + BLOCK_SIZE)  # Payload position within a packet
+
+
+class WriteImage:
+    """
+    A codeplug's 0x40/0x43 write packets, encoded once.
+
+    Build with compile(), from_codeplug() or load(). The buffer is
+    immutable, so one image can be shared between threads.
+
+    Args:
+        buffer: Channel packets followed by DMR packets (see module docstring)
+        channel_count: Number of 0x40 packets at the start of buffer
+        channels: The channels the packets encode, in buffer order (decoded
+            from the buffer if omitted)
+
+    Raises:
+        ValueError: If the buffer does not hold valid write packets
+    """
+
+    def __init__(self, buffer: bytes, channel_count: int, channels: List[ChannelData] = None):
+        if len(buffer) % PACKET_SIZE or len(buffer) < channel_count * PACKET_SIZE:
+            raise ValueError(f"Write image size {len(buffer)} does not match {channel_count} channels")
+        self.buffer = bytes(buffer)
+        self._view = memoryview(self.buffer)
+        self._offsets: Dict[int, Tuple[int, Optional[int]]] = {}
+
+        decoded = []
+        dmr_offsets: Dict[int, int] = {}
+        for position in range(len(self.buffer) // PACKET_SIZE):
+            offset = position * PACKET_SIZE
+            is_channel = position < channel_count
+            command, payload, crc_valid = decode_packet(self._view[offset:offset + PACKET_SIZE])
+            expected = Command.CHANNEL_WRITE if is_channel else Command.DMR_DATA_WRITE
+            if command != expected or not crc_valid or len(payload) != BLOCK_SIZE:
+                raise ValueError(f"Invalid write image packet at offset {offset}")
+            index = struct.unpack_from('>H', payload)[0]
+            if is_channel:
+                if index in self._offsets:
+                    raise ValueError(f"Channel {index} appears twice in write image")
+                self._offsets[index] = (offset, None)
+                if channels is None:
+                    decoded.append(parse_channel_packet(payload))
+            else:
+                if index not in self._offsets or index in dmr_offsets:
+                    raise ValueError(f"Unexpected DMR packet for channel {index} in write image")
+                dmr_offsets[index] = offset
+
+        for index, offset in dmr_offsets.items():
+            self._offsets[index] = (self._offsets[index][0], offset)
+        self.channel_count = channel_count
+        self.channels = decoded if channels is None else list(channels)
+
+        if channels is None:
+            # call_format is only carried by the DMR block
+            for channel in self.channels:
+                if channel.index in dmr_offsets:
+                    fields = parse_dmr_data_packet(self.dmr_payload(channel.index), channel)
+                    channel.call_format = fields['call_type']
+
+    @classmethod
+    def compile(cls, channels: List[ChannelData]) -> 'WriteImage':
+        """
+        Encode channels (sorted by index) into a new image.
+
+        Raises:
+            ValueError: If a channel index appears more than once
+        """
+        channels = sorted(channels, key=lambda c: c.index)
+        dmr_channels = [channel for channel in channels if channel.rx_mode == Mode.DMR]
+        buffer = (build_channel_packets(channels, Command.CHANNEL_WRITE) +
+                  build_dmr_data_packets(dmr_channels, Command.DMR_DATA_WRITE))
+        return cls(buffer, len(channels), channels)
+
+    @classmethod
+    def from_codeplug(cls, codeplug: Dict[str, Dict]) -> 'WriteImage':
+        """Compile a codeplug dictionary (channel ID -> channel data dict)"""
+        return cls.compile([ChannelData.from_dict(ch_data) for ch_data in codeplug.values()])
+
+    @classmethod
+    def load(cls, path: str) -> 'WriteImage':
+        """
+        Read an image written by save().
+
+        Raises:
+            ValueError: If the file is not a valid write image
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < _FILE_HEADER.size:
+            raise ValueError(f"{path} is not a PMR-171 write image")
+        magic, version, channel_count, dmr_count = _FILE_HEADER.unpack_from(data)
+        if magic != IMAGE_MAGIC or version != IMAGE_VERSION:
+            raise ValueError(f"{path} is not a PMR-171 write image (version {IMAGE_VERSION})")
+        buffer = data[_FILE_HEADER.size:]
+        if len(buffer) != (channel_count + dmr_count) * PACKET_SIZE:
+            raise ValueError(f"{path} is truncated")
+        return cls(buffer, channel_count)
+
+    def save(self, path: str) -> None:
+        """Write the image to path"""
+        header = _FILE_HEADER.pack(IMAGE_MAGIC, IMAGE_VERSION, self.channel_count, self.dmr_count)
+        with open(path, 'wb') as f:
+            f.write(header)
+            f.write(self.buffer)
+
+    @property
+    def dmr_count(self) -> int:
+        return len(self.buffer) // PACKET_SIZE - self.channel_count
+
+    @property
+    def indices(self) -> List[int]:
+        return [channel.index for channel in self.channels]
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def __iter__(self) -> Iterator[ChannelData]:
+        return iter(self.channels)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._offsets
+
+    def packet(self, index: int) -> memoryview:
+        """0x40 packet for a slot (view into the buffer)"""
+        offset = self._offsets[index][0]
+        return self._view[offset:offset + PACKET_SIZE]
+
+    def dmr_packet(self, index: int) -> Optional[memoryview]:
+        """0x43 packet for a slot, or None if it is not a DMR channel"""
+        offset = self._offsets[index][1]
+        if offset is None:
+            return None
+        return self._view[offset:offset + PACKET_SIZE]
+
+    def payload(self, index: int) -> bytes:
+        """26-byte channel block for a slot"""
+        return self.packet(index)[_PAYLOAD].tobytes()
+
+    def dmr_payload(self, index: int) -> Optional[bytes]:
+        """26-byte DMR block for a slot, or None"""
+        packet = self.dmr_packet(index)
+        return None if packet is None else packet[_PAYLOAD].tobytes()
+
+    def expected_payloads(self) -> Tuple[Dict[int, bytes], Dict[int, bytes]]:
+        """(slot -> channel payload, slot -> DMR payload), as verify.expected_payloads"""
+        blocks = {index: self.payload(index) for index in self._offsets}
+        dmr_blocks = {index: self.dmr_payload(index) for index, (_, dmr) in self._offsets.items()
+                      if dmr is not None}
+        return blocks, dmr_blocks
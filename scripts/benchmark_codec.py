@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for PMR-171 packet encoding and decoding.
+
+Compares, for a full 1000-channel codeplug:
+
+  legacy  the original concatenation encoder (which also packed every
+          payload a second time into a discarded struct) and the
+          slice-per-field decoder, reproduced below
+  single  build_channel_packet / parse_packet + parse_channel_packet,
+          now on the precompiled layouts in codec.py
+  batch   build_channel_packets / parse_channel_payloads (one call for
+          the whole codeplug)
+
+Usage:
+    python scripts/benchmark_codec.py
+    python scripts/benchmark_codec.py --repeat 20
+"""
+
+import argparse
+import struct
+import sys
+import time
+from pathlib import Path
+
+# Add repository root to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pmr_171_cps.radio.codec import BLOCK_SIZE, packet_size
+from pmr_171_cps.radio.crc import crc16_ccitt
+from pmr_171_cps.radio.pmr171_uart import (
+    PACKET_HEADER, CHANNEL_COUNT, ChannelData, Command, Mode,
+    build_channel_packet, build_channel_packets, parse_channel_packet,
+    parse_channel_payloads, parse_packet,
+)
+
+
+def legacy_build_packet(command: int, data: bytes) -> bytes:
+    length = 1 + len(data) + 2
+    packet = PACKET_HEADER + bytes([length, command]) + data
+    crc = crc16_ccitt(bytes([length, command]) + data)
+    return packet + struct.pack('>H', crc)
+
+
+def legacy_build_channel_packet(channel: ChannelData, command: int) -> bytes:
+    name_bytes = channel.name.encode('ascii', errors='replace')[:11]
+    name_bytes = name_bytes + b'\x00' * (12 - len(name_bytes))
+    struct.pack('>HBBIIBBc11s', channel.index, channel.rx_mode, channel.tx_mode,
+                channel.rx_freq_hz, channel.tx_freq_hz, channel.rx_ctcss_index,
+                channel.tx_ctcss_index, name_bytes[:1], name_bytes[1:12])
+    data = (struct.pack('>H', channel.index) + bytes([channel.rx_mode]) +
+            bytes([channel.tx_mode]) + struct.pack('>I', channel.rx_freq_hz) +
+            struct.pack('>I', channel.tx_freq_hz) + bytes([channel.rx_ctcss_index]) +
+            bytes([channel.tx_ctcss_index]) + name_bytes)
+    return legacy_build_packet(command, data)
+
+
+def legacy_parse_packet(data: bytes):
+    length = data[4]
+    payload = data[6:5 + length - 2]
+    crc_ok = crc16_ccitt(data[4:5 + length - 2]) == (data[5 + length - 2] << 8) | data[5 + length - 1]
+    return data[5], payload, crc_ok
+
+
+def legacy_parse_channel(data: bytes) -> ChannelData:
+    return ChannelData(
+        index=struct.unpack('>H', data[0:2])[0], rx_mode=data[2], tx_mode=data[3],
+        rx_freq_hz=struct.unpack('>I', data[4:8])[0], tx_freq_hz=struct.unpack('>I', data[8:12])[0],
+        rx_ctcss_index=data[12], tx_ctcss_index=data[13],
+        name=data[14:26].split(b'\x00')[0].decode('ascii', errors='replace'))
+
+
+def make_codeplug() -> list:
+    return [ChannelData(index=index, rx_mode=Mode.NFM, tx_mode=Mode.NFM,
+                        rx_freq_hz=446_006_250 + index * 12_500,
+                        tx_freq_hz=446_006_250 + index * 12_500,
+                        rx_ctcss_index=index % 50, tx_ctcss_index=0, name=f"CH{index}")
+            for index in range(CHANNEL_COUNT)]
+
+
+def best_of(repeat: int, func) -> float:
+    """Fastest of repeat runs of func (seconds)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PMR-171 packet encoding/decoding")
+    parser.add_argument('--repeat', type=int, default=10, help="Runs per variant (best is reported)")
+    args = parser.parse_args()
+
+    channels = make_codeplug()
+    command = Command.CHANNEL_WRITE
+    packets = [build_channel_packet(channel, command) for channel in channels]
+    batch = build_channel_packets(channels, command)
+    step = packet_size(BLOCK_SIZE)
+
+    # Both encoders must produce the same bytes
+    legacy_packets = [legacy_build_channel_packet(channel, command) for channel in channels]
+    if legacy_packets != packets or bytes(batch) != b''.join(packets):
+        raise AssertionError("codec output differs from the legacy encoder")
+
+    def single_decode():
+        return [parse_channel_packet(parse_packet(packet)[1]) for packet in packets]
+
+    def batch_decode():
+        view = memoryview(batch)
+        return parse_channel_payloads(view[offset + 6:offset + 6 + BLOCK_SIZE]
+                                      for offset in range(0, len(batch), step))
+
+    variants = [
+        ("encode", [
+            ("legacy", lambda: [legacy_build_channel_packet(channel, command) for channel in channels]),
+            ("single", lambda: [build_channel_packet(channel, command) for channel in channels]),
+            ("batch", lambda: build_channel_packets(channels, command)),
+        ]),
+        ("decode", [
+            ("legacy", lambda: [legacy_parse_channel(legacy_parse_packet(packet)[1]) for packet in packets]),
+            ("single", single_decode),
+            ("batch", batch_decode),
+        ]),
+    ]
+
+    print(f"{len(channels)} channels, best of {args.repeat} runs")
+    for label, runs in variants:
+        print(f"\n{label}:")
+        baseline = None
+        for name, func in runs:
+            elapsed = best_of(args.repeat, func)
+            baseline = baseline or elapsed
+            per_packet = elapsed / len(channels) * 1e6
+            print(f"  {name:8s} {elapsed * 1000:8.2f} ms  {per_packet:6.2f} us/packet  "
+                  f"x{baseline / elapsed:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the PMR-171 CRC-16-CCITT implementations.
+
+Compares the original bit-by-bit loop, the 256-entry table and the
+binascii.crc_hqx fast path on two workloads:
+
+  1. Building and parsing 1000 channel packets (one full codeplug read:
+     each round trip computes the CRC in build_packet and parse_packet)
+  2. Checksumming every A5A5A5A5 packet in the Eltima .spm captures under
+     tests/test_configs/Results, plus a raw pass over the whole file
+
+Usage:
+    python scripts/benchmark_crc.py
+    python scripts/benchmark_crc.py path/to/capture.spm
+"""
+
+import struct
+import sys
+import time
+from pathlib import Path
+
+# Add repository root to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pmr_171_cps.radio.crc import (
+    CRC_INIT, crc16_ccitt_bitwise, crc16_update_table, crc16_update, HQX_AVAILABLE
+)
+from pmr_171_cps.radio.pmr171_uart import PACKET_HEADER, Command, CHANNEL_COUNT
+
+RESULTS_DIR = Path(__file__).resolve().parent.parent / "tests" / "test_configs" / "Results"
+
+IMPLEMENTATIONS = [
+    ("bitwise", lambda data: crc16_ccitt_bitwise(data)),
+    ("table", lambda data: crc16_update_table(CRC_INIT, data)),
+    ("crc_hqx" if HQX_AVAILABLE else "default", lambda data: crc16_update(CRC_INIT, data)),
+]
+
+
+def channel_crc_inputs() -> list:
+    """CRC inputs (Length + Command + Data) for a 1000-channel read session"""
+    inputs = []
+    for index in range(CHANNEL_COUNT):
+        request = bytes([5, Command.CHANNEL_READ]) + struct.pack('>H', index)
+        response = (bytes([29, Command.CHANNEL_READ]) + struct.pack('>H', index) +
+                    bytes([6, 6]) + struct.pack('>II', 446_000_000 + index, 446_000_000 + index) +
+                    bytes([0, 0]) + f"CH{index}".encode('ascii').ljust(12, b'\x00'))
+        # build_packet + parse_packet for the request/response pair
+        inputs.extend([request, request, response, response])
+    return inputs
+
+
+def spm_crc_inputs(data: bytes) -> list:
+    """CRC inputs for every plausible A5A5A5A5 packet in a capture"""
+    inputs = []
+    pos = data.find(PACKET_HEADER)
+    while pos != -1:
+        if pos + 5 <= len(data):
+            length = data[pos + 4]
+            end = pos + 5 + length
+            if 3 <= length and end <= len(data):
+                inputs.append(data[pos + 4:end - 2])
+        pos = data.find(PACKET_HEADER, pos + 1)
+    return inputs
+
+
+def run(label: str, inputs: list) -> None:
+    """Time each implementation over the inputs and print a comparison"""
+    total_bytes = sum(len(chunk) for chunk in inputs)
+    print(f"\n{label}: {len(inputs)} CRC calls, {total_bytes:,} bytes")
+
+    baseline = None
+    expected = None
+    for name, func in IMPLEMENTATIONS:
+        start = time.perf_counter()
+        results = [func(chunk) for chunk in inputs]
+        elapsed = time.perf_counter() - start
+
+        if expected is None:
+            expected = results
+        elif results != expected:
+            raise AssertionError(f"{name} results differ from bitwise reference")
+
+        if baseline is None:
+            baseline = elapsed
+        speedup = baseline / elapsed if elapsed > 0 else float('inf')
+        rate = total_bytes / elapsed / 1e6 if elapsed > 0 else float('inf')
+        print(f"  {name:10s} {elapsed * 1000:10.2f} ms  {rate:8.2f} MB/s  x{speedup:,.1f}")
+
+
+def main() -> int:
+    run("1000-channel read (build + parse per round trip)", channel_crc_inputs())
+
+    if len(sys.argv) > 1:
+        captures = [Path(arg) for arg in sys.argv[1:]]
+    else:
+        captures = sorted(RESULTS_DIR.glob("*.spm"))[:1]
+
+    for capture in captures:
+        data = capture.read_bytes()
+        run(f"{capture.name} packets", spm_crc_inputs(data))
+        run(f"{capture.name} raw ({len(data) / 1e6:.1f} MB)", [data])
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Read/write throughput benchmark against the software PMR-171 emulator.
+
+Starts a RadioEmulator on a pseudo-terminal, connects an unmodified
+PMR171Radio to it and times:
+
+  1. Writing a codeplug (analog + DMR channels)
+  2. Reading it back one channel per round trip
+  3. Reading it back pipelined (PIPELINED_READ_WINDOW requests in flight)
+
+Responses are paced at the emulated baud rate, and writes are delayed by
+the given flash-commit latency, so the numbers track protocol overhead
+rather than Python speed alone. Linux/macOS only (needs os.openpty).
+
+With --loopback the emulator is attached through an in-memory
+LoopbackTransport instead, with no pty, pacing or latency, which isolates
+the driver's own per-channel overhead.
+
+Usage:
+    python scripts/benchmark_radio.py
+    python scripts/benchmark_radio.py --channels 1000 --write-latency 0.02
+    python scripts/benchmark_radio.py --loopback
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add repository root to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pmr_171_cps.radio.pmr171_uart import (
+    PMR171Radio, ChannelData, Command, Mode, PIPELINED_READ_WINDOW, DEFAULT_BAUDRATE
+)
+from pmr_171_cps.radio.emulator import RadioEmulator
+from pmr_171_cps.radio.transport import LoopbackTransport
+
+
+def make_codeplug(count: int, dmr_every: int) -> list:
+    """count channels, every dmr_every-th one DMR"""
+    channels = []
+    for index in range(count):
+        mode = Mode.DMR if dmr_every and index % dmr_every == 0 else Mode.NFM
+        channel = ChannelData(index=index, rx_mode=mode, tx_mode=mode,
+                              rx_freq_hz=446_006_250 + index * 12_500,
+                              tx_freq_hz=446_006_250 + index * 12_500,
+                              rx_ctcss_index=0, tx_ctcss_index=0, name=f"BENCH{index}")
+        if mode == Mode.DMR:
+            channel.call_id = 91
+        channels.append(channel)
+    return channels
+
+
+def timed(label: str, count: int, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:24s} {elapsed:8.2f} s  {count / elapsed:8.1f} ch/s")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--channels', type=int, default=200, help="Channels to write and read")
+    parser.add_argument('--dmr-every', type=int, default=4, help="Make every Nth channel DMR (0 = none)")
+    parser.add_argument('--baudrate', type=int, default=DEFAULT_BAUDRATE, help="Emulated line rate")
+    parser.add_argument('--write-latency', type=float, default=0.0,
+                        help="Emulated flash-commit latency per write (seconds)")
+    parser.add_argument('--loopback', action='store_true',
+                        help="Attach the emulator in memory (no pty, no pacing)")
+    args = parser.parse_args()
+
+    channels = make_codeplug(args.channels, args.dmr_every)
+    indices = [channel.index for channel in channels]
+    latency = {Command.CHANNEL_WRITE: args.write_latency, Command.DMR_DATA_WRITE: args.write_latency}
+
+    emulator = RadioEmulator(baudrate=args.baudrate, commit_latency=latency)
+    if args.loopback:
+        port = LoopbackTransport(emulator)
+        print(f"In-memory loopback: {args.channels} channels")
+    else:
+        port = emulator.start()
+        print(f"Emulator on {emulator.port}: {args.channels} channels, {args.baudrate} baud, "
+              f"{args.write_latency * 1000:.0f} ms write latency")
+
+    try:
+        with PMR171Radio(port) as radio:
+            timed("write", len(channels), lambda: radio.write_all_channels(channels))
+            radio.read_window = 1
+            sequential = timed("read (sequential)", len(indices), lambda: radio.read_selected_channels(indices))
+            radio.read_window = PIPELINED_READ_WINDOW
+            pipelined = timed(f"read (window {PIPELINED_READ_WINDOW})", len(indices),
+                              lambda: radio.read_selected_channels(indices))
+    finally:
+        emulator.stop()
+
+    expected = [channel.name for channel in channels]
+    for label, result in (("sequential", sequential), ("pipelined", pipelined)):
+        if [channel.name for channel in result] != expected:
+            print(f"  {label} read-back does not match the written codeplug")
+            return 1
+
+    print(f"  {emulator.bytes_in:,} bytes in, {emulator.bytes_out:,} bytes out")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
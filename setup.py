@@ -39,6 +39,9 @@ setup(
         "uart": [
             "pyserial>=3.5",  # For future UART programming support
         ],
+        "spectrum": [
+            "numpy>=1.20",  # Spectrum (0x39) waterfall and capture extraction
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -0,0 +1,177 @@
+"""In-memory serial port stand-ins and test data for hardware-free driver tests"""
+
+import asyncio
+import struct
+import time
+
+from pmr_171_cps.radio.pmr171_uart import (
+    ChannelData,
+    PacketFramer,
+    Command,
+    Mode,
+    build_packet,
+    parse_packet,
+)
+from pmr_171_cps.radio.async_radio import AsyncTransport
+from pmr_171_cps.radio.transport import Transport
+
+# Non-default DMR settings, so a DMR block written with them is recognisable
+DMR_FIELDS = {'rx_cc': 3, 'tx_cc': 3, 'call_id': 91, 'own_id': 3107683, 'call_format': 0}
+
+
+def make_channel(index: int, name: str = None, mode: int = Mode.NFM,
+                 freq_step: int = 0, **fields) -> ChannelData:
+    """
+    Simplex channel on 446.00625 MHz named CH<index>.
+
+    Args:
+        index: Channel slot
+        name: Channel name (default CH<index>)
+        mode: RX and TX mode
+        freq_step: Hz added to the frequency per slot, so channels differ
+        fields: Any other ChannelData fields (e.g. **DMR_FIELDS)
+    """
+    freq = 446_006_250 + index * freq_step
+    values = {'rx_freq_hz': freq, 'tx_freq_hz': freq, 'rx_ctcss_index': 0, 'tx_ctcss_index': 0}
+    values.update(fields)
+    return ChannelData(index=index, rx_mode=mode, tx_mode=mode, name=name or f"CH{index}", **values)
+
+
+def channel_payload(index: int, mode: int = Mode.NFM) -> bytes:
+    """
+    26-byte CHANNEL_READ payload packed by hand (not by the driver's encoder),
+    on a different frequency for every slot.
+    """
+    name = f"CH{index}".encode('ascii').ljust(12, b'\x00')
+    freq = 446_000_000 + index * 12_500
+    return struct.pack('>HBBII', index, mode, mode, freq, freq) + bytes([0, 0]) + name
+
+
+class FakeSerial(Transport):
+    """Minimal Transport stand-in that replays canned RX bytes"""
+
+    def __init__(self, rx: bytes = b''):
+        self.rx = bytearray(rx)
+        self.tx = bytearray()
+        self.is_open = True
+        self.read_calls = 0
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.rx)
+
+    def read(self, size: int = 1) -> bytes:
+        self.read_calls += 1
+        if not self.rx:
+            time.sleep(0.005)  # Behave like a short read timeout
+        data = bytes(self.rx[:size])
+        del self.rx[:size]
+        return data
+
+    def write(self, data: bytes) -> int:
+        self.tx += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.is_open = False
+
+
+class FakeRadioSerial(FakeSerial):
+    """
+    FakeSerial that answers CHANNEL_READ / DMR_DATA_READ requests from a
+    memory image.
+
+    Args:
+        channels: channel index -> 26-byte channel payload
+        dmr: channel index -> 26-byte DMR payload
+        drop_once: channel indices whose first read request is ignored
+        reverse: deliver queued responses newest-first (out of order)
+        latency: seconds each request takes to answer (a slow radio)
+    """
+
+    def __init__(self, channels=None, dmr=None, drop_once=(), reverse=False, latency=0.0):
+        super().__init__()
+        self.latency = latency
+        self.channels = dict(channels or {})
+        self.dmr = dict(dmr or {})
+        self.drop_once = set(drop_once)
+        self.reverse = reverse
+        self.requests = []
+        self._framer = PacketFramer()
+
+    def channel_payload(self, index: int) -> bytes:
+        return self.channels.get(index, struct.pack('>H', index) + bytes([0xFF, 0xFF]) + bytes(22))
+
+    def write(self, data: bytes) -> int:
+        super().write(data)
+        self._framer.feed(data)
+        for kind, frame in self._framer.frames():
+            if kind != PacketFramer.PACKET:
+                continue
+            cmd, payload, _ = parse_packet(frame)
+            self.requests.append((cmd, payload))
+            if self.latency:
+                time.sleep(self.latency)
+            response = self.respond(cmd, payload)
+            if response is None:
+                continue
+            if self.reverse:
+                self.rx[0:0] = response
+            else:
+                self.rx += response
+        return len(data)
+
+    def respond(self, cmd: int, payload: bytes):
+        index = struct.unpack('>H', payload[:2])[0] if len(payload) >= 2 else 0
+        if cmd == Command.CHANNEL_READ:
+            if index in self.drop_once:
+                self.drop_once.discard(index)
+                return None
+            return build_packet(cmd, self.channel_payload(index))
+        if cmd == Command.DMR_DATA_READ:
+            return build_packet(cmd, self.dmr.get(index, struct.pack('>H', index) + bytes(24)))
+        if cmd in (Command.CHANNEL_WRITE, Command.DMR_DATA_WRITE):
+            if cmd == Command.CHANNEL_WRITE:
+                self.channels[index] = payload
+            else:
+                self.dmr[index] = payload
+            return build_packet(cmd, payload)
+        return None
+
+
+class AsyncFakeTransport(AsyncTransport):
+    """
+    AsyncTransport over a FakeRadioSerial memory image.
+
+    Args:
+        radio: FakeRadioSerial that answers the requests
+        latency: Seconds before each response becomes readable
+    """
+
+    def __init__(self, radio: FakeRadioSerial = None, latency: float = 0.0):
+        self.radio = radio or FakeRadioSerial()
+        self.latency = latency
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def read(self) -> bytes:
+        while not self.radio.rx:
+            await asyncio.sleep(0.001)
+        data = bytes(self.radio.rx)
+        self.radio.rx.clear()
+        return data
+
+    async def write(self, data: bytes) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.radio.write(data)
+
+    async def discard_input(self) -> int:
+        count = len(self.radio.rx)
+        self.radio.rx.clear()
+        return count
@@ -0,0 +1,241 @@
+"""Tests for the asyncio PMR-171 client"""
+
+import asyncio
+
+import pytest
+
+from pmr_171_cps.radio.pmr171_uart import Command, Mode, DMRReadError, SessionAbortedError
+from pmr_171_cps.radio.async_radio import AsyncPMR171Radio, StreamTransport
+from pmr_171_cps.radio.retry import RetryPolicy
+from tests.fake_serial import AsyncFakeTransport, FakeRadioSerial, make_channel
+
+
+def make_radio(**kwargs) -> AsyncPMR171Radio:
+    return AsyncPMR171Radio(AsyncFakeTransport(**kwargs), timeout=0.05)
+
+
+def test_write_then_read_back():
+    async def scenario():
+        async with make_radio() as radio:
+            dmr = make_channel(3, mode=Mode.DMR)
+            dmr.call_id = 91
+            dmr.slot = 2
+            assert await radio.write_channel(make_channel(1, name="ALPHA"))
+            assert await radio.write_channel(dmr)
+            return await radio.read_channel(1), await radio.read_channel(3)
+
+    plain, dmr = asyncio.run(scenario())
+    assert plain.name == "ALPHA"
+    assert (dmr.call_id, dmr.slot) == (91, 2)
+
+
+def test_read_all_channels_subset():
+    async def scenario():
+        async with make_radio() as radio:
+            for index in (0, 2):
+                await radio.write_channel(make_channel(index))
+            return await radio.read_all_channels(include_empty=False, channel_indices=range(4))
+
+    assert [c.index for c in asyncio.run(scenario())] == [0, 2]
+
+
+def test_dropped_response_is_retried():
+    async def scenario():
+        transport = AsyncFakeTransport(FakeRadioSerial(drop_once=[5]))
+        async with AsyncPMR171Radio(transport, timeout=0.05) as radio:
+            channel = await radio.read_channel(5)
+        return channel, transport
+
+    channel, transport = asyncio.run(scenario())
+    assert channel.index == 5
+    assert transport.closed
+    reads = [p for cmd, p in transport.radio.requests if cmd == Command.CHANNEL_READ and p == b'\x00\x05']
+    assert len(reads) == 2
+
+
+def test_cancel_task():
+    """Cancelling the task stops a bulk read; the client stays usable"""
+    async def scenario():
+        radio = make_radio(latency=0.01)
+        await radio.connect()
+        task = asyncio.create_task(radio.read_all_channels())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        channel = await radio.read_channel(7)
+        await radio.disconnect()
+        return channel
+
+    assert asyncio.run(scenario()).index == 7
+
+
+def test_stream_transport_over_tcp():
+    """The client runs unchanged over a socket stand-in"""
+    async def handle(reader, writer):
+        fake = FakeRadioSerial()
+        while True:
+            data = await reader.read(64)
+            if not data:
+                break
+            fake.write(data)
+            writer.write(bytes(fake.rx))
+            fake.rx.clear()
+            await writer.drain()
+        writer.close()
+
+    async def scenario():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            transport = await StreamTransport.connect_tcp('127.0.0.1', port)
+            async with AsyncPMR171Radio(transport, timeout=0.5) as radio:
+                await radio.write_channel(make_channel(9, name="TCP"))
+                return await radio.read_channel(9)
+
+    assert asyncio.run(scenario()).name == "TCP"
+
+
+class MisdirectedSerial(FakeRadioSerial):
+    """Answers a write with a read response and a read with another slot, once each"""
+
+    def __init__(self):
+        super().__init__()
+        self.misdirect = {Command.CHANNEL_WRITE, Command.CHANNEL_READ}
+
+    def respond(self, cmd, payload):
+        if cmd in self.misdirect:
+            self.misdirect.discard(cmd)
+            if cmd == Command.CHANNEL_WRITE:
+                return super().respond(Command.CHANNEL_READ, payload[:2])
+            return super().respond(cmd, b'\x00\x63')
+        if cmd == Command.DMR_DATA_WRITE:
+            return None
+        return super().respond(cmd, payload)
+
+
+def test_responses_are_checked():
+    """A packet for another command or slot is not taken as the answer"""
+    async def scenario():
+        transport = AsyncFakeTransport(MisdirectedSerial())
+        radio = AsyncPMR171Radio(transport, timeout=0.05, retry_policy=RetryPolicy(max_attempts=2))
+        assert radio._lock is None
+        async with radio:
+            assert await radio.write_channel(make_channel(2, name="TWO"))
+            channel = await radio.read_channel(2)
+            assert not await radio.write_channel(make_channel(4, mode=Mode.DMR))
+        return channel, transport
+
+    channel, transport = asyncio.run(scenario())
+    assert channel.name == "TWO"
+    writes = [p[:2] for cmd, p in transport.radio.requests if cmd == Command.CHANNEL_WRITE]
+    assert writes == [b'\x00\x02', b'\x00\x02', b'\x00\x04']
+
+
+def test_serial_transport_drains_after_pending_read():
+    """discard_input never reads the port while an executor read is running"""
+    pytest.importorskip("serial")
+    from pmr_171_cps.radio.async_radio import AsyncSerialTransport
+    from pmr_171_cps.radio.emulator import RadioEmulator, EMULATOR_AVAILABLE
+    if not EMULATOR_AVAILABLE:
+        pytest.skip("needs os.openpty")
+
+    async def scenario(port):
+        transport = AsyncSerialTransport(port)
+        async with AsyncPMR171Radio(transport, timeout=0.5) as radio:
+            # A cancelled request leaves its read running in the executor
+            reader = asyncio.ensure_future(transport.read())
+            await asyncio.sleep(0)
+            reader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await reader
+            await radio._clear_input()
+            assert transport._pending_read is None
+            return await radio.read_channel(3)
+
+    with RadioEmulator(channels=[make_channel(3, name="PTY")]) as emulator:
+        assert asyncio.run(scenario(emulator.port)).name == "PTY"
+
+
+class SilentSerial(FakeRadioSerial):
+    """Never answers, like a radio that was unplugged or left programming mode"""
+
+    def respond(self, cmd, payload):
+        return None
+
+
+def test_bulk_operations_trip_breaker():
+    """breaker_threshold silent channels in a row abort a bulk read or write"""
+    policy = RetryPolicy(max_attempts=1, breaker_threshold=3)
+
+    async def scenario():
+        transport = AsyncFakeTransport(SilentSerial())
+        async with AsyncPMR171Radio(transport, timeout=0.05, retry_policy=policy) as radio:
+            with pytest.raises(SessionAbortedError, match='3 consecutive failed channels'):
+                await radio.read_all_channels(channel_indices=range(10))
+            with pytest.raises(SessionAbortedError):
+                await radio.write_all_channels([make_channel(i) for i in range(10)])
+        return transport.radio.requests
+
+    requests = asyncio.run(scenario())
+    assert len([p for cmd, p in requests if cmd == Command.CHANNEL_WRITE]) == 3
+    # Connect wake, three reads, then a pre-write wake before each write
+    assert len([p for cmd, p in requests if cmd == Command.CHANNEL_READ]) == 1 + 3 + 3
+
+
+class NoDMRReadSerial(FakeRadioSerial):
+    """Stores DMR blocks but never answers a DMR data read"""
+
+    def respond(self, cmd, payload):
+        if cmd == Command.DMR_DATA_READ:
+            return None
+        return super().respond(cmd, payload)
+
+
+def test_failed_dmr_read_is_reported():
+    async def scenario():
+        progress = []
+        async with AsyncPMR171Radio(AsyncFakeTransport(NoDMRReadSerial()), timeout=0.05,
+                                    retry_policy=RetryPolicy(max_attempts=1)) as radio:
+            dmr = make_channel(3, mode=Mode.DMR)
+            dmr.call_id = 91
+            assert await radio.write_channel(dmr)
+            with pytest.raises(DMRReadError) as excinfo:
+                await radio.read_channel(3)
+            channels = await radio.read_all_channels(
+                channel_indices=[2, 3],
+                progress_callback=lambda cur, total, msg: progress.append(msg))
+        return excinfo.value, channels, progress
+
+    error, channels, progress = asyncio.run(scenario())
+    assert error.channel.index == 3 and error.channel.call_id != 91
+    assert [c.index for c in channels] == [2, 3]
+    assert "Error reading DMR data for channel 3" in progress
+
+
+def test_write_wakes_idle_radio():
+    """A write after the radio went back to streaming status is preceded by a wake"""
+    pytest.importorskip("serial")
+    from pmr_171_cps.radio.async_radio import AsyncSerialTransport
+    from pmr_171_cps.radio.emulator import RadioEmulator, EMULATOR_AVAILABLE
+    if not EMULATOR_AVAILABLE:
+        pytest.skip("needs os.openpty")
+
+    async def scenario(emulator):
+        radio = AsyncPMR171Radio(AsyncSerialTransport(emulator.port), timeout=0.5,
+                                 keepalive_idle=emulator.idle_timeout)
+        async with radio:
+            assert await radio.write_channel(make_channel(1, name="BUSY"))
+            await asyncio.sleep(emulator.idle_timeout * 3)
+            assert not emulator.programming
+            reads = emulator.requests.get(Command.CHANNEL_READ, 0)
+            assert await radio.write_channel(make_channel(2, name="IDLE"))
+            assert emulator.requests[Command.CHANNEL_READ] == reads + 1
+            assert await radio.write_channel(make_channel(3, name="AWAKE"))
+            assert emulator.requests[Command.CHANNEL_READ] == reads + 1
+            assert (await radio.read_channel(2)).name == "IDLE"
+            return radio.session
+
+    with RadioEmulator(idle_timeout=0.2, status_interval=0.02) as emulator:
+        session = asyncio.run(scenario(emulator))
+    assert (session.wakes_sent, session.wakes_avoided) == (1, 2)
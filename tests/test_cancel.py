@@ -0,0 +1,118 @@
+"""Tests for token-based cancellation of radio operations"""
+
+import threading
+import time
+
+import pytest
+
+from pmr_171_cps.radio.cancel import CancelToken
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, OperationCancelledError
+from pmr_171_cps.radio.retry import RetryPolicy
+from tests.fake_serial import FakeRadioSerial, channel_payload, make_channel
+
+CANCEL_LATENCY = 0.1
+
+
+class MuteRadioSerial(FakeRadioSerial):
+    """Ignores every request while mute is set"""
+
+    mute = False
+
+    def respond(self, cmd, payload):
+        if self.mute:
+            return None
+        return super().respond(cmd, payload)
+
+
+def make_radio(window=1, timeout=2.0, **kwargs):
+    port = MuteRadioSerial(channels={i: channel_payload(i) for i in range(20)})
+    # Long timeouts and backoffs: without the token a cancel would take seconds
+    radio = PMR171Radio(port, timeout=timeout, read_window=window, keepalive_idle=60,
+                        retry_policy=RetryPolicy(max_attempts=5, base_backoff=3.0, breaker_threshold=None),
+                        **kwargs)
+    return radio, port
+
+
+def cancel_while_running(radio, operation, delay=0.3):
+    """Run operation on a thread, cancel it after delay; returns (result, seconds to return)"""
+    outcome = {}
+    worker = threading.Thread(target=lambda: outcome.setdefault('result', operation()))
+    worker.start()
+    time.sleep(delay)
+    cancelled_at = time.monotonic()
+    radio.cancel()
+    worker.join(5)
+    assert not worker.is_alive()
+    return outcome.get('result'), time.monotonic() - cancelled_at
+
+
+def assert_reusable(radio, port):
+    port.mute = False
+    assert not radio.cancel_token.cancelled
+    assert radio.metrics.cancellations == 1
+    assert [c.name for c in radio.read_selected_channels([3, 4])] == ["CH3", "CH4"]
+
+
+def test_token_is_a_cancel_check():
+    token = CancelToken()
+    assert not token() and not token.wait(0.01)
+    token.cancel()
+    assert token() and token.cancelled and token.wait(10)
+    token.clear()
+    assert not token.cancelled
+
+
+@pytest.mark.parametrize("window", [1, 4])
+def test_cancel_read_of_dead_radio(window):
+    radio, port = make_radio(window)
+    port.mute = True
+    channels, latency = cancel_while_running(radio, lambda: radio.read_selected_channels(list(range(10))))
+    assert latency < CANCEL_LATENCY
+    assert channels == []
+    assert_reusable(radio, port)
+
+
+def test_cancel_during_retry_backoff():
+    radio, port = make_radio(timeout=0.05)
+    port.mute = True
+    channels, latency = cancel_while_running(radio, lambda: radio.read_all_channels(), delay=0.5)
+    assert latency < CANCEL_LATENCY
+    assert channels == []
+    assert radio.metrics.retries  # Cancelled while backing off, not while reading
+    assert_reusable(radio, port)
+
+
+def test_cancel_write_keeps_completed_channels():
+    radio, port = make_radio()
+    channels = [make_channel(i, name=f"W{i}") for i in range(10)]
+
+    def write():
+        written = radio.write_all_channels(channels[:2])
+        port.mute = True
+        return written + radio.write_all_channels(channels[2:])
+
+    written, latency = cancel_while_running(radio, write)
+    assert latency < CANCEL_LATENCY
+    assert written == 2 and radio.last_write_summary['failed'] == 0
+    assert_reusable(radio, port)
+    assert radio.read_selected_channels([1])[0].name == "W1"
+
+
+def test_single_channel_read_raises():
+    radio, port = make_radio()
+    port.mute = True
+    outcome = {}
+
+    def read():
+        try:
+            radio.read_channel(0)
+        except OperationCancelledError as e:
+            outcome['error'] = e
+
+    worker = threading.Thread(target=read)
+    worker.start()
+    time.sleep(0.1)
+    radio.cancel()
+    worker.join(1)
+    assert isinstance(outcome.get('error'), OperationCancelledError)
+    assert_reusable(radio, port)
@@ -5,28 +5,12 @@ import sys
 import time
 import struct
 import serial
+from pathlib import Path
 
-PACKET_HEADER = bytes([0xA5, 0xA5, 0xA5, 0xA5])
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-
-def crc16_ccitt(data: bytes) -> int:
-    crc = 0xFFFF
-    for byte in data:
-        cur = byte << 8
-        for _ in range(8):
-            if (crc ^ cur) & 0x8000:
-                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
-            else:
-                crc = (crc << 1) & 0xFFFF
-            cur = (cur << 1) & 0xFFFF
-    return crc
-
-
-def build_packet(cmd: int, data: bytes = b'') -> bytes:
-    length = 1 + len(data) + 2
-    crc_data = bytes([length, cmd]) + data
-    crc = crc16_ccitt(crc_data)
-    return PACKET_HEADER + bytes([length, cmd]) + data + struct.pack('>H', crc)
+from pmr_171_cps.radio.pmr171_uart import PACKET_HEADER, build_packet
 
 
 def main():
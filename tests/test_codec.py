@@ -0,0 +1,103 @@
+"""Tests for the precompiled packet codec"""
+
+import struct
+
+import pytest
+
+from pmr_171_cps.radio.codec import (
+    BLOCK_SIZE,
+    CHANNEL_LAYOUT,
+    DMR_LAYOUT,
+    decode_packet,
+    decode_payloads,
+    encode_packet,
+    packet_size,
+)
+from pmr_171_cps.radio.pmr171_uart import (
+    ChannelData,
+    Command,
+    Mode,
+    build_channel_packet,
+    build_channel_packets,
+    build_dmr_data_packet,
+    build_dmr_data_packets,
+    build_packet,
+    parse_channel_packet,
+    parse_channel_payloads,
+    parse_dmr_data_packet,
+    parse_packet,
+)
+from tests.fake_serial import make_channel
+
+
+def dmr_channel(index: int, name: str = None) -> ChannelData:
+    """DMR channel with split frequencies, tones and every DMR field set"""
+    return make_channel(index, name, Mode.DMR,
+                        rx_freq_hz=438_500_000 + index, tx_freq_hz=431_100_000 + index,
+                        rx_ctcss_index=3, tx_ctcss_index=7, rx_cc=17, tx_cc=2, slot=2,
+                        call_id=91, own_id=3107683, call_format=0)
+
+
+def test_channel_packet_matches_wire_format():
+    packet = build_channel_packet(dmr_channel(5, "A" * 20))
+    expected_payload = (struct.pack('>HBBII', 5, Mode.DMR, Mode.DMR, 438_500_005, 431_100_005) +
+                        bytes([3, 7]) + b"A" * 11 + b"\x00")
+    assert packet == build_packet(Command.CHANNEL_WRITE, expected_payload)
+    assert len(packet) == packet_size(BLOCK_SIZE)
+
+
+def test_dmr_packet_matches_wire_format():
+    payload = parse_packet(build_dmr_data_packet(dmr_channel(5)))[1]
+    assert payload == (struct.pack('>HxBBBII', 5, 1, 2, 2, 91, 3107683) + bytes(5) +
+                       bytes([0]) + bytes([0, 0, 0, 0, 0, 1]))
+    fields = parse_dmr_data_packet(payload)
+    assert (fields['rx_cc'], fields['slot'], fields['own_id'], fields['call_type']) == (1, 2, 3107683, 0)
+
+
+def test_channel_round_trip():
+    channel = dmr_channel(999)
+    decoded = parse_channel_packet(parse_packet(build_channel_packet(channel))[1])
+    assert (decoded.index, decoded.rx_freq_hz, decoded.tx_ctcss_index, decoded.name) == \
+        (999, 438_500_999, 7, "CH999")
+
+
+def test_batch_equals_single_packets():
+    channels = [dmr_channel(index) for index in range(50)]
+    assert bytes(build_channel_packets(channels)) == b''.join(build_channel_packet(c) for c in channels)
+    assert bytes(build_dmr_data_packets(channels)) == b''.join(build_dmr_data_packet(c) for c in channels)
+    assert build_channel_packets([]) == bytearray()
+
+
+def test_batch_decode_list_and_contiguous():
+    channels = [dmr_channel(index) for index in range(10)]
+    payloads = [parse_packet(build_channel_packet(c))[1] for c in channels]
+    from_list = parse_channel_payloads(payloads)
+    from_buffer = parse_channel_payloads(b''.join(payloads))
+    assert [c.name for c in from_list] == [c.name for c in channels]
+    assert from_list == from_buffer
+    assert decode_payloads(DMR_LAYOUT, []) == []
+
+
+def test_decode_packet_is_zero_copy():
+    packet = bytearray(encode_packet(Command.CHANNEL_READ, CHANNEL_LAYOUT,
+                                     (1, 6, 6, 446_000_000, 446_000_000, 0, 0, b"X")))
+    command, payload, crc_valid = decode_packet(packet)
+    assert command == Command.CHANNEL_READ and crc_valid
+    assert isinstance(payload, memoryview) and payload.obj is packet
+    assert CHANNEL_LAYOUT.unpack_from(payload)[0] == 1
+
+    packet[-1] ^= 0xFF
+    assert decode_packet(packet)[2] is False
+    assert parse_packet(bytes(packet))[2] is False
+
+
+@pytest.mark.parametrize("data, message", [
+    (b'\xa5' * 4, "too short"),
+    (b'\x00' * 10, "Invalid header"),
+    (bytes.fromhex('a5a5a5a5') + bytes([2, 0x41, 0, 0]), "Invalid length"),
+    (bytes.fromhex('a5a5a5a5') + bytes([29, 0x41, 0, 0]), "incomplete"),
+])
+def test_malformed_packets(data, message):
+    for copy in (False, True):
+        with pytest.raises(ValueError, match=message):
+            decode_packet(data, copy=copy)
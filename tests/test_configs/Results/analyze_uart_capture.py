@@ -24,6 +24,11 @@ from pathlib import Path
 from typing import List, Tuple, Dict, Optional
 import re
 
+# Add repository root to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from pmr_171_cps.radio.crc import crc16_ccitt
+
 
 # PMR-171 Protocol Constants
 PACKET_HEADER = bytes([0xA5, 0xA5, 0xA5, 0xA5])
@@ -63,27 +68,6 @@ MODES = {
 }
 
 
-def crc16_ccitt(data: bytes) -> int:
-    """
-    Calculate CRC-16-CCITT for PMR-171 protocol.
-    
-    From manual (Sheet 39):
-    - Polynomial: 0x1021
-    - Initial value: 0xFFFF
-    - Input: bytes from Length field through last DATA byte (before CRC)
-    """
-    crc = 0xFFFF
-    for byte in data:
-        cur = byte << 8
-        for _ in range(8):
-            if (crc ^ cur) & 0x8000:
-                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
-            else:
-                crc = (crc << 1) & 0xFFFF
-            cur = (cur << 1) & 0xFFFF
-    return crc
-
-
 def verify_packet_crc(packet_data: bytes) -> Tuple[bool, int, int]:
     """
     Verify CRC of a packet.
@@ -0,0 +1,58 @@
+"""Tests for the PMR-171 CRC-16-CCITT module"""
+
+import random
+
+import pytest
+
+from pmr_171_cps.radio.crc import (
+    CRC_INIT,
+    CRC16_TABLE,
+    crc16_ccitt,
+    crc16_ccitt_bitwise,
+    crc16_update,
+    crc16_update_table,
+)
+
+
+def test_check_value():
+    """CRC-16/CCITT-FALSE check value for '123456789'"""
+    assert crc16_ccitt(b'123456789') == 0x29B1
+    assert crc16_ccitt_bitwise(b'123456789') == 0x29B1
+
+
+def test_table_size():
+    assert len(CRC16_TABLE) == 256
+    assert CRC16_TABLE[1] == 0x1021
+
+
+def test_known_packet():
+    """Channel 0 read request: A5 A5 A5 A5 | 05 41 00 00 | 12 18"""
+    crc_data = bytes([0x05, 0x41, 0x00, 0x00])
+    assert crc16_ccitt(crc_data) == 0x1218
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fast_paths_match_bitwise(seed):
+    """Table and crc_hqx paths are bit-exact with the original loop"""
+    rng = random.Random(seed)
+    for size in (0, 1, 2, 29, 31, 255, 1024):
+        data = bytes(rng.randrange(256) for _ in range(size))
+        expected = crc16_ccitt_bitwise(data)
+        assert crc16_update_table(CRC_INIT, data) == expected
+        assert crc16_update(CRC_INIT, data) == expected
+        assert crc16_ccitt(data) == expected
+
+
+def test_incremental_update():
+    """Feeding chunks gives the same result as one call"""
+    data = bytes(range(256)) * 3
+    crc = CRC_INIT
+    for i in range(0, len(data), 7):
+        crc = crc16_update(crc, data[i:i + 7])
+    assert crc == crc16_ccitt(data)
+
+
+def test_uart_module_uses_shared_crc():
+    pytest.importorskip("serial")
+    from pmr_171_cps.radio import pmr171_uart
+    assert pmr171_uart.crc16_ccitt is crc16_ccitt
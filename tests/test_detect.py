@@ -0,0 +1,111 @@
+"""Tests for parallel radio port auto-detection"""
+
+import time
+
+import pytest
+
+pytest.importorskip("serial")
+
+from pmr_171_cps.radio.detect import PortDetector, parse_usb_id
+from tests.fake_serial import FakeRadioSerial, FakeSerial
+
+CH340 = 'USB VID:PID=1A86:7523 SER=A LOCATION=1-1'
+
+
+def make_detector(tmp_path, ports, serials, settle_delay=0.0):
+    opened = []
+
+    def serial_factory(port):
+        opened.append(port)
+        if serials.get(port) is None:
+            raise OSError(f"cannot open {port}")
+        return serials[port]
+
+    detector = PortDetector(probe_timeout=0.2, settle_delay=settle_delay,
+                            cache_path=tmp_path / 'ports.json',
+                            serial_factory=serial_factory, list_ports=lambda: ports)
+    return detector, opened
+
+
+def port(name, hwid):
+    return {'port': name, 'description': f"{name} cable", 'hwid': hwid}
+
+
+def test_parse_usb_id():
+    assert parse_usb_id(CH340) == (0x1A86, 0x7523)
+    assert parse_usb_id('PNP0501') is None
+
+
+def test_detect_ranks_by_response_time_and_caches(tmp_path):
+    ports = [port('SLOW', CH340 + '2'), port('FAST', CH340 + '3'), port('SILENT', CH340 + '4'),
+             port('GONE', CH340 + '5'), port('BLUETOOTH', 'BTHENUM\\{0000}')]
+    serials = {'SLOW': FakeRadioSerial(latency=0.05), 'FAST': FakeRadioSerial(),
+               'SILENT': FakeSerial(), 'BLUETOOTH': FakeRadioSerial()}
+    detector, opened = make_detector(tmp_path, ports, serials)
+
+    radios = detector.detect()
+    assert [radio.port for radio in radios] == ['FAST', 'SLOW']
+    assert sorted(opened) == ['FAST', 'GONE', 'SILENT', 'SLOW']   # Unknown VID:PID skipped
+    assert not any(radio.cached for radio in radios)
+
+    opened.clear()
+    again = detector.detect()
+    assert [radio.port for radio in again] == ['FAST', 'SLOW']
+    assert all(radio.cached for radio in again)
+    assert opened == []
+
+
+def test_include_unknown_and_forget(tmp_path):
+    ports = [port('RADIO', CH340), port('NATIVE', '')]
+    serials = {'RADIO': FakeRadioSerial(), 'NATIVE': FakeRadioSerial()}
+    detector, opened = make_detector(tmp_path, ports, serials)
+
+    assert [radio.port for radio in detector.detect()] == ['RADIO']
+    assert {radio.port for radio in detector.detect(include_unknown=True)} == {'RADIO', 'NATIVE'}
+
+    detector.forget('RADIO')
+    opened.clear()
+    serials['RADIO'] = FakeRadioSerial()
+    detector.detect()
+    assert opened == ['RADIO']
+
+
+class EchoSerial(FakeSerial):
+    """Loopback adapter: every byte written comes straight back"""
+
+    def write(self, data):
+        self.rx += data
+        return super().write(data)
+
+
+class WakingRadioSerial(FakeRadioSerial):
+    """Ignores requests until settle seconds after DTR/RTS were raised"""
+
+    def __init__(self, settle):
+        super().__init__()
+        self.settle = settle
+        self.raised_at = None
+
+    def set_control_lines(self, dtr=True, rts=True):
+        self.raised_at = time.time()
+
+    def respond(self, cmd, payload):
+        if self.raised_at is None or time.time() - self.raised_at < self.settle:
+            return None
+        return super().respond(cmd, payload)
+
+
+def test_echo_is_not_a_radio(tmp_path):
+    ports = [port('LOOP', CH340), port('RADIO', CH340 + '2')]
+    detector, _ = make_detector(tmp_path, ports, {'LOOP': EchoSerial(), 'RADIO': FakeRadioSerial()})
+    assert [radio.port for radio in detector.detect()] == ['RADIO']
+
+
+def test_probe_waits_for_programming_mode(tmp_path):
+    ports = [port('RADIO', CH340)]
+    hasty, _ = make_detector(tmp_path / 'a', ports, {'RADIO': WakingRadioSerial(0.3)})
+    assert hasty.detect() == []
+
+    patient, _ = make_detector(tmp_path / 'b', ports, {'RADIO': WakingRadioSerial(0.1)},
+                               settle_delay=0.15)
+    assert [radio.port for radio in patient.detect()] == ['RADIO']
@@ -0,0 +1,75 @@
+"""Tests for write echo verification"""
+
+import struct
+
+from pmr_171_cps.radio.pmr171_uart import (
+    PMR171Radio,
+    Command,
+    Mode,
+    build_channel_packet,
+    parse_packet,
+)
+from pmr_171_cps.radio.retry import RetryPolicy
+from tests.fake_serial import DMR_FIELDS, FakeRadioSerial, make_channel
+
+
+class GarbledEchoSerial(FakeRadioSerial):
+    """Stores and echoes a corrupted block for the first garble writes of each command"""
+
+    def __init__(self, garble=1, **kwargs):
+        super().__init__(**kwargs)
+        self.garble = {Command.CHANNEL_WRITE: garble, Command.DMR_DATA_WRITE: garble}
+        self.writes = {Command.CHANNEL_WRITE: 0, Command.DMR_DATA_WRITE: 0}
+
+    def respond(self, cmd, payload):
+        if cmd in self.writes:
+            self.writes[cmd] += 1
+            if self.garble[cmd]:
+                self.garble[cmd] -= 1
+                payload = payload[:20] + bytes([payload[20] ^ 0x40]) + payload[21:]
+        return super().respond(cmd, payload)
+
+
+def make_radio(serial, verify_echo=True, attempts=10) -> PMR171Radio:
+    policy = RetryPolicy(max_attempts=attempts, base_backoff=0.01, jitter=0)
+    return PMR171Radio(serial, timeout=0.05, keepalive_idle=60, retry_policy=policy,
+                       verify_echo=verify_echo)
+
+
+def test_garbled_echo_is_retried():
+    serial = GarbledEchoSerial()
+    radio = make_radio(serial)
+    channel = make_channel(4)
+
+    assert radio.write_channel(channel)
+    assert serial.writes[Command.CHANNEL_WRITE] == 2
+    assert serial.channels[4] == parse_packet(build_channel_packet(channel, Command.CHANNEL_WRITE))[1]
+    assert radio.metrics.echo_mismatches == 1
+    assert radio.metrics.channel_retries == {4: 1}
+
+
+def test_echo_not_checked_by_default():
+    serial = GarbledEchoSerial()
+    radio = make_radio(serial, verify_echo=False)
+    assert radio.write_channel(make_channel(4))
+    assert serial.writes[Command.CHANNEL_WRITE] == 1
+    assert radio.metrics.echo_mismatches == 0
+
+
+def test_dmr_echo_checked():
+    serial = GarbledEchoSerial()
+    serial.garble[Command.CHANNEL_WRITE] = 0
+    radio = make_radio(serial)
+
+    assert radio.write_dmr_data(make_channel(4, mode=Mode.DMR, **DMR_FIELDS))
+    assert serial.writes[Command.DMR_DATA_WRITE] == 2
+    assert struct.unpack('>I', serial.dmr[4][6:10])[0] == 91
+    assert radio.metrics.echo_mismatches == 1
+
+
+def test_persistent_mismatch_fails_write():
+    serial = GarbledEchoSerial(garble=100)
+    radio = make_radio(serial, attempts=3)
+    assert radio.write_channel(make_channel(4)) is False
+    assert serial.writes[Command.CHANNEL_WRITE] == 3
+    assert radio.metrics.echo_mismatches == 3
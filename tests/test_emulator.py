@@ -0,0 +1,66 @@
+"""Tests for the pseudo-terminal PMR-171 emulator"""
+
+import time
+
+import pytest
+
+pytest.importorskip("serial")
+
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command, Mode
+from pmr_171_cps.radio.emulator import RadioEmulator, EMULATOR_AVAILABLE, STATUS_FRAME
+from pmr_171_cps.radio.transport import SerialTransport
+from tests.fake_serial import make_channel
+
+pytestmark = pytest.mark.skipif(not EMULATOR_AVAILABLE, reason="needs os.openpty")
+
+
+def test_unmodified_driver_round_trip():
+    dmr = make_channel(7, mode=Mode.DMR)
+    dmr.call_id = 91
+    with RadioEmulator(channels=[make_channel(3, name="PRELOAD")], status_interval=0.02) as emulator:
+        with PMR171Radio(emulator.port, timeout=0.5, read_window=4) as radio:
+            assert radio.write_channel(dmr)
+            channels = radio.read_selected_channels([3, 7, 8])
+            assert radio.get_radio_info()['connected']
+
+    assert [c.name for c in channels] == ["PRELOAD", "CH7", ""]
+    assert channels[1].call_id == 91
+    assert emulator.requests[Command.DMR_DATA_WRITE] == 1
+    assert emulator.requests[Command.EQUIPMENT_TYPE] == 1
+
+
+def test_status_noise_until_programming_command():
+    with RadioEmulator(status_interval=0.01, idle_timeout=0.2) as emulator:
+        port = SerialTransport(emulator.port)
+        port.open()
+        time.sleep(0.1)
+        assert STATUS_FRAME[:4] in port.read(port.in_waiting)
+
+        radio = PMR171Radio(port, timeout=0.5)
+        assert radio.read_channel(0).index == 0
+        port.reset_input_buffer()
+        time.sleep(0.1)
+        assert port.in_waiting == 0            # Quiet while programming
+        time.sleep(0.25)
+        assert port.in_waiting > 0             # Streaming again once idle
+        port.close()
+
+
+def test_line_time_and_commit_latency():
+    """Responses are paced at the baud rate plus the configured commit latency"""
+    with RadioEmulator(baudrate=9600, status_interval=0,
+                       commit_latency={Command.CHANNEL_WRITE: 0.05}) as emulator:
+        port = SerialTransport(emulator.port)
+        port.open()
+        radio = PMR171Radio(port, timeout=1.0, keepalive_idle=60)
+
+        start = time.perf_counter()
+        radio.read_channel(1)
+        read_time = time.perf_counter() - start
+        # 10-byte request + 34-byte response at 960 bytes/s
+        assert read_time >= 44 / 960
+
+        start = time.perf_counter()
+        assert radio.write_channel(make_channel(1))
+        assert time.perf_counter() - start >= 0.05 + 68 / 960
+        radio.disconnect()
@@ -0,0 +1,88 @@
+"""Tests for the progress event stream"""
+
+import struct
+import threading
+
+from pmr_171_cps.radio.events import (
+    CHANNEL_DONE,
+    CHANNEL_FAILED,
+    CHANNEL_RETRIED,
+    CHANNEL_STARTED,
+    PHASE_CHANGED,
+    PROGRESS,
+    ProgressQueue,
+)
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Mode
+from pmr_171_cps.radio.retry import RetryPolicy
+from tests.fake_serial import FakeRadioSerial, channel_payload
+
+
+class DeadSlotSerial(FakeRadioSerial):
+    """Never answers requests for slot 9"""
+
+    def respond(self, cmd, payload):
+        if struct.unpack('>H', payload[:2])[0] == 9:
+            return None
+        return super().respond(cmd, payload)
+
+
+def make_radio(window=1, **kwargs):
+    channels = {i: channel_payload(i, Mode.DMR if i == 2 else Mode.NFM) for i in range(6)}
+    events = ProgressQueue()
+    radio = PMR171Radio(DeadSlotSerial(channels=channels, **kwargs), timeout=0.05, read_window=window,
+                        keepalive_idle=60, events=events,
+                        retry_policy=RetryPolicy(max_attempts=2, base_backoff=0.01, breaker_threshold=None))
+    return radio, events
+
+
+def kinds(events, kind):
+    return [event for event in events if event.kind == kind]
+
+
+def test_queue_is_fifo_and_thread_safe():
+    queue = ProgressQueue()
+    threads = [threading.Thread(target=lambda: [queue.emit(CHANNEL_DONE, channel=i) for i in range(100)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(queue) == 400
+    assert len(queue.drain(limit=10)) == 10
+    assert len(queue.drain()) == 390 and queue.drain() == []
+
+    queue.callback(3, 10, "Reading channel 2")
+    event, = queue.drain()
+    assert (event.kind, event.current, event.total, event.message) == (PROGRESS, 3, 10, "Reading channel 2")
+
+
+def test_sequential_read_events():
+    radio, events = make_radio()
+    radio.read_selected_channels([0, 1, 9, 3], progress_callback=events.callback)
+    stream = events.drain()
+
+    phase, = kinds(stream, PHASE_CHANGED)
+    assert (phase.phase, phase.total) == ('read', 4)
+    assert [e.channel for e in kinds(stream, CHANNEL_STARTED)] == [0, 1, 9, 3]
+    assert [(e.channel, e.current) for e in kinds(stream, CHANNEL_DONE)] == [(0, 1), (1, 2), (3, 3)]
+    assert [e.channel for e in kinds(stream, CHANNEL_FAILED)] == [9]
+    assert [(e.channel, e.attempt) for e in kinds(stream, CHANNEL_RETRIED)] == [(9, 1)]
+    assert len(kinds(stream, PROGRESS)) >= 4
+
+
+def test_pipelined_read_phases_and_retry():
+    radio, events = make_radio(window=4, drop_once={4})
+    radio.read_selected_channels(list(range(6)))
+    stream = events.drain()
+
+    assert [(e.phase, e.total) for e in kinds(stream, PHASE_CHANGED)] == \
+        [('channel_blocks', 6), ('dmr_blocks', 1)]
+    assert [(e.channel, e.attempt) for e in kinds(stream, CHANNEL_RETRIED)] == [(4, 1)]
+    done = kinds(stream, CHANNEL_DONE)
+    assert sorted(e.channel for e in done if e.phase == 'channel_blocks') == list(range(6))
+    assert [e.channel for e in done if e.phase == 'dmr_blocks'] == [2]
+
+
+def test_no_events_without_queue():
+    radio = PMR171Radio(FakeRadioSerial(channels={0: channel_payload(0)}), timeout=0.05, keepalive_idle=60)
+    assert radio.read_selected_channels([0])[0].name == "CH0"
@@ -0,0 +1,99 @@
+"""Tests for the parallel fleet programmer"""
+
+import functools
+import os
+import tty
+
+import pytest
+
+pytest.importorskip("serial")
+
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command, Mode
+from pmr_171_cps.radio.emulator import RadioEmulator, EMULATOR_AVAILABLE, empty_channel_block
+from pmr_171_cps.radio.fleet import FleetProgrammer, encode_channels
+from pmr_171_cps.radio.retry import RetryPolicy
+from tests.fake_serial import make_channel
+
+pytestmark = pytest.mark.skipif(not EMULATOR_AVAILABLE, reason="needs os.openpty")
+
+# Real driver on every port; short timeouts keep the failure cases quick
+radio_factory = functools.partial(PMR171Radio, timeout=0.1, keepalive_idle=0,
+                                  retry_policy=RetryPolicy(max_attempts=2, breaker_threshold=2))
+
+
+def make_codeplug(count=6):
+    channels = [make_channel(i) for i in range(count - 1)]
+    dmr = make_channel(count - 1, mode=Mode.DMR)
+    dmr.call_id = 91
+    channels.append(dmr)
+    return channels
+
+
+def test_program_and_verify_fleet():
+    channels = make_codeplug()
+    slow_writes = {Command.CHANNEL_WRITE: 0.03}
+    with RadioEmulator(status_interval=0) as a, RadioEmulator(status_interval=0) as b, \
+            RadioEmulator(status_interval=0, commit_latency=slow_writes) as slow:
+        fleet = FleetProgrammer(channels, [a.port, b.port, slow.port], radio_factory=radio_factory)
+
+        progress = []
+        result = fleet.program(progress_callback=lambda cur, total, msg: progress.append((cur, total)))
+        assert result.ok, result.summary()
+        assert [cur for cur, _ in progress] == list(range(1, 19))
+        assert progress[-1] == (18, 18)
+
+        # Fast radios are not held back by the slow one
+        slow_report = result.reports[slow.port]
+        assert all(result.reports[e.port].finished < slow_report.finished for e in (a, b))
+
+        # Every radio holds the same pre-encoded blocks
+        encoded = encode_channels(channels)
+        for emulator in (a, b, slow):
+            assert [emulator.channels[item.channel.index] for item in encoded] == \
+                [item.payload for item in encoded]
+            assert emulator.dmr[5] == encoded[5].dmr_payload
+
+        assert fleet.verify().ok
+
+
+def test_failures_are_isolated():
+    channels = make_codeplug(4)
+    dead = '/dev/pmr171-no-such-port'
+    with RadioEmulator(status_interval=0) as good, RadioEmulator(status_interval=0) as stale:
+        fleet = FleetProgrammer(channels, [good.port, dead, stale.port], radio_factory=radio_factory)
+        assert fleet.program().reports[good.port].ok
+
+        stale.channels[2] = empty_channel_block(2)
+        result = fleet.verify()
+
+    assert result.reports[good.port].ok
+    assert result.reports[stale.port].failed_channels == [2]
+    assert result.reports[stale.port].completed == 3
+    assert set(result.failures()) == {dead, stale.port}
+    assert f'Failed to connect to {dead}' in result.failures()[dead]
+
+
+def test_unresponsive_radio_trips_breaker():
+    """A radio that stops answering is abandoned; failed channels are not throughput"""
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    mute = os.ttyname(slave)
+    try:
+        with RadioEmulator(status_interval=0) as good:
+            fleet = FleetProgrammer(make_codeplug(8), [good.port, mute], radio_factory=radio_factory)
+            result = fleet.program()
+    finally:
+        os.close(master)
+        os.close(slave)
+
+    report = result.reports[mute]
+    assert report.failed_channels == [0, 1]  # breaker_threshold, not all 8
+    assert report.completed == 0 and report.throughput == 0.0
+    assert 'consecutive failed channels' in report.error
+    assert result.reports[good.port].ok
+
+
+def test_duplicate_ports_rejected():
+    with pytest.raises(ValueError):
+        FleetProgrammer([make_channel(0)], ['COM6', 'COM6'])
@@ -0,0 +1,154 @@
+"""Tests for the radio image cache and delta-write planner"""
+
+import random
+
+import pytest
+
+pytest.importorskip("serial")
+
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command, CommunicationError, Mode
+from pmr_171_cps.radio.emulator import RadioEmulator
+from pmr_171_cps.radio.image_cache import (
+    RadioImageCache,
+    radio_cache_key,
+    plan_writes,
+    verify_image_cache,
+    channel_payload,
+    dmr_payload,
+)
+from pmr_171_cps.radio.transport import LoopbackTransport
+from tests.fake_serial import FakeRadioSerial, make_channel
+
+
+def make_radio(tmp_path, serial=None) -> PMR171Radio:
+    radio = PMR171Radio('TEST', timeout=0.05)
+    radio.transport = serial or FakeRadioSerial()
+    radio.image_cache = RadioImageCache.load('test', tmp_path)
+    return radio
+
+
+def writes(radio):
+    return [payload[:2] for cmd, payload in radio.transport.requests
+            if cmd in (Command.CHANNEL_WRITE, Command.DMR_DATA_WRITE)]
+
+
+def test_cache_key_depends_on_radio_identity():
+    info = {'model': 'PMR-171', 'raw_response': '0171'}
+    assert radio_cache_key('USB VID:PID=1A86:7523', info) == radio_cache_key('USB VID:PID=1A86:7523', info)
+    assert radio_cache_key('USB VID:PID=1A86:7523', info) != radio_cache_key('USB VID:PID=0403:6001', info)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    cache = RadioImageCache('abc', tmp_path)
+    channel = make_channel(12, mode=Mode.DMR)
+    cache.update_channel(channel_payload(channel))
+    cache.update_dmr(dmr_payload(channel))
+    cache.save()
+
+    loaded = RadioImageCache.load('abc', tmp_path)
+    assert loaded.channels == {12: channel_payload(channel)}
+    assert loaded.dmr == {12: dmr_payload(channel)}
+    assert RadioImageCache.load('other', tmp_path).channels == {}
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    (tmp_path / 'abc.json').write_text('{not json')
+    assert len(RadioImageCache.load('abc', tmp_path)) == 0
+
+
+def test_planner():
+    cache = RadioImageCache('abc')
+    dmr_channel = make_channel(2, mode=Mode.DMR)
+    for channel in (make_channel(0), make_channel(1), dmr_channel):
+        cache.update_channel(channel_payload(channel))
+    cache.update_dmr(dmr_payload(dmr_channel))
+
+    changed_dmr = make_channel(2, mode=Mode.DMR)
+    changed_dmr.call_id = 91
+    plan = plan_writes([make_channel(0), make_channel(1, name="NEW"), changed_dmr, make_channel(3)], cache)
+
+    assert plan.unchanged == [0]
+    assert [c.index for c in plan.full] == [1, 3]
+    assert [c.index for c in plan.dmr_only] == [2]
+    assert len(plan) == 3
+
+
+def test_delta_write_after_read(tmp_path):
+    """Reads fill the cache; the next delta write only sends edited channels"""
+    serial = FakeRadioSerial(channels={i: channel_payload(make_channel(i)) for i in range(8)})
+    radio = make_radio(tmp_path, serial)
+    radio.read_selected_channels(list(range(8)))
+    radio.disconnect()  # Saves the cache
+
+    serial.is_open = True
+    radio = make_radio(tmp_path, serial)
+    assert len(radio.image_cache) == 8
+    serial.requests.clear()
+
+    target = [make_channel(i) for i in range(8)]
+    target[5] = make_channel(5, name="EDITED")
+    assert radio.write_changed_channels(target) == 8
+    assert writes(radio) == [b'\x00\x05']
+    assert radio.last_write_summary == {'written': 1, 'skipped': 7, 'failed': 0}
+
+
+def test_verify_corrects_stale_cache(tmp_path):
+    """A slot changed behind the cache's back is caught by sampled readback"""
+    radio = make_radio(tmp_path)
+    channels = [make_channel(i) for i in range(4)]
+    radio.write_all_channels(channels)
+
+    radio.transport.channels[2] = channel_payload(make_channel(2, name="ELSEWHERE"))
+    assert verify_image_cache(radio, radio.image_cache, samples=4, rng=random.Random(1)) == [2]
+
+    radio.transport.requests.clear()
+    radio.write_changed_channels(channels)
+    assert writes(radio) == [b'\x00\x02']
+
+
+def test_dmr_only_write_wakes_idle_radio(tmp_path):
+    """A delta write that only touches the DMR block still wakes an idle radio first"""
+    radio = make_radio(tmp_path)
+    dmr_channel = make_channel(2, mode=Mode.DMR)
+    radio.image_cache.update_channel(channel_payload(dmr_channel))
+    radio.image_cache.update_dmr(dmr_payload(dmr_channel))
+
+    dmr_channel.call_id = 91
+    assert radio.write_changed_channels([dmr_channel]) == 1
+    assert [(cmd, payload[:2]) for cmd, payload in radio.transport.requests] == \
+        [(Command.CHANNEL_READ, b'\x00\x02'), (Command.DMR_DATA_WRITE, b'\x00\x02')]
+    assert radio.session.wakes_sent == 1
+
+
+def test_write_changed_requires_cache():
+    radio = PMR171Radio('TEST', timeout=0.05)
+    radio.transport = FakeRadioSerial()
+    with pytest.raises(Exception, match="attach_image_cache"):
+        radio.write_changed_channels([make_channel(0)])
+
+
+def test_radio_identified_once_per_connection(tmp_path):
+    emulator = RadioEmulator()
+    radio = PMR171Radio(LoopbackTransport(emulator), timeout=0.05, keepalive_idle=60)
+    radio.transport.open()
+    first = radio.attach_image_cache(tmp_path)
+    radio.read_selected_channels([0])
+    assert radio.attach_image_cache(tmp_path).key == first.key
+    assert emulator.requests[Command.EQUIPMENT_TYPE] == 1
+
+    # A later connection handed the earlier answer does not ask again
+    info = radio.radio_info
+    radio.disconnect()
+    assert radio.radio_info is None
+    radio.transport.open()
+    assert radio.attach_image_cache(tmp_path, radio_info=info).key == first.key
+    assert emulator.requests[Command.EQUIPMENT_TYPE] == 1
+
+
+def test_cache_not_attached_to_unidentified_radio(tmp_path):
+    """Keying by the port hwid alone would share one cache between radios"""
+    radio = make_radio(tmp_path)
+    radio.image_cache = None
+    with pytest.raises(CommunicationError):
+        radio.attach_image_cache(tmp_path)
+    assert radio.image_cache is None and not list(tmp_path.iterdir())
@@ -0,0 +1,123 @@
+"""Tests for resumable session journals"""
+
+import json
+
+import pytest
+
+pytest.importorskip("serial")
+
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command, Mode
+from pmr_171_cps.radio.journal import SessionJournal, find_unfinished_journals, encode_channel
+from pmr_171_cps.radio.retry import RetryPolicy
+from tests.fake_serial import FakeRadioSerial, make_channel
+
+
+def make_radio(serial=None) -> PMR171Radio:
+    radio = PMR171Radio('TEST', timeout=0.05)
+    radio.transport = serial or FakeRadioSerial()
+    return radio
+
+
+def cancel_after(radio, command, count):
+    """cancel_check that trips once count packets of a command have been sent"""
+    return lambda: sum(1 for cmd, _ in radio.transport.requests if cmd == command) >= count
+
+
+def test_write_resumes_from_first_unconfirmed(tmp_path):
+    channels = [make_channel(i) for i in range(10)]
+    dmr = make_channel(10, mode=Mode.DMR)
+    dmr.call_id = 91
+    channels.append(dmr)
+
+    radio = make_radio()
+    journal = SessionJournal.create(SessionJournal.WRITE, channels=channels, port='TEST',
+                                    journal_dir=tmp_path)
+    radio.write_all_channels(channels, cancel_check=cancel_after(radio, Command.CHANNEL_WRITE, 7),
+                             journal=journal)
+    assert journal.pending() == [7, 8, 9, 10]
+    assert [j.path for j in find_unfinished_journals(tmp_path)] == [journal.path]
+
+    radio.transport.requests.clear()
+    assert radio.resume(journal.path) == 11
+    written = [payload[:2] for cmd, payload in radio.transport.requests if cmd == Command.CHANNEL_WRITE]
+    assert written == [bytes([0, i]) for i in (7, 8, 9, 10)]
+    assert radio.transport.dmr[10] == bytes.fromhex(encode_channel(dmr)['dmr'])
+    assert SessionJournal.open(journal.path).finished
+    assert find_unfinished_journals(tmp_path) == []
+
+
+def test_read_resume_returns_whole_session(tmp_path):
+    serial = FakeRadioSerial(channels={i: bytes.fromhex(encode_channel(make_channel(i))['payload'])
+                                       for i in range(6)})
+    radio = make_radio(serial)
+    journal = SessionJournal.create(SessionJournal.READ, indices=list(range(6)), journal_dir=tmp_path)
+    radio.read_selected_channels(list(range(6)), cancel_check=cancel_after(radio, Command.CHANNEL_READ, 4),
+                                 journal=journal)
+    assert journal.pending() == [4, 5]
+
+    serial.requests.clear()
+    channels = radio.resume(journal.path)
+    assert [c.name for c in channels] == [f"CH{i}" for i in range(6)]
+    assert [payload[:2] for _, payload in serial.requests] == [b'\x00\x04', b'\x00\x05']
+
+
+def test_torn_line_and_inconsistent_entry_are_redone(tmp_path):
+    """A crash mid-append and a confirmation that does not match the target are both redone"""
+    channels = [make_channel(i) for i in range(3)]
+    journal = SessionJournal.create(SessionJournal.WRITE, channels=channels, journal_dir=tmp_path)
+    journal.confirm(channels[0])
+    journal.confirm(make_channel(1, name="STALE"))
+    with open(journal.path, 'a') as f:
+        f.write(json.dumps({'type': 'confirm', 'index': 2})[:12])
+
+    replayed = SessionJournal.open(journal.path)
+    assert replayed.pending() == [2]
+    assert replayed.integrity_check() == [1]
+
+    radio = make_radio()
+    assert radio.resume(journal.path) == 3
+    written = [payload[:2] for cmd, payload in radio.transport.requests if cmd == Command.CHANNEL_WRITE]
+    assert written == [b'\x00\x01', b'\x00\x02']
+    assert SessionJournal.open(journal.path).finished
+
+
+class DeadDMRSerial(FakeRadioSerial):
+    """Answers channel requests but never 0x43/0x44 DMR requests"""
+
+    def respond(self, cmd, payload):
+        if cmd in (Command.DMR_DATA_READ, Command.DMR_DATA_WRITE):
+            return None
+        return super().respond(cmd, payload)
+
+
+def fast_radio(serial):
+    radio = PMR171Radio('TEST', timeout=0.05, retry_policy=RetryPolicy(max_attempts=1))
+    radio.transport = serial
+    return radio
+
+
+def test_failed_dmr_block_is_not_confirmed(tmp_path):
+    """A DMR slot whose 0x44 read or 0x43 write failed stays pending"""
+    dmr = make_channel(1, mode=Mode.DMR)
+    channels = [make_channel(0), dmr, make_channel(2)]
+    serial = DeadDMRSerial(channels={c.index: bytes.fromhex(encode_channel(c)['payload']) for c in channels})
+
+    journal = SessionJournal.create(SessionJournal.READ, indices=[0, 1, 2], journal_dir=tmp_path)
+    read = fast_radio(serial).read_selected_channels([0, 1, 2], journal=journal)
+    assert [c.index for c in read] == [0, 1, 2]  # Kept, with default DMR settings
+    assert journal.pending() == [1]
+
+    journal = SessionJournal.create(SessionJournal.WRITE, channels=channels, journal_dir=tmp_path)
+    radio = fast_radio(serial)
+    assert radio.write_selected_channels(channels, journal=journal) == 2
+    assert radio.write_channel(dmr) is False
+    assert journal.pending() == [1]
+
+
+def test_completed_journal_can_be_deleted(tmp_path):
+    journal = SessionJournal.create(SessionJournal.READ, indices=[0], journal_dir=tmp_path)
+    journal.confirm(make_channel(0))
+    journal.finish()
+    journal.delete()
+    assert list(tmp_path.iterdir()) == []
+    journal.delete()  # Already gone
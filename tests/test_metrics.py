@@ -0,0 +1,70 @@
+"""Tests for per-session latency and retry metrics"""
+
+import json
+
+from pmr_171_cps.radio.metrics import SessionMetrics, bucket_labels
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command
+from tests.fake_serial import FakeRadioSerial, channel_payload
+
+STATUS_FRAME = bytes.fromhex('84a96100') + bytes(20)
+
+
+class NoisyRadioSerial(FakeRadioSerial):
+    """Streams one status frame ahead of every response"""
+
+    def respond(self, cmd, payload):
+        response = super().respond(cmd, payload)
+        return STATUS_FRAME + response if response else response
+
+
+def make_radio(window: int = 1, serial_class=FakeRadioSerial, **kwargs) -> PMR171Radio:
+    channels = {i: channel_payload(i) for i in range(20)}
+    radio = PMR171Radio(serial_class(channels=channels, **kwargs), timeout=0.05,
+                        read_window=window, keepalive_idle=60)
+    return radio
+
+
+def test_histogram_buckets():
+    metrics = SessionMetrics()
+    metrics.record_rtt(Command.CHANNEL_READ, 0.004)
+    metrics.record_rtt(Command.CHANNEL_READ, 0.015)
+    metrics.record_rtt(Command.CHANNEL_READ, 5.0)
+
+    rtt = metrics.snapshot()['rtt']['CHANNEL_READ']
+    assert rtt['samples'] == 3
+    assert rtt['histogram']['<=5ms'] == 1
+    assert rtt['histogram']['<=20ms'] == 1
+    assert rtt['histogram'][bucket_labels()[-1]] == 1
+    assert sum(rtt['histogram'].values()) == 3
+
+
+def test_retries_ranked_per_channel():
+    metrics = SessionMetrics()
+    for index in (7, 7, 7, 2, 2, 9):
+        metrics.record_retry(Command.CHANNEL_WRITE, index)
+    assert metrics.slowest_channels(2) == [7, 2]
+    assert metrics.snapshot()['retries'] == {'CHANNEL_WRITE': 6}
+    metrics.reset()
+    assert metrics.snapshot()['channel_retries'] == {}
+
+
+def test_sequential_read_records_session():
+    radio = make_radio(serial_class=NoisyRadioSerial)
+    radio.read_selected_channels(list(range(5)))
+
+    snapshot = radio.metrics.snapshot()
+    assert snapshot['channels'] == 5
+    assert snapshot['rtt']['CHANNEL_READ']['samples'] == 5
+    assert snapshot['noise_bytes'] == 5 * len(STATUS_FRAME)
+    json.dumps(snapshot)  # Plain data only
+
+
+def test_pipelined_retry_counted_against_channel():
+    radio = make_radio(window=4, drop_once={3})
+    radio.read_selected_channels(list(range(8)))
+
+    metrics = radio.metrics
+    assert metrics.channels == 8
+    assert metrics.channel_retries == {3: 1}
+    assert metrics.timeouts == 1
+    assert metrics.snapshot()['rtt']['CHANNEL_READ']['samples'] == 8
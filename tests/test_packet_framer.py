@@ -0,0 +1,135 @@
+"""Tests for the PMR-171 UART packet framer"""
+
+import struct
+
+import pytest
+
+pytest.importorskip("serial")
+
+from pmr_171_cps.radio.pmr171_uart import (
+    PacketFramer,
+    PMR171Radio,
+    CRCError,
+    TimeoutError,
+    Command,
+    build_packet,
+)
+from tests.fake_serial import FakeSerial
+
+
+# Status frame the radio streams when idle (84 a9 61 00 header)
+STATUS_NOISE = bytes.fromhex('84a96100') + bytes(range(20))
+
+
+def make_radio(rx: bytes = b'') -> PMR171Radio:
+    radio = PMR171Radio('TEST', timeout=0.05)
+    radio.transport = FakeSerial(rx)
+    return radio
+
+
+def channel_response(index: int) -> bytes:
+    return build_packet(Command.CHANNEL_READ, struct.pack('>H', index) + bytes(24))
+
+
+def test_single_packet():
+    """A packet fed in one piece comes straight back out"""
+    packet = channel_response(5)
+    framer = PacketFramer()
+    framer.feed(packet)
+    assert list(framer.frames()) == [(PacketFramer.PACKET, packet)]
+    assert len(framer) == 0
+
+
+def test_noise_before_packet():
+    """Status stream bytes are reported as noise ahead of the packet"""
+    packet = channel_response(1)
+    framer = PacketFramer()
+    framer.feed(STATUS_NOISE + packet)
+    frames = list(framer.frames())
+    assert frames == [(PacketFramer.NOISE, STATUS_NOISE), (PacketFramer.PACKET, packet)]
+
+
+def test_split_feeds():
+    """A packet split across many reads (including the header) is reassembled"""
+    packet = channel_response(42)
+    stream = STATUS_NOISE + packet
+    framer = PacketFramer()
+    packets = []
+    noise = 0
+    for i in range(len(stream)):
+        framer.feed(stream[i:i + 1])
+        for kind, data in framer.frames():
+            if kind == PacketFramer.PACKET:
+                packets.append(data)
+            else:
+                noise += len(data)
+    assert packets == [packet]
+    assert noise == len(STATUS_NOISE)
+
+
+def test_back_to_back_packets():
+    """Several packets in one chunk are all returned in order"""
+    packets = [channel_response(i) for i in range(3)]
+    framer = PacketFramer()
+    framer.feed(b''.join(packets))
+    assert [data for _, data in framer.frames()] == packets
+
+
+def test_crc_error():
+    """A complete frame with a bad CRC is reported, then framing continues"""
+    bad = bytearray(channel_response(7))
+    bad[-1] ^= 0xFF
+    good = channel_response(8)
+    framer = PacketFramer()
+    framer.feed(bytes(bad) + good)
+    frames = list(framer.frames())
+    assert frames == [(PacketFramer.CRC_ERROR, bytes(bad)), (PacketFramer.PACKET, good)]
+
+
+def test_false_header():
+    """A header followed by an impossible length byte is treated as noise"""
+    good = channel_response(3)
+    framer = PacketFramer()
+    framer.feed(bytes.fromhex('a5a5a5a501') + good)
+    frames = list(framer.frames())
+    assert frames[-1] == (PacketFramer.PACKET, good)
+    assert sum(len(data) for kind, data in frames if kind == PacketFramer.NOISE) == 5
+
+
+def test_receive_packet_bulk_reads():
+    """_receive_packet skips status noise without reading byte-by-byte"""
+    packet = channel_response(9)
+    radio = make_radio(STATUS_NOISE * 5 + packet)
+    assert radio._receive_packet() == packet
+    assert radio.transport.read_calls == 1
+
+
+def test_receive_packet_keeps_following_bytes():
+    """Bytes after the returned packet stay buffered for the next call"""
+    first, second = channel_response(1), channel_response(2)
+    radio = make_radio(first + second)
+    assert radio._receive_packet() == first
+    assert radio._receive_packet() == second
+
+
+def test_receive_packet_crc_error():
+    bad = bytearray(channel_response(7))
+    bad[-2] ^= 0x01
+    radio = make_radio(bytes(bad))
+    with pytest.raises(CRCError):
+        radio._receive_packet()
+
+
+def test_receive_packet_timeout():
+    radio = make_radio(STATUS_NOISE)
+    with pytest.raises(TimeoutError):
+        radio._receive_packet()
+
+
+def test_clear_input_resets_framer():
+    radio = make_radio(channel_response(1)[:10])
+    radio._read_into_framer()
+    assert len(radio._framer) == 10
+    radio.transport.rx += STATUS_NOISE
+    assert radio._clear_input() == 10 + len(STATUS_NOISE)
+    assert len(radio._framer) == 0
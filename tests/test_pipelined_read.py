@@ -0,0 +1,148 @@
+"""Tests for pipelined (windowed) channel reads"""
+
+import struct
+import time
+
+import pytest
+
+pytest.importorskip("serial")
+
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command, Mode, ChannelData
+from tests.fake_serial import FakeRadioSerial, channel_payload
+
+
+def make_radio(window: int, **kwargs) -> PMR171Radio:
+    channels = {i: channel_payload(i) for i in range(40)}
+    channels.update(kwargs.pop('channels', {}))
+    radio = PMR171Radio('TEST', timeout=0.05, read_window=window)
+    radio.transport = FakeRadioSerial(channels=channels, **kwargs)
+    return radio
+
+
+def read_requests(radio: PMR171Radio, command: int = Command.CHANNEL_READ) -> list:
+    return [struct.unpack('>H', payload[:2])[0]
+            for cmd, payload in radio.transport.requests if cmd == command]
+
+
+def test_pipelined_matches_sequential():
+    indices = list(range(20))
+    sequential = make_radio(1).read_selected_channels(indices)
+    pipelined = make_radio(8).read_selected_channels(indices)
+    assert [ch.index for ch in pipelined] == indices
+    assert [ch.to_dict() for ch in pipelined] == [ch.to_dict() for ch in sequential]
+
+
+def test_out_of_order_responses_matched_by_index():
+    radio = make_radio(8, reverse=True)
+    channels = radio.read_selected_channels(list(range(16)))
+    assert [ch.index for ch in channels] == list(range(16))
+    assert all(ch.name == f"CH{ch.index}" for ch in channels)
+
+
+def test_lost_slot_retransmitted_selectively():
+    radio = make_radio(8, drop_once={5})
+    channels = radio.read_selected_channels(list(range(10)))
+    assert [ch.index for ch in channels] == list(range(10))
+    requests = read_requests(radio)
+    assert requests.count(5) == 2
+    assert all(requests.count(i) == 1 for i in range(10) if i != 5)
+
+
+class GarbledSlotSerial(FakeRadioSerial):
+    """Answers after a fixed delay; the first response for one slot is late and fails its CRC"""
+
+    def __init__(self, garble, delay=0.02, **kwargs):
+        super().__init__(**kwargs)
+        self.garble = garble
+        self.delay = delay
+        self.queued = []  # (release time, response)
+
+    def respond(self, cmd, payload):
+        response = super().respond(cmd, payload)
+        delay = self.delay
+        if response is not None and self.garble == struct.unpack('>H', payload[:2])[0]:
+            self.garble = None
+            response = response[:-1] + bytes([response[-1] ^ 0xFF])
+            delay *= 3
+        if response is not None:
+            self.queued.append((time.time() + delay, response))
+        return None
+
+    def _release(self):
+        now = time.time()
+        for item in sorted(self.queued):
+            if item[0] <= now:
+                self.rx += item[1]
+                self.queued.remove(item)
+
+    @property
+    def in_waiting(self):
+        self._release()
+        return len(self.rx)
+
+    def read(self, size=1):
+        self._release()
+        return super().read(size)
+
+
+def test_crc_error_requeues_overdue_slot():
+    """A garbled response does not leave its slot waiting for the slot timeout"""
+    radio = PMR171Radio('TEST', timeout=0.5, read_window=8)
+    radio.transport = GarbledSlotSerial(5, channels={i: channel_payload(i) for i in range(16)})
+    started = time.time()
+    channels = radio.read_selected_channels(list(range(16)))
+    elapsed = time.time() - started
+
+    assert [ch.index for ch in channels] == list(range(16))
+    assert read_requests(radio).count(5) == 2
+    assert radio.metrics.crc_errors == 1
+    assert elapsed < 0.5  # slot_timeout is 1 s
+
+
+def test_dmr_channels_get_dmr_block():
+    dmr_channel = channel_payload(3, Mode.DMR)
+    dmr_block = struct.pack('>HBBBBII', 3, 0, 7, 7, 2, 91, 3107683) + bytes([0] * 5) + bytes([1]) + bytes(6)
+    radio = make_radio(4, channels={3: dmr_channel}, dmr={3: dmr_block})
+    channels = radio.read_selected_channels([2, 3, 4])
+    dmr = channels[1]
+    assert (dmr.rx_cc, dmr.slot, dmr.call_id, dmr.own_id) == (7, 2, 91, 3107683)
+    assert read_requests(radio, Command.DMR_DATA_READ) == [3]
+
+
+
+def test_dmr_blocks_read_in_second_phase():
+    """All channel blocks come first, then the DMR blocks, with progress and timing for both"""
+    dmr_slots = [1, 4, 6, 7]
+    radio = make_radio(4, channels={i: channel_payload(i, Mode.DMR) for i in dmr_slots})
+    progress = []
+    channels = radio.read_selected_channels(list(range(10)),
+                                            lambda cur, total, msg: progress.append((cur, total)))
+
+    commands = [cmd for cmd, _ in radio.transport.requests]
+    assert commands == [Command.CHANNEL_READ] * 10 + [Command.DMR_DATA_READ] * 4
+    assert read_requests(radio, Command.DMR_DATA_READ) == dmr_slots
+    assert [ch.index for ch in channels] == list(range(10))
+    assert progress[-1] == (14, 14)
+
+    phases = radio.timing.phases()
+    assert phases['channel_blocks']['items'] == 10
+    assert phases['dmr_blocks']['items'] == 4
+
+def test_progress_and_cancel():
+    radio = make_radio(4)
+    progress = []
+
+    def cancel_check():
+        return len(progress) >= 6
+
+    channels = radio.read_selected_channels(
+        list(range(30)), lambda cur, total, msg: progress.append(cur), cancel_check)
+    assert 6 <= len(channels) < 30
+    assert progress[:6] == [1, 2, 3, 4, 5, 6]
+
+
+def test_read_all_channels_pipelined_filters_empty():
+    radio = make_radio(8)
+    channels = radio.read_all_channels(include_empty=False)
+    assert [ch.index for ch in channels] == list(range(40))
+    assert isinstance(channels[0], ChannelData)
@@ -0,0 +1,91 @@
+"""Tests for the shared retry policy and circuit breaker"""
+
+import time
+
+import pytest
+
+from pmr_171_cps.radio.pmr171_uart import (
+    PMR171Radio,
+    Command,
+    CRCError,
+    SessionAbortedError,
+)
+from pmr_171_cps.radio.retry import (
+    ERROR_CRC,
+    ERROR_TIMEOUT,
+    CircuitBreaker,
+    RetryPolicy,
+)
+from tests.fake_serial import FakeSerial, make_channel
+
+
+def dead_radio(policy: RetryPolicy) -> PMR171Radio:
+    """Radio whose port never answers"""
+    return PMR171Radio(FakeSerial(), timeout=0.05, retry_policy=policy, keepalive_idle=60)
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(base_backoff=0.1, backoff_factor=2, max_backoff=0.5, jitter=0)
+    assert [policy.backoff(a) for a in range(5)] == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5])
+    assert policy.backoff(4, ERROR_CRC) == pytest.approx(policy.crc_backoff)
+
+
+def test_jitter_stays_in_range():
+    policy = RetryPolicy(base_backoff=1.0, max_backoff=1.0, jitter=0.2)
+    delays = [policy.backoff(0, ERROR_TIMEOUT) for _ in range(200)]
+    assert all(0.8 <= delay <= 1.2 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_policy_validation_and_round_trip():
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+    policy = RetryPolicy(max_attempts=4, deadline=2.5, breaker_threshold=3)
+    assert RetryPolicy.from_dict({**policy.to_dict(), 'unknown': 1}) == policy
+    assert policy.out_of_time(2.0, 0.6)
+    assert not RetryPolicy().out_of_time(1e6)
+
+
+def test_breaker_opens_on_consecutive_failures_only():
+    breaker = CircuitBreaker(3)
+    assert not breaker.failure()
+    assert not breaker.failure()
+    breaker.success()
+    assert not breaker.failure()
+    assert not breaker.failure()
+    assert breaker.failure()
+    assert not CircuitBreaker(None).failure()
+
+
+def test_policy_attempts_used_by_default():
+    radio = dead_radio(RetryPolicy(max_attempts=2, base_backoff=0.01, breaker_threshold=None))
+    with pytest.raises(Exception):
+        radio.read_channel(5)
+    requests = radio.transport.tx.count(bytes.fromhex('A5A5A5A5'))
+    assert requests == 2
+
+
+def test_deadline_stops_retrying():
+    policy = RetryPolicy(max_attempts=50, base_backoff=0.05, jitter=0, deadline=0.4,
+                         breaker_threshold=None)
+    radio = dead_radio(policy)
+    started = time.time()
+    assert radio.write_channel(make_channel(1)) is False
+    assert time.time() - started < 1.5
+    assert radio.transport.tx.count(bytes.fromhex('A5A5A5A5')) < 50
+
+
+def test_breaker_aborts_bulk_read():
+    policy = RetryPolicy(max_attempts=1, breaker_threshold=3)
+    radio = dead_radio(policy)
+    with pytest.raises(SessionAbortedError):
+        radio.read_selected_channels(list(range(100)))
+    assert radio.transport.tx.count(bytes.fromhex('A5A5A5A5')) == 3
+
+
+def test_crc_error_retried_without_drain():
+    radio = dead_radio(RetryPolicy(crc_backoff=0.0, jitter=0))
+    started = time.time()
+    assert radio._retry_wait(Command.CHANNEL_READ, 0, 10, 1, CRCError("bad"), time.time())
+    assert time.time() - started < 0.05
+    assert radio.metrics.channel_retries == {1: 1}
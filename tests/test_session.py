@@ -0,0 +1,64 @@
+"""Tests for the programming-session keepalive"""
+
+import time
+
+import pytest
+
+from pmr_171_cps.radio.session import ProgrammingSession
+
+
+def test_wake_until_acknowledged():
+    session = ProgrammingSession(idle_threshold=1.0)
+    assert session.needs_wake() is True
+    session.touch()
+    assert session.needs_wake() is False
+    assert (session.wakes_sent, session.wakes_avoided) == (1, 1)
+
+
+def test_idle_threshold_expires_session():
+    session = ProgrammingSession(idle_threshold=0.02)
+    session.touch()
+    time.sleep(0.03)
+    assert session.active is False
+    assert session.needs_wake() is True
+
+
+def test_expire_and_zero_threshold():
+    session = ProgrammingSession(idle_threshold=10.0)
+    session.touch()
+    session.expire()
+    assert session.needs_wake() is True
+
+    legacy = ProgrammingSession(idle_threshold=0)
+    legacy.touch()
+    assert legacy.needs_wake() is True
+
+
+def test_bulk_write_wakes_once():
+    """Writes inside an active session go straight to CHANNEL_WRITE"""
+    pytest.importorskip("serial")
+    from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command
+    from tests.fake_serial import FakeRadioSerial, make_channel
+
+    radio = PMR171Radio('TEST', timeout=0.05)
+    radio.transport = FakeRadioSerial()
+    assert radio.write_all_channels([make_channel(i) for i in range(20)]) == 20
+
+    commands = [cmd for cmd, _ in radio.transport.requests]
+    assert commands.count(Command.CHANNEL_READ) == 1
+    assert commands.count(Command.CHANNEL_WRITE) == 20
+    assert radio.session.stats()['wakes_sent'] == 1
+    assert radio.session.stats()['wakes_avoided'] == 19
+
+
+def test_legacy_wake_every_write():
+    pytest.importorskip("serial")
+    from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command
+    from tests.fake_serial import FakeRadioSerial, make_channel
+
+    radio = PMR171Radio('TEST', timeout=0.05, keepalive_idle=0)
+    radio.transport = FakeRadioSerial()
+    radio.write_all_channels([make_channel(i) for i in range(5)])
+    commands = [cmd for cmd, _ in radio.transport.requests]
+    assert commands.count(Command.CHANNEL_READ) == 5
+    assert radio.session.wakes_avoided == 0
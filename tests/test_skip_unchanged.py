@@ -0,0 +1,69 @@
+"""Tests for skip-unchanged writes"""
+
+import pytest
+
+pytest.importorskip("serial")
+
+from pmr_171_cps.radio.pmr171_uart import (
+    PMR171Radio,
+    Command,
+    Mode,
+    WRITE_SKIPPED,
+    WRITE_WRITTEN,
+)
+from tests.fake_serial import FakeRadioSerial, make_channel
+
+
+def make_radio() -> PMR171Radio:
+    radio = PMR171Radio('TEST', timeout=0.05)
+    radio.transport = FakeRadioSerial()
+    return radio
+
+
+def sent(radio, command):
+    return [payload for cmd, payload in radio.transport.requests if cmd == command]
+
+
+def test_reflash_identical_codeplug_writes_nothing():
+    radio = make_radio()
+    channels = [make_channel(i) for i in range(10)]
+    radio.write_all_channels(channels)
+    radio.transport.requests.clear()
+
+    channels[4] = make_channel(4, name="CHANGED")
+    messages = []
+    count = radio.write_all_channels(channels, lambda c, t, m: messages.append(m),
+                                     skip_unchanged=True)
+
+    assert count == 10
+    assert radio.last_write_summary == {'written': 1, 'skipped': 9, 'failed': 0}
+    assert [p[:2] for p in sent(radio, Command.CHANNEL_WRITE)] == [b'\x00\x04']
+    assert "1 written, 9 unchanged" in messages[-1]
+
+
+def test_first_write_writes_everything():
+    radio = make_radio()
+    radio.write_all_channels([make_channel(i) for i in range(3)], skip_unchanged=True)
+    assert radio.last_write_summary['written'] == 3
+    assert len(sent(radio, Command.CHANNEL_WRITE)) == 3
+
+
+def test_dmr_block_compared_separately():
+    """Only the 0x43 block is written when just the DMR settings differ"""
+    radio = make_radio()
+    channel = make_channel(7, mode=Mode.DMR)
+    radio.write_channel(channel)
+    assert radio.write_channel_if_changed(channel) == WRITE_SKIPPED
+
+    radio.transport.requests.clear()
+    channel.call_id = 91
+    assert radio.write_channel_if_changed(channel) == WRITE_WRITTEN
+    assert sent(radio, Command.CHANNEL_WRITE) == []
+    assert len(sent(radio, Command.DMR_DATA_WRITE)) == 1
+
+
+def test_failed_readback_writes_anyway():
+    radio = make_radio()
+    radio.transport.drop_once = {2}
+    assert radio.write_channel_if_changed(make_channel(2)) == WRITE_WRITTEN
+    assert len(sent(radio, Command.CHANNEL_WRITE)) == 1
@@ -0,0 +1,110 @@
+"""Tests for spectrum (0x39) frame ingest"""
+
+import random
+import time
+
+import pytest
+
+from pmr_171_cps.radio.pmr171_uart import Command, build_packet
+from pmr_171_cps.radio.spectrum import (
+    MAX_BINS,
+    SpectrumFramer,
+    build_spectrum_frame,
+    spectrum_frame_size,
+)
+from tests.fake_serial import FakeSerial
+
+
+def levels(seed: int, count: int = MAX_BINS) -> bytes:
+    return bytes(random.Random(seed).randrange(256) for _ in range(count))
+
+
+def capture(frames: int = 20) -> bytes:
+    """Spectrum frames mixed with programming packets, a run of 7E bytes and a corrupted frame"""
+    parts = [b'\x7e\x7e\x7e\x7e\x7e\x00']  # A run of 7E that is not a frame
+    for seed in range(frames):
+        parts.append(build_spectrum_frame(levels(seed, 80 if seed % 5 == 4 else 256)))
+        if seed % 3 == 0:
+            parts.append(build_packet(Command.CHANNEL_READ, b'\x00\x01'))
+    corrupted = bytearray(build_spectrum_frame(levels(99)))
+    corrupted[100] ^= 0xFF
+    parts.insert(3, bytes(corrupted))
+    return b''.join(parts)
+
+
+def test_frame_layout():
+    frame = build_spectrum_frame(bytes(range(80)))
+    assert len(frame) == spectrum_frame_size(80) == 89
+    assert frame[:7] == bytes.fromhex('7e7e7e7e390050')
+    with pytest.raises(ValueError):
+        build_spectrum_frame(bytes(100))
+
+
+@pytest.mark.parametrize("chunk", [1, 13, 4096])
+def test_framer_separates_frames_in_any_chunking(chunk):
+    data = capture()
+    framer = SpectrumFramer()
+    frames = []
+    for offset in range(0, len(data), chunk):
+        framer.feed(data[offset:offset + chunk])
+        frames.extend(framer.frames())
+    assert frames == [levels(seed, 80 if seed % 5 == 4 else 256) for seed in range(20)]
+    assert framer.crc_errors == 1 and len(framer) == 0
+
+
+def test_pipeline_waterfall_and_subscribers():
+    pytest.importorskip("numpy")
+    from pmr_171_cps.radio.spectrum import SpectrumPipeline
+
+    pipeline = SpectrumPipeline(rows=8)
+    received = []
+    pipeline.subscribe(lambda frame: received.append((frame.sequence, bytes(frame.bins))))
+    assert pipeline.ingest(capture()) == 20
+
+    assert [sequence for sequence, _ in received] == list(range(20))
+    assert received[4][1] == levels(4, 80)
+    waterfall = pipeline.waterfall
+    assert len(waterfall) == 8 and waterfall.total == 20
+    rows = waterfall.rows()
+    assert rows.shape == (8, MAX_BINS)
+    assert bytes(rows[-2]) == levels(18) and bytes(waterfall.latest()) == levels(19, 80)
+    assert bytes(rows[2][:80]) == levels(14, 80) and not rows[2][80:].any()
+    assert pipeline.stats()['crc_errors'] == 1
+
+
+def test_pipeline_threads_keep_up_with_line_rate():
+    pytest.importorskip("numpy")
+    from pmr_171_cps.radio.spectrum import SpectrumPipeline
+
+    # Ten seconds of 256-bin frames at 115200 baud, delivered at once
+    frames = 115200 // 10 * 10 // spectrum_frame_size(256)
+    port = FakeSerial(b''.join(build_spectrum_frame(levels(seed % 8)) for seed in range(frames)))
+    pipeline = SpectrumPipeline(port, rows=64)
+    pipeline.subscribe(lambda frame: time.sleep(0))  # Subscribers do not hold up reading
+    started = time.perf_counter()
+    pipeline.start()
+    deadline = time.time() + 5
+    while pipeline.frames < frames and time.time() < deadline:
+        time.sleep(0.01)
+    pipeline.stop()
+    assert pipeline.frames == frames
+    assert time.perf_counter() - started < 2.5  # Well above real time
+    assert pipeline.stats()['noise_bytes'] == 0
+
+
+def test_offline_extraction_matches_framer(tmp_path):
+    np = pytest.importorskip("numpy")
+    from pmr_171_cps.radio.spectrum import extract_spectrum_frames, load_spm_spectrum
+
+    data = capture()
+    offsets, frames = extract_spectrum_frames(data)
+    assert frames.shape == (16, 256) and frames.dtype == np.uint8
+    assert [bytes(row) for row in frames] == [levels(seed) for seed in range(20) if seed % 5 != 4]
+    assert all(data[offset:offset + 4] == b'\x7e' * 4 for offset in offsets)
+
+    path = tmp_path / 'capture.spm'
+    path.write_bytes(b'SPM header' + data)
+    offsets80, frames80 = load_spm_spectrum(str(path), bin_count=80)
+    assert frames80.shape == (4, 80) and bytes(frames80[0]) == levels(4, 80)
+
+    assert extract_spectrum_frames(b'\x00' * 10)[1].shape == (0, MAX_BINS)
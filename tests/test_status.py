@@ -0,0 +1,120 @@
+"""Tests for the idle status-stream decoder and monitor"""
+
+import asyncio
+import struct
+
+import pytest
+
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command, Mode, build_packet
+from pmr_171_cps.radio.emulator import RadioEmulator
+from pmr_171_cps.radio.status import (
+    STATUS_HEADER,
+    STATUS_LAYOUT,
+    StatusDecoder,
+    StatusMonitor,
+    decode_status,
+)
+from pmr_171_cps.radio.transport import LoopbackTransport
+from tests.fake_serial import FakeRadioSerial, FakeSerial
+
+
+def status_body(freq_a=446_006_250, freq_b=145_500_000, vfo=0, mode_a=Mode.NFM, spectrum_bw=3):
+    return STATUS_LAYOUT.pack(mode_a, Mode.WFM, freq_a, freq_b,
+                              vfo, 0b01, -2, 0, 1, spectrum_bw, 138)
+
+
+def status_frame(**kwargs) -> bytes:
+    return STATUS_HEADER + status_body(**kwargs)
+
+
+def test_decode_fields():
+    status = decode_status(status_body(vfo=1))
+    assert (status.vfo_a_freq_hz, status.vfo_b_freq_hz) == (446_006_250, 145_500_000)
+    assert status.active_freq_hz == 145_500_000 and status.active_mode_name == 'WFM'
+    assert (status.rit, status.filter_bw, status.spectrum_bw, status.supply_voltage) == (-2, 1, 3, 13.8)
+    assert status.to_dict()['active_mode'] == 'WFM'
+    with pytest.raises(ValueError):
+        decode_status(bytes(19))
+
+
+def test_decoder_frames_split_and_noisy_stream():
+    packet = build_packet(Command.CHANNEL_READ, struct.pack('>H', 1))
+    stream = b'\x00\x84' + status_frame() + packet + status_frame(spectrum_bw=9) + status_frame()[:10]
+    for size in (1, 7, 3, 64):  # Any chunking gives the same frames
+        decoder = StatusDecoder()
+        decoded = []
+        for offset in range(0, len(stream), size):
+            decoded += decoder.feed(stream[offset:offset + size])
+        assert [status.spectrum_bw for status in decoded] == [3, 9]
+        assert decoder.noise_bytes == 2 + len(packet)
+        assert len(decoder) == 10
+
+    assert decoder.feed(status_frame()[10:])[0] == decoded[0]  # time is not compared
+
+
+def test_monitor_callbacks_and_stats():
+    monitor = StatusMonitor()
+    every, changes = [], []
+    monitor.subscribe(every.append)
+    unsubscribe = monitor.subscribe(changes.append, changes_only=True)
+    monitor.subscribe(lambda status: 1 / 0)  # A failing subscriber does not stop the feed
+
+    monitor.feed(status_frame() * 3 + status_frame(freq_a=433_500_000))
+    assert len(every) == 4 and [s.vfo_a_freq_hz for s in changes] == [446_006_250, 433_500_000]
+    unsubscribe()
+    monitor.feed(status_frame())
+    assert len(every) == 5 and len(changes) == 2
+
+    stats = monitor.stats.snapshot()
+    assert (stats['frames'], stats['changes'], stats['bytes']) == (5, 3, 5 * len(status_frame()))
+    assert monitor.latest.vfo_a_freq_hz == 446_006_250
+
+
+def test_monitor_thread_and_async_stream():
+    port = FakeSerial(status_frame() * 2)
+    monitor = StatusMonitor(port)
+
+    async def consume():
+        received = []
+        async for status in monitor.stream():
+            received.append(status)
+            if len(received) == 3:
+                return received
+
+    async def run():
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        port.rx += status_frame(freq_a=430_000_000)
+        return await asyncio.wait_for(task, 2)
+
+    try:
+        received = asyncio.run(run())
+    finally:
+        monitor.stop()
+    assert [s.vfo_a_freq_hz for s in received] == [446_006_250, 446_006_250, 430_000_000]
+    assert not monitor._subscribers
+
+
+def test_radio_feeds_discarded_status_frames():
+    class StreamingSerial(FakeRadioSerial):
+        def respond(self, cmd, payload):
+            return status_frame(spectrum_bw=cmd) + super().respond(cmd, payload)
+
+    radio = PMR171Radio(StreamingSerial(), timeout=0.05, keepalive_idle=60)
+    monitor = StatusMonitor()
+    radio.status_feed = monitor.feed
+    radio.read_selected_channels([0, 1])
+    assert monitor.stats.frames == 2 and monitor.latest.spectrum_bw == Command.CHANNEL_READ
+
+
+def test_get_status_decodes_shared_fields():
+    emulator = RadioEmulator()
+    emulator.status[:20] = status_body(freq_a=438_500_000)
+    radio = PMR171Radio(LoopbackTransport(emulator), keepalive_idle=60)
+    radio.transport.open()
+    status = radio.get_status()
+    assert status['status'] == 'connected'
+    assert (status['vfo_a_freq_hz'], status['active_mode'], status['supply_voltage']) == \
+        (438_500_000, 'NFM', 13.8)
@@ -0,0 +1,122 @@
+"""Tests for the adaptive UART timing controller"""
+
+import time
+
+import pytest
+
+from pmr_171_cps.radio.timing import (
+    TimingController,
+    RETRY_DRAIN_DELAY,
+    RETRY_BACKOFF_STEP,
+)
+
+
+def warm_controller(rtt: float = 0.01, samples: int = 3) -> TimingController:
+    timing = TimingController(max_timeout=2.0)
+    for _ in range(samples):
+        timing.record(0x41, rtt)
+    return timing
+
+
+def test_legacy_delays_before_warmup():
+    """Until enough samples are in, the fixed delays are used unchanged"""
+    timing = TimingController(max_timeout=2.0)
+    timing.record(0x41, 0.01)
+    assert timing.response_timeout(0x41) == 2.0
+    assert timing.drain_delay(0x41) == RETRY_DRAIN_DELAY
+    assert timing.backoff_delay(0x41, 2) == pytest.approx(RETRY_BACKOFF_STEP * 3)
+    assert timing.settle_delay(0x41, 0.15) == 0.15
+
+
+def test_estimator_follows_rfc6298():
+    timing = TimingController()
+    timing.record(0x41, 0.1)
+    profile = timing.profile()['0x41']
+    assert profile['srtt'] == pytest.approx(0.1)
+    assert profile['rttvar'] == pytest.approx(0.05)
+
+    timing.record(0x41, 0.2)
+    profile = timing.profile()['0x41']
+    assert profile['rttvar'] == pytest.approx(0.75 * 0.05 + 0.25 * 0.1)
+    assert profile['srtt'] == pytest.approx(0.875 * 0.1 + 0.125 * 0.2)
+    assert timing.rto(0x41) == pytest.approx(profile['srtt'] + 4 * profile['rttvar'])
+
+
+def test_adaptive_delays_capped_at_legacy():
+    """A fast radio shortens every delay; a slow one never lengthens them"""
+    fast = warm_controller(0.01)
+    assert fast.response_timeout(0x41) == pytest.approx(0.1)  # min_timeout floor
+    assert fast.drain_delay(0x41) < RETRY_DRAIN_DELAY
+    assert fast.backoff_delay(0x41, 0) < RETRY_BACKOFF_STEP
+    assert fast.settle_delay(0x41, 0.15) < 0.15
+
+    slow = warm_controller(5.0)
+    assert slow.response_timeout(0x41) == 2.0
+    assert slow.drain_delay(0x41) == RETRY_DRAIN_DELAY
+    assert slow.backoff_delay(0x41, 1) == pytest.approx(RETRY_BACKOFF_STEP * 2)
+    assert slow.settle_delay(0x41, 0.15) == 0.15
+
+
+def test_timeout_backoff_resets_on_sample():
+    timing = warm_controller(0.05)
+    base = timing.response_timeout(0x41)
+    timing.on_timeout(0x41)
+    assert timing.response_timeout(0x41) == pytest.approx(base * 2)
+    timing.record(0x41, 0.05)
+    assert timing.response_timeout(0x41) == pytest.approx(max(0.1, timing.rto(0x41)))
+    assert timing.profile()['0x41']['timeouts'] == 1
+
+
+def test_not_adaptive():
+    timing = TimingController(adaptive=False)
+    for _ in range(10):
+        timing.record(0x41, 0.01)
+    assert timing.drain_delay(0x41) == RETRY_DRAIN_DELAY
+    assert timing.profile()['0x41']['adaptive'] is False
+
+
+def test_driver_learns_profile():
+    """Round trips through the driver populate the profile by command name"""
+    pytest.importorskip("serial")
+    from pmr_171_cps.radio.pmr171_uart import PMR171Radio
+    from tests.fake_serial import FakeRadioSerial, make_channel
+
+    radio = PMR171Radio('TEST', timeout=0.05, keepalive_idle=0)
+    radio.transport = FakeRadioSerial()
+    for index in range(4):
+        radio.read_channel(index)
+        radio.write_channel(make_channel(index))
+
+    profile = radio.timing.profile()
+    assert profile['CHANNEL_READ']['samples'] == 8  # Reads plus pre-write wakes
+    assert profile['CHANNEL_WRITE']['samples'] == 4
+    assert profile['CHANNEL_READ']['adaptive'] is True
+
+
+def test_retry_backoff_shrinks_once_warm():
+    """A dropped response is retried after an RTT-scaled, not fixed, delay"""
+    pytest.importorskip("serial")
+    from pmr_171_cps.radio.pmr171_uart import PMR171Radio
+    from tests.fake_serial import FakeRadioSerial
+
+    radio = PMR171Radio('TEST', timeout=0.05)
+    radio.transport = FakeRadioSerial(drop_once=[9])
+    for index in range(3):
+        radio.read_channel(index)
+
+    start = time.time()
+    assert radio.read_channel(9).index == 9
+    # Legacy: 0.1 s timeout + 0.2 s drain + 0.3 s backoff
+    assert time.time() - start < 0.3
+    assert radio.timing.profile()['CHANNEL_READ']['timeouts'] == 1
+
+
+def test_phase_metrics():
+    timing = TimingController()
+    timing.record_phase('channel_blocks', 2.0, 1000)
+    timing.record_phase('dmr_blocks', 0.0, 0)
+    phases = timing.phases()
+    assert phases['channel_blocks']['per_item'] == pytest.approx(0.002)
+    assert phases['dmr_blocks']['per_item'] == 0.0
+    timing.reset()
+    assert timing.phases() == {}
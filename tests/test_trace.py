@@ -0,0 +1,104 @@
+"""Tests for the wire trace recorder"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command
+from pmr_171_cps.radio.emulator import RadioEmulator
+from pmr_171_cps.radio.transport import LoopbackTransport
+from pmr_171_cps.radio.trace import (
+    RX,
+    TX,
+    TraceRecorder,
+    TracingTransport,
+    read_trace,
+)
+from tests.fake_serial import make_channel
+
+ANALYZER = Path(__file__).parent / 'test_configs' / 'Results' / 'analyze_uart_capture.py'
+
+
+def load_analyzer():
+    spec = importlib.util.spec_from_file_location('analyze_uart_capture', ANALYZER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def traced_radio():
+    emulator = RadioEmulator()
+    emulator.load_channel(make_channel(3, name="Trace"))
+    radio = PMR171Radio(LoopbackTransport(emulator), keepalive_idle=60)
+    recorder = radio.start_trace()
+    radio.transport.open()
+    return radio, recorder
+
+
+def test_recorder_keeps_chunks_in_order():
+    recorder = TraceRecorder(capacity=64, max_records=8)
+    recorder.record(TX, b'abc')
+    recorder.record(RX, b'defg')
+    recorder.record(RX, b'')
+
+    records = recorder.records()
+    assert [(r.direction, r.data) for r in records] == [(TX, b'abc'), (RX, b'defg')]
+    assert records[0].time <= records[1].time
+
+
+def test_ring_drops_oldest_chunks():
+    recorder = TraceRecorder(capacity=10, max_records=3)
+    for chunk in (b'1111', b'2222', b'3333', b'4444'):
+        recorder.record(TX, chunk)
+    # 16 bytes written into a 10-byte ring: only the last two chunks are whole
+    assert [r.data for r in recorder.records()] == [b'3333', b'4444']
+
+    recorder = TraceRecorder(capacity=100, max_records=2)
+    for chunk in (b'a', b'b', b'c'):
+        recorder.record(RX, chunk)
+    assert [r.data for r in recorder.records()] == [b'b', b'c']
+
+
+def test_traces_radio_session(tmp_path):
+    radio, recorder = traced_radio()
+    channel = radio.read_channel(3)
+    assert channel.name == "Trace"
+    assert isinstance(radio.transport, TracingTransport)
+
+    sent = b''.join(r.data for r in recorder.records() if r.direction == TX)
+    received = b''.join(r.data for r in recorder.records() if r.direction == RX)
+    assert sent.startswith(bytes.fromhex('A5A5A5A5'))
+    assert len(received) == 34
+
+    path = tmp_path / 'session.pmrtrace'
+    assert recorder.dump(path) == len(recorder)
+    started, records = read_trace(path)
+    assert started == pytest.approx(recorder.started)
+    assert [(r.direction, r.data) for r in records] == \
+        [(r.direction, r.data) for r in recorder.records()]
+
+    assert radio.stop_trace() is recorder
+    assert isinstance(radio.transport, LoopbackTransport)
+    assert radio.stop_trace() is None
+
+
+def test_dump_is_readable_by_capture_analyzer(tmp_path):
+    radio, recorder = traced_radio()
+    radio.read_channel(3)
+    path = tmp_path / 'session.pmrtrace'
+    recorder.dump(path)
+
+    analyzer = load_analyzer()
+    content = path.read_bytes()
+    packets = analyzer.extract_packets(content, analyzer.find_packet_headers(content))
+    commands = [packet.command for packet in packets]
+    assert commands.count(Command.CHANNEL_READ) == 2  # Request and response
+    assert all(packet.crc_valid for packet in packets)
+
+
+def test_read_trace_rejects_other_files(tmp_path):
+    path = tmp_path / 'capture.spm'
+    path.write_bytes(b'not a trace')
+    with pytest.raises(ValueError):
+        read_trace(path)
@@ -0,0 +1,72 @@
+"""Tests for the pluggable driver transports"""
+
+import socket
+import threading
+
+import pytest
+
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command, Mode
+from pmr_171_cps.radio.emulator import RadioEmulator
+from pmr_171_cps.radio.transport import (
+    SERIAL_AVAILABLE,
+    LoopbackTransport,
+    SerialTransport,
+    TcpTransport,
+    open_transport,
+)
+from tests.fake_serial import make_channel
+
+
+def serve_emulator(emulator):
+    """One-connection TCP bridge in front of an emulator; returns the port"""
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(1)
+
+    def bridge():
+        conn, _ = server.accept()
+        with conn:
+            while True:
+                data = conn.recv(4096)
+                if not data:
+                    break
+                conn.sendall(emulator.feed(data))
+        server.close()
+
+    threading.Thread(target=bridge, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def test_open_transport_dispatch():
+    tcp = open_transport('socket://radio.local:4001')
+    assert isinstance(tcp, TcpTransport) and (tcp.host, tcp.port) == ('radio.local', 4001)
+    assert isinstance(open_transport('loop://'), LoopbackTransport)
+    with pytest.raises(ValueError):
+        TcpTransport.from_url('socket://radio.local')
+    if SERIAL_AVAILABLE:
+        assert isinstance(open_transport('COM6'), SerialTransport)
+
+
+def test_loopback_runs_driver_without_io():
+    emulator = RadioEmulator()
+    radio = PMR171Radio(LoopbackTransport(emulator), keepalive_idle=60)
+    radio.transport.open()
+    assert radio.port == 'loop://'
+
+    dmr = make_channel(4, mode=Mode.DMR)
+    dmr.call_id = 91
+    assert radio.write_channel(dmr)
+    channel = radio.read_channel(4)
+    assert (channel.name, channel.call_id) == ("CH4", 91)
+    assert emulator.requests[Command.CHANNEL_WRITE] == 1
+    radio.disconnect()
+    assert not radio.is_connected
+
+
+def test_tcp_bridge():
+    emulator = RadioEmulator(channels=[make_channel(2, name="REMOTE")])
+    port = serve_emulator(emulator)
+    with PMR171Radio(f'socket://127.0.0.1:{port}', timeout=0.5, read_window=4) as radio:
+        assert radio.write_channel(make_channel(3, name="NET"))
+        channels = radio.read_selected_channels([2, 3])
+    assert [c.name for c in channels] == ["REMOTE", "NET"]
@@ -0,0 +1,76 @@
+"""Tests for pipelined read-back verification"""
+
+import struct
+
+from pmr_171_cps.radio.pmr171_uart import PMR171Radio, Command, Mode
+from pmr_171_cps.radio.emulator import RadioEmulator
+from pmr_171_cps.radio.transport import LoopbackTransport
+from pmr_171_cps.radio.verify import CHANNEL_FIELDS, compare_block, expected_payloads
+from pmr_171_cps.radio.retry import RetryPolicy
+from tests.fake_serial import DMR_FIELDS, FakeRadioSerial, make_channel
+
+
+class SilentSlotSerial(FakeRadioSerial):
+    """Never answers reads of slot 3"""
+
+    def respond(self, cmd, payload):
+        if struct.unpack('>H', payload[:2])[0] == 3:
+            return None
+        return super().respond(cmd, payload)
+
+
+def codeplug_channel(index, mode=Mode.NFM, name=None):
+    fields = DMR_FIELDS if mode == Mode.DMR else {}
+    return make_channel(index, name, mode, freq_step=12_500, **fields)
+
+
+def loaded_radio(channels, window=1):
+    emulator = RadioEmulator(channels=channels)
+    radio = PMR171Radio(LoopbackTransport(emulator), read_window=window, keepalive_idle=60)
+    radio.transport.open()
+    return radio, emulator
+
+
+def test_identical_blocks_report_nothing():
+    channels = [codeplug_channel(i) for i in range(30)] + [codeplug_channel(30, Mode.DMR)]
+    radio, emulator = loaded_radio(channels)
+    report = radio.verify_channels(channels)
+    assert report.ok and report.checked == 31
+    assert emulator.requests[Command.CHANNEL_READ] == 31
+    assert emulator.requests[Command.DMR_DATA_READ] == 1
+
+
+def test_field_level_mismatches():
+    channels = [codeplug_channel(i) for i in range(5)] + [codeplug_channel(5, Mode.DMR)]
+    radio, emulator = loaded_radio(channels)
+    emulator.load_channel(codeplug_channel(2, name="Wrong"))
+    changed = codeplug_channel(5, Mode.DMR)
+    changed.slot = 2
+    emulator.load_channel(changed)
+
+    report = radio.verify_channels(channels)
+    assert not report.ok
+    assert report.mismatched_slots() == [2, 5]
+    by_slot = report.by_slot()
+    assert [(m.field, m.expected, m.actual) for m in by_slot[2]] == [('name', 'CH2', 'Wrong')]
+    assert [(m.field, m.expected, m.actual) for m in by_slot[5]] == [('dmr.slot', 1, 2)]
+    assert "Channel 2 name" in report.summary()
+
+
+def test_unanswered_slot_reported_missing():
+    expected = [codeplug_channel(i) for i in range(4)]
+    blocks, _ = expected_payloads(expected)
+    serial = SilentSlotSerial(channels=blocks)
+    radio = PMR171Radio(serial, timeout=0.05, keepalive_idle=60,
+                        retry_policy=RetryPolicy(max_attempts=2))
+
+    report = radio.verify_channels(expected, window=4)
+    assert [(m.slot, m.field) for m in report.mismatches] == [(3, 'missing')]
+
+
+def test_compare_block_skips_decoding_equal_bytes():
+    block = expected_payloads([codeplug_channel(7)])[0][7]
+    assert compare_block(7, block, block, CHANNEL_FIELDS) == []
+    other = block[:4] + struct.pack('>I', 145_500_000) + block[8:]
+    mismatch, = compare_block(7, block, other, CHANNEL_FIELDS)
+    assert (mismatch.field, mismatch.actual) == ('rx_freq_hz', 145_500_000)
@@ -0,0 +1,84 @@
+"""Tests for the pre-encoded codeplug write image"""
+
+import pytest
+
+from pmr_171_cps.radio import pmr171_uart
+from pmr_171_cps.radio.pmr171_uart import (
+    PMR171Radio,
+    Command,
+    Mode,
+    build_channel_packet,
+    build_dmr_data_packet,
+    channels_to_codeplug,
+)
+from pmr_171_cps.radio.emulator import RadioEmulator
+from pmr_171_cps.radio.transport import LoopbackTransport
+from pmr_171_cps.radio.write_image import PACKET_SIZE, WriteImage
+from tests.fake_serial import DMR_FIELDS, make_channel
+
+
+def codeplug_channel(index, mode=Mode.NFM):
+    fields = DMR_FIELDS if mode == Mode.DMR else {}
+    return make_channel(index, mode=mode, freq_step=12_500, **fields)
+
+
+def make_codeplug():
+    return [codeplug_channel(i, Mode.DMR if i % 4 == 0 else Mode.NFM) for i in (9, 2, 4, 0, 7)]
+
+
+def test_compile_layout():
+    image = WriteImage.compile(make_codeplug())
+    assert image.indices == [0, 2, 4, 7, 9]
+    assert (image.channel_count, image.dmr_count) == (5, 2)
+    assert len(image.buffer) == 7 * PACKET_SIZE
+
+    channel = codeplug_channel(4, Mode.DMR)
+    assert bytes(image.packet(4)) == build_channel_packet(channel, Command.CHANNEL_WRITE)
+    assert bytes(image.dmr_packet(4)) == build_dmr_data_packet(channel, Command.DMR_DATA_WRITE)
+    assert image.dmr_packet(7) is None and 3 not in image
+
+    with pytest.raises(ValueError):
+        WriteImage.compile([codeplug_channel(1), codeplug_channel(1)])
+
+
+def test_save_load_round_trip(tmp_path):
+    image = WriteImage.compile(make_codeplug())
+    path = tmp_path / "codeplug.pmrimg"
+    image.save(str(path))
+
+    loaded = WriteImage.load(str(path))
+    assert loaded.buffer == image.buffer
+    assert loaded.expected_payloads() == image.expected_payloads()
+    dmr = loaded.channels[0]
+    assert (dmr.index, dmr.name, dmr.call_id, dmr.call_format) == (0, "CH0", 91, 0)
+
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        WriteImage.load(str(path))
+
+
+def test_corrupted_buffer_rejected():
+    buffer = bytearray(WriteImage.compile(make_codeplug()).buffer)
+    buffer[PACKET_SIZE + 10] ^= 0xFF
+    with pytest.raises(ValueError):
+        WriteImage(bytes(buffer), 5)
+
+
+def test_write_streams_from_image(monkeypatch):
+    channels = make_codeplug()
+    image = WriteImage.from_codeplug(channels_to_codeplug(channels))
+    emulator = RadioEmulator()
+    radio = PMR171Radio(LoopbackTransport(emulator), keepalive_idle=60, verify_echo=True)
+    radio.transport.open()
+
+    def no_encoding(*args, **kwargs):
+        raise AssertionError("packet encoded during write")
+
+    monkeypatch.setattr(pmr171_uart, 'build_channel_packet', no_encoding)
+    monkeypatch.setattr(pmr171_uart, 'build_dmr_data_packet', no_encoding)
+    assert radio.write_codeplug(image) == 5
+    monkeypatch.undo()
+
+    assert emulator.requests[Command.CHANNEL_WRITE] == 5
+    assert emulator.requests[Command.DMR_DATA_WRITE] == 2
+    assert radio.verify_channels(image).ok